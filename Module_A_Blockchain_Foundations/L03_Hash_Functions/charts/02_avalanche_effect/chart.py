@@ -6,8 +6,12 @@ Shows how 1-bit change causes ~50% of output bits to flip
 import matplotlib.pyplot as plt
 import numpy as np
 import hashlib
+import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[4]))
+from engines.avalanche import avalanche, hamming_distance
+
 CHART_METADATA = {
     'title': 'Avalanche Effect Visualization',
     'url': 'https://github.com/Digital-AI-Finance/Blockchain_Crypto/tree/main/Module_A_Blockchain_Foundations/L03_Hash_Functions/charts/02_avalanche_effect'
@@ -35,26 +39,25 @@ MLLAVENDER = '#ADADE0'
 input1 = "blockchain"
 input2 = "Blockchain"  # Only 1 bit different (b vs B)
 
-hash1 = hashlib.sha256(input1.encode()).hexdigest()
-hash2 = hashlib.sha256(input2.encode()).hexdigest()
-
-# Convert to binary and count differences
-def hex_to_binary(hex_str):
-    return bin(int(hex_str, 16))[2:].zfill(256)
+digest1 = hashlib.sha256(input1.encode()).digest()
+digest2 = hashlib.sha256(input2.encode()).digest()
+hash1, hash2 = digest1.hex(), digest2.hex()
 
-bin1 = hex_to_binary(hash1)
-bin2 = hex_to_binary(hash2)
-
-# Count bit differences
-differences = sum(b1 != b2 for b1, b2 in zip(bin1, bin2))
+# Output bits of both hashes and their differences
+bits1 = np.unpackbits(np.frombuffer(digest1, dtype=np.uint8))
+bits2 = np.unpackbits(np.frombuffer(digest2, dtype=np.uint8))
+differences = hamming_distance(digest1, digest2)
 percentage = differences / 256 * 100
 
+# The same experiment in bulk: every bit of 4,096 random 32-byte messages flipped
+bulk = avalanche('sha256', messages=4096, seed=42)
+
 fig, ax = plt.subplots(figsize=(10, 6))
 
 # Create bit visualization (16x16 grid for 256 bits)
 grid_size = 16
-bits_grid1 = np.array([int(b) for b in bin1]).reshape(grid_size, grid_size)
-bits_grid2 = np.array([int(b) for b in bin2]).reshape(grid_size, grid_size)
+bits_grid1 = bits1.reshape(grid_size, grid_size)
+bits_grid2 = bits2.reshape(grid_size, grid_size)
 diff_grid = (bits_grid1 != bits_grid2).astype(int)
 
 # Plot the difference grid
@@ -71,12 +74,14 @@ ax.set_yticks([])
 
 # Title and annotations
 ax.set_title(f'Avalanche Effect: SHA-256("{input1}") vs SHA-256("{input2}")',
-             fontweight='bold', fontsize=14, pad=15)
+             fontweight='bold', fontsize=14, pad=55)
 
 # Add statistics box
-stats_text = f'Input change: 1 bit (b vs B)\nOutput bits changed: {differences}/256\nPercentage: {percentage:.1f}%'
+stats_text = (f'Input change: 1 bit (b vs B)\nOutput bits changed: {differences}/256\nPercentage: {percentage:.1f}%\n'
+              f'Over {bulk.samples:,} flips:\n{bulk.mean_distance:.1f} +/- {bulk.std_distance:.1f} bits '
+              f'({bulk.mean_distance / 256:.1%})')
 props = dict(boxstyle='round,pad=0.5', facecolor='white', edgecolor=MLPURPLE, alpha=0.95)
-ax.text(0.02, 0.98, stats_text, transform=ax.transAxes, fontsize=15,
+ax.text(1.04, 0.98, stats_text, transform=ax.transAxes, fontsize=15,
         verticalalignment='top', bbox=props, color=MLPURPLE)
 
 # Legend
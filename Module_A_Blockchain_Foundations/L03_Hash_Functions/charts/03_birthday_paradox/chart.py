@@ -1,12 +1,20 @@
 """
 Birthday Paradox Probability Curve
 Shows probability of collision as number of samples increases
+
+The measured collisions come from attempts.json, written by:
+    python -m engines.birthday --output <this folder>/attempts.json
 """
 
+import json
+import sys
 import matplotlib.pyplot as plt
 import numpy as np
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[4]))
+from engines.birthday import collision_probability, collision_threshold, expected_draws
+
 CHART_METADATA = {
     'title': 'Birthday Paradox Probability',
     'url': 'https://github.com/Digital-AI-Finance/Blockchain_Crypto/tree/main/Module_A_Blockchain_Foundations/L03_Hash_Functions/charts/03_birthday_paradox'
@@ -30,30 +38,22 @@ MLGREEN = '#2CA02C'
 MLRED = '#D62728'
 MLLAVENDER = '#ADADE0'
 
-fig, ax = plt.subplots(figsize=(10, 6))
+fig, (ax, ax_sha) = plt.subplots(1, 2, figsize=(16, 6), gridspec_kw={'width_ratios': [3, 2]})
 
 # Birthday problem: probability of at least one collision
 # P(collision) = 1 - P(no collision) = 1 - (365/365)(364/365)...(365-n+1)/365
 n_people = np.arange(1, 71)
 n_days = 365
 
-# Calculate probability of collision
-def collision_probability(n, N):
-    if n > N:
-        return 1.0
-    prob_no_collision = 1.0
-    for i in range(n):
-        prob_no_collision *= (N - i) / N
-    return 1 - prob_no_collision
-
-probs = [collision_probability(n, n_days) for n in n_people]
+probs = collision_probability(n_people, n_days)
+n_50, n_99 = collision_threshold(n_days, 0.5), collision_threshold(n_days, 0.99)
 
 # Plot
 ax.plot(n_people, probs, color=MLPURPLE, linewidth=3, label='Collision probability')
 
 # Mark key points
 # 50% probability
-idx_50 = np.argmin(np.abs(np.array(probs) - 0.5))
+idx_50 = n_50 - 1
 ax.axhline(y=0.5, color=MLORANGE, linestyle='--', linewidth=1.5, alpha=0.7)
 ax.axvline(x=n_people[idx_50], color=MLORANGE, linestyle='--', linewidth=1.5, alpha=0.7)
 ax.scatter([n_people[idx_50]], [probs[idx_50]], color=MLORANGE, s=100, zorder=5)
@@ -62,7 +62,7 @@ ax.annotate(f'50% at n={n_people[idx_50]}', xy=(n_people[idx_50], probs[idx_50])
             arrowprops=dict(arrowstyle='->', color=MLORANGE))
 
 # 99% probability
-idx_99 = np.argmin(np.abs(np.array(probs) - 0.99))
+idx_99 = n_99 - 1
 ax.scatter([n_people[idx_99]], [probs[idx_99]], color=MLRED, s=100, zorder=5)
 ax.annotate(f'99% at n={n_people[idx_99]}', xy=(n_people[idx_99], probs[idx_99]),
             xytext=(55, 0.85), fontsize=15, color=MLRED,
@@ -83,12 +83,33 @@ ax.spines['top'].set_visible(False)
 ax.spines['right'].set_visible(False)
 
 # Key insight box
-insight_text = 'Birthday Paradox:\nWith 365 possible values,\ncollision likely at n $\\approx$ $\\sqrt{365}$ $\\approx$ 23\n\nFor SHA-256 (2$^{256}$ outputs):\nCollision at $\\approx$ 2$^{128}$ attempts'
+insight_text = f'Birthday Paradox:\nWith 365 possible values,\ncollision likely at n $\\approx$ 1.18$\\sqrt{{365}}$ = {n_50}\n\nFor SHA-256 (2$^{{256}}$ outputs):\nCollision at $\\approx$ 2$^{{128}}$ attempts'
 props = dict(boxstyle='round,pad=0.5', facecolor='white', edgecolor=MLPURPLE, alpha=0.95)
 ax.text(0.98, 0.35, insight_text, transform=ax.transAxes, fontsize=14,
         verticalalignment='top', horizontalalignment='right', bbox=props, color='#333')
 
-plt.title('Birthday Paradox: Collision Probability vs Sample Size', fontweight='bold', fontsize=15, pad=15)
+ax.set_title('Birthday Paradox: Collision Probability vs Sample Size', fontweight='bold', fontsize=15, pad=15)
+
+# Measured: hashes until the first n-bit prefix of SHA-256 repeats
+measured = json.loads((Path(__file__).parent / 'attempts.json').read_text(encoding='utf-8'))
+bits = np.array(measured['bits'])
+attempts = measured['attempts']
+for b, runs in zip(bits, attempts):
+    ax_sha.scatter(np.full(len(runs), b), runs, color=MLPURPLE, alpha=0.6, s=40, zorder=4,
+                   label='Measured collisions' if b == bits[0] else None)
+ax_sha.plot(bits, 2.0 ** (bits / 2), color=MLORANGE, linestyle='--', linewidth=2, label='Bound $2^{n/2}$')
+ax_sha.plot(bits, [expected_draws(2 ** int(b)) for b in bits], color=MLGREEN, linewidth=2,
+            label='Expected $\\sqrt{\\pi 2^n / 2}$')
+ax_sha.set_yscale('log', base=2)
+ax_sha.set_xticks(bits)
+ax_sha.set_xlabel('Truncated SHA-256 Output (bits)', fontsize=16)
+ax_sha.set_ylabel('Hashes Until First Collision', fontsize=16)
+ax_sha.grid(True, alpha=0.3)
+ax_sha.spines['top'].set_visible(False)
+ax_sha.spines['right'].set_visible(False)
+ax_sha.legend(loc='upper left', fontsize=13)
+ax_sha.set_title('Real Collisions in Truncated SHA-256', fontweight='bold', fontsize=15, pad=15)
+
 plt.tight_layout()
 
 output_path = Path(__file__).parent / 'chart.pdf'
@@ -7,8 +7,12 @@ import matplotlib.pyplot as plt
 import matplotlib.patches as patches
 from matplotlib.patches import FancyBboxPatch, Circle
 import numpy as np
+import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[4]))
+from engines.merkle import MerkleTree, verify_proof
+
 CHART_METADATA = {
     'title': 'Merkle Tree Construction',
     'url': 'https://github.com/Digital-AI-Finance/Blockchain_Crypto/tree/main/Module_A_Blockchain_Foundations/L03_Hash_Functions/charts/05_merkle_tree'
@@ -34,11 +38,20 @@ MLLAVENDER = '#ADADE0'
 
 fig, ax = plt.subplots(figsize=(10, 6))
 
-# Tree structure (bottom to top)
+# Tree structure (bottom to top), built by the same code as the lab reference
 # Level 0: Transactions
 # Level 1: Transaction hashes
 # Level 2: Paired hashes
 # Level 3: Root
+tx_labels = ['Tx1', 'Tx2', 'Tx3', 'Tx4']
+tree = MerkleTree.from_data([label.encode() for label in tx_labels])
+PROVE = 2  # Tx3 highlighted for proof
+proof = tree.proof(PROVE)
+
+
+def short(digest):
+    return digest.hex()[:6]
+
 
 # Positions
 tx_y = 0.12
@@ -48,8 +61,7 @@ root_y = 0.82
 
 # Transactions (Level 0)
 tx_positions = [0.15, 0.38, 0.62, 0.85]
-tx_labels = ['Tx1', 'Tx2', 'Tx3', 'Tx4']
-tx_colors = [MLBLUE, MLBLUE, MLORANGE, MLBLUE]  # Tx3 highlighted for proof
+tx_colors = [MLORANGE if i == PROVE else MLBLUE for i in range(len(tx_labels))]
 
 for x, label, color in zip(tx_positions, tx_labels, tx_colors):
     box = FancyBboxPatch((x - 0.06, tx_y - 0.06), 0.12, 0.12,
@@ -60,36 +72,34 @@ for x, label, color in zip(tx_positions, tx_labels, tx_colors):
             fontweight='bold', color=color)
 
 # Level 1: Hash of each transaction
-h1_positions = [0.15, 0.38, 0.62, 0.85]
-h1_labels = ['H(Tx1)', 'H(Tx2)', 'H(Tx3)', 'H(Tx4)']
-h1_colors = [MLGREEN, MLGREEN, MLORANGE, MLGREEN]
+h1_positions = tx_positions
+h1_colors = [MLORANGE if i == PROVE else MLGREEN for i in range(len(tx_labels))]
 
-for x, label, color in zip(h1_positions, h1_labels, h1_colors):
+for i, (x, color) in enumerate(zip(h1_positions, h1_colors)):
     circle = Circle((x, h1_y), 0.055, facecolor=color, edgecolor='black', linewidth=1.5, alpha=0.8)
     ax.add_patch(circle)
-    ax.text(x, h1_y, label.replace('H(', '').replace(')', ''), ha='center', va='center',
+    ax.text(x, h1_y, tx_labels[i].replace('Tx', 'H'), ha='center', va='center',
             fontsize=14, fontweight='bold', color='white')
+    ax.text(x + 0.065, h1_y - 0.06, short(tree.node(0, i)), ha='left', va='center',
+            fontsize=12, family='monospace', color='#555')
     # Arrow from tx to hash
-    tx_idx = h1_positions.index(x)
-    ax.annotate('', xy=(x, h1_y - 0.055), xytext=(tx_positions[tx_idx], tx_y + 0.06),
+    ax.annotate('', xy=(x, h1_y - 0.055), xytext=(tx_positions[i], tx_y + 0.06),
                 arrowprops=dict(arrowstyle='->', color='#666', lw=1.5))
 
 # Level 2: Paired hashes
 h2_positions = [0.265, 0.735]
 h2_labels = ['H12', 'H34']
-h2_colors = [MLGREEN, MLORANGE]
+h2_colors = [MLORANGE if i == PROVE // 2 else MLGREEN for i in range(2)]
 
 for i, (x, label, color) in enumerate(zip(h2_positions, h2_labels, h2_colors)):
     circle = Circle((x, h2_y), 0.06, facecolor=color, edgecolor='black', linewidth=1.5, alpha=0.8)
     ax.add_patch(circle)
     ax.text(x, h2_y, label, ha='center', va='center', fontsize=14, fontweight='bold', color='white')
+    ax.text(x + 0.07, h2_y - 0.06, short(tree.node(1, i)), ha='left', va='center',
+            fontsize=12, family='monospace', color='#555')
 
     # Arrows from level 1
-    if i == 0:
-        sources = [0.15, 0.38]
-    else:
-        sources = [0.62, 0.85]
-    for src_x in sources:
+    for src_x in h1_positions[2 * i:2 * i + 2]:
         ax.annotate('', xy=(x, h2_y - 0.06), xytext=(src_x, h1_y + 0.055),
                     arrowprops=dict(arrowstyle='->', color='#666', lw=1.5))
 
@@ -98,6 +108,8 @@ root_x = 0.5
 circle = Circle((root_x, root_y), 0.07, facecolor=MLPURPLE, edgecolor='black', linewidth=2)
 ax.add_patch(circle)
 ax.text(root_x, root_y, 'ROOT', ha='center', va='center', fontsize=14, fontweight='bold', color='white')
+ax.text(root_x - 0.08, root_y, short(tree.root), ha='right', va='center',
+        fontsize=12, family='monospace', color='#555')
 
 # Arrows to root
 for x in h2_positions:
@@ -111,13 +123,15 @@ ax.text(0.02, h2_y, 'Level 2\nInternal', ha='center', va='center', fontsize=14,
 ax.text(0.02, root_y, 'Level 3\nMerkle Root', ha='center', va='center', fontsize=14, color='#666')
 
 # Merkle proof annotation
-proof_text = 'Merkle Proof for Tx3:\n1. H(Tx4) - sibling\n2. H12 - aunt\nVerify: H(H12 || H(H(Tx3)||H(Tx4))) = Root'
+verified = verify_proof(tree.leaf(PROVE), PROVE, proof, tree.root)
+proof_text = (f'Merkle Proof for Tx3:\n1. H4 = {short(proof[0])} - sibling\n2. H12 = {short(proof[1])} - aunt\n'
+              f'Verify: H(H12 || H(H3||H4)) = Root ({"valid" if verified else "invalid"})')
 props = dict(boxstyle='round,pad=0.3', facecolor='#FFF5E6', edgecolor=MLORANGE, alpha=0.95)
-ax.text(0.98, 0.25, proof_text, transform=ax.transAxes, fontsize=14,
-        verticalalignment='bottom', horizontalalignment='right', bbox=props, color='#333')
+ax.text(0.98, 1.0, proof_text, transform=ax.transAxes, fontsize=14,
+        verticalalignment='top', horizontalalignment='right', bbox=props, color='#333')
 
 ax.set_xlim(-0.05, 1.05)
-ax.set_ylim(0, 1)
+ax.set_ylim(0, 1.1)
 ax.axis('off')
 
 plt.title('Merkle Tree: Hierarchical Hash Structure', fontweight='bold', fontsize=15, pad=10)
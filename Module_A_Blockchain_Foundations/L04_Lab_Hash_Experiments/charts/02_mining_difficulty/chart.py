@@ -1,12 +1,20 @@
 """
 Mining Difficulty vs Computation Time
-Exponential growth visualization
+Measured nonce searches per difficulty, and the speedup of midstate reuse and parallel mining
+
+The measurements come from benchmark.json, written by the lab miner:
+    python -m engines.mining --output <this folder>/benchmark.json
 """
 
+import json
+import sys
 import matplotlib.pyplot as plt
 import numpy as np
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[4]))
+from engines.mining import DifficultyBenchmark
+
 CHART_METADATA = {
     'title': 'Mining Difficulty',
     'url': 'https://github.com/Digital-AI-Finance/Blockchain_Crypto/tree/main/Module_A_Blockchain_Foundations/L04_Lab_Hash_Experiments/charts/02_mining_difficulty'
@@ -29,14 +37,40 @@ MLORANGE = '#FF7F0E'
 MLGREEN = '#2CA02C'
 MLRED = '#D62728'
 
-fig, ax = plt.subplots(figsize=(10, 6))
+fig, (ax, ax_rate) = plt.subplots(1, 2, figsize=(14, 6), gridspec_kw={'width_ratios': [2, 1]})
+
+# Real lab blocks mined at each difficulty: trial t is block number t + 1, so
+# the attempts are reproducible and only the times depend on the machine
+results = json.loads((Path(__file__).parent / 'benchmark.json').read_text(encoding='utf-8'))
+bench = DifficultyBenchmark.from_dict(results['difficulty'])
+difficulty = bench.levels
+processes = bench.processes
+process_label = f'{processes} process{"es" if processes > 1 else ""}'
+naive_rate = results['hashrate']['plain']
+midstate_rate = results['hashrate']['midstate']
+parallel_rate = results['hashrate']['parallel']
+avg_attempts = bench.mean_attempts
+
+
+def format_seconds(seconds):
+    if seconds < 0.001:
+        return '< 1 ms'
+    if seconds < 1:
+        return f'{seconds * 1000:.0f} ms'
+    return f'{seconds:.1f} sec' if seconds < 60 else f'{seconds / 60:.1f} min'
 
-# Difficulty levels and expected attempts
-difficulty = [1, 2, 3, 4, 5]
-avg_attempts = [16, 256, 4096, 65536, 1048576]
-time_estimate = ['< 1 sec', '< 1 sec', '1-5 sec', '10-60 sec', '5-20 min']
 
-bars = ax.bar(difficulty, avg_attempts, color=MLBLUE, edgecolor='black', linewidth=1.5, width=0.6)
+time_estimate = [format_seconds(s) for s in np.nanmean(bench.seconds, axis=1)]
+
+bars = ax.bar(difficulty, avg_attempts, color=MLBLUE, edgecolor='black', linewidth=1.5, width=0.6,
+              label='Measured average')
+rng = np.random.default_rng(0)
+for level, runs in zip(difficulty, bench.attempts):
+    runs = runs[~np.isnan(runs)]
+    ax.scatter(level + rng.uniform(-0.2, 0.2, len(runs)), runs, s=10, color='black', alpha=0.4, zorder=3,
+               label='Single blocks' if level == difficulty[0] else None)
+ax.plot(difficulty, bench.expected, 'D--', color=MLPURPLE, markersize=9, linewidth=1.5, zorder=4,
+        label='Expected: 16^difficulty')
 
 # Color gradient based on difficulty
 for i, bar in enumerate(bars):
@@ -48,25 +82,43 @@ for i, bar in enumerate(bars):
         bar.set_color(MLRED)
 
 # Add time labels
+top = np.nanmax(bench.attempts, axis=1)
 for i, (bar, time) in enumerate(zip(bars, time_estimate)):
-    ax.text(bar.get_x() + bar.get_width()/2, bar.get_height() * 1.1,
+    ax.text(bar.get_x() + bar.get_width()/2, top[i] * 1.6,
             time, ha='center', va='bottom', fontsize=14, fontweight='bold')
 
 ax.set_yscale('log')
+ax.set_ylim(1, top[-1] * 50)
 ax.set_xlabel('Difficulty (Leading Zeros)', fontsize=15)
-ax.set_ylabel('Average Attempts (log scale)', fontsize=15)
+ax.set_ylabel('Attempts (log scale)', fontsize=15)
 ax.set_xticks(difficulty)
 ax.set_xticklabels(['1 zero', '2 zeros', '3 zeros', '4 zeros', '5 zeros'], fontsize=14)
 
 ax.grid(True, alpha=0.3, axis='y')
-
-# Add formula annotation
-ax.text(0.98, 0.02, 'Expected attempts = 16^difficulty',
-        transform=ax.transAxes, fontsize=14, ha='right', va='bottom',
-        bbox=dict(boxstyle='round,pad=0.3', facecolor='#E8F5E9', edgecolor=MLGREEN))
-
+ax.legend(loc='upper left', fontsize=12, title=f'Times on {process_label}', title_fontsize=12)
 ax.set_title('Mining Difficulty: Exponential Growth in Computation', fontweight='bold', fontsize=14, pad=10)
 
+# What the midstate and extra processes buy over a plain mining loop; a
+# benchmark recorded on one process has no parallel measurement to show
+rates = [naive_rate, midstate_rate]
+labels = ['Plain\nloop', 'Midstate\n1 process']
+colors = [MLORANGE, MLBLUE]
+if processes > 1:
+    rates.append(parallel_rate)
+    labels.append(f'Midstate\n{process_label}')
+    colors.append(MLPURPLE)
+rate_bars = ax_rate.bar(range(len(rates)), np.array(rates) / 1e6, color=colors,
+                        edgecolor='black', linewidth=1.5, width=0.6)
+for bar, rate in zip(rate_bars, rates):
+    ax_rate.text(bar.get_x() + bar.get_width()/2, bar.get_height() * 1.02,
+                 f'{rate / naive_rate:.1f}x', ha='center', va='bottom', fontsize=14, fontweight='bold')
+ax_rate.set_xticks(range(len(rates)))
+ax_rate.set_xticklabels(labels, fontsize=12)
+ax_rate.set_ylim(0, max(rates) / 1e6 * 1.2)
+ax_rate.set_ylabel('Measured Hashrate (MH/s)', fontsize=15)
+ax_rate.set_title('Speedup over a Plain Loop', fontweight='bold', fontsize=14, pad=10)
+ax_rate.grid(True, alpha=0.3, axis='y')
+
 plt.tight_layout()
 output_path = Path(__file__).parent / 'chart.pdf'
 plt.savefig(output_path, bbox_inches='tight', dpi=300)
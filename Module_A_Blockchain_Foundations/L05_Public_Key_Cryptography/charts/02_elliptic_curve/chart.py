@@ -3,10 +3,14 @@ Elliptic Curve Visualization
 Shows the secp256k1 curve used in Bitcoin with point addition
 """
 
+import sys
 import matplotlib.pyplot as plt
 import numpy as np
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[4]))
+from engines.secp256k1 import P, public_key_batch
+
 CHART_METADATA = {
     'title': 'Elliptic Curve secp256k1',
     'url': 'https://github.com/Digital-AI-Finance/Blockchain_Crypto/tree/main/Module_A_Blockchain_Foundations/L05_Public_Key_Cryptography/charts/02_elliptic_curve'
@@ -30,7 +34,7 @@ MLGREEN = '#2CA02C'
 MLRED = '#D62728'
 MLLAVENDER = '#ADADE0'
 
-fig, ax = plt.subplots(figsize=(10, 6))
+fig, (ax, ax_mod) = plt.subplots(1, 2, figsize=(16, 6), gridspec_kw={'width_ratios': [3, 2]})
 
 # Plot elliptic curve y^2 = x^3 + 7 (secp256k1, but over reals for visualization)
 x = np.linspace(-2, 4, 1000)
@@ -52,26 +56,24 @@ ax.text(Px + 0.15, Py + 0.3, 'P', fontsize=14, fontweight='bold', color=MLBLUE)
 # Point Q
 Qx, Qy = 2.5, np.sqrt(2.5**3 + 7)
 ax.scatter([Qx], [Qy], s=150, color=MLGREEN, zorder=5, edgecolor='black', linewidth=2)
-ax.text(Qx + 0.15, Qy + 0.3, 'Q', fontsize=14, fontweight='bold', color=MLGREEN)
+ax.text(Qx + 0.15, Qy - 0.5, 'Q', fontsize=14, fontweight='bold', color=MLGREEN)
 
 # Line through P and Q
 slope = (Qy - Py) / (Qx - Px)
-x_line = np.linspace(-1.5, 4, 100)
+x_line = np.linspace(-2, 4, 100)
 y_line = Py + slope * (x_line - Px)
 ax.plot(x_line, y_line, color=MLORANGE, linestyle='--', linewidth=2, alpha=0.7, label='Line through P, Q')
 
-# Find intersection point R' (solving cubic)
-# For visualization, approximate
-Rx = 3.2
-Ry_neg = -np.sqrt(Rx**3 + 7)
-ax.scatter([Rx], [Ry_neg], s=150, color=MLRED, zorder=5, edgecolor='black', linewidth=2)
-ax.text(Rx + 0.15, Ry_neg - 0.4, 'R = P + Q', fontsize=15, fontweight='bold', color=MLRED)
+# Third intersection R' of the line with the curve (chord rule), reflected to R
+Rx = slope ** 2 - Px - Qx
+Ry_line = Py + slope * (Rx - Px)
+ax.scatter([Rx], [-Ry_line], s=150, color=MLRED, zorder=5, edgecolor='black', linewidth=2)
+ax.text(Rx + 0.15, -Ry_line + 0.3, 'R = P + Q', fontsize=15, fontweight='bold', color=MLRED)
 
 # Show reflection line
-Ry_pos = np.sqrt(Rx**3 + 7)
-ax.plot([Rx, Rx], [Ry_neg, Ry_pos], color=MLRED, linestyle=':', linewidth=2, alpha=0.7)
-ax.scatter([Rx], [Ry_pos], s=80, color=MLRED, zorder=4, alpha=0.5, edgecolor='black')
-ax.text(Rx + 0.15, Ry_pos + 0.2, "R'", fontsize=14, color=MLRED, alpha=0.7)
+ax.plot([Rx, Rx], [Ry_line, -Ry_line], color=MLRED, linestyle=':', linewidth=2, alpha=0.7)
+ax.scatter([Rx], [Ry_line], s=80, color=MLRED, zorder=4, alpha=0.5, edgecolor='black')
+ax.text(Rx + 0.15, Ry_line - 0.5, "R'", fontsize=14, color=MLRED, alpha=0.7)
 
 # Axis
 ax.axhline(y=0, color='gray', linewidth=0.5)
@@ -88,10 +90,27 @@ ax.grid(True, alpha=0.3)
 # Equation box
 eq_text = "Bitcoin's secp256k1 curve:\n$y^2 = x^3 + 7$ (mod p)\n\nPoint Addition:\nR = P + Q"
 props = dict(boxstyle='round,pad=0.4', facecolor='white', edgecolor=MLPURPLE, alpha=0.95)
-ax.text(0.02, 0.98, eq_text, transform=ax.transAxes, fontsize=14,
-        verticalalignment='top', bbox=props, color='#333')
-
-plt.title('Elliptic Curve Cryptography: Point Addition', fontweight='bold', fontsize=15, pad=10)
+ax.text(0.98, 0.72, eq_text, transform=ax.transAxes, fontsize=14,
+        verticalalignment='top', horizontalalignment='right', bbox=props, color='#333')
+
+ax.set_title('Elliptic Curve Cryptography: Point Addition', fontweight='bold', fontsize=15, pad=10)
+
+# The real curve: k * G over the integers mod p, for k = 1 .. 2000
+multiples = public_key_batch(range(1, 2001))
+xs = np.array([float(x) / P for x, _ in multiples])
+ys = np.array([float(y) / P for _, y in multiples])
+ax_mod.scatter(xs, ys, s=6, color=MLPURPLE, alpha=0.5, label='k * G, k = 1..2000')
+for k, color in [(1, MLBLUE), (2, MLGREEN), (3, MLRED)]:
+    ax_mod.scatter([xs[k - 1]], [ys[k - 1]], s=150, color=color, zorder=5, edgecolor='black', linewidth=2)
+    left = xs[k - 1] > 0.85
+    ax_mod.text(xs[k - 1] + (-0.03 if left else 0.03), ys[k - 1] + 0.03, f'{k}G' if k > 1 else 'G',
+                fontsize=14, fontweight='bold', color=color, ha='right' if left else 'left')
+ax_mod.set_xlim(0, 1)
+ax_mod.set_ylim(0, 1.12)
+ax_mod.set_xlabel('x / p', fontsize=16)
+ax_mod.set_ylabel('y / p', fontsize=16)
+ax_mod.legend(loc='upper right', fontsize=13)
+ax_mod.set_title('secp256k1 mod p: Multiples of G Look Random', fontweight='bold', fontsize=15, pad=10)
 plt.tight_layout()
 
 output_path = Path(__file__).parent / 'chart.pdf'
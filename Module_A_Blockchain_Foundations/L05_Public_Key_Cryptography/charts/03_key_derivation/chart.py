@@ -3,12 +3,17 @@ Key to Address Derivation Flow
 Shows how private key becomes a blockchain address
 """
 
+import hashlib
+import sys
 import matplotlib.pyplot as plt
 import matplotlib.patches as patches
 from matplotlib.patches import FancyBboxPatch, FancyArrowPatch
 import numpy as np
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[4]))
+from engines.secp256k1 import encode_public_key, generate_keys, hash160, p2pkh_address
+
 CHART_METADATA = {
     'title': 'Key to Address Derivation',
     'url': 'https://github.com/Digital-AI-Finance/Blockchain_Crypto/tree/main/Module_A_Blockchain_Foundations/L05_Public_Key_Cryptography/charts/03_key_derivation'
@@ -58,7 +63,7 @@ for i, (x, y, label, desc, color) in enumerate(steps):
             fontweight='bold', color='white')
 
     # Description
-    ax.text(x, y - 0.04, desc, ha='center', va='center', fontsize=14,
+    ax.text(x, y - 0.04, desc, ha='center', va='center', fontsize=12,
             color='white')
 
     # Arrow
@@ -68,13 +73,19 @@ for i, (x, y, label, desc, color) in enumerate(steps):
                     xytext=(x + box_width/2 + 0.01, y),
                     arrowprops=dict(arrowstyle='->', color='#333', lw=2.5))
 
-# Example values below
+# Example values below: one real key pair worked through every step
+private_keys, public_keys = generate_keys(1, seed=42)
+public_bytes = encode_public_key(public_keys[0])
+pubkey_hash = hash160(public_bytes)
+checksum = hashlib.sha256(hashlib.sha256(b'\x00' + pubkey_hash).digest()).digest()[:4]
+address = p2pkh_address(public_keys[0])
+private_hex = f'{private_keys[0]:064x}'
 examples = [
-    (0.08, 0.15, '256 bits\n(secret!)'),
-    (0.30, 0.15, '33 or 65 bytes\n(public)'),
-    (0.52, 0.15, '20 bytes\n(160 bits)'),
-    (0.74, 0.15, '4 bytes'),
-    (0.92, 0.15, '25-34 chars\n1A1zP1...'),
+    (0.08, 0.15, f'256 bits (secret!)\n{private_hex[:4]}...{private_hex[-4:]}'),
+    (0.30, 0.15, f'33 bytes (public)\n{public_bytes.hex()[:6]}...{public_bytes.hex()[-4:]}'),
+    (0.52, 0.15, f'20 bytes\n{pubkey_hash.hex()[:4]}...{pubkey_hash.hex()[-4:]}'),
+    (0.74, 0.15, f'4 bytes\n{checksum.hex()}'),
+    (0.92, 0.15, f'{len(address)} chars\n{address[:6]}...'),
 ]
 
 for x, y, text in examples:
@@ -93,7 +104,7 @@ props = dict(boxstyle='round,pad=0.3', facecolor='#FFE0E0', edgecolor=MLRED, alp
 ax.text(0.5, 0.88, insight_text, ha='center', va='center', fontsize=15,
         fontweight='bold', bbox=props, color=MLRED)
 
-ax.set_xlim(0, 1)
+ax.set_xlim(-0.02, 1.02)
 ax.set_ylim(0, 1)
 ax.axis('off')
 
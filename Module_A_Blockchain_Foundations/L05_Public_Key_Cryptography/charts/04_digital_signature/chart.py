@@ -3,12 +3,16 @@ ECDSA Digital Signature Process
 Shows signing and verification workflow
 """
 
+import sys
 import matplotlib.pyplot as plt
 import matplotlib.patches as patches
 from matplotlib.patches import FancyBboxPatch, FancyArrowPatch, Circle
 import numpy as np
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[4]))
+from engines.secp256k1 import generate_keys, message_hash, sign, verify
+
 CHART_METADATA = {
     'title': 'ECDSA Digital Signature Process',
     'url': 'https://github.com/Digital-AI-Finance/Blockchain_Crypto/tree/main/Module_A_Blockchain_Foundations/L05_Public_Key_Cryptography/charts/04_digital_signature'
@@ -32,6 +36,13 @@ MLGREEN = '#2CA02C'
 MLRED = '#D62728'
 MLLAVENDER = '#ADADE0'
 
+# A real ECDSA signature on secp256k1, checked as sent and after tampering
+message = b'Alice pays Bob 1 BTC'
+(private_key,), (public_key,) = generate_keys(1, seed=7)
+signature = sign(private_key, message_hash(message))
+valid = verify(public_key, message_hash(message), signature)
+tampered_valid = verify(public_key, message_hash(b'Alice pays Bob 9 BTC'), signature)
+
 fig, ax = plt.subplots(figsize=(10, 6))
 
 # Signing section (top)
@@ -40,14 +51,14 @@ ax.text(0.25, 0.95, 'SIGNING (Alice)', ha='center', fontsize=14, fontweight='bol
 # Signing steps
 sign_steps = [
     (0.08, 0.75, 'Message\nm', MLBLUE),
-    (0.25, 0.75, 'Hash\nh=SHA256(m)', MLORANGE),
+    (0.25, 0.75, 'Hash\nSHA-256(m)', MLORANGE),
     (0.42, 0.75, 'Sign with\nPrivate Key', MLRED),
     (0.60, 0.75, 'Signature\n(r, s)', MLPURPLE),
 ]
 
 for i, (x, y, text, color) in enumerate(sign_steps):
     box = FancyBboxPatch((x - 0.07, y - 0.08), 0.14, 0.16,
-                          boxstyle="round,pad=0.02", facecolor=color,
+                          boxstyle="round,pad=0.005", facecolor=color,
                           edgecolor='black', linewidth=1.5, alpha=0.85)
     ax.add_patch(box)
     ax.text(x, y, text, ha='center', va='center', fontsize=14,
@@ -68,14 +79,14 @@ ax.text(0.75, 0.95, 'VERIFICATION (Anyone)', ha='center', fontsize=14, fontweigh
 
 # Verification steps
 verify_steps = [
-    (0.60, 0.30, 'Received\nm, (r, s)', MLLAVENDER),
-    (0.75, 0.30, 'Compute\nh=SHA256(m)', MLORANGE),
-    (0.90, 0.30, 'Verify with\nPublic Key', MLGREEN),
+    (0.58, 0.30, 'Received\nm, (r, s)', MLLAVENDER),
+    (0.745, 0.30, 'Hash\nSHA-256(m)', MLORANGE),
+    (0.91, 0.30, 'Verify with\nPublic Key', MLGREEN),
 ]
 
 for i, (x, y, text, color) in enumerate(verify_steps):
     box = FancyBboxPatch((x - 0.07, y - 0.08), 0.14, 0.16,
-                          boxstyle="round,pad=0.02", facecolor=color,
+                          boxstyle="round,pad=0.005", facecolor=color,
                           edgecolor='black', linewidth=1.5, alpha=0.85)
     ax.add_patch(box)
     ax.text(x, y, text, ha='center', va='center', fontsize=14,
@@ -87,16 +98,23 @@ for i, (x, y, text, color) in enumerate(verify_steps):
                     arrowprops=dict(arrowstyle='->', color='#333', lw=1.5))
 
 # Result
-result_box = FancyBboxPatch((0.83, 0.08), 0.14, 0.12,
-                             boxstyle="round,pad=0.02", facecolor=MLGREEN,
+result_box = FancyBboxPatch((0.84, 0.08), 0.14, 0.12,
+                             boxstyle="round,pad=0.005", facecolor=MLGREEN if valid else MLRED,
                              edgecolor='black', linewidth=2)
 ax.add_patch(result_box)
-ax.text(0.90, 0.14, 'Valid?', ha='center', va='center', fontsize=14,
+ax.text(0.91, 0.14, 'Valid' if valid else 'Invalid', ha='center', va='center', fontsize=14,
         fontweight='bold', color='white')
 
-ax.annotate('', xy=(0.90, 0.20), xytext=(0.90, 0.22),
+ax.annotate('', xy=(0.91, 0.20), xytext=(0.91, 0.22),
             arrowprops=dict(arrowstyle='->', color='#333', lw=1.5))
 
+# The worked example
+example_text = '\n'.join([f'm = "{message.decode()}"',
+                          f'r = {signature[0]:064x}'[:20] + '...',
+                          f's = {signature[1]:064x}'[:20] + '...',
+                          f'"9 BTC" instead: {"valid" if tampered_valid else "rejected"}'])
+ax.text(0.02, 0.08, example_text, ha='left', va='center', fontsize=11, family='monospace', color='#333')
+
 # Key properties box
 props_text = 'Properties:\n- Authentication\n- Integrity\n- Non-repudiation'
 props = dict(boxstyle='round,pad=0.3', facecolor='white', edgecolor=MLPURPLE, alpha=0.95)
@@ -3,12 +3,16 @@ Hierarchical Deterministic Wallet Structure
 Shows the BIP-32 key derivation tree
 """
 
+import sys
 import matplotlib.pyplot as plt
 import matplotlib.patches as patches
 from matplotlib.patches import FancyBboxPatch, Circle
 import numpy as np
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[4]))
+from engines.hd_wallet import HDWallet
+
 CHART_METADATA = {
     'title': 'HD Wallet Tree Structure',
     'url': 'https://github.com/Digital-AI-Finance/Blockchain_Crypto/tree/main/Module_A_Blockchain_Foundations/L05_Public_Key_Cryptography/charts/05_hd_wallet_tree'
@@ -32,6 +36,13 @@ MLGREEN = '#2CA02C'
 MLRED = '#D62728'
 MLLAVENDER = '#ADADE0'
 
+# Real BIP32/BIP44 derivations from the standard BIP39 test mnemonic
+MNEMONIC = 'abandon ' * 11 + 'about'
+wallet = HDWallet.from_mnemonic(MNEMONIC)
+master_fingerprint = wallet.derive('m').fingerprint.hex()
+receiving = wallet.derive("m/44'/0'/0'/0")
+addresses = wallet.addresses("m/44'/0'/0'/0", 0, 1000)
+
 fig, ax = plt.subplots(figsize=(10, 6))
 
 # Master seed at top
@@ -47,6 +58,8 @@ master_y = 0.70
 ax.add_patch(Circle((0.5, master_y), 0.045, facecolor=MLPURPLE, edgecolor='black', linewidth=2))
 ax.text(0.5, master_y, 'm', ha='center', va='center', fontsize=15, fontweight='bold', color='white')
 ax.text(0.58, master_y, "Master Key", ha='left', va='center', fontsize=14, color='#444')
+ax.text(0.58, master_y - 0.045, f"fingerprint {master_fingerprint}", ha='left', va='center', fontsize=10,
+        color='#777', family='monospace')
 
 # Arrow from seed to master
 ax.annotate('', xy=(0.5, master_y + 0.045), xytext=(0.5, 0.85),
@@ -96,6 +109,8 @@ addr_labels = ['0', '1', '2']
 for x, label in zip(addr_positions, addr_labels):
     ax.add_patch(Circle((x, addr_y), 0.025, facecolor=MLLAVENDER, edgecolor='black', linewidth=1))
     ax.text(x, addr_y, label, ha='center', va='center', fontsize=14, fontweight='bold', color='#333')
+    ax.text(x, addr_y - 0.048, addresses[int(label)][:6], ha='center', va='center', fontsize=9,
+            color='#555', family='monospace')
 
     ax.annotate('', xy=(x, addr_y + 0.025), xytext=(0.20, account_y - 0.03),
                 arrowprops=dict(arrowstyle='->', color='#aaa', lw=0.8))
@@ -118,11 +133,18 @@ for y in [0.63, 0.48, 0.31, 0.15]:
     ax.axhline(y=y, xmin=0.05, xmax=0.95, color='#ddd', linestyle='-', linewidth=0.5)
 
 # Key insight
-insight_text = 'One seed backup = All addresses recoverable'
+insight_text = 'One seed backup =\nAll addresses recoverable'
 props = dict(boxstyle='round,pad=0.3', facecolor='#E0FFE0', edgecolor=MLGREEN, alpha=0.95)
-ax.text(0.70, 0.90, insight_text, ha='center', va='center', fontsize=14,
+ax.text(0.87, 0.90, insight_text, ha='center', va='center', fontsize=12,
         fontweight='bold', bbox=props, color=MLGREEN)
 
+# Batch derivation of a receiving-address range through the cached parent
+batch_text = (f"m/44'/0'/0'/0/0..{len(addresses) - 1:,}: parent derived once (cached),\n"
+              f"then one step per address: {receiving.depth + len(addresses):,} steps, "
+              f"not {(receiving.depth + 1) * len(addresses):,}")
+ax.text(0.58, 0.08, batch_text, ha='center', va='center', fontsize=11, color='#444',
+        bbox=dict(boxstyle='round,pad=0.3', facecolor='white', edgecolor=MLLAVENDER))
+
 ax.set_xlim(0, 1)
 ax.set_ylim(0, 1)
 ax.axis('off')
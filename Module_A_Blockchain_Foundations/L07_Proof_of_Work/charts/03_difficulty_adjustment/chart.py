@@ -3,10 +3,14 @@ Bitcoin Difficulty Adjustment
 Shows how difficulty adapts to hash rate changes
 """
 
+import sys
 import matplotlib.pyplot as plt
 import numpy as np
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[4]))
+from engines.difficulty import SECONDS_PER_YEAR, TARGET_TIMESPAN, hashrate_schedule, simulate_difficulty
+
 CHART_METADATA = {
     'title': 'Difficulty Adjustment',
     'url': 'https://github.com/Digital-AI-Finance/Blockchain_Crypto/tree/main/Module_A_Blockchain_Foundations/L07_Proof_of_Work/charts/03_difficulty_adjustment'
@@ -31,29 +35,26 @@ MLRED = '#D62728'
 
 fig, ax1 = plt.subplots(figsize=(10, 6))
 
-# Simulated data for difficulty and block time
-np.random.seed(42)
+# Simulated network: hashrate grows 80%/year, then half the miners switch off
+# at the start of period 12 (as in the 2021 China mining ban)
 periods = np.arange(0, 20)  # Adjustment periods
+SHOCK_PERIOD = 12
+schedule = hashrate_schedule(500e18, years=1, annual_growth=0.8,
+                             shocks=[(SHOCK_PERIOD * TARGET_TIMESPAN / SECONDS_PER_YEAR, 0.5)])
+mining = simulate_difficulty(schedule, windows=len(periods), replicas=1000, seed=42)
 
-# Difficulty increases over time with some variation
-difficulty = np.array([1.0])
-for i in range(19):
-    change = np.random.uniform(-0.1, 0.3)
-    difficulty = np.append(difficulty, difficulty[-1] * (1 + change))
+# Difficulty relative to the start, with the 5-95% range over all replicas
+relative = mining.difficulty / mining.difficulty[:, :1]
+difficulty = np.median(relative, axis=0)
+difficulty_low, difficulty_high = np.percentile(relative, [5, 95], axis=0)
 
-# Block time fluctuates around 10 minutes
-block_time = np.zeros(20)
-for i in range(20):
-    if i == 0:
-        block_time[i] = 10
-    else:
-        # Block time depends on previous hash rate vs difficulty
-        deviation = np.random.uniform(-3, 3)
-        block_time[i] = 10 + deviation
+# Block time of one simulated chain: exponential arrivals around 10 minutes
+block_time = mining.mean_block_time[0] / 60
 
 # Plot difficulty
 ax1.plot(periods, difficulty, 'o-', color=MLBLUE, linewidth=2, markersize=6, label='Difficulty')
-ax1.fill_between(periods, difficulty, alpha=0.2, color=MLBLUE)
+ax1.fill_between(periods, difficulty_low, difficulty_high, alpha=0.2, color=MLBLUE,
+                 label='5-95% of simulations')
 ax1.set_xlabel('Adjustment Period (every 2016 blocks)', fontsize=16)
 ax1.set_ylabel('Relative Difficulty', fontsize=16, color=MLBLUE)
 ax1.tick_params(axis='y', labelcolor=MLBLUE)
@@ -69,8 +70,8 @@ ax2.set_ylim(0, 20)
 # Adjustment formula annotation
 formula = r'New Difficulty = Old Difficulty $\times$ $\frac{\text{Actual Time}}{\text{Expected Time}}$'
 props = dict(boxstyle='round,pad=0.3', facecolor='white', edgecolor=MLPURPLE, alpha=0.95)
-ax1.text(10, max(difficulty) * 0.95, formula, ha='center', fontsize=14,
-         bbox=props, color='#333')
+ax2.text(0.35, 0.08, formula, transform=ax2.transAxes, ha='center', fontsize=14,
+         bbox=props, color='#333', zorder=10)
 
 # Legend
 lines1, labels1 = ax1.get_legend_handles_labels()
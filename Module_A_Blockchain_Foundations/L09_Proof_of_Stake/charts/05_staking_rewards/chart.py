@@ -3,10 +3,14 @@ Ethereum Staking Rewards APR Curve
 Shows how APR decreases with total stake
 """
 
+import sys
 import matplotlib.pyplot as plt
 import numpy as np
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[4]))
+from engines.staking import EPOCHS_PER_YEAR, ValidatorSet, ideal_apr
+
 CHART_METADATA = {
     'title': 'Staking Rewards APR',
     'url': 'https://github.com/Digital-AI-Finance/Blockchain_Crypto/tree/main/Module_A_Blockchain_Foundations/L09_Proof_of_Stake/charts/05_staking_rewards'
@@ -31,11 +35,11 @@ MLRED = '#D62728'
 
 fig, ax = plt.subplots(figsize=(10, 6))
 
-# APR formula: APR = 64 * sqrt(N) / N where N is total ETH staked in millions
-# Simplified: APR% = 64 / sqrt(N)
+# Consensus-spec base reward: 64 Gwei per ETH / sqrt(total staked Gwei) per epoch
+# With perfect participation this works out to APR% ~ 16.6 / sqrt(N), N in million ETH
 
 total_staked = np.linspace(1, 50, 100)  # Million ETH
-apr = 64 / np.sqrt(total_staked)
+apr = ideal_apr(total_staked * 1e6) * 100
 
 ax.plot(total_staked, apr, color=MLBLUE, linewidth=3, label='Base APR')
 ax.fill_between(total_staked, apr, alpha=0.2, color=MLBLUE)
@@ -47,10 +51,21 @@ ax.plot(total_staked, apr_with_mev, color=MLGREEN, linewidth=2, linestyle='--',
 
 # Current marker (34M ETH)
 current_stake = 34
-current_apr = 64 / np.sqrt(current_stake)
+current_apr = ideal_apr(current_stake * 1e6) * 100
+
+# One simulated year of every validator at 99% uptime: proposal and
+# sync committee luck spread the realized APR around the ideal
+validators = ValidatorSet(int(current_stake * 1e6 / 32), uptime=0.99, seed=42)
+year = validators.run(EPOCHS_PER_YEAR)
+realized = validators.apr(year.epochs) * 100
+apr_p5, apr_median, apr_p95 = np.percentile(realized, [5, 50, 95])
+
+ax.errorbar(current_stake, apr_median, yerr=[[apr_median - apr_p5], [apr_p95 - apr_median]],
+            fmt='none', ecolor=MLRED, elinewidth=2, capsize=8, zorder=4)
 ax.plot(current_stake, current_apr, 'o', markersize=12, color=MLRED, zorder=5)
-ax.annotate(f'Current (2024)\n{current_stake}M ETH\n{current_apr:.1f}% APR',
-            xy=(current_stake, current_apr), xytext=(40, 5),
+ax.annotate(f'Current (2024)\n{current_stake}M ETH\n{current_apr:.1f}% APR\n'
+            f'validators: {apr_p5:.1f}-{apr_p95:.1f}%',
+            xy=(current_stake, current_apr), xytext=(38, 8),
             fontsize=14, fontweight='bold',
             arrowprops=dict(arrowstyle='->', color='#333', lw=1.5))
 
@@ -60,9 +75,9 @@ ax.set_xlim(0, 50)
 ax.set_ylim(0, 25)
 
 # Formula annotation
-formula = r'$APR \approx \frac{64}{\sqrt{N}}$ where N = total ETH staked (millions)'
+formula = r'$APR \approx \frac{16.6\%}{\sqrt{N}}$ where N = total ETH staked (millions)'
 props = dict(boxstyle='round,pad=0.3', facecolor='white', edgecolor=MLPURPLE)
-ax.text(30, 18, formula, fontsize=14, bbox=props, color='#333')
+ax.text(14, 17, formula, fontsize=14, bbox=props, color='#333')
 
 ax.legend(loc='upper right', fontsize=14)
 ax.grid(True, alpha=0.3)
@@ -3,10 +3,14 @@ Slashing Penalties Structure
 Shows correlation penalty and slashable offenses
 """
 
+import sys
 import matplotlib.pyplot as plt
 import numpy as np
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[4]))
+from engines.staking import EPOCHS_PER_SLASHINGS_VECTOR, MAX_EFFECTIVE_BALANCE, ValidatorSet, correlation_penalty
+
 CHART_METADATA = {
     'title': 'Slashing Penalties',
     'url': 'https://github.com/Digital-AI-Finance/Blockchain_Crypto/tree/main/Module_A_Blockchain_Foundations/L09_Proof_of_Stake/charts/06_slashing_penalties'
@@ -31,23 +35,33 @@ MLRED = '#D62728'
 
 fig, ax = plt.subplots(figsize=(10, 6))
 
-# Correlation penalty formula: Penalty = Stake * 3 * slashed_validators / total_validators
-# If 33% slashed together: lose ~99%
-
+# Correlation penalty: 32 ETH * min(3 * slashed stake, total) / total, in whole ETH,
+# on top of the initial 1/32. If 33% are slashed together: lose ~99%
 percent_slashed = np.linspace(0, 35, 100)
-penalty_percent = 3 * percent_slashed
-
-# Cap at 100%
-penalty_percent = np.minimum(penalty_percent, 100)
+penalty = MAX_EFFECTIVE_BALANCE / 32 + correlation_penalty(MAX_EFFECTIVE_BALANCE, percent_slashed / 100, 1.0)
+penalty_percent = np.minimum(penalty / MAX_EFFECTIVE_BALANCE * 100, 100)
 
 ax.plot(percent_slashed, penalty_percent, color=MLRED, linewidth=3, label='Correlation Penalty')
 ax.fill_between(percent_slashed, penalty_percent, alpha=0.2, color=MLRED)
 
+
+def simulated_loss(percent, n_validators=10_000):
+    """Stake lost by slashed validators by withdrawal (36 days, incl. missed duties)."""
+    validators = ValidatorSet(n_validators, uptime=0.99, seed=42)
+    slashed = np.arange(max(1, round(n_validators * percent / 100)))
+    validators.run(EPOCHS_PER_SLASHINGS_VECTOR, scheduled_slashings={0: slashed})
+    return 100 * (1 - validators.balance[slashed].mean() / MAX_EFFECTIVE_BALANCE)
+
+
+sim_percent = np.array([0.1, 5, 15, 20, 25, 30])
+ax.plot(sim_percent, [simulated_loss(p) for p in sim_percent], 's', markersize=8, color=MLPURPLE,
+        label='Simulated: 10k validators, 36 days')
+
 # Key thresholds
 thresholds = [
-    (1, 3, 'Individual offense'),
-    (10, 30, 'Small coordinated'),
-    (33, 99, 'Catastrophic'),
+    (1, simulated_loss(1), 'Individual offense'),
+    (10, simulated_loss(10), 'Small coordinated'),
+    (33, simulated_loss(33), 'Catastrophic'),
 ]
 
 for x, y, label in thresholds:
@@ -70,7 +84,7 @@ props = dict(boxstyle='round,pad=0.3', facecolor='#FFE0E0', edgecolor=MLRED)
 ax.text(18, 90, 'Coordinated attacks = Catastrophic losses',
         fontsize=15, fontweight='bold', bbox=props, color=MLRED, ha='center')
 
-ax.legend(loc='lower right', fontsize=14)
+ax.legend(loc='lower right', bbox_to_anchor=(1, 0.08), fontsize=14)
 ax.grid(True, alpha=0.3)
 
 ax.set_title('Ethereum Slashing: Correlation Penalty', fontweight='bold', fontsize=15, pad=10)
@@ -3,10 +3,14 @@ Ethereum Staking Centralization
 Shows stake distribution among entities
 """
 
+import sys
 import matplotlib.pyplot as plt
 import numpy as np
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[4]))
+from engines.staking import herfindahl, nakamoto_coefficient, stake_shares
+
 CHART_METADATA = {
     'title': 'Staking Centralization',
     'url': 'https://github.com/Digital-AI-Finance/Blockchain_Crypto/tree/main/Module_A_Blockchain_Foundations/L09_Proof_of_Stake/charts/07_centralization_risks'
@@ -32,9 +36,23 @@ MLLAVENDER = '#ADADE0'
 
 fig, ax = plt.subplots(figsize=(10, 6))
 
-# Staking distribution (approximate 2024)
-entities = ['Lido', 'Coinbase', 'Binance', 'Kraken', 'Rocket Pool', 'Others']
-percentages = [28, 13, 5, 4, 3, 47]
+# Validator set (approximate 2024): ~1.06M validators of 32 ETH. The large
+# operators below, the rest spread over thousands of solo stakers and small pools
+N_VALIDATORS = 1_062_500
+operators = ['Lido', 'Coinbase', 'Binance', 'Kraken', 'Rocket Pool']
+operator_share = [0.28, 0.13, 0.05, 0.04, 0.03]
+rng = np.random.default_rng(42)
+counts = np.round(np.array(operator_share) * N_VALIDATORS).astype(int)
+rest = N_VALIDATORS - counts.sum()
+sizes = rng.geometric(0.2, size=rest)  # validators per solo staker / small pool
+others = np.repeat(np.arange(rest), sizes)[:rest]
+entity = np.concatenate([np.repeat(np.arange(len(operators)), counts), len(operators) + others])
+balance = np.full(N_VALIDATORS, 32.0)
+
+ids, shares = stake_shares(entity, balance)
+top = ids[:len(operators)]
+entities = [operators[i] for i in top] + ['Others']
+percentages = list(shares[:len(operators)] * 100) + [100 - shares[:len(operators)].sum() * 100]
 colors = [MLORANGE, MLBLUE, MLLAVENDER, MLPURPLE, MLGREEN, '#CCCCCC']
 
 # Create pie chart
@@ -47,10 +65,11 @@ for autotext in autotexts:
     autotext.set_fontweight('bold')
 
 # Add danger zone annotation
-ax.text(0, -1.35, 'Top 5 entities: ~53% of staked ETH', ha='center',
+top5 = shares[:5].sum()
+ax.text(0, -1.35, f'Top 5 entities: {top5:.0%} of staked ETH (HHI {herfindahl(shares):.3f})', ha='center',
         fontsize=15, fontweight='bold', color=MLRED)
-ax.text(0, -1.50, '33% threshold = finality blocking power', ha='center',
-        fontsize=14, color='#555', style='italic')
+ax.text(0, -1.50, f'{nakamoto_coefficient(shares)} entities pass the 33% threshold = finality blocking power',
+        ha='center', fontsize=14, color='#555', style='italic')
 
 # Decentralization trends
 ax.text(1.2, 0.6, 'Trends:', ha='left', fontsize=14, fontweight='bold')
@@ -3,10 +3,14 @@ Dencun Upgrade Impact
 EIP-4844 blob transactions reduce L2 fees
 """
 
+import sys
 import matplotlib.pyplot as plt
 import numpy as np
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[4]))
+from engines.fee_market import BLOCKS_PER_YEAR, DENCUN, GWEI, DemandProcess, simulate_blob_fee
+
 CHART_METADATA = {
     'title': 'Dencun Impact',
     'url': 'https://github.com/Digital-AI-Finance/Blockchain_Crypto/tree/main/Module_B_Ethereum_Smart_Contracts/L13_Ethereum_Architecture/charts/07_dencun_impact'
@@ -36,7 +40,16 @@ l2s = ['Arbitrum', 'Optimism', 'Base', 'zkSync', 'Polygon zkEVM']
 
 # Costs before and after Dencun (in USD)
 costs_before = [0.50, 0.45, 0.48, 0.40, 0.55]
-costs_after = [0.02, 0.01, 0.015, 0.02, 0.025]
+
+# Before Dencun ~95% of an L2 fee paid for calldata (16 gas/byte at ~30 Gwei).
+# After, that data goes into blobs priced by the simulated blob base fee
+DATA_SHARE = 0.95
+calldata_cost_per_byte = 16 * 30 * GWEI
+blob_market = simulate_blob_fee(BLOCKS_PER_YEAR, DemandProcess(mean=0.6, seed=42), schedule=DENCUN,
+                                reference_fee=10 ** 8, elasticity=1.0)
+blob_cost_per_byte = blob_market.histogram.mean  # one unit of blob gas per byte
+data_cost_ratio = blob_cost_per_byte / calldata_cost_per_byte
+costs_after = [c * (1 - DATA_SHARE) + c * DATA_SHARE * data_cost_ratio for c in costs_before]
 
 x = np.arange(len(l2s))
 width = 0.35
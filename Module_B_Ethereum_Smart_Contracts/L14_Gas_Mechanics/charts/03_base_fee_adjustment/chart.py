@@ -3,10 +3,15 @@ Base Fee Adjustment Mechanism
 Shows how base fee changes based on block fullness
 """
 
+import sys
 import matplotlib.pyplot as plt
 import numpy as np
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[4]))
+from engines.fee_market import (BLOCKS_PER_YEAR, GAS_LIMIT, GWEI, DemandProcess,
+                                base_fee_path, simulate_base_fee)
+
 CHART_METADATA = {
     'title': 'Base Fee Adjustment',
     'url': 'https://github.com/Digital-AI-Finance/Blockchain_Crypto/tree/main/Module_B_Ethereum_Smart_Contracts/L14_Gas_Mechanics/charts/03_base_fee_adjustment'
@@ -29,24 +34,21 @@ MLORANGE = '#FF7F0E'
 MLGREEN = '#2CA02C'
 MLRED = '#D62728'
 
-fig, ax = plt.subplots(figsize=(10, 6))
+fig, (ax, ax_hist) = plt.subplots(1, 2, figsize=(14, 6), gridspec_kw={'width_ratios': [3, 2]})
 
 # Simulate base fee over blocks
 np.random.seed(42)
 blocks = np.arange(0, 50)
-base_fee = [30]  # Start at 30 Gwei
 
-# Simulate varying block fullness
-for i in range(1, 50):
-    # Random fullness between 30% and 80%
-    fullness = np.random.uniform(0.3, 0.8)
-    target = 0.5  # 50% target
-    gas_limit = 30_000_000
+# Random fullness between 30% and 80% (target: 50%), exact EIP-1559 update in wei
+fullness = np.random.uniform(0.3, 0.8, len(blocks) - 1)
+gas_used = (fullness * GAS_LIMIT).astype(np.int64)
+base_fee = base_fee_path(gas_used, initial_base_fee=30 * GWEI)[:len(blocks)] / GWEI
 
-    # Calculate adjustment
-    adjustment = (fullness - target) / target / 8
-    new_base = base_fee[-1] * (1 + adjustment)
-    base_fee.append(max(1, new_base))
+# Two years of blocks with price-sensitive demand, summarized as a histogram
+YEARS = 2
+long_run = simulate_base_fee(YEARS * BLOCKS_PER_YEAR, DemandProcess(seed=42))
+fee_p50, fee_p90, fee_p99 = long_run.percentiles([50, 90, 99])
 
 # Plot base fee
 ax.plot(blocks, base_fee, linewidth=2.5, color=MLBLUE, label='Base Fee')
@@ -75,6 +77,21 @@ ax.legend(loc='lower right', fontsize=14)
 ax.grid(True, alpha=0.3)
 
 ax.set_title('EIP-1559 Base Fee Adjustment Mechanism', fontweight='bold', fontsize=15, pad=10)
+
+# Long-run distribution (log-spaced bins)
+hist = long_run.histogram
+shares = hist.counts / hist.count * 100
+ax_hist.stairs(shares, hist.edges, fill=True, color=MLBLUE, alpha=0.5)
+for value, label, color in [(fee_p50, 'Median', MLGREEN), (fee_p90, 'P90', MLORANGE), (fee_p99, 'P99', MLRED)]:
+    ax_hist.axvline(x=value, color=color, linestyle='--', linewidth=1.5,
+                    label=f'{label}: {value:.0f} Gwei')
+ax_hist.set_xscale('log')
+ax_hist.set_xlim(3, 1000)
+ax_hist.set_xlabel('Base Fee (Gwei)', fontsize=16)
+ax_hist.set_ylabel('Share of Blocks (%)', fontsize=16)
+ax_hist.legend(loc='upper right', fontsize=14)
+ax_hist.grid(True, alpha=0.3)
+ax_hist.set_title(f'{YEARS} Years of Simulated Blocks', fontweight='bold', fontsize=15, pad=10)
 plt.tight_layout()
 
 output_path = Path(__file__).parent / 'chart.pdf'
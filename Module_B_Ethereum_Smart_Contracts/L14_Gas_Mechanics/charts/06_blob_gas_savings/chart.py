@@ -3,10 +3,14 @@ EIP-4844 Blob Gas Savings
 Shows cost reduction for L2 data posting
 """
 
+import sys
 import matplotlib.pyplot as plt
 import numpy as np
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[4]))
+from engines.fee_market import BLOCKS_PER_YEAR, DENCUN, GAS_PER_BLOB, DemandProcess, simulate_blob_fee
+
 CHART_METADATA = {
     'title': 'Blob Gas Savings',
     'url': 'https://github.com/Digital-AI-Finance/Blockchain_Crypto/tree/main/Module_B_Ethereum_Smart_Contracts/L14_Gas_Mechanics/charts/06_blob_gas_savings'
@@ -40,9 +44,14 @@ pre_dencun_gas = [b * 16 for b in data_bytes]
 # At 30 Gwei, $2000/ETH
 pre_dencun_cost = [(g * 30 * 1e-9 * 2000) for g in pre_dencun_gas]
 
-# Post-Dencun: blob gas much cheaper (~0.001 Gwei equivalent)
-# Roughly $0.01 per blob
-post_dencun_cost = [0.01, 0.05, 0.08, 0.10]
+# Post-Dencun: data goes into whole blobs (128 KB each), priced by the blob base fee.
+# Mean blob fee over a simulated year: usually 1 wei, with demand spikes
+blob_market = simulate_blob_fee(BLOCKS_PER_YEAR, DemandProcess(mean=0.6, seed=42), schedule=DENCUN,
+                                reference_fee=10 ** 8, elasticity=1.0)
+blob_fee_eth = blob_market.histogram.mean * 1e-18
+blobs_needed = [int(np.ceil(b / GAS_PER_BLOB)) for b in data_bytes]
+post_dencun_cost = [n * GAS_PER_BLOB * blob_fee_eth * 2000 for n in blobs_needed]
+savings_pct = [(1 - post / pre) * 100 for pre, post in zip(pre_dencun_cost, post_dencun_cost)]
 
 x = np.arange(len(data_sizes))
 width = 0.35
@@ -52,35 +61,36 @@ bars_pre = ax.bar(x - width/2, pre_dencun_cost, width, label='Pre-Dencun (Callda
 bars_post = ax.bar(x + width/2, post_dencun_cost, width, label='Post-Dencun (Blobs)',
                     color=MLGREEN, edgecolor='black', linewidth=0.5)
 
+y_max = max(pre_dencun_cost) * 1.3
+
 # Add cost labels
 for bar, cost in zip(bars_pre, pre_dencun_cost):
     height = bar.get_height()
-    ax.text(bar.get_x() + bar.get_width()/2, height + 1,
+    ax.text(bar.get_x() + bar.get_width()/2, height + 0.01 * y_max,
             f'${cost:.2f}', ha='center', fontsize=14)
 
 for bar, cost in zip(bars_post, post_dencun_cost):
     height = bar.get_height()
-    ax.text(bar.get_x() + bar.get_width()/2, height + 1,
+    ax.text(bar.get_x() + bar.get_width()/2, height + 0.01 * y_max,
             f'${cost:.2f}', ha='center', fontsize=14, fontweight='bold', color=MLGREEN)
 
 # Savings annotation
-for i, (pre, post) in enumerate(zip(pre_dencun_cost, post_dencun_cost)):
-    savings = (1 - post/pre) * 100
-    ax.text(i, 25, f'-{savings:.0f}%', ha='center', fontsize=14,
+for i, (pre, savings) in enumerate(zip(pre_dencun_cost, savings_pct)):
+    ax.text(i, pre + 0.08 * y_max, f'-{savings:.2f}%', ha='center', fontsize=14,
             fontweight='bold', color=MLGREEN)
 
 ax.set_xlabel('L2 Data Size Posted to Ethereum', fontsize=16)
 ax.set_ylabel('Cost (USD)', fontsize=16)
 ax.set_xticks(x)
 ax.set_xticklabels(data_sizes, fontsize=14)
-ax.set_ylim(0, 35)
+ax.set_ylim(0, y_max)
 
 ax.legend(loc='upper left', fontsize=14)
 ax.grid(True, alpha=0.3, axis='y')
 
 # Key insight
 props = dict(boxstyle='round,pad=0.3', facecolor='#E8F5E9', edgecolor=MLGREEN)
-ax.text(0.98, 0.95, 'EIP-4844 (March 2024):\n90-99% L2 cost reduction',
+ax.text(0.98, 0.95, f'EIP-4844 (March 2024):\n>{np.floor(min(savings_pct)):.0f}% L2 data cost reduction',
         transform=ax.transAxes, ha='right', va='top',
         fontsize=14, fontweight='bold', bbox=props, color=MLGREEN)
 
@@ -3,10 +3,14 @@ Supply Models Comparison
 Comparing fixed, inflationary, and deflationary supply models
 """
 
+import sys
 import matplotlib.pyplot as plt
 import numpy as np
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[4]))
+from engines.issuance import COIN, yearly_supply
+
 CHART_METADATA = {
     'title': 'Supply Models Comparison',
     'url': 'https://github.com/Digital-AI-Finance/Blockchain_Crypto/tree/main/Module_D_Tokenomics/L29_Token_Economics/charts/03_supply_models'
@@ -34,9 +38,8 @@ fig, ax = plt.subplots(figsize=(10, 6))
 # Years projection
 years = np.arange(2020, 2031)
 
-# Bitcoin fixed supply model (approaching 21M)
-btc_supply = 18.5 + 0.4 * np.log1p(years - 2020)  # Millions
-btc_supply = np.minimum(btc_supply, 21)
+# Bitcoin fixed supply model (approaching 21M), on January 1 of each year
+btc_supply = yearly_supply(2020, 2030)[1] / COIN / 1e6  # Millions
 
 # Inflationary model (constant growth)
 inflationary = 100 * (1.02 ** (years - 2020))  # 2% annual inflation
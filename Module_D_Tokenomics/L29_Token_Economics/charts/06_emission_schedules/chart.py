@@ -3,10 +3,14 @@ Emission Schedule Comparison
 Line chart comparing different emission schedule types
 """
 
+import sys
 import matplotlib.pyplot as plt
 import numpy as np
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[4]))
+from engines.issuance import MAX_SUPPLY, yearly_supply
+
 CHART_METADATA = {
     'title': 'Emission Schedules',
     'url': 'https://github.com/Digital-AI-Finance/Blockchain_Crypto/tree/main/Module_D_Tokenomics/L29_Token_Economics/charts/06_emission_schedules'
@@ -42,7 +46,8 @@ linear = 10 * years
 linear = np.minimum(linear, max_supply)
 
 # Decreasing emission (Bitcoin halving style)
-halving = max_supply * (1 - 0.5 ** (years / 4))
+# (Bitcoin's actual schedule, years counted from January 2009)
+halving = max_supply * yearly_supply(2009, 2019)[1] / MAX_SUPPLY
 
 # Exponential decay (rapid initial, then slow)
 exp_decay = max_supply * (1 - np.exp(-0.5 * years))
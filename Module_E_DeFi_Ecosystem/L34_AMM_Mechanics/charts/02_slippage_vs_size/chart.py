@@ -3,10 +3,14 @@ Slippage vs Trade Size in AMM
 Shows non-linear increase in slippage with trade size
 """
 
+import sys
 import matplotlib.pyplot as plt
 import numpy as np
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[4]))
+from engines.amm import slippage_exact_out
+
 CHART_METADATA = {
     'title': 'Slippage vs Trade Size',
     'url': 'https://github.com/Digital-AI-Finance/Blockchain_Crypto/tree/main/Module_E_DeFi_Ecosystem/L34_AMM_Mechanics/charts/02_slippage_vs_size'
@@ -33,21 +37,14 @@ fig, ax = plt.subplots(figsize=(10, 6))
 
 # Pool: 100 ETH, 200,000 USDC, k = 20,000,000
 # Initial price: 1 ETH = 2,000 USDC
-k = 20_000_000
-initial_price = 2000
+RESERVE_ETH = 100
+RESERVE_USDC = 200_000
 
 # Trade sizes (ETH to buy)
 trade_sizes = np.linspace(0.1, 30, 100)
 
-# Calculate slippage for each trade size
-slippage = []
-for trade in trade_sizes:
-    new_x = 100 - trade
-    new_y = k / new_x
-    usdc_cost = new_y - 200000
-    avg_price = usdc_cost / trade
-    slip = ((avg_price - initial_price) / initial_price) * 100
-    slippage.append(slip)
+# Slippage of buying each amount of ETH with USDC (price impact only, no fee)
+slippage = slippage_exact_out(trade_sizes, RESERVE_USDC, RESERVE_ETH, fee=0) * 100
 
 ax.plot(trade_sizes, slippage, '-', color=MLBLUE, linewidth=2.5)
 
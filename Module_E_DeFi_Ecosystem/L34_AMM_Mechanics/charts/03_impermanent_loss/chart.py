@@ -3,10 +3,14 @@ Impermanent Loss vs Price Change
 Shows IL curve for different price ratios
 """
 
+import sys
 import matplotlib.pyplot as plt
 import numpy as np
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[4]))
+from engines.impermanent_loss import impermanent_loss, simulate_lp
+
 CHART_METADATA = {
     'title': 'Impermanent Loss',
     'url': 'https://github.com/Digital-AI-Finance/Blockchain_Crypto/tree/main/Module_E_DeFi_Ecosystem/L34_AMM_Mechanics/charts/03_impermanent_loss'
@@ -35,9 +39,13 @@ fig, ax = plt.subplots(figsize=(10, 6))
 price_ratio = np.linspace(0.2, 5, 200)
 
 # IL formula: 2*sqrt(r)/(1+r) - 1
-il = (2 * np.sqrt(price_ratio) / (1 + price_ratio)) - 1
+il = impermanent_loss(price_ratio)
 il_percent = il * 100
 
+# 1-year Monte Carlo: full-range LP on GBM paths at 80% annual volatility
+simulation = simulate_lp(100_000, 52, horizon=1.0, sigma=0.8, seed=42)
+il_p5, il_median = simulation.percentiles([5, 50])[0] * 100
+
 ax.plot(price_ratio, il_percent, '-', color=MLRED, linewidth=2.5)
 ax.fill_between(price_ratio, il_percent, 0, alpha=0.2, color=MLRED)
 
@@ -45,7 +53,7 @@ ax.fill_between(price_ratio, il_percent, 0, alpha=0.2, color=MLRED)
 key_ratios = [0.5, 1.0, 1.5, 2.0, 3.0, 4.0]
 key_labels = ['0.5x (-50%)', '1.0x (0%)', '1.5x (+50%)', '2.0x (+100%)', '3.0x (+200%)', '4.0x (+300%)']
 for ratio, label in zip(key_ratios, key_labels):
-    il_val = (2 * np.sqrt(ratio) / (1 + ratio)) - 1
+    il_val = impermanent_loss(ratio)
     ax.plot(ratio, il_val * 100, 'o', color=MLORANGE, markersize=10, zorder=5)
     y_offset = -3 if ratio == 1.0 else 2
     ax.annotate(f'{il_val*100:.1f}%', xy=(ratio, il_val*100),
@@ -69,6 +77,11 @@ ax.text(0.95, 0.95, r'$IL = \frac{2\sqrt{r}}{1+r} - 1$', transform=ax.transAxes,
         fontsize=15, va='top', ha='right',
         bbox=dict(boxstyle='round,pad=0.3', facecolor='white', edgecolor=MLBLUE))
 
+# Simulated distribution after 1 year
+ax.text(0.27, 0.05, f'1-year simulation (vol 80%):\nmedian IL {il_median:.1f}%\n1 in 20 paths worse than {il_p5:.1f}%',
+        transform=ax.transAxes, fontsize=14, va='bottom', ha='left',
+        bbox=dict(boxstyle='round,pad=0.3', facecolor='#FFF3E0', edgecolor=MLORANGE))
+
 ax.set_title('Impermanent Loss vs Price Change', fontweight='bold', fontsize=15, pad=10)
 plt.tight_layout()
 
@@ -3,10 +3,14 @@ Concentrated Liquidity V2 vs V3 Comparison
 Shows how liquidity is distributed in each version
 """
 
+import sys
 import matplotlib.pyplot as plt
 import numpy as np
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[4]))
+from engines.clmm import ConcentratedPool, align_tick, price_to_tick, liquidity_for_value, tick_to_price
+
 CHART_METADATA = {
     'title': 'Concentrated Liquidity',
     'url': 'https://github.com/Digital-AI-Finance/Blockchain_Crypto/tree/main/Module_E_DeFi_Ecosystem/L35_Uniswap_Deep_Dive/charts/02_concentrated_liquidity'
@@ -34,44 +38,60 @@ fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(10, 5))
 # Price range
 prices = np.linspace(500, 5000, 200)
 current_price = 2000
+TVL = 10_000_000          # same capital in both pools (USD)
+N_LPS = 20_000
 
-# V2: Liquidity spread across entire range (constant)
-v2_liquidity = np.ones_like(prices) * 0.3
+# V2: every dollar is spread over (0, inf)
+v2_pool = ConcentratedPool(current_price)
+v2_base = v2_pool.add_range_by_value(TVL, 0, np.inf)
+v2_liquidity = v2_pool.liquidity_at(prices) / v2_base
 
-# V3: Concentrated liquidity in narrow range
-v3_liquidity = np.where((prices > 1800) & (prices < 2200),
-                         1.5, 0.05)
+# V3: LPs pick their own ranges, mostly +/- 5-20% around the current price
+rng = np.random.default_rng(42)
+half_width = np.clip(rng.lognormal(np.log(0.10), 0.6, N_LPS), 0.01, 0.8)
+center = current_price * rng.normal(1, 0.02, N_LPS)
+spacing = 60
+lower = align_tick(price_to_tick(center * (1 - half_width)), spacing)
+upper = align_tick(price_to_tick(center * (1 + half_width)), spacing) + spacing
+deposits = TVL * rng.dirichlet(np.ones(N_LPS))
+v3_pool = ConcentratedPool(current_price, tick_spacing=spacing)
+v3_pool.add_positions(lower, upper, liquidity_for_value(deposits, current_price,
+                                                        tick_to_price(lower), tick_to_price(upper)))
+v3_liquidity = v3_pool.liquidity_at(prices) / v2_base
+efficiency = v3_pool.liquidity / v2_base
+y_max = np.ceil(v3_liquidity.max() * 1.25)
+range_lo, range_hi = np.percentile(center * (1 - half_width), 50), np.percentile(center * (1 + half_width), 50)
 
 # V2 Chart
 ax1.fill_between(prices, v2_liquidity, alpha=0.5, color=MLBLUE)
 ax1.plot(prices, v2_liquidity, color=MLBLUE, linewidth=2)
 ax1.axvline(x=current_price, color='black', linestyle='--', linewidth=1.5)
-ax1.text(current_price + 100, 0.5, 'Current\nPrice', fontsize=14)
+ax1.text(current_price + 100, 1 + 0.08 * y_max, 'Current\nPrice', fontsize=14)
 ax1.set_xlabel('ETH Price (USD)', fontsize=14)
-ax1.set_ylabel('Liquidity Depth', fontsize=14)
+ax1.set_ylabel('Liquidity Depth (x V2)', fontsize=14)
 ax1.set_title('Uniswap V2: Full Range', fontweight='bold', fontsize=15)
 ax1.set_xlim(500, 5000)
-ax1.set_ylim(0, 2)
+ax1.set_ylim(0, y_max)
 ax1.fill_between(prices, v2_liquidity, alpha=0.3, color=MLBLUE, label='Liquidity spread thin')
 
 # V3 Chart
 ax2.fill_between(prices, v3_liquidity, alpha=0.5, color=MLGREEN)
 ax2.plot(prices, v3_liquidity, color=MLGREEN, linewidth=2)
 ax2.axvline(x=current_price, color='black', linestyle='--', linewidth=1.5)
-ax2.axvline(x=1800, color=MLRED, linestyle=':', linewidth=1.5, alpha=0.7)
-ax2.axvline(x=2200, color=MLRED, linestyle=':', linewidth=1.5, alpha=0.7)
-ax2.text(current_price + 100, 1.7, 'Current\nPrice', fontsize=14)
-ax2.annotate('Range\nbounds', xy=(1800, 1.5), xytext=(1400, 1.3),
+ax2.axvline(x=range_lo, color=MLRED, linestyle=':', linewidth=1.5, alpha=0.7)
+ax2.axvline(x=range_hi, color=MLRED, linestyle=':', linewidth=1.5, alpha=0.7)
+ax2.text(current_price + 250, 0.85 * y_max, 'Current\nPrice', fontsize=14)
+ax2.annotate('Median\nrange', xy=(range_hi, 0.5 * y_max), xytext=(range_hi + 700, 0.45 * y_max),
              fontsize=14, color=MLRED, arrowprops=dict(arrowstyle='->', color=MLRED))
 ax2.set_xlabel('ETH Price (USD)', fontsize=14)
 ax2.set_title('Uniswap V3: Concentrated', fontweight='bold', fontsize=15)
 ax2.set_xlim(500, 5000)
-ax2.set_ylim(0, 2)
+ax2.set_ylim(0, y_max)
 
 # Add efficiency comparison
 ax1.text(0.5, -0.18, 'Capital Efficiency: 1x', transform=ax1.transAxes, ha='center',
          fontsize=14, fontweight='bold', color=MLBLUE)
-ax2.text(0.5, -0.18, 'Capital Efficiency: ~5x (in range)', transform=ax2.transAxes, ha='center',
+ax2.text(0.5, -0.18, f'Capital Efficiency: ~{efficiency:.0f}x (in range)', transform=ax2.transAxes, ha='center',
          fontsize=14, fontweight='bold', color=MLGREEN)
 
 plt.suptitle('V2 vs V3: Liquidity Distribution', fontweight='bold', fontsize=14, y=1.02)
@@ -3,10 +3,14 @@ Capital Efficiency by Range Width
 Shows how concentrated liquidity increases efficiency
 """
 
+import sys
 import matplotlib.pyplot as plt
 import numpy as np
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[4]))
+from engines.clmm import capital_efficiency
+
 CHART_METADATA = {
     'title': 'Capital Efficiency',
     'url': 'https://github.com/Digital-AI-Finance/Blockchain_Crypto/tree/main/Module_E_DeFi_Ecosystem/L35_Uniswap_Deep_Dive/charts/05_capital_efficiency'
@@ -33,7 +37,9 @@ fig, ax = plt.subplots(figsize=(10, 6))
 
 # Range widths and corresponding efficiency
 range_widths = ['Full Range\n(V2 style)', 'Wide\n(+/- 50%)', 'Medium\n(+/- 20%)', 'Narrow\n(+/- 5%)', 'Very Narrow\n(+/- 1%)']
-efficiency = [1, 3, 10, 50, 200]  # x times more capital efficient
+half_widths = np.array([np.inf, 0.50, 0.20, 0.05, 0.01])
+# x times more liquidity per dollar than a full-range position at the same price
+efficiency = capital_efficiency(1.0, np.clip(1 - half_widths, 0, None), 1 + half_widths)
 risk_level = ['Very Low', 'Low', 'Medium', 'High', 'Very High']
 colors = [MLGREEN, '#81C784', MLORANGE, '#FFB74D', MLRED]
 
@@ -44,7 +50,7 @@ bars = ax.bar(x_pos, efficiency, color=colors, edgecolor='black', linewidth=1.5,
 # Add efficiency labels
 for bar, eff, risk in zip(bars, efficiency, risk_level):
     ax.text(bar.get_x() + bar.get_width()/2, bar.get_height() + 5,
-            f'{eff}x', ha='center', fontsize=14, fontweight='bold')
+            f'{eff:.0f}x', ha='center', fontsize=14, fontweight='bold')
     ax.text(bar.get_x() + bar.get_width()/2, 5,
             f'Risk:\n{risk}', ha='center', fontsize=14, color='white', fontweight='bold')
 
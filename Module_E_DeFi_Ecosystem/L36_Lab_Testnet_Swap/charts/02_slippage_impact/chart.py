@@ -1,15 +1,20 @@
 """Slippage Impact by Trade Size"""
+import sys
 import matplotlib.pyplot as plt
 import numpy as np
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[4]))
+from engines.amm import slippage_exact_in
+
 plt.rcParams.update({'font.size': 14, 'figure.figsize': (10, 6), 'figure.dpi': 150})
 MLBLUE, MLORANGE, MLRED = '#0066CC', '#FF7F0E', '#D62728'
 
 fig, ax = plt.subplots(figsize=(10, 6))
 
+# Testnet pool: 40 ETH / 80,000 USDC with the 0.3% swap fee, selling ETH
 trade_sizes = np.array([0.01, 0.05, 0.1, 0.5, 1.0, 2.0, 5.0])
-slippage = np.array([0.05, 0.15, 0.3, 1.2, 2.5, 5.0, 12.5])
+slippage = np.round(slippage_exact_in(trade_sizes, 40, 80_000, fee=0.003) * 100, 2)
 
 colors = [MLBLUE if s < 1 else MLORANGE if s < 5 else MLRED for s in slippage]
 bars = ax.bar(range(len(trade_sizes)), slippage, color=colors, edgecolor='black', linewidth=1.5, width=0.6)
@@ -3,10 +3,14 @@ Health Factor Visualization
 Shows health factor changes with collateral price
 """
 
+import sys
 import matplotlib.pyplot as plt
 import numpy as np
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[4]))
+from engines.lending import LendingBook
+
 CHART_METADATA = {
     'title': 'Health Factor',
     'url': 'https://github.com/Digital-AI-Finance/Blockchain_Crypto/tree/main/Module_E_DeFi_Ecosystem/L37_Lending_Protocols/charts/03_health_factor'
@@ -35,11 +39,11 @@ fig, ax = plt.subplots(figsize=(10, 6))
 # Initial ETH price: $2000
 borrowed = 12000
 liq_threshold = 0.83
+position = LendingBook(collateral=[10], debt=[borrowed], liquidation_threshold=liq_threshold)
 
 # ETH prices from $1200 to $3000
 eth_prices = np.linspace(1200, 3000, 100)
-collateral_values = 10 * eth_prices
-health_factors = (collateral_values * liq_threshold) / borrowed
+health_factors = position.health_factor(eth_prices[:, None])[:, 0]
 
 ax.plot(eth_prices, health_factors, '-', color=MLBLUE, linewidth=2.5)
 
@@ -56,14 +60,14 @@ ax.axhline(y=1, color=MLRED, linestyle='--', linewidth=2, label='Liquidation Thr
 
 # Mark key points
 # Liquidation price
-liq_price = borrowed / (10 * liq_threshold)
+liq_price = position.liquidation_price()[0]
 ax.axvline(x=liq_price, color=MLRED, linestyle=':', linewidth=1.5, alpha=0.7)
 ax.annotate(f'Liquidation\n${liq_price:.0f}', xy=(liq_price, 1), xytext=(liq_price-150, 1.5),
             fontsize=14, ha='center', arrowprops=dict(arrowstyle='->', color=MLRED))
 
 # Initial price
 ax.axvline(x=2000, color=MLGREEN, linestyle=':', linewidth=1.5, alpha=0.7)
-hf_initial = (10 * 2000 * 0.83) / 12000
+hf_initial = position.health_factor(2000)[0]
 ax.plot(2000, hf_initial, 'o', color=MLGREEN, markersize=10, zorder=5)
 ax.annotate(f'Initial\nHF={hf_initial:.2f}', xy=(2000, hf_initial), xytext=(2150, hf_initial-0.3),
             fontsize=14, ha='left', arrowprops=dict(arrowstyle='->', color=MLGREEN))
@@ -3,10 +3,14 @@ Utilization-Based Interest Rate Model
 Shows how rates increase with utilization
 """
 
+import sys
 import matplotlib.pyplot as plt
 import numpy as np
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[4]))
+from engines.interest_rates import KinkedRateModel
+
 CHART_METADATA = {
     'title': 'Interest Rate Model',
     'url': 'https://github.com/Digital-AI-Finance/Blockchain_Crypto/tree/main/Module_E_DeFi_Ecosystem/L37_Lending_Protocols/charts/04_interest_rate_model'
@@ -37,24 +41,13 @@ utilization = np.linspace(0, 100, 200)
 # Aave-style interest rate model
 # Below optimal (80%): linear increase
 # Above optimal: steep increase
-optimal_util = 80
-base_rate = 1
-slope1 = 4  # slope below optimal
-slope2 = 100  # slope above optimal (steep)
-
-borrow_rate = []
-for u in utilization:
-    if u <= optimal_util:
-        rate = base_rate + (slope1 * u / optimal_util)
-    else:
-        rate = base_rate + slope1 + (slope2 * (u - optimal_util) / (100 - optimal_util))
-    borrow_rate.append(rate)
-
-borrow_rate = np.array(borrow_rate)
+model = KinkedRateModel(base_rate=0.01, slope1=0.04, slope2=1.00,
+                        optimal_utilization=0.80, reserve_factor=0.10)
+optimal_util = model.optimal_utilization * 100
 
 # Supply rate = borrow rate * utilization * (1 - reserve factor)
-reserve_factor = 0.1
-supply_rate = borrow_rate * (utilization / 100) * (1 - reserve_factor)
+borrow_rate = model.borrow_rate(utilization / 100) * 100
+supply_rate = model.supply_rate(utilization / 100) * 100
 
 ax.plot(utilization, borrow_rate, '-', color=MLRED, linewidth=2.5, label='Borrow APY')
 ax.plot(utilization, supply_rate, '-', color=MLGREEN, linewidth=2.5, label='Supply APY')
@@ -1,30 +1,48 @@
 """Health Factor and Liquidation Zones"""
+import sys
 import matplotlib.pyplot as plt
 import numpy as np
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[4]))
+from engines.lending import LendingBook
+
 plt.rcParams.update({'font.size': 14, 'figure.figsize': (10, 6), 'figure.dpi': 150})
 MLBLUE, MLORANGE, MLGREEN, MLRED = '#0066CC', '#FF7F0E', '#2CA02C', '#D62728'
 
 fig, ax = plt.subplots(figsize=(10, 6))
 
-health_factors = [0.5, 0.8, 1.0, 1.2, 1.5, 2.0, 3.0]
-zones = ['LIQUIDATED', 'LIQUIDATED', 'LIQUIDATION', 'DANGER', 'CAUTION', 'SAFE', 'VERY SAFE']
-colors = [MLRED, MLRED, MLRED, MLORANGE, MLORANGE, MLGREEN, MLGREEN]
+# Seven lab positions, 0.5 ETH collateral each at ETH = $2000, borrowed at
+# loan-to-value ratios from reckless (90%) to very conservative (30%)
+ETH_PRICE = 2000
+COLLATERAL = 0.5
+ltvs = np.array([0.90, 0.80, 0.70, 0.60, 0.50, 0.40, 0.30])
+debts = ltvs * COLLATERAL * ETH_PRICE
+positions = LendingBook(collateral=np.full(len(debts), COLLATERAL), debt=debts, liquidation_threshold=0.825)
+health_factors = np.round(positions.health_factor(ETH_PRICE), 2)
+
+# Risk zone from the health factor: below 1 the position can be liquidated
+zone_edges = [1.0, 1.25, 2.0, 2.5]
+zone_names = ['LIQUIDATABLE', 'DANGER', 'CAUTION', 'SAFE', 'VERY SAFE']
+zone_colors = [MLRED, MLRED, MLORANGE, MLGREEN, MLGREEN]
+zone_index = np.digitize(health_factors, zone_edges)
+zones = [zone_names[z] for z in zone_index]
+colors = [zone_colors[z] for z in zone_index]
 
 bars = ax.barh(range(len(health_factors)), health_factors, color=colors, edgecolor='black', linewidth=1.5, height=0.6)
 
 for i, (bar, hf, zone) in enumerate(zip(bars, health_factors, zones)):
-    ax.text(bar.get_width() + 0.1, i, f'HF = {hf}', va='center', fontsize=14, fontweight='bold')
-    ax.text(3.5, i, zone, va='center', fontsize=14, ha='center', color=colors[i], fontweight='bold')
+    ax.text(bar.get_width() + 0.1, i, f'HF = {hf:g}', va='center', fontsize=14, fontweight='bold')
+    ax.text(4.0, i, zone, va='center', fontsize=14, ha='center', color=colors[i], fontweight='bold')
 
 ax.axvline(x=1.0, color=MLRED, linestyle='--', linewidth=2, alpha=0.7)
-ax.text(1.05, 6.3, 'Liquidation\nThreshold', fontsize=14, color=MLRED)
+ax.text(1.05, 6.45, 'Liquidation\nThreshold', fontsize=14, color=MLRED)
 
 ax.set_yticks(range(len(health_factors)))
-ax.set_yticklabels([f'Position {i+1}' for i in range(len(health_factors))])
+ax.set_yticklabels([f'LTV {ltv:.0%} (${debt:,.0f})' for ltv, debt in zip(ltvs, debts)])
 ax.set_xlabel('Health Factor', fontsize=15)
-ax.set_xlim(0, 4.5)
+ax.set_xlim(0, 4.7)
+ax.set_ylim(-0.5, 7.1)
 ax.set_title('Health Factor Determines Liquidation Risk', fontweight='bold', fontsize=14)
 ax.grid(True, alpha=0.3, axis='x')
 plt.tight_layout()
@@ -1,17 +1,28 @@
 """Collateral vs Debt and Liquidation Point"""
+import sys
 import matplotlib.pyplot as plt
 import numpy as np
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[4]))
+from engines.interest_rates import KinkedRateModel, compound_index
+from engines.lending import LendingBook, run_cascade, synthetic_book
+
 plt.rcParams.update({'font.size': 14, 'figure.figsize': (10, 6), 'figure.dpi': 150})
 MLBLUE, MLORANGE, MLGREEN, MLRED = '#0066CC', '#FF7F0E', '#2CA02C', '#D62728'
 
 fig, ax = plt.subplots(figsize=(10, 6))
 
 eth_prices = np.linspace(1000, 2500, 100)
-collateral_value = 0.5 * eth_prices
-debt = np.full_like(eth_prices, 400)
-liquidation_threshold = collateral_value * 0.825
+position = LendingBook(collateral=[0.5], debt=[400], liquidation_threshold=0.825)
+collateral_value = position.collateral_value(eth_prices[:, None])[:, 0]
+debt = np.full_like(eth_prices, position.debt[0])
+liquidation_threshold = collateral_value * position.liquidation_threshold[0]
+
+# The same shock across a whole market: 1M borrowers, liquidators sell into a $2B pool
+market = synthetic_book(1_000_000, price=2000, total_collateral=500_000, seed=7)
+cascades = {shock: run_cascade(market.copy(), 2000 * (1 - shock), market_depth=2e9)
+            for shock in (0.10, 0.20)}
 
 ax.fill_between(eth_prices, 0, debt, alpha=0.3, color=MLRED, label='Borrowed (Debt)')
 ax.fill_between(eth_prices, debt, liquidation_threshold, alpha=0.3, color=MLORANGE, where=liquidation_threshold > debt, label='Safety Buffer')
@@ -21,10 +32,25 @@ ax.plot(eth_prices, collateral_value, color=MLBLUE, linewidth=2.5, label='Collat
 ax.plot(eth_prices, liquidation_threshold, color=MLORANGE, linewidth=2.5, linestyle='--', label='Liquidation Threshold (82.5%)')
 ax.axhline(y=400, color=MLRED, linewidth=2.5, linestyle=':', label='Debt ($400)')
 
-liq_price = 400 / (0.5 * 0.825)
+liq_price = position.liquidation_price()[0]
+
+# One year of borrow interest at 80% pool utilization moves the liquidation price up
+usdc_rates = KinkedRateModel(base_rate=0.01, slope1=0.04, slope2=1.00, optimal_utilization=0.80)
+borrow_apy = float(usdc_rates.borrow_rate(0.80))
+position.accrue_interest(compound_index(borrow_apy, years=1))
+liq_price_1y = position.liquidation_price()[0]
+ax.axvline(x=liq_price_1y, color=MLRED, linewidth=2, linestyle='--', alpha=0.5,
+           label=f'Liquidation after 1y at {borrow_apy:.0%} APY (${liq_price_1y:.0f})')
 ax.axvline(x=liq_price, color=MLRED, linewidth=2, alpha=0.7)
 ax.text(liq_price + 20, 450, f'Liquidation\n@ ${liq_price:.0f}', fontsize=14, color=MLRED)
 
+market_text = 'Market of 1M borrowers, ETH from $2000:'
+for shock, result in cascades.items():
+    market_text += (f'\n-{shock:.0%} shock: {result.repaid.sum() / market.debt.sum():.0%} of debt liquidated,'
+                    f' price ends at ${result.final_price:,.0f}')
+ax.text(0.98, 0.03, market_text, transform=ax.transAxes, fontsize=14, ha='right', va='bottom',
+        bbox=dict(boxstyle='round,pad=0.3', facecolor='white', edgecolor=MLRED))
+
 ax.set_xlabel('ETH Price ($)', fontsize=15)
 ax.set_ylabel('Value ($)', fontsize=15)
 ax.set_title('Collateral Value vs ETH Price (0.5 ETH, $400 Debt)', fontweight='bold', fontsize=14)
@@ -3,10 +3,14 @@ AMM Constant Product Formula Visualization (x * y = k)
 Shows the hyperbola curve of token reserves in Uniswap-style AMMs
 """
 
+import sys
 import matplotlib.pyplot as plt
 import numpy as np
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from engines.amm import constant_product_curve, get_amount_out
+
 # Chart metadata for QuantLet integration
 CHART_METADATA = {
     'title': 'AMM Constant Product Formula (x*y=k)',
@@ -28,7 +32,7 @@ k = 10000  # x * y = k
 
 # Generate x values (Token X reserves)
 x = np.linspace(20, 500, 1000)
-y = k / x  # Token Y reserves
+y = constant_product_curve(k, x)  # Token Y reserves
 
 # Create the chart
 fig, ax = plt.subplots(figsize=(8, 6))
@@ -43,9 +47,9 @@ ax.plot(x_initial, y_initial, 'o', color='black', markersize=10,
         label=f'Initial Pool (x={x_initial}, y={y_initial:.0f})')
 
 # Show a trade example
-# Trade: User swaps 20 Token X for Token Y
+# Trade: User swaps 20 Token X for Token Y (fee left out to stay on the curve)
 x_after_trade = x_initial + 20
-y_after_trade = k / x_after_trade
+y_after_trade = y_initial - get_amount_out(20, x_initial, y_initial, fee=0)
 ax.plot(x_after_trade, y_after_trade, 's', color='gray', markersize=8,
         label=f'After Trade (x={x_after_trade}, y={y_after_trade:.1f})')
 
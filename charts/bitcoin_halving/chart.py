@@ -3,11 +3,14 @@ Bitcoin Block Reward Halving Schedule
 Shows the step-down of mining rewards over time
 """
 
+import sys
 import matplotlib.pyplot as plt
 import numpy as np
-from datetime import datetime
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from engines.issuance import COIN, halving_table
+
 # Chart metadata for QuantLet integration
 CHART_METADATA = {
     'title': 'Bitcoin Block Reward Halving Schedule',
@@ -24,19 +27,13 @@ plt.rcParams.update({
     'legend.fontsize': 12
 })
 
-# Bitcoin halving schedule (real data)
-halvings = [
-    ('2009-01', 0, 50.0),      # Genesis
-    ('2012-11', 210000, 25.0),  # First halving
-    ('2016-07', 420000, 12.5),  # Second halving
-    ('2020-05', 630000, 6.25),  # Third halving
-    ('2024-04', 840000, 3.125), # Fourth halving
-    ('2028-01', 1050000, 1.5625), # Fifth halving (projected)
-    ('2032-01', 1260000, 0.78125) # Sixth halving (projected)
-]
+# Bitcoin halving schedule: actual dates up to 2024, projected at 10 min/block after
+table = halving_table()
+halvings = [(str(date)[:7], int(height), subsidy / COIN)
+            for date, height, subsidy in zip(table['date'][:7], table['height'][:7], table['subsidy'][:7])]
 
 # Prepare data for step plot
-dates = [datetime.strptime(d, '%Y-%m') for d, _, _ in halvings]
+dates = table['date'][:7].astype(object)
 blocks = [b for _, b, _ in halvings]
 rewards = [r for _, _, r in halvings]
 
@@ -69,17 +66,7 @@ ax1.text(dates[4], 50, 'Current',
          ha='center', fontsize=14, style='italic', alpha=0.7)
 
 # Bottom plot: Cumulative BTC mined
-cumulative_btc = []
-total = 0
-for i in range(len(halvings)):
-    if i == 0:
-        blocks_in_period = halvings[i][1]
-    else:
-        blocks_in_period = halvings[i][1] - halvings[i-1][1]
-
-    if i > 0:
-        total += blocks_in_period * halvings[i-1][2]
-    cumulative_btc.append(total / 1_000_000)  # Convert to millions
+cumulative_btc = table['supply'][:7] / COIN / 1_000_000  # Convert to millions
 
 ax2.plot(dates, cumulative_btc, color='black', linewidth=2)
 ax2.fill_between(dates, cumulative_btc, alpha=0.2, color='gray')
@@ -1,17 +1,20 @@
 """
 Hash Avalanche Effect Visualization
-Shows how SHA-256 produces vastly different outputs for minimal input changes
-[SYNTHETIC DATA]
+Distribution of bits changed by single-bit input flips for SHA-256, SHA3 and
+BLAKE2, with per-output-bit bias and chi-square uniformity tests
 """
 
-import hashlib
+import sys
 import matplotlib.pyplot as plt
 import numpy as np
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from engines.avalanche import avalanche, binomial_pmf
+
 # Chart metadata for QuantLet integration
 CHART_METADATA = {
-    'title': 'Hash Avalanche Effect - SHA-256 Bit Differences',
+    'title': 'Hash Avalanche Effect - SHA-256, SHA3 and BLAKE2 Bit Differences',
     'url': 'https://github.com/Digital-AI-Finance/Blockchain_Crypto/tree/main/charts/hash_avalanche'
 }
 
@@ -25,70 +28,53 @@ plt.rcParams.update({
     'legend.fontsize': 12
 })
 
-def hamming_distance(hash1, hash2):
-    """Calculate Hamming distance between two hashes (number of differing bits)"""
-    bytes1 = bytes.fromhex(hash1)
-    bytes2 = bytes.fromhex(hash2)
-    distance = 0
-    for b1, b2 in zip(bytes1, bytes2):
-        xor = b1 ^ b2
-        distance += bin(xor).count('1')
-    return distance
-
-# Generate synthetic data showing avalanche effect
-base_input = "blockchain"
-variations = [
-    ("Original", base_input),
-    ("+1 char", base_input + "x"),
-    ("+space", base_input + " "),
-    ("Capital", base_input.capitalize()),
-    ("+digit", base_input + "1"),
-    ("Reverse", base_input[::-1]),
-]
-
-# Calculate hashes and distances
-base_hash = hashlib.sha256(base_input.encode()).hexdigest()
-distances = []
-labels = []
-
-for label, input_str in variations:
-    current_hash = hashlib.sha256(input_str.encode()).hexdigest()
-    distance = hamming_distance(base_hash, current_hash)
-    distances.append(distance)
-    labels.append(label)
+# Flip every bit of 4,096 random 32-byte messages: 1,048,576 pairs per hash
+ALGORITHMS = [('sha256', 'SHA-256', '#1a1a1a', '-'),
+              ('sha3_256', 'SHA3-256', '#666666', '--'),
+              ('blake2s', 'BLAKE2s', '#999999', ':')]
+results = {name: avalanche(name, messages=4096, seed=42) for name, _, _, _ in ALGORITHMS}
+samples = results['sha256'].samples
+digest_bits = results['sha256'].digest_bits
 
 # Create the chart
-fig, ax = plt.subplots(figsize=(8, 5))
-
-# Use grayscale-friendly colors
-bars = ax.bar(range(len(labels)), distances, color='#4d4d4d', edgecolor='black', linewidth=0.8)
-
-# Highlight the original (0 distance)
-bars[0].set_color('#cccccc')
-bars[0].set_edgecolor('black')
-
-ax.set_ylabel('Hamming Distance (Bits Changed)')
-ax.set_xlabel('Input Variation')
-ax.set_title('SHA-256 Avalanche Effect: Minimal Input Change, Maximal Output Difference')
-ax.set_xticks(range(len(labels)))
-ax.set_xticklabels(labels, rotation=45, ha='right')
-ax.set_ylim(0, 256)
-
-# Add horizontal line at 128 (expected average for random changes)
-ax.axhline(y=128, color='black', linestyle='--', linewidth=0.8, alpha=0.5, label='Expected (~128 bits)')
-
-# Add value labels on bars
-for i, (bar, dist) in enumerate(zip(bars, distances)):
-    height = bar.get_height()
-    ax.text(bar.get_x() + bar.get_width()/2., height + 3,
-            f'{dist}',
-            ha='center', va='bottom', fontsize=14)
-
-ax.legend(loc='upper right')
+fig, (ax, ax_bits) = plt.subplots(1, 2, figsize=(13, 5))
+
+# Distance distribution against Binomial(256, 1/2)
+distance = np.arange(digest_bits + 1)
+ax.bar(distance, binomial_pmf(digest_bits) * 100, width=1.0, color='#cccccc', edgecolor='none',
+       label='Binomial(256, 1/2)')
+for name, label, color, style in ALGORITHMS:
+    result = results[name]
+    _, _, p_value = result.distance_chi_square()
+    ax.step(distance, result.histogram / result.samples * 100, where='mid', color=color, linestyle=style,
+            linewidth=1.5, label=f'{label}: mean {result.mean_distance:.2f}, p = {p_value:.2f}')
+
+ax.set_xlim(90, 166)
+ax.set_ylim(0, 8.5)
+ax.set_xlabel('Hamming Distance (Bits Changed)')
+ax.set_ylabel('Share of Flip Pairs (%)')
+ax.set_title('Bits Changed by a 1-Bit Input Flip')
+ax.axvline(x=128, color='black', linestyle='--', linewidth=0.8, alpha=0.5)
+ax.legend(loc='upper left', fontsize=11, title='chi-square p-value vs binomial', title_fontsize=11)
 ax.grid(axis='y', alpha=0.3, linestyle=':', linewidth=0.5)
 
-# Add note about synthetic data
-fig.text(0.99, 0.01, '[SYNTHETIC]', ha='right', va='bottom', fontsize=14, style='italic', alpha=0.6)
+# Flip rate of every output bit: no position should deviate from 1/2
+band = 3 * np.sqrt(0.25 / samples) * 100
+ax_bits.axhspan(50 - band, 50 + band, color='#e6e6e6', label='50% +/- 3 std. errors')
+for name, label, color, _ in ALGORITHMS:
+    result = results[name]
+    _, _, p_value = result.bit_chi_square()
+    ax_bits.plot(np.arange(digest_bits), result.bit_flip_rate * 100, '.', color=color, markersize=4,
+                 label=f'{label}: p = {p_value:.2f}')
+ax_bits.set_xlim(-2, digest_bits + 1)
+ax_bits.set_ylim(49.6, 50.45)
+ax_bits.set_xlabel('Output Bit Position')
+ax_bits.set_ylabel('Flip Probability (%)')
+ax_bits.set_title('No Output Bit is Biased')
+ax_bits.legend(loc='upper left', fontsize=11, ncol=2)
+ax_bits.grid(axis='y', alpha=0.3, linestyle=':', linewidth=0.5)
+
+fig.suptitle(f'Hash Avalanche Effect over {samples:,} Single-Bit Flips', fontsize=16)
 
 plt.tight_layout()
 
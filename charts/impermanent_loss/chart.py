@@ -3,10 +3,14 @@ Impermanent Loss Visualization for Automated Market Makers (AMMs)
 Shows IL percentage as token price ratio changes from initial deposit
 """
 
+import sys
 import matplotlib.pyplot as plt
 import numpy as np
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from engines.impermanent_loss import impermanent_loss, simulate_lp
+
 # Chart metadata for QuantLet integration
 CHART_METADATA = {
     'title': 'Impermanent Loss in AMM Liquidity Pools',
@@ -24,18 +28,18 @@ plt.rcParams.update({
 })
 
 def calculate_impermanent_loss(price_ratio):
-    """
-    Calculate impermanent loss for a given price ratio
-    IL = 2*sqrt(r)/(1+r) - 1
-    where r is the price ratio (new_price / initial_price)
-    """
-    il = 2 * np.sqrt(price_ratio) / (1 + price_ratio) - 1
-    return il * 100  # Convert to percentage
+    """Impermanent loss in percent for a price ratio (new / initial price)"""
+    return impermanent_loss(price_ratio) * 100  # Convert to percentage
 
 # Generate price ratios from 0.25x to 4x
 price_ratios = np.linspace(0.25, 4, 500)
 il_percentages = calculate_impermanent_loss(price_ratios)
 
+# Where prices actually end up: 1 year of GBM at 80% annual volatility
+VOLATILITY = 0.8
+simulation = simulate_lp(100_000, 52, horizon=1.0, sigma=VOLATILITY, seed=42)
+expected_il = simulation.il.mean() * 100
+
 # Create the chart
 fig, ax = plt.subplots(figsize=(8, 5))
 
@@ -45,6 +49,16 @@ ax.plot(price_ratios, il_percentages, color='black', linewidth=2, label='Imperma
 # Fill the area to emphasize loss
 ax.fill_between(price_ratios, il_percentages, 0, alpha=0.2, color='gray')
 
+# Distribution of simulated 1-year price ratios behind the curve
+ax_dist = ax.twinx()
+density, _, _ = ax_dist.hist(simulation.price_ratio, bins=np.linspace(0.25, 4, 61), density=True,
+                             color='#0066CC', alpha=0.15,
+                             label=f'1-year price paths (vol {VOLATILITY:.0%})')
+ax_dist.set_ylim(0, density.max() * 2.5)  # keep the bars in the lower part of the plot
+ax_dist.set_yticks([])
+ax.set_zorder(ax_dist.get_zorder() + 1)
+ax.patch.set_visible(False)
+
 # Mark key points
 key_points = [0.5, 1.0, 2.0, 3.0, 4.0]
 for ratio in key_points:
@@ -72,7 +86,10 @@ ax.set_ylim(-30, 5)
 ax.grid(alpha=0.3, linestyle=':', linewidth=0.5)
 
 # Add legend
-ax.legend(loc='lower right')
+ax.plot([], [], ' ', label=f'Expected IL (simulated): {expected_il:.1f}%')
+handles, labels = ax.get_legend_handles_labels()
+dist_handles, dist_labels = ax_dist.get_legend_handles_labels()
+ax.legend(handles + dist_handles, labels + dist_labels, loc='lower right')
 
 # Add note explaining the concept
 note_text = "Loss relative to holding tokens outside pool"
@@ -4,10 +4,14 @@ Shows how transaction hashes are combined into a Merkle root
 [SYNTHETIC DATA]
 """
 
+import sys
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from engines.merkle import MerkleTree
+
 # Chart metadata for QuantLet integration
 CHART_METADATA = {
     'title': 'Merkle Tree Structure - Transaction Hash Aggregation',
@@ -36,7 +40,16 @@ branch_color = '#5a5a5a'
 leaf_color = '#8a8a8a'
 tx_color = '#b0b0b0'
 
-def draw_node(x, y, text, color, width=1.4, height=0.55):
+# A real tree over four transactions: every node shows its digest prefix
+transactions = ['Tx A', 'Tx B', 'Tx C', 'Tx D']
+tree = MerkleTree.from_data([tx.encode() for tx in transactions])
+
+
+def node_label(text, level, index):
+    return f'{text}\n{tree.node(level, index).hex()[:8]}'
+
+
+def draw_node(x, y, text, color, width=1.4, height=0.8):
     rect = mpatches.FancyBboxPatch((x - width/2, y - height/2), width, height,
                                     boxstyle="round,pad=0.05", facecolor=color,
                                     edgecolor='black', linewidth=1)
@@ -47,33 +60,26 @@ def draw_line(x1, y1, x2, y2):
     ax.plot([x1, x2], [y1, y2], 'k-', linewidth=1, alpha=0.6)
 
 # Level 0: Merkle Root
-draw_node(5, 6, 'Merkle Root', root_color, width=2.0)
+draw_node(5, 6, node_label('Merkle Root', 2, 0), root_color, width=2.0)
 
 # Level 1: Branch hashes
-draw_node(2.5, 4.5, 'H(AB)', branch_color, width=1.5)
-draw_node(7.5, 4.5, 'H(CD)', branch_color, width=1.5)
-draw_line(5, 5.75, 2.5, 4.75)
-draw_line(5, 5.75, 7.5, 4.75)
+draw_node(2.5, 4.5, node_label('H(AB)', 1, 0), branch_color, width=1.5)
+draw_node(7.5, 4.5, node_label('H(CD)', 1, 1), branch_color, width=1.5)
+draw_line(5, 5.6, 2.5, 4.9)
+draw_line(5, 5.6, 7.5, 4.9)
 
 # Level 2: Leaf hashes
-draw_node(1.25, 3, 'H(A)', leaf_color)
-draw_node(3.75, 3, 'H(B)', leaf_color)
-draw_node(6.25, 3, 'H(C)', leaf_color)
-draw_node(8.75, 3, 'H(D)', leaf_color)
-draw_line(2.5, 4.25, 1.25, 3.25)
-draw_line(2.5, 4.25, 3.75, 3.25)
-draw_line(7.5, 4.25, 6.25, 3.25)
-draw_line(7.5, 4.25, 8.75, 3.25)
+for i, x in enumerate([1.25, 3.75, 6.25, 8.75]):
+    draw_node(x, 3, node_label(f'H({transactions[i][-1]})', 0, i), leaf_color)
+draw_line(2.5, 4.1, 1.25, 3.4)
+draw_line(2.5, 4.1, 3.75, 3.4)
+draw_line(7.5, 4.1, 6.25, 3.4)
+draw_line(7.5, 4.1, 8.75, 3.4)
 
 # Level 3: Transactions
-draw_node(1.25, 1.5, 'Tx A', tx_color)
-draw_node(3.75, 1.5, 'Tx B', tx_color)
-draw_node(6.25, 1.5, 'Tx C', tx_color)
-draw_node(8.75, 1.5, 'Tx D', tx_color)
-draw_line(1.25, 2.75, 1.25, 1.75)
-draw_line(3.75, 2.75, 3.75, 1.75)
-draw_line(6.25, 2.75, 6.25, 1.75)
-draw_line(8.75, 2.75, 8.75, 1.75)
+for x, tx in zip([1.25, 3.75, 6.25, 8.75], transactions):
+    draw_node(x, 1.5, tx, tx_color, height=0.55)
+    draw_line(x, 2.6, x, 1.75)
 
 # Legend
 legend_elements = [
@@ -85,7 +91,7 @@ legend_elements = [
 ax.legend(handles=legend_elements, loc='lower center', ncol=2, fontsize=14, framealpha=0.9)
 
 # Add explanation
-ax.text(5, 0.3, 'Verification: To prove Tx B is in the tree, only need H(A), H(CD), and Root',
+ax.text(4.4, -0.3, 'Verification: To prove Tx B is in the tree, only need H(A), H(CD), and Root',
         ha='center', va='center', fontsize=14, style='italic', alpha=0.7)
 
 # Add note about synthetic data
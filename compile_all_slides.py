@@ -1,14 +1,22 @@
 """
 Batch compile all Beamer slides to PDF
 Autonomous execution - no user interaction required
+
+Decks whose .tex and referenced charts are unchanged since their last
+successful build are skipped; pass --force to recompile everything.
 """
 
 import os
 import subprocess
 import shutil
+import sys
 from pathlib import Path
 from datetime import datetime
 
+sys.path.insert(0, str(Path(__file__).parent / "tools"))
+from tex_deps import TexBuildState
+from course_index import get_index
+
 # Configuration
 BASE_DIR = Path(r"D:\Joerg\Research\slides\Blockchain_Crypto")
 TEMP_DIR = BASE_DIR / "temp"
@@ -18,13 +26,7 @@ TEMP_DIR.mkdir(exist_ok=True)
 
 def find_all_tex_files():
     """Find all .tex files in module directories"""
-    tex_files = []
-    for module_dir in BASE_DIR.glob("Module_*"):
-        for tex_file in module_dir.rglob("*.tex"):
-            # Skip files in temp or previous folders
-            if "temp" not in str(tex_file) and "previous" not in str(tex_file):
-                tex_files.append(tex_file)
-    return sorted(tex_files)
+    return sorted(get_index(BASE_DIR).tex_files)
 
 def compile_tex(tex_path):
     """Compile a single .tex file to PDF"""
@@ -75,7 +77,7 @@ def compile_tex(tex_path):
         print(f"  [ERROR] {str(e)}")
         return False, None
 
-def main():
+def main(force=False):
     print("=" * 60)
     print("BSc Blockchain Course - Batch PDF Compilation")
     print(f"Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
@@ -84,25 +86,42 @@ def main():
     tex_files = find_all_tex_files()
     print(f"\nFound {len(tex_files)} .tex files to compile")
 
+    state = TexBuildState.load(BASE_DIR / ".tex_fingerprints.json")
+    if force:
+        state.entries.clear()
+
     success_count = 0
+    skip_count = 0
     fail_count = 0
     results = []
 
     for tex_file in tex_files:
+        pdf_file = tex_file.with_suffix(".pdf")
+        if state.is_up_to_date(tex_file, pdf_file):
+            print(f"\n[SKIP] {tex_file.name} (unchanged)")
+            skip_count += 1
+            results.append(f"[SKIP] {tex_file.name} -> {pdf_file}")
+            continue
+
         success, pdf_path = compile_tex(tex_file)
         if success:
             success_count += 1
+            state.record(tex_file, pdf_path)
             results.append(f"[OK] {tex_file.name} -> {pdf_path}")
         else:
             fail_count += 1
+            state.forget(tex_file)
             results.append(f"[FAIL] {tex_file.name}")
 
+    state.save()
+
     # Summary
     print("\n" + "=" * 60)
     print("COMPILATION SUMMARY")
     print("=" * 60)
     print(f"Total files: {len(tex_files)}")
     print(f"Successful: {success_count}")
+    print(f"Skipped (unchanged): {skip_count}")
     print(f"Failed: {fail_count}")
     print(f"Aux files moved to: {TEMP_DIR}")
 
@@ -111,7 +130,7 @@ def main():
     with open(report_path, "w") as f:
         f.write(f"Compilation Report - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
         f.write("=" * 60 + "\n\n")
-        f.write(f"Total: {len(tex_files)} | Success: {success_count} | Failed: {fail_count}\n\n")
+        f.write(f"Total: {len(tex_files)} | Success: {success_count} | Skipped: {skip_count} | Failed: {fail_count}\n\n")
         f.write("\n".join(results))
 
     print(f"\nReport saved to: {report_path}")
@@ -119,4 +138,4 @@ def main():
     return success_count, fail_count
 
 if __name__ == "__main__":
-    main()
+    main(force="--force" in sys.argv)
@@ -3,96 +3,98 @@ Compile and Verify All LaTeX Lessons
 Compiles all .tex files and updates index.html with status indicators.
 - Green checkmark: Compilation successful
 - Red X: Compilation failed
+
+Lessons are independent, so they are compiled concurrently (one pdflatex per
+job, each writing into its own lesson temp/ directory). A second pdflatex
+pass only runs when the first pass changed the .aux/.nav/.toc files.
+
+Decks whose .tex source and every \includegraphics/\input dependency are
+unchanged since their last successful build are skipped (see
+tools/tex_deps.py) and reported as compiled.
+
+Usage:
+    python compile_and_verify.py            # One job per core
+    python compile_and_verify.py --jobs 4   # Limit concurrent pdflatex runs
+    python compile_and_verify.py --force    # Recompile unchanged decks too
 """
 
+import argparse
+import hashlib
+import os
 import re
 import subprocess
 import sys
 import shutil
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from datetime import datetime
-from collections import defaultdict
 
 BASE_DIR = Path(__file__).parent
 
+sys.path.insert(0, str(BASE_DIR / "tools"))
+from tex_deps import TexBuildState
+from course_index import get_index
 
-def get_timestamp(filename):
-    """Extract timestamp from filename like 20251211_1400_L01_Name.tex"""
-    match = re.match(r'^(\d{8}_\d{4})_', filename)
-    return match.group(1) if match else None
-
-
-def get_lesson_id(filename):
-    """Extract lesson ID like L01, L02, etc."""
-    match = re.search(r'_(L\d{2})_', filename)
-    return match.group(1) if match else None
+# Auxiliary outputs whose changes require another pdflatex pass
+RERUN_EXTENSIONS = ['.aux', '.nav', '.toc', '.out', '.snm']
+MAX_PASSES = 3
 
 
 def find_latest_tex_files():
     """Find the latest .tex file for each lesson."""
-    tex_files = {}
-
-    for module_dir in sorted(BASE_DIR.glob("Module_*")):
-        for lesson_dir in sorted(module_dir.glob("L*")):
-            if not lesson_dir.is_dir():
-                continue
-
-            # Check for presentations/ subfolder (Modules D, E)
-            presentations_dir = lesson_dir / "presentations"
-            target_dir = presentations_dir if presentations_dir.exists() else lesson_dir
+    return get_index(BASE_DIR).latest_decks()
 
-            # Group tex files by lesson
-            lesson_texes = defaultdict(list)
-            for tex_file in target_dir.glob("*.tex"):
-                if "previous" in str(tex_file) or "temp" in str(tex_file):
-                    continue
-                timestamp = get_timestamp(tex_file.name)
-                lesson_id = get_lesson_id(tex_file.name)
-                if timestamp and lesson_id:
-                    lesson_texes[lesson_id].append(tex_file)
 
-            # Keep only the latest for each lesson
-            for lesson_id, files in lesson_texes.items():
-                files.sort(key=lambda x: get_timestamp(x.name), reverse=True)
-                tex_files[lesson_id] = files[0]
-
-    return tex_files
+def aux_fingerprint(temp_dir, stem):
+    """Hash the auxiliary files that feed cross-references into the next pass."""
+    fingerprint = {}
+    for ext in RERUN_EXTENSIONS:
+        aux_file = temp_dir / (stem + ext)
+        if aux_file.exists():
+            fingerprint[ext] = hashlib.md5(aux_file.read_bytes()).hexdigest()
+    return fingerprint
 
 
 def compile_tex(tex_path):
-    """Compile a .tex file and return (success, error_message)."""
+    """Compile a .tex file and return (success, error_message, pdf_path)."""
     tex_dir = tex_path.parent
     tex_name = tex_path.name
 
-    # Create temp directory for aux files
+    # Per-lesson temp directory for aux files; keeping them between runs
+    # lets the first pass start from the previous cross-reference state
     temp_dir = tex_dir / "temp"
     temp_dir.mkdir(exist_ok=True)
 
+    pdf_name = tex_path.stem + ".pdf"
+    temp_pdf = temp_dir / pdf_name
+    if temp_pdf.exists():
+        temp_pdf.unlink()
+
     try:
-        # Run pdflatex (twice for references)
-        for _ in range(2):
+        # Run pdflatex until the aux files stop changing
+        before = aux_fingerprint(temp_dir, tex_path.stem)
+        for _ in range(MAX_PASSES):
             result = subprocess.run(
-                ["pdflatex", "-interaction=nonstopmode", "-output-directory", str(tex_dir), tex_name],
+                ["pdflatex", "-interaction=nonstopmode", "-output-directory", str(temp_dir), tex_name],
                 cwd=tex_dir,
                 capture_output=True,
                 text=True,
                 timeout=120
             )
+            after = aux_fingerprint(temp_dir, tex_path.stem)
+            if after == before:
+                break
+            before = after
 
         # Check if PDF was created
-        pdf_name = tex_path.stem + ".pdf"
         pdf_path = tex_dir / pdf_name
 
-        if pdf_path.exists():
-            # Move aux files to temp
-            for ext in ['.aux', '.log', '.out', '.nav', '.snm', '.toc', '.vrb']:
-                aux_file = tex_dir / (tex_path.stem + ext)
-                if aux_file.exists():
-                    shutil.move(str(aux_file), str(temp_dir / aux_file.name))
+        if temp_pdf.exists():
+            shutil.move(str(temp_pdf), str(pdf_path))
             return True, None, pdf_path
         else:
             # Extract error from log
-            log_file = tex_dir / (tex_path.stem + ".log")
+            log_file = temp_dir / (tex_path.stem + ".log")
             error_msg = "PDF not generated"
             if log_file.exists():
                 log_content = log_file.read_text(encoding='latin-1')
@@ -109,6 +111,47 @@ def compile_tex(tex_path):
         return False, str(e)[:100], None
 
 
+def compile_all(tex_files, jobs=None, state=None):
+    """Compile lessons concurrently; returns {lesson_id: (success, error, pdf)}.
+
+    With a TexBuildState, decks whose inputs are unchanged since their last
+    successful build are not recompiled and count as successful.
+    """
+    results = {}
+    jobs = max(1, jobs or os.cpu_count() or 1)
+
+    to_compile = {}
+    for lesson_id, tex_path in sorted(tex_files.items()):
+        pdf_path = tex_path.with_suffix(".pdf")
+        if state is not None and state.is_up_to_date(tex_path, pdf_path):
+            results[lesson_id] = (True, None, pdf_path)
+            print(f"[{lesson_id}] {tex_path.name}... OK (unchanged)")
+        else:
+            to_compile[lesson_id] = tex_path
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        futures = {pool.submit(compile_tex, tex_path): lesson_id
+                   for lesson_id, tex_path in to_compile.items()}
+        for future in as_completed(futures):
+            lesson_id = futures[future]
+            success, error_msg, pdf_path = future.result()
+            results[lesson_id] = (success, error_msg, pdf_path)
+
+            if state is not None:
+                if success:
+                    state.record(tex_files[lesson_id], pdf_path)
+                else:
+                    state.forget(tex_files[lesson_id])
+
+            status = "OK" if success else f"FAILED - {error_msg}"
+            print(f"[{lesson_id}] {tex_files[lesson_id].name}... {status}", flush=True)
+
+    if state is not None:
+        state.save()
+
+    return results
+
+
 def update_index_html(results):
     """Update index.html with compilation status indicators."""
     index_path = BASE_DIR / "index.html"
@@ -160,7 +203,7 @@ def update_index_html(results):
     return True
 
 
-def main():
+def main(jobs=None, force=False):
     print("=" * 60)
     print("Compile and Verify All LaTeX Lessons")
     print(f"Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
@@ -168,25 +211,15 @@ def main():
 
     # Find all tex files
     tex_files = find_latest_tex_files()
-    print(f"\nFound {len(tex_files)} lessons to compile\n")
+    jobs = jobs or os.cpu_count() or 1
+    print(f"\nFound {len(tex_files)} lessons to compile ({jobs} jobs)\n")
 
-    results = {}
-    success_count = 0
-    error_count = 0
-
-    for lesson_id in sorted(tex_files.keys()):
-        tex_path = tex_files[lesson_id]
-        print(f"[{lesson_id}] Compiling: {tex_path.name}...", end=" ", flush=True)
-
-        success, error_msg, pdf_path = compile_tex(tex_path)
-        results[lesson_id] = (success, error_msg, pdf_path)
-
-        if success:
-            print("OK")
-            success_count += 1
-        else:
-            print(f"FAILED - {error_msg}")
-            error_count += 1
+    state = TexBuildState.load()
+    if force:
+        state.entries.clear()
+    results = compile_all(tex_files, jobs=jobs, state=state)
+    success_count = sum(1 for success, _, _ in results.values() if success)
+    error_count = len(results) - success_count
 
     # Update index.html
     print("\nUpdating index.html with status indicators...")
@@ -203,7 +236,7 @@ def main():
 
     if error_count > 0:
         print("\nFailed lessons:")
-        for lesson_id, (success, error_msg, _) in results.items():
+        for lesson_id, (success, error_msg, _) in sorted(results.items()):
             if not success:
                 print(f"  - {lesson_id}: {error_msg}")
 
@@ -211,5 +244,12 @@ def main():
 
 
 if __name__ == "__main__":
-    success = main()
+    parser = argparse.ArgumentParser(description="Compile all lessons and update index.html")
+    parser.add_argument("--jobs", "-j", type=int, default=None,
+                        help="Number of concurrent pdflatex runs (default: all cores)")
+    parser.add_argument("--force", action="store_true",
+                        help="Recompile decks even if their inputs are unchanged")
+    args = parser.parse_args()
+
+    success = main(jobs=args.jobs, force=args.force)
     sys.exit(0 if success else 1)
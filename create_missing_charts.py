@@ -1,10 +1,29 @@
-"""Create all missing charts for lessons 28, 29, 31, 33, 42, 45, 46, 47"""
+"""Create all missing charts for lessons 28, 29, 31, 33, 42, 45, 46, 47
+
+chart.py files are only rewritten when their content differs, and the charts
+are then rendered incrementally: unchanged charts keep their existing PDF.
+"""
 import os
+import sys
 from pathlib import Path
 
 # Base directory
 base_dir = Path(__file__).parent
 
+sys.path.insert(0, str(base_dir / "tools"))
+from chart_build import build_charts, STATUS_SKIPPED
+
+created_charts = []
+
+
+def write_chart(chart_path, content):
+    """Write chart.py only if its content changed, so its hash stays stable."""
+    chart_path.mkdir(parents=True, exist_ok=True)
+    chart_file = chart_path / "chart.py"
+    if not chart_file.exists() or chart_file.read_text() != content:
+        chart_file.write_text(content)
+    created_charts.append(chart_file)
+
 # ============================================================================
 # L28 Lab NFT Evaluation - 3 charts
 # ============================================================================
@@ -85,8 +104,7 @@ plt.close()
 '''
 
 chart1_path = base_dir / "Module_C_NFTs_Digital_Assets" / "L28_Lab_NFT_Evaluation" / "charts" / "01_evaluation_workflow"
-chart1_path.mkdir(parents=True, exist_ok=True)
-(chart1_path / "chart.py").write_text(chart1_content)
+write_chart(chart1_path, chart1_content)
 
 # Chart 2: Valuation Factors
 chart2_content = '''"""NFT Valuation Factors - Key factors influencing NFT value"""
@@ -150,8 +168,7 @@ plt.close()
 '''
 
 chart2_path = base_dir / "Module_C_NFTs_Digital_Assets" / "L28_Lab_NFT_Evaluation" / "charts" / "02_valuation_factors"
-chart2_path.mkdir(parents=True, exist_ok=True)
-(chart2_path / "chart.py").write_text(chart2_content)
+write_chart(chart2_path, chart2_content)
 
 # Chart 3: Risk Matrix
 chart3_content = '''"""NFT Risk Assessment Matrix - Risk categories and levels"""
@@ -217,7 +234,16 @@ plt.close()
 '''
 
 chart3_path = base_dir / "Module_C_NFTs_Digital_Assets" / "L28_Lab_NFT_Evaluation" / "charts" / "03_risk_matrix"
-chart3_path.mkdir(parents=True, exist_ok=True)
-(chart3_path / "chart.py").write_text(chart3_content)
+write_chart(chart3_path, chart3_content)
 
 print("Created 3 charts for L28 Lab NFT Evaluation")
+
+if __name__ == "__main__":
+    results = build_charts(created_charts, incremental=True)
+    for chart_file, result in results.items():
+        if result.status == STATUS_SKIPPED:
+            print(f"  [SKIP] {chart_file.parent.name} (unchanged)")
+        elif result.ok:
+            print(f"  [OK] {chart_file.parent.name}")
+        else:
+            print(f"  [ERROR] {chart_file.parent.name}: {result.message[-100:]}")
@@ -0,0 +1,26 @@
+"""
+Simulation Engines
+Reusable, NumPy-vectorized models shared by the chart scripts and the labs.
+
+Charts import them after putting the project root on sys.path:
+
+    sys.path.insert(0, str(Path(__file__).resolve().parents[4]))  # lesson charts
+    from engines.amm import get_amount_out
+
+Modules:
+    amm - constant-product (x*y=k) pools: quotes, slippage, batched swaps
+    avalanche - bulk single-bit-flip hash statistics: popcount distances, bit bias, chi-square
+    birthday - log-space collision probabilities, truncated SHA-256 collision searches
+    clmm - concentrated-liquidity (Uniswap v3) pools: tick index, depth, swaps
+    difficulty - PoW block arrivals and 2016-block retargeting under hashrate shocks
+    fee_market - EIP-1559 base fee and EIP-4844 blob fee simulation, fee percentiles
+    hd_wallet - BIP32/BIP44 key derivation: path-prefix LRU cache, batch address ranges
+    impermanent_loss - Monte Carlo LP vs HODL (GBM, jump-diffusion, fees, ranges)
+    interest_rates - kinked, jump-rate and adaptive rate curves; index accrual
+    issuance - satoshi-exact Bitcoin subsidy and supply by height or date
+    lending - lending book (structure of arrays): health factors, liquidation cascades
+    merkle - Bitcoin-style Merkle trees: level buffers, proofs, incremental append/update
+    mining - reference lab miner: midstate nonce search across processes, hashrate benchmarks
+    secp256k1 - Jacobian point arithmetic, windowed multiplication, ECDSA with batch verification
+    staking - PoS validator set: rewards, inactivity leak, correlated slashing, concentration
+"""
@@ -0,0 +1,117 @@
+"""
+Constant-Product AMM
+Uniswap v2-style x * y = k pools, vectorized with NumPy.
+
+Every function broadcasts over its arguments, so a single call can quote a
+million trade sizes against one pool, one trade against thousands of pools,
+or a full trade-size x fee grid:
+
+    sizes = np.linspace(0.1, 30, 1_000_000)
+    out = get_amount_out(sizes, 100, 200_000)                  # one pool
+    grid = get_amount_out(sizes[:, None], 100, 200_000,
+                          fee=np.array([0.0005, 0.003, 0.01]))  # fee sweep
+
+Fees are fractions of the input amount (0.003 = 30 bps) and, as in Uniswap
+v2, stay in the pool. Amounts are floats; integer-exact on-chain rounding
+(997/1000 with floor division) is not modelled.
+
+Sequential swaps against the same pool are simulated by simulate_swaps()
+without a Python loop: flows are expressed as signed token-X deltas, so the
+X reserve is a cumulative sum and the Y reserve a cumulative product of
+per-swap ratios that depend only on the X reserve.
+"""
+
+import numpy as np
+
+DEFAULT_FEE = 0.003
+
+
+def get_amount_out(amount_in, reserve_in, reserve_out, fee=DEFAULT_FEE):
+    """Output received for an exact input amount."""
+    amount_in = np.asarray(amount_in, dtype=float)
+    amount_in_with_fee = amount_in * (1 - np.asarray(fee, dtype=float))
+    return amount_in_with_fee * reserve_out / (reserve_in + amount_in_with_fee)
+
+
+def get_amount_in(amount_out, reserve_in, reserve_out, fee=DEFAULT_FEE):
+    """Input required for an exact output amount (inf if the pool cannot pay it)."""
+    amount_out = np.asarray(amount_out, dtype=float)
+    remaining = np.asarray(reserve_out, dtype=float) - amount_out
+    with np.errstate(divide='ignore', invalid='ignore'):
+        amount_in = reserve_in * amount_out / (remaining * (1 - np.asarray(fee, dtype=float)))
+    return np.where(remaining > 0, amount_in, np.inf)
+
+
+def spot_price(reserve_in, reserve_out):
+    """Marginal price of the input token in units of the output token."""
+    return np.asarray(reserve_out, dtype=float) / reserve_in
+
+
+def slippage_exact_in(amount_in, reserve_in, reserve_out, fee=DEFAULT_FEE):
+    """Shortfall of the output versus trading at the spot price (fraction)."""
+    out = get_amount_out(amount_in, reserve_in, reserve_out, fee)
+    return 1 - out / (np.asarray(amount_in, dtype=float) * spot_price(reserve_in, reserve_out))
+
+
+def slippage_exact_out(amount_out, reserve_in, reserve_out, fee=DEFAULT_FEE):
+    """Extra input paid versus trading at the spot price (fraction)."""
+    cost = get_amount_in(amount_out, reserve_in, reserve_out, fee)
+    return cost / (np.asarray(amount_out, dtype=float) / spot_price(reserve_in, reserve_out)) - 1
+
+
+class SwapPath:
+    """Pool state and trader flows after each swap of a sequence."""
+    def __init__(self, reserve_x, reserve_y, amount_x, amount_y):
+        self.reserve_x = reserve_x  # X reserve after each swap
+        self.reserve_y = reserve_y  # Y reserve after each swap
+        self.amount_x = amount_x    # X paid into the pool (negative: received)
+        self.amount_y = amount_y    # Y paid into the pool (negative: received)
+
+    @property
+    def price(self):
+        """Spot price of X in Y after each swap."""
+        return self.reserve_y / self.reserve_x
+
+    @property
+    def k(self):
+        """Invariant after each swap; grows as fees accrue to the pool."""
+        return self.reserve_x * self.reserve_y
+
+    def __repr__(self):
+        return f"SwapPath({self.reserve_x.shape[-1]} swaps)"
+
+
+def simulate_swaps(reserve_x, reserve_y, dx, fee=DEFAULT_FEE) -> SwapPath:
+    """Apply a sequence of swaps to one or many pools in a single vectorized pass.
+
+    dx holds signed token-X flows along its last axis: a positive value sells
+    exactly dx of X for Y, a negative value buys exactly -dx of X with Y.
+    Leading axes broadcast against reserve_x/reserve_y/fee, so shape
+    (pools, swaps) runs one sequence per pool. Swaps that would drain the X
+    reserve make the rest of that path NaN.
+    """
+    dx = np.asarray(dx, dtype=float)
+    fee = np.asarray(fee, dtype=float)[..., None] if np.ndim(fee) else float(fee)
+    x0 = np.asarray(reserve_x, dtype=float)[..., None]
+    y0 = np.asarray(reserve_y, dtype=float)[..., None]
+
+    x_after = x0 + np.cumsum(dx, axis=-1)
+    x_before = x_after - dx
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Selling X: y' = y * x / (x + dx(1-f)); buying X: y' = y * (1 + |dx| / ((x-|dx|)(1-f)))
+        sell = x_before / (x_before + dx * (1 - fee))
+        buy = 1 - dx / (x_after * (1 - fee))
+        ratio = np.where(dx >= 0, sell, buy)
+        ratio = np.where(x_after > 0, ratio, np.nan)
+        # Once a path is invalid it stays invalid
+        ratio = np.where(np.maximum.accumulate(np.isnan(ratio), axis=-1), np.nan, ratio)
+        y_after = y0 * np.cumprod(ratio, axis=-1)
+
+    y_before = np.concatenate([np.broadcast_to(y0, y_after.shape[:-1] + (1,)), y_after[..., :-1]], axis=-1)
+    return SwapPath(x_after, y_after, dx, y_after - y_before)
+
+
+def constant_product_curve(k, x):
+    """Y reserve on the invariant curve x * y = k."""
+    return k / np.asarray(x, dtype=float)
@@ -0,0 +1,189 @@
+"""
+Avalanche Statistics
+Bulk single-bit-flip analysis of hash functions: distance distributions,
+bit-position bias and chi-square uniformity tests.
+
+For each random base message, every one of its input bits is flipped in
+turn and both versions are hashed. A good hash flips each output bit with
+probability 1/2, independently, so the Hamming distance between the two
+digests is Binomial(digest_bits, 1/2) and every (input bit, output bit)
+cell of the strict avalanche matrix is close to 0.5.
+
+Messages are generated as one uint8 array per batch, hashed with a list
+comprehension over memoryview slices (no per-message bytes objects), and
+the digests are compared as packed uint64 words: XOR, then a vectorized
+popcount (np.bitwise_count on NumPy >= 2, a SWAR bit count otherwise). A
+million flip pairs per algorithm take about a second, nearly all of it in
+hashlib.
+
+The tests need no SciPy: the binomial pmf comes from log-gamma and
+chi-square p-values from the Wilson-Hilferty normal approximation, which is
+accurate to about 1e-3 at the degrees of freedom here.
+
+Usage:
+    result = avalanche('sha256', messages=4096, seed=1)   # 1,048,576 flips
+    result.mean_distance, result.distance_chi_square()
+    result.bit_flip_rate                                   # per output bit
+"""
+
+import hashlib
+import math
+from typing import Optional, Tuple
+
+import numpy as np
+
+ALGORITHMS = {
+    'sha256': hashlib.sha256,
+    'sha3_256': hashlib.sha3_256,
+    'blake2s': hashlib.blake2s,
+    'blake2b': hashlib.blake2b,
+}
+
+_M1 = np.uint64(0x5555555555555555)
+_M2 = np.uint64(0x3333333333333333)
+_M4 = np.uint64(0x0F0F0F0F0F0F0F0F)
+_H01 = np.uint64(0x0101010101010101)
+
+
+def popcount(words: np.ndarray) -> np.ndarray:
+    """Set bits in each element of a uint64 array."""
+    words = np.asarray(words, dtype=np.uint64)
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(words)
+    words = words - ((words >> np.uint64(1)) & _M1)
+    words = (words & _M2) + ((words >> np.uint64(2)) & _M2)
+    words = (words + (words >> np.uint64(4))) & _M4
+    return ((words * _H01) >> np.uint64(56)).astype(np.uint8)
+
+
+def hamming_distance(digest1: bytes, digest2: bytes) -> int:
+    """Differing bits between two equal-length digests."""
+    if len(digest1) != len(digest2):
+        raise ValueError("digests must have the same length")
+    return bin(int.from_bytes(digest1, 'big') ^ int.from_bytes(digest2, 'big')).count('1')
+
+
+def hash_batch(algorithm: str, messages: np.ndarray) -> np.ndarray:
+    """Digests of the rows of a uint8 array, as an array of digest bytes."""
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"unknown algorithm {algorithm!r}, expected one of {sorted(ALGORITHMS)}")
+    new = ALGORITHMS[algorithm]
+    messages = np.ascontiguousarray(messages, dtype=np.uint8)
+    size = messages.shape[-1]
+    view = memoryview(messages.reshape(-1)).cast('B')
+    digests = b''.join([new(view[i:i + size]).digest() for i in range(0, len(view), size)])
+    view.release()
+    return np.frombuffer(digests, dtype=np.uint8).reshape(messages.shape[:-1] + (-1,))
+
+
+def binomial_pmf(n: int, p: float = 0.5) -> np.ndarray:
+    """P(K = k) for k = 0 .. n, K ~ Binomial(n, p)."""
+    k = np.arange(n + 1)
+    log_comb = np.array([math.lgamma(n + 1) - math.lgamma(i + 1) - math.lgamma(n - i + 1) for i in k])
+    return np.exp(log_comb + k * math.log(p) + (n - k) * math.log1p(-p))
+
+
+def chi_square_sf(statistic: float, dof: int) -> float:
+    """Upper tail P(X >= statistic) of a chi-square with dof degrees of freedom (Wilson-Hilferty)."""
+    if dof <= 0:
+        raise ValueError("dof must be positive")
+    z = ((statistic / dof) ** (1 / 3) - (1 - 2 / (9 * dof))) / math.sqrt(2 / (9 * dof))
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+class AvalancheResult:
+    """Single-bit-flip statistics of one hash algorithm."""
+    def __init__(self, algorithm, distances, flip_counts, messages):
+        self.algorithm = algorithm      # hashlib name
+        self.distances = distances      # Hamming distance of every flip pair
+        self.flip_counts = flip_counts  # (input bits, output bits) times each output bit flipped
+        self.messages = messages        # base messages; each input bit flipped once per message
+
+    @property
+    def samples(self) -> int:
+        return len(self.distances)
+
+    @property
+    def digest_bits(self) -> int:
+        return self.flip_counts.shape[1]
+
+    @property
+    def mean_distance(self) -> float:
+        return float(self.distances.mean())
+
+    @property
+    def std_distance(self) -> float:
+        return float(self.distances.std())
+
+    @property
+    def histogram(self) -> np.ndarray:
+        """Count of flip pairs at each distance 0 .. digest_bits."""
+        return np.bincount(self.distances, minlength=self.digest_bits + 1)
+
+    @property
+    def avalanche_matrix(self) -> np.ndarray:
+        """P(output bit j flips | input bit i flipped), the strict avalanche matrix."""
+        return self.flip_counts / self.messages
+
+    @property
+    def bit_flip_rate(self) -> np.ndarray:
+        """Flip probability of each output bit over all input flips."""
+        return self.flip_counts.sum(axis=0) / self.samples
+
+    def distance_chi_square(self, min_expected: float = 5.0) -> Tuple[float, int, float]:
+        """(statistic, dof, p-value) of the distances against Binomial(bits, 1/2).
+
+        Distances in the tails are pooled until every bin expects at least
+        min_expected pairs.
+        """
+        expected = binomial_pmf(self.digest_bits) * self.samples
+        observed = self.histogram.astype(float)
+        keep = np.flatnonzero(expected >= min_expected)
+        lo, hi = keep[0], keep[-1]
+        expected = np.concatenate([[expected[:lo + 1].sum()], expected[lo + 1:hi], [expected[hi:].sum()]])
+        observed = np.concatenate([[observed[:lo + 1].sum()], observed[lo + 1:hi], [observed[hi:].sum()]])
+        statistic = float(((observed - expected) ** 2 / expected).sum())
+        dof = len(expected) - 1
+        return statistic, dof, chi_square_sf(statistic, dof)
+
+    def bit_chi_square(self) -> Tuple[float, int, float]:
+        """(statistic, dof, p-value) that every output bit flips with probability 1/2."""
+        flips = self.flip_counts.sum(axis=0)
+        half = self.samples / 2
+        statistic = float((2 * (flips - half) ** 2 / half).sum())
+        return statistic, self.digest_bits, chi_square_sf(statistic, self.digest_bits)
+
+    def __repr__(self):
+        return (f"AvalancheResult({self.algorithm}, {self.samples:,} flips, "
+                f"mean {self.mean_distance:.2f}/{self.digest_bits} bits)")
+
+
+def avalanche(algorithm: str = 'sha256', messages: int = 4096, message_bytes: int = 32,
+              batch: int = 256, seed: Optional[int] = None) -> AvalancheResult:
+    """Flip every input bit of random messages and compare the digests.
+
+    messages * message_bytes * 8 flip pairs are hashed, batch base
+    messages at a time.
+    """
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"unknown algorithm {algorithm!r}, expected one of {sorted(ALGORITHMS)}")
+    digest_size = ALGORITHMS[algorithm]().digest_size
+    if digest_size % 8:
+        raise ValueError("digest size must be a multiple of 8 bytes")
+    rng = np.random.default_rng(seed)
+    input_bits = 8 * message_bytes
+    flip_index = np.arange(input_bits)
+    flip_mask = (0x80 >> (flip_index % 8)).astype(np.uint8)
+
+    distances = np.empty((messages, input_bits), dtype=np.int16)
+    flip_counts = np.zeros((input_bits, 8 * digest_size), dtype=np.int64)
+    for first in range(0, messages, batch):
+        count = min(batch, messages - first)
+        base = rng.integers(0, 256, (count, message_bytes), dtype=np.uint8)
+        flipped = np.repeat(base[:, None, :], input_bits, axis=1)
+        flipped[:, flip_index, flip_index // 8] ^= flip_mask
+        base_words = hash_batch(algorithm, base).view(np.uint64)
+        diff = hash_batch(algorithm, flipped).view(np.uint64) ^ base_words[:, None, :]
+        distances[first:first + count] = popcount(diff).sum(axis=-1)
+        flip_counts += np.unpackbits(diff.view(np.uint8), axis=-1).sum(axis=0, dtype=np.int64)
+    return AvalancheResult(algorithm, distances.reshape(-1), flip_counts, messages)
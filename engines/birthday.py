@@ -0,0 +1,266 @@
+"""
+Birthday Collisions
+Analytic collision probabilities for any number of outcomes, and empirical
+collision searches on truncated SHA-256.
+
+Among n uniform draws from N outcomes, the probability of no collision is
+prod_{i<n} (1 - i/N). In log-space that is a cumulative sum of
+log1p(-i/N), which gives the whole curve for every n at once with no
+underflow; 1 - P is taken with expm1 so tiny probabilities stay exact. For
+N above 2^24 the sum uses its power series in n/N,
+
+    log P(no collision) = -n(n-1)/(2N) - sum_i i^2/(2N^2) - sum_i i^3/(3N^3) - ...
+
+whose first omitted term is below 1e-7 of the sum wherever P is not
+already 0 or 1, so it works for N up to 2^64 and beyond.
+
+The empirical search hashes a counter, keeps the first bits of each digest,
+and inserts the keys in batches into a CollisionSet: an open-addressing hash
+set (linear probing) stored as one uint64 array, so each key costs 8 bytes
+of table and nothing else. Insertion is vectorized over a batch; slot
+conflicts inside the batch go to the lowest message index, so the first
+repeated key is found exactly as a one-at-a-time loop would find it. A
+48-bit search needs about 2^24 hashes and a 256 MB table (512 MB when it
+runs long and the table doubles).
+
+Searches over many bit widths take seconds each, so the lab chart plots
+attempts written by this module's entry point instead of searching on
+every render.
+
+Usage:
+    collision_probability(23, 365)               # 0.507
+    collision_threshold(2 ** 64)                 # 5.06e9 draws for 50%
+    search_collision(40, seed=1).attempts        # about 1.3M hashes
+
+    python -m engines.birthday --output attempts.json   # from the project root
+"""
+
+import argparse
+import json
+import math
+from pathlib import Path
+from typing import Optional, Sequence
+
+import numpy as np
+
+from engines.avalanche import hash_batch
+
+EXACT_LIMIT = 1 << 24
+BATCH = 1 << 16
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+
+
+def log_no_collision(n, outcomes: int) -> np.ndarray:
+    """log P(n draws from outcomes values are all distinct), vectorized over n."""
+    n = np.asarray(n)
+    if outcomes <= EXACT_LIMIT:
+        draws = int(min(n.max(initial=0), outcomes))
+        table = np.concatenate([[0.0], np.cumsum(np.log1p(-np.arange(draws) / outcomes))])
+        return np.where(n > outcomes, -np.inf, table[np.minimum(n, draws)])
+    n = n.astype(float)
+    pairs = n * (n - 1) / 2
+    squares = (n - 1) * n * (2 * n - 1) / 6
+    return -pairs / outcomes - squares / (2 * outcomes ** 2) - pairs ** 2 / (3 * outcomes ** 3)
+
+
+def collision_probability(n, outcomes: int) -> np.ndarray:
+    """P(at least two of n uniform draws from outcomes values are equal)."""
+    return -np.expm1(log_no_collision(n, outcomes))
+
+
+def collision_threshold(outcomes: int, probability: float = 0.5) -> int:
+    """Fewest draws for a collision with at least the given probability."""
+    if not 0 < probability < 1:
+        raise ValueError("probability must be between 0 and 1")
+    target = math.log1p(-probability)
+    # Bisect between lo (probability too low) and hi (high enough)
+    approx = math.sqrt(2 * outcomes * -target)
+    lo, hi = max(int(approx * 0.9) - 2, 0), int(approx * 1.1) + 3
+    if log_no_collision(lo, outcomes) <= target:
+        lo = 0
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        if log_no_collision(mid, outcomes) <= target:
+            hi = mid
+        else:
+            lo = mid
+    return hi
+
+
+def expected_draws(outcomes: int) -> float:
+    """Mean draws until the first repeat, about sqrt(pi N / 2)."""
+    return math.sqrt(math.pi * outcomes / 2) + 2 / 3
+
+
+class CollisionSet:
+    """Open-addressing set of integer keys below 2^63 in one uint64 array.
+
+    Keys are stored plus one so that 0 marks an empty slot. The table
+    doubles when it is more than max_load full.
+    """
+    def __init__(self, capacity: int = 1 << 16, max_load: float = 0.7):
+        self.bits = max(int(capacity - 1).bit_length(), 4)
+        self.table = np.zeros(1 << self.bits, dtype=np.uint64)
+        self.size = 0
+        self.max_load = max_load
+
+    def __len__(self):
+        return self.size
+
+    @property
+    def nbytes(self) -> int:
+        return self.table.nbytes
+
+    def _home(self, stored: np.ndarray) -> np.ndarray:
+        return ((stored * _GOLDEN) >> np.uint64(64 - self.bits)).astype(np.int64)
+
+    def _insert(self, stored: np.ndarray) -> np.ndarray:
+        """Insert stored keys in order; indices of keys that were already present."""
+        mask = len(self.table) - 1
+        pos = self._home(stored)
+        pending = np.arange(len(stored))
+        repeats = [np.empty(0, dtype=np.int64)]
+        while pending.size:
+            found = self.table[pos[pending]]
+            hit = found == stored[pending]
+            repeats.append(pending[hit])
+            empty = found == 0
+            claim = pending[empty]
+            _, first = np.unique(pos[claim], return_index=True)
+            winners = claim[first]
+            self.table[pos[winners]] = stored[winners]
+            self.size += len(winners)
+            # Losers of a slot recheck it next round: it now holds the winner's key
+            losers = np.setdiff1d(claim, winners, assume_unique=True)
+            moving = pending[~hit & ~empty]
+            pos[moving] = (pos[moving] + 1) & mask
+            pending = np.sort(np.concatenate([moving, losers]))
+        return np.sort(np.concatenate(repeats))
+
+    def _grow(self):
+        stored = self.table[self.table != 0]
+        self.bits += 1
+        self.table = np.zeros(1 << self.bits, dtype=np.uint64)
+        self.size = 0
+        self._insert(stored)
+
+    def add(self, keys) -> np.ndarray:
+        """Add keys in order; indices of keys already in the set (or earlier in keys)."""
+        keys = np.asarray(keys, dtype=np.uint64)
+        while (self.size + len(keys)) > self.max_load * len(self.table):
+            self._grow()
+        return self._insert(keys + np.uint64(1))
+
+    def __contains__(self, key):
+        stored = np.uint64(key) + np.uint64(1)
+        mask = len(self.table) - 1
+        pos = int(self._home(np.array([stored]))[0])
+        while self.table[pos]:
+            if self.table[pos] == stored:
+                return True
+            pos = (pos + 1) & mask
+        return False
+
+    def __repr__(self):
+        return f"CollisionSet({self.size:,} keys, {len(self.table):,} slots, {self.nbytes / 2 ** 20:.1f} MB)"
+
+
+def truncated_sha256(messages: np.ndarray, bits: int) -> np.ndarray:
+    """First bits of the SHA-256 digest of each row of a uint8 array, as integers."""
+    if not 1 <= bits <= 63:
+        raise ValueError("bits must be between 1 and 63")
+    digests = hash_batch('sha256', messages)
+    return np.ascontiguousarray(digests[:, :8]).view('>u8').ravel().astype(np.uint64) >> np.uint64(64 - bits)
+
+
+def _counter_messages(salt: int, start: int, count: int) -> np.ndarray:
+    """Messages salt || counter (two little-endian uint64) for counters start ..."""
+    words = np.empty((count, 2), dtype='<u8')
+    words[:, 0] = salt
+    words[:, 1] = np.arange(start, start + count, dtype=np.uint64)
+    return words.view(np.uint8)
+
+
+def _message(salt: int, counter: int) -> bytes:
+    return salt.to_bytes(8, 'little') + counter.to_bytes(8, 'little')
+
+
+class CollisionResult:
+    """First collision of a truncated-hash search."""
+    def __init__(self, bits, attempts, first, second, key, table_bytes):
+        self.bits = bits                # digest bits kept
+        self.attempts = attempts        # hashes computed until the repeat
+        self.first = first              # the two colliding messages
+        self.second = second
+        self.key = key                  # their shared truncated digest
+        self.table_bytes = table_bytes  # final hash set size
+
+    @property
+    def bound(self) -> float:
+        """The 2^(bits/2) birthday bound."""
+        return 2.0 ** (self.bits / 2)
+
+    def __repr__(self):
+        return (f"CollisionResult({self.bits} bits, {self.attempts:,} attempts = "
+                f"{self.attempts / self.bound:.2f} x 2^{self.bits / 2:g}, key={self.key:#x})")
+
+
+def search_collision(bits: int, seed: Optional[int] = None, batch: int = BATCH,
+                     find_pair: bool = True) -> CollisionResult:
+    """Hash salt || 0, salt || 1, ... until two truncated digests repeat.
+
+    The salt comes from seed, so each seed is a different search. With
+    find_pair the earlier message is recovered by rehashing the counters
+    before the repeat (about half the work again); without it only the
+    attempt count and the repeated key are exact.
+    """
+    salt = int(np.random.default_rng(seed).integers(0, 2 ** 63))
+    seen = CollisionSet(capacity=int(expected_draws(2 ** bits) / 0.7))
+    start = 0
+    while True:
+        keys = truncated_sha256(_counter_messages(salt, start, batch), bits)
+        repeats = seen.add(keys)
+        if repeats.size:
+            second = start + int(repeats[0])
+            key = int(keys[repeats[0]])
+            break
+        start += batch
+        if start >= 2 ** 64 - batch:
+            raise RuntimeError("counter space exhausted")
+
+    first = None
+    if find_pair:
+        for begin in range(0, second, batch):
+            count = min(batch, second - begin)
+            match = np.flatnonzero(truncated_sha256(_counter_messages(salt, begin, count), bits) == key)
+            if match.size:
+                first = _message(salt, begin + int(match[0]))
+                break
+    return CollisionResult(bits, second + 1, first, _message(salt, second), key, seen.nbytes)
+
+
+def collision_attempts(bits: Sequence[int] = (32, 34, 36, 38, 40),
+                       trials: Sequence[int] = (12, 8, 6, 4, 2)) -> dict:
+    """Attempts until the first collision for trials[i] seeds (0, 1, ...) at each bits[i]."""
+    return {
+        'bits': [int(b) for b in bits],
+        'attempts': [[search_collision(int(b), seed=seed, find_pair=False).attempts for seed in range(count)]
+                     for b, count in zip(bits, trials)],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Search truncated SHA-256 collisions and write the attempts as JSON')
+    parser.add_argument('--output', '-o', type=Path, required=True,
+                        help='JSON file to write (e.g. next to the birthday paradox chart)')
+    args = parser.parse_args()
+
+    results = collision_attempts()
+    args.output.write_text(json.dumps(results, indent=2) + '\n', encoding='utf-8')
+    for b, runs in zip(results['bits'], results['attempts']):
+        print(f"{b} bits: mean {sum(runs) / len(runs):,.0f} attempts over {len(runs)} searches")
+    print(f"Saved to: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
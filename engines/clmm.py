@@ -0,0 +1,284 @@
+"""
+Concentrated Liquidity (Uniswap v3-style)
+Tick-based pool where each position provides liquidity only inside its
+price range.
+
+Prices live on the tick grid p = 1.0001 ** tick. A position adds liquidity L
+at its lower tick and removes it at its upper tick (liquidity_net), so the
+active liquidity at any price is a running sum over initialized ticks.
+
+The pool keeps two indexes of initialized ticks:
+- a sorted NumPy array (with liquidity_net aligned to it), used for
+  vectorized depth curves and O(log n) jumps to the next initialized tick
+- a tick bitmap (one 256-bit word per 256 tick spacings, as in v3's
+  TickBitmap) for the common case where the next tick is in the same word
+
+Positions are added in bulk with np.unique/np.bincount, so tens of thousands
+of positions build in milliseconds. swap() walks tick boundaries exactly as
+v3's swap loop does (exact-input, fee taken per step), in floating point.
+
+Usage:
+    pool = ConcentratedPool(price=2000, tick_spacing=60)
+    pool.add_positions(lower_ticks, upper_ticks, liquidity)
+    pool.liquidity_at(prices)             # depth curve
+    result = pool.swap(10.0, zero_for_one=True)
+"""
+
+import math
+from typing import Optional, Tuple
+
+import numpy as np
+
+MIN_TICK = -887272
+MAX_TICK = 887272
+TICK_BASE = 1.0001
+DEFAULT_FEE = 0.003
+
+_LOG_BASE = math.log(TICK_BASE)
+_WORD_MASK = (1 << 256) - 1
+
+
+def tick_to_price(tick):
+    return TICK_BASE ** np.asarray(tick, dtype=float)
+
+
+def price_to_tick(price):
+    """Largest tick whose price is <= price."""
+    return np.floor(np.log(np.asarray(price, dtype=float)) / _LOG_BASE).astype(np.int64)
+
+
+def tick_to_sqrt_price(tick):
+    return TICK_BASE ** (np.asarray(tick, dtype=float) / 2)
+
+
+def align_tick(tick, tick_spacing: int):
+    """Round ticks down to the nearest usable tick."""
+    return np.floor_divide(np.asarray(tick, dtype=np.int64), tick_spacing) * tick_spacing
+
+
+def range_value(liquidity, price, lower_price, upper_price):
+    """Value (in token1) of a position's reserves at price."""
+    sp = np.sqrt(np.asarray(price, dtype=float))
+    sa, sb = np.sqrt(lower_price), np.sqrt(upper_price)
+    sp = np.clip(sp, sa, sb)
+    amount0 = liquidity * (1 / sp - 1 / sb)
+    amount1 = liquidity * (sp - sa)
+    return amount0 * np.asarray(price, dtype=float) + amount1
+
+
+def liquidity_for_value(value, price, lower_price, upper_price):
+    """Liquidity a position of the given value (in token1) provides."""
+    return np.asarray(value, dtype=float) / range_value(1.0, price, lower_price, upper_price)
+
+
+def capital_efficiency(price, lower_price, upper_price):
+    """Liquidity per unit of capital relative to a full-range (v2) position.
+
+    For a range [pa, pb] around p this is 2 sqrt(p) / (2 sqrt(p) - sqrt(pa) - p / sqrt(pb)).
+    """
+    full_range = range_value(1.0, price, 0.0, np.inf)
+    return full_range / range_value(1.0, price, lower_price, upper_price)
+
+
+class TickBitmap:
+    """Initialized ticks as 256-bit words keyed by compressed tick >> 8."""
+    def __init__(self, tick_spacing: int):
+        self.tick_spacing = tick_spacing
+        self.words = {}
+
+    def _position(self, compressed: int) -> Tuple[int, int]:
+        return compressed >> 8, compressed & 0xFF
+
+    def rebuild(self, ticks: np.ndarray):
+        self.words = {}
+        self.set_ticks(ticks)
+
+    def set_ticks(self, ticks: np.ndarray):
+        """Mark ticks initialized, touching only the words that hold them."""
+        compressed = np.unique(np.asarray(ticks, dtype=np.int64) // self.tick_spacing)
+        words = self.words
+        for word, bit in zip((compressed >> 8).tolist(), (compressed & 0xFF).tolist()):
+            words[word] = words.get(word, 0) | (1 << bit)
+
+    def is_initialized(self, tick: int) -> bool:
+        word, bit = self._position(tick // self.tick_spacing)
+        return bool(self.words.get(word, 0) >> bit & 1)
+
+    def next_within_one_word(self, tick: int, lte: bool) -> Tuple[int, bool]:
+        """Next initialized tick in the same word, or the word boundary (v3 semantics)."""
+        compressed = tick // self.tick_spacing
+        if lte:
+            word, bit = self._position(compressed)
+            masked = self.words.get(word, 0) & ((1 << (bit + 1)) - 1)
+            if masked:
+                return (compressed - (bit - (masked.bit_length() - 1))) * self.tick_spacing, True
+            return (compressed - bit) * self.tick_spacing, False
+        word, bit = self._position(compressed + 1)
+        masked = self.words.get(word, 0) & (~((1 << bit) - 1) & _WORD_MASK)
+        if masked:
+            lowest = (masked & -masked).bit_length() - 1
+            return (compressed + 1 + (lowest - bit)) * self.tick_spacing, True
+        return (compressed + 1 + (255 - bit)) * self.tick_spacing, False
+
+
+class SwapResult:
+    """Outcome of an exact-input swap."""
+    def __init__(self, amount_in: float, amount_out: float, fee_paid: float,
+                 price: float, ticks_crossed: int):
+        self.amount_in = amount_in
+        self.amount_out = amount_out
+        self.fee_paid = fee_paid
+        self.price = price
+        self.ticks_crossed = ticks_crossed
+
+    def __repr__(self):
+        return (f"SwapResult(in={self.amount_in:.6g}, out={self.amount_out:.6g}, "
+                f"price={self.price:.6g}, crossed={self.ticks_crossed})")
+
+
+class ConcentratedPool:
+    """A single v3-style pool of token0/token1 (price = token1 per token0)."""
+    def __init__(self, price: float, tick_spacing: int = 60, fee: float = DEFAULT_FEE):
+        self.tick_spacing = tick_spacing
+        self.fee = fee
+        self.sqrt_price = math.sqrt(price)
+        self.tick = int(price_to_tick(price))
+        self.liquidity = 0.0
+        self.ticks = np.zeros(0, dtype=np.int64)   # sorted initialized ticks
+        self.liquidity_net = np.zeros(0)            # aligned with ticks
+        self.bitmap = TickBitmap(tick_spacing)
+        self.min_tick = int(align_tick(MIN_TICK, tick_spacing)) + tick_spacing
+        self.max_tick = int(align_tick(MAX_TICK, tick_spacing))
+
+    @property
+    def price(self) -> float:
+        return self.sqrt_price ** 2
+
+    # -- positions ---------------------------------------------------------
+
+    def add_positions(self, lower_ticks, upper_ticks, liquidity):
+        """Add many positions at once; ticks must be multiples of tick_spacing."""
+        lower = np.atleast_1d(np.asarray(lower_ticks, dtype=np.int64))
+        upper = np.atleast_1d(np.asarray(upper_ticks, dtype=np.int64))
+        liquidity = np.broadcast_to(np.asarray(liquidity, dtype=float), lower.shape)
+        if np.any(lower >= upper):
+            raise ValueError("lower tick must be below upper tick")
+        if np.any(lower % self.tick_spacing) or np.any(upper % self.tick_spacing):
+            raise ValueError(f"ticks must be multiples of tick_spacing={self.tick_spacing}")
+        if np.any(lower < self.min_tick) or np.any(upper > self.max_tick):
+            raise ValueError("tick outside the usable range")
+
+        ticks = np.concatenate([self.ticks, lower, upper])
+        net = np.concatenate([self.liquidity_net, liquidity, -liquidity])
+        self.ticks, inverse = np.unique(ticks, return_inverse=True)
+        self.liquidity_net = np.bincount(inverse, weights=net, minlength=len(self.ticks))
+        # Ticks whose net cancelled out stay initialized, as on-chain, so the
+        # bitmap only gains the new positions' ticks
+        self.bitmap.set_ticks(np.concatenate([lower, upper]))
+
+        in_range = (lower <= self.tick) & (self.tick < upper)
+        self.liquidity += float(liquidity[in_range].sum())
+
+    def add_position(self, lower_tick: int, upper_tick: int, liquidity: float):
+        self.add_positions([lower_tick], [upper_tick], [liquidity])
+
+    def add_range_by_value(self, value: float, lower_price: float, upper_price: float) -> float:
+        """Deposit value (in token1) into [lower_price, upper_price]; returns the liquidity."""
+        lower_price = max(lower_price, float(tick_to_price(self.min_tick)))
+        upper_price = min(upper_price, float(tick_to_price(self.max_tick - self.tick_spacing)))
+        lower = max(int(align_tick(price_to_tick(lower_price), self.tick_spacing)), self.min_tick)
+        upper = min(int(align_tick(price_to_tick(upper_price), self.tick_spacing)) + self.tick_spacing,
+                    self.max_tick)
+        liquidity = float(liquidity_for_value(value, self.price, tick_to_price(lower), tick_to_price(upper)))
+        self.add_position(lower, upper, liquidity)
+        return liquidity
+
+    # -- queries -----------------------------------------------------------
+
+    def liquidity_at(self, prices) -> np.ndarray:
+        """Active liquidity at each price (vectorized over the tick index)."""
+        ticks = price_to_tick(prices)
+        cumulative = np.concatenate([[0.0], np.cumsum(self.liquidity_net)])
+        return cumulative[np.searchsorted(self.ticks, ticks, side='right')]
+
+    def next_initialized_tick(self, tick: int, lte: bool) -> Optional[int]:
+        """Next initialized tick at or below (lte) / strictly above tick, or None."""
+        found, initialized = self.bitmap.next_within_one_word(tick, lte)
+        if initialized:
+            return found
+        if lte:
+            index = np.searchsorted(self.ticks, tick, side='right') - 1
+            return int(self.ticks[index]) if index >= 0 else None
+        index = np.searchsorted(self.ticks, tick, side='right')
+        return int(self.ticks[index]) if index < len(self.ticks) else None
+
+    def _net_at(self, tick: int) -> float:
+        return float(self.liquidity_net[np.searchsorted(self.ticks, tick)])
+
+    # -- swaps -------------------------------------------------------------
+
+    def swap(self, amount_in: float, zero_for_one: bool,
+             price_limit: Optional[float] = None) -> SwapResult:
+        """Exact-input swap; token0 in if zero_for_one, else token1 in.
+
+        Stops early at price_limit or when liquidity runs out.
+        """
+        remaining = float(amount_in)
+        amount_out = fee_paid = 0.0
+        crossed = 0
+        fee = self.fee
+        if price_limit is None:
+            limit_tick = self.min_tick if zero_for_one else self.max_tick
+            sqrt_limit = float(tick_to_sqrt_price(limit_tick))
+        else:
+            sqrt_limit = math.sqrt(price_limit)
+
+        while remaining > 0 and (self.sqrt_price > sqrt_limit if zero_for_one else self.sqrt_price < sqrt_limit):
+            next_tick = self.next_initialized_tick(self.tick, lte=zero_for_one)
+            if next_tick is None:
+                sqrt_target = sqrt_limit
+            else:
+                sqrt_next = float(tick_to_sqrt_price(next_tick))
+                sqrt_target = max(sqrt_next, sqrt_limit) if zero_for_one else min(sqrt_next, sqrt_limit)
+
+            L = self.liquidity
+            sp = self.sqrt_price
+            available = remaining * (1 - fee)
+            if L <= 0:
+                step_in = step_out = 0.0
+                reached = True
+            elif zero_for_one:
+                needed = L * (1 / sqrt_target - 1 / sp)
+                reached = available >= needed
+                new_sp = sqrt_target if reached else L * sp / (L + available * sp)
+                step_in = needed if reached else available
+                step_out = L * (sp - new_sp)
+            else:
+                needed = L * (sqrt_target - sp)
+                reached = available >= needed
+                new_sp = sqrt_target if reached else sp + available / L
+                step_in = needed if reached else available
+                step_out = L * (1 / sp - 1 / new_sp)
+
+            step_fee = step_in * fee / (1 - fee) if reached else remaining - step_in
+            remaining -= step_in + step_fee
+            fee_paid += step_fee
+            amount_out += step_out
+
+            if not reached:
+                self.sqrt_price = new_sp
+                self.tick = int(price_to_tick(new_sp ** 2))
+                break
+
+            self.sqrt_price = sqrt_target
+            if next_tick is not None and sqrt_target == sqrt_next:
+                # Cross the tick: liquidity_net applies left-to-right
+                net = self._net_at(next_tick)
+                self.liquidity += -net if zero_for_one else net
+                self.tick = next_tick - 1 if zero_for_one else next_tick
+                crossed += 1
+            else:
+                self.tick = int(price_to_tick(sqrt_target ** 2))
+                break
+
+        return SwapResult(amount_in - max(remaining, 0.0), amount_out, fee_paid, self.price, crossed)
@@ -0,0 +1,393 @@
+"""
+Ethereum Fee Market
+EIP-1559 base fee and EIP-4844 blob base fee over long block streams.
+
+Both update rules are applied exactly as specified, in integer wei:
+- EIP-1559: the base fee moves by base_fee * (gas_used - target) / target / 8
+  with floor division, at least +1 wei when the block is above target
+- EIP-4844: excess blob gas accumulates max(0, excess + used - target) and
+  the blob base fee is fake_exponential(1, excess, update_fraction)
+
+Demand is a DemandProcess: a mean-reverting log-AR(1) level with a daily
+cycle and occasional spikes, times independent per-block noise, scaled so
+that its long-run mean is exactly `mean`. Generated gas usage reacts to the
+current fee with a constant price elasticity, so the fee settles where
+demand meets the 50% target.
+
+Blocks are streamed in chunks: demand is generated with NumPy a chunk at a
+time, the fee recurrence runs over plain Python integers (about 1 us per
+block), and every fee lands in a FeeHistogram. Percentiles therefore come
+from log-spaced bins without keeping the blocks; only every record_every-th
+fee is stored for plotting. Without fee feedback (elasticity=0), excess blob
+gas is a reflected random walk and is computed fully vectorized (Lindley
+recursion: cumsum minus its running minimum), fees included. Such a walk
+only has a steady state when mean demand is below the blob target: at
+mean >= 1 nothing pulls the excess back and the fee grows without bound, and
+even below it a demand spike that fills blocks to max_blobs for a few hours
+raises the fee by dozens of orders of magnitude. Rollups in fact stop
+posting when blobs get expensive, so realistic runs set an elasticity.
+
+Usage:
+    result = simulate_base_fee(2 * BLOCKS_PER_YEAR, DemandProcess(seed=1))
+    result.histogram.percentile([50, 90, 99])      # gwei
+    blobs = simulate_blob_fee(BLOCKS_PER_YEAR, DemandProcess(mean=0.6, seed=2), schedule=DENCUN,
+                              reference_fee=10 ** 8, elasticity=1.0)
+    blobs.histogram.percentile([50, 99])           # 1 wei, about 2e8 wei per blob gas
+"""
+
+import math
+from functools import lru_cache
+from typing import Optional
+
+import numpy as np
+
+GWEI = 10 ** 9
+BLOCK_TIME = 12
+BLOCKS_PER_DAY = 24 * 3600 // BLOCK_TIME
+BLOCKS_PER_YEAR = 365 * BLOCKS_PER_DAY
+
+# EIP-1559
+GAS_LIMIT = 30_000_000
+ELASTICITY_MULTIPLIER = 2
+BASE_FEE_MAX_CHANGE_DENOMINATOR = 8
+
+# EIP-4844
+GAS_PER_BLOB = 2 ** 17
+MIN_BLOB_BASE_FEE = 1
+EXACT_FEE_LIMIT = 2 ** 53
+
+
+class BlobSchedule:
+    """Blob target, maximum and fee update fraction of one fork."""
+    def __init__(self, name: str, target_blobs: int, max_blobs: int, update_fraction: int):
+        self.name = name
+        self.target_blobs = target_blobs
+        self.max_blobs = max_blobs
+        self.update_fraction = update_fraction
+
+    @property
+    def target_blob_gas(self) -> int:
+        return self.target_blobs * GAS_PER_BLOB
+
+    def __repr__(self):
+        return f"BlobSchedule({self.name}, target={self.target_blobs}, max={self.max_blobs})"
+
+
+DENCUN = BlobSchedule('Dencun', 3, 6, 3_338_477)
+PECTRA = BlobSchedule('Pectra', 6, 9, 5_007_716)
+
+
+def next_base_fee(base_fee, gas_used, gas_limit=GAS_LIMIT):
+    """Exact EIP-1559 base fee of the next block (vectorized over int arrays).
+
+    base_fee * delta // target is evaluated as (q * delta + r * delta // target)
+    with q, r = divmod(base_fee, target), which stays within int64.
+    """
+    base_fee = np.asarray(base_fee, dtype=np.int64)
+    gas_used = np.asarray(gas_used, dtype=np.int64)
+    target = gas_limit // ELASTICITY_MULTIPLIER
+    delta = np.abs(gas_used - target)
+    q, r = np.divmod(base_fee, target)
+    change = (q * delta + r * delta // target) // BASE_FEE_MAX_CHANGE_DENOMINATOR
+    up = base_fee + np.maximum(change, 1)
+    down = base_fee - change
+    return np.where(gas_used > target, up, np.where(gas_used < target, down, base_fee))
+
+
+def base_fee_path(gas_used, initial_base_fee: int, gas_limit: int = GAS_LIMIT) -> np.ndarray:
+    """Exact base fee before each block and after the last, for given usage."""
+    target = gas_limit // ELASTICITY_MULTIPLIER
+    base = int(initial_base_fee)
+    path = [base]
+    for used in np.asarray(gas_used, dtype=np.int64).tolist():
+        if used > target:
+            change = base * (used - target) // target // BASE_FEE_MAX_CHANGE_DENOMINATOR
+            base += change if change > 1 else 1
+        elif used < target:
+            base -= base * (target - used) // target // BASE_FEE_MAX_CHANGE_DENOMINATOR
+        path.append(base)
+    return np.array(path, dtype=np.int64)
+
+
+def fake_exponential(factor: int, numerator: int, denominator: int) -> int:
+    """factor * e ** (numerator / denominator) in integers, as in EIP-4844."""
+    i = 1
+    output = 0
+    numerator_accum = factor * denominator
+    while numerator_accum > 0:
+        output += numerator_accum
+        numerator_accum = (numerator_accum * numerator) // (denominator * i)
+        i += 1
+    return output // denominator
+
+
+@lru_cache(maxsize=None)
+def _blob_fee_table(update_fraction: int) -> np.ndarray:
+    """fake_exponential at excess 0, GAS_PER_BLOB, 2 * GAS_PER_BLOB, ... while below 2 ** 53."""
+    fees = []
+    excess = 0
+    while True:
+        fee = fake_exponential(MIN_BLOB_BASE_FEE, excess, update_fraction)
+        if fee >= EXACT_FEE_LIMIT:
+            break
+        fees.append(fee)
+        excess += GAS_PER_BLOB
+    table = np.array(fees, dtype=float)
+    table.setflags(write=False)
+    return table
+
+
+def blob_base_fee(excess_blob_gas, schedule: BlobSchedule = DENCUN) -> np.ndarray:
+    """Blob base fee (wei per blob gas) for each excess value, as float64.
+
+    Equal to fake_exponential wherever that is below 2 ** 53 (float64 holds
+    every integer there); above it, the float exponential it approximates.
+    Excess blob gas moves in whole blobs, so starting from a multiple of
+    GAS_PER_BLOB it stays on that grid, and those fees come from a cached
+    table of about a thousand entries. Only off-grid values are computed one
+    at a time.
+    """
+    excess = np.asarray(excess_blob_gas, dtype=np.int64)
+    table = _blob_fee_table(schedule.update_fraction)
+    slot, offset = np.divmod(excess, GAS_PER_BLOB)
+    on_grid = (offset == 0) & (slot < len(table))
+    with np.errstate(over='ignore'):
+        fees = MIN_BLOB_BASE_FEE * np.exp(excess / schedule.update_fraction)
+    fees[on_grid] = table[slot[on_grid]]
+    rest = ~on_grid & (fees < EXACT_FEE_LIMIT)
+    if rest.any():
+        values, inverse = np.unique(excess[rest], return_inverse=True)
+        exact = [fake_exponential(MIN_BLOB_BASE_FEE, v, schedule.update_fraction) for v in values.tolist()]
+        fees[rest] = np.array(exact, dtype=float)[inverse.ravel()]
+    return fees
+
+
+def excess_blob_gas_path(blob_gas_used, schedule: BlobSchedule = DENCUN, initial: int = 0):
+    """Excess blob gas after each block for exogenous usage (vectorized).
+
+    excess_n = max(0, excess_{n-1} + used_n - target) is a random walk
+    reflected at zero: its value is the walk minus its running minimum.
+    """
+    steps = np.asarray(blob_gas_used, dtype=np.int64) - schedule.target_blob_gas
+    walk = initial + np.cumsum(steps)
+    return walk - np.minimum(np.minimum.accumulate(walk), 0)
+
+
+class FeeHistogram:
+    """Streaming log-binned histogram with exact count, mean, min and max."""
+    def __init__(self, low: float, high: float, bins_per_decade: int = 200):
+        decades = math.log10(high) - math.log10(low)
+        self.edges = np.logspace(math.log10(low), math.log10(high), int(decades * bins_per_decade) + 1)
+        self.counts = np.zeros(len(self.edges) - 1, dtype=np.int64)
+        self._log_low = math.log10(low)
+        self._bins_per_decade = bins_per_decade
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, values):
+        values = np.asarray(values, dtype=float).ravel()
+        if values.size == 0:
+            return
+        with np.errstate(divide='ignore', over='ignore'):
+            index = np.floor((np.log10(values) - self._log_low) * self._bins_per_decade)
+            self.total += float(values.sum())
+        index = np.clip(np.nan_to_num(index, neginf=0), 0, len(self.counts) - 1).astype(np.int64)
+        self.counts += np.bincount(index, minlength=len(self.counts))
+        self.count += values.size
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else math.nan
+
+    @property
+    def centers(self) -> np.ndarray:
+        return np.sqrt(self.edges[:-1] * self.edges[1:])
+
+    def percentile(self, q):
+        """Approximate percentiles (bin centers, within one bin width)."""
+        cumulative = np.cumsum(self.counts)
+        ranks = np.asarray(q, dtype=float) / 100 * (self.count - 1)
+        index = np.searchsorted(cumulative, ranks, side='right')
+        return np.clip(self.centers[np.minimum(index, len(self.counts) - 1)], self.min, self.max)
+
+    def __repr__(self):
+        return f"FeeHistogram({self.count} values, mean={self.mean:.4g})"
+
+
+class DemandProcess:
+    """Demand multiplier per block (1.0 = exactly the target at the reference fee).
+
+    log level follows an AR(1) with the given half-life and stationary
+    volatility, plus a daily cycle and exponential-size spikes; each block
+    then gets independent lognormal noise. The output is divided by the
+    long-run mean of the exponentiated level and cycle, so it averages
+    `mean`. Spikes are Exponential(spike_size) jumps in log demand, which
+    have a finite mean only for spike_size < 1.
+    """
+    def __init__(self, mean: float = 1.0, volatility: float = 0.3, half_life: float = 6 * 3600 / BLOCK_TIME,
+                 daily_amplitude: float = 0.15, spike_rate: float = 1 / BLOCKS_PER_DAY,
+                 spike_size: float = 0.5, block_noise: float = 0.35, seed: Optional[int] = None):
+        if not 0 <= spike_size < 1:
+            raise ValueError("spike_size must be in [0, 1) for demand to have a finite mean")
+        self.mean = mean
+        self.volatility = volatility
+        self.half_life = half_life
+        self.daily_amplitude = daily_amplitude
+        self.spike_rate = spike_rate
+        self.spike_size = spike_size
+        self.block_noise = block_noise
+        self.rng = np.random.default_rng(seed)
+        a = 0.5 ** (1 / half_life)
+        # Start at the long-run mean level (the spikes' share of it)
+        self.level = spike_rate * spike_size / (1 - a)
+        self.block = 0
+        self._log_scale = self._log_mean_factor(a)
+
+    def _log_mean_factor(self, a: float) -> float:
+        """log E[exp(level + cycle)] in the stationary state.
+
+        The Gaussian part contributes volatility^2 / 2, the daily cycle
+        log I0(amplitude) averaged over a day, and a spike k blocks back,
+        decayed to a^k J, contributes log(1 - p + p / (1 - a^k size)).
+        """
+        decay = a ** np.arange(int(math.log(1e-12) / math.log(a)) + 1)
+        spikes = np.log1p(self.spike_rate * decay * self.spike_size / (1 - decay * self.spike_size)).sum()
+        return self.volatility ** 2 / 2 + math.log(np.i0(self.daily_amplitude)) + float(spikes)
+
+    def sample(self, n: int, row: int = 256) -> np.ndarray:
+        """Next n demand multipliers; the process state carries over between calls."""
+        a = 0.5 ** (1 / self.half_life)
+        shocks = self.volatility * math.sqrt(1 - a * a) * self.rng.standard_normal(n)
+        spikes = self.rng.random(n) < self.spike_rate
+        shocks[spikes] += self.rng.exponential(self.spike_size, int(spikes.sum()))
+
+        # AR(1) x_k = a x_{k-1} + e_k, solved in closed form within rows of
+        # `row` blocks (a ** -row stays small) and carried across rows
+        level = np.empty(n)
+        powers = a ** np.arange(1, row + 1)
+        x = self.level
+        for start in range(0, n, row):
+            e = shocks[start:start + row]
+            p = powers[:len(e)]
+            level[start:start + len(e)] = p * (x + np.cumsum(e / p))
+            x = level[start + len(e) - 1]
+        self.level = x
+
+        blocks = self.block + np.arange(n)
+        self.block += n
+        cycle = self.daily_amplitude * np.sin(2 * np.pi * blocks / BLOCKS_PER_DAY)
+        noise = self.block_noise * self.rng.standard_normal(n) - 0.5 * self.block_noise ** 2
+        return self.mean * np.exp(level + cycle + noise - self._log_scale)
+
+
+class FeeMarketResult:
+    """Streaming summary of a simulated block range."""
+    def __init__(self, histogram: FeeHistogram, samples: np.ndarray, record_every: int,
+                 usage_mean: float, final_fee: int, blocks: int):
+        self.histogram = histogram        # every block's fee
+        self.samples = samples            # fee after every record_every-th block
+        self.record_every = record_every
+        self.usage_mean = usage_mean      # mean fraction of the block (or blob) limit used
+        self.final_fee = final_fee
+        self.blocks = blocks
+
+    def percentiles(self, q):
+        return self.histogram.percentile(q)
+
+    def __repr__(self):
+        return f"FeeMarketResult({self.blocks} blocks, {self.histogram})"
+
+
+def simulate_base_fee(n_blocks: int, demand: DemandProcess, initial_base_fee: int = 20 * GWEI,
+                      reference_fee: int = 20 * GWEI, elasticity: float = 1.0,
+                      gas_limit: int = GAS_LIMIT, record_every: int = BLOCKS_PER_DAY,
+                      chunk_size: int = 1 << 18) -> FeeMarketResult:
+    """Stream n_blocks through the EIP-1559 rule.
+
+    A block uses target * demand * (reference_fee / base_fee) ** elasticity
+    gas, capped at the gas limit. Fees are recorded in gwei.
+    """
+    target = gas_limit // ELASTICITY_MULTIPLIER
+    histogram = FeeHistogram(1e-3, 1e5)
+    samples = []
+    base = int(initial_base_fee)
+    used_total = 0
+
+    for start in range(0, n_blocks, chunk_size):
+        n = min(chunk_size, n_blocks - start)
+        wanted = (target * demand.sample(n)).tolist()
+        fees = []
+        record = fees.append
+        for want in wanted:
+            used = want * (reference_fee / base) ** elasticity if elasticity else want
+            used = gas_limit if used >= gas_limit else int(used)
+            used_total += used
+            if used > target:
+                change = base * (used - target) // target // BASE_FEE_MAX_CHANGE_DENOMINATOR
+                base += change if change > 1 else 1
+            elif used < target:
+                base -= base * (target - used) // target // BASE_FEE_MAX_CHANGE_DENOMINATOR
+            record(base)
+        fees = np.array(fees, dtype=float) / GWEI
+        histogram.add(fees)
+        samples.append(fees[(-start - 1) % record_every::record_every])
+
+    return FeeMarketResult(histogram, np.concatenate(samples), record_every,
+                           used_total / (n_blocks * gas_limit), base, n_blocks)
+
+
+def simulate_blob_fee(n_blocks: int, demand: DemandProcess, schedule: BlobSchedule = DENCUN,
+                      reference_fee: int = 10 ** 9, elasticity: float = 0.0,
+                      initial_excess: int = 0, record_every: int = BLOCKS_PER_DAY,
+                      chunk_size: int = 1 << 18) -> FeeMarketResult:
+    """Stream n_blocks through the EIP-4844 rule.
+
+    A block carries target_blobs * demand blobs (stochastically rounded,
+    capped at max_blobs). Rollups post regardless of price until the blob fee
+    exceeds reference_fee; above it demand falls off as (reference_fee /
+    blob_fee) ** elasticity. Fees are recorded in wei per blob gas.
+    """
+    histogram = FeeHistogram(1, 1e15)
+    samples = []
+    excess = int(initial_excess)
+    blobs_total = 0
+    fee_cache = {}
+    rng = demand.rng
+
+    for start in range(0, n_blocks, chunk_size):
+        n = min(chunk_size, n_blocks - start)
+        wanted = schedule.target_blobs * demand.sample(n)
+        jitter = rng.random(n)
+        if not elasticity:
+            blobs = np.minimum(np.floor(wanted + jitter), schedule.max_blobs).astype(np.int64)
+            after = excess_blob_gas_path(blobs * GAS_PER_BLOB, schedule, excess)
+            # A block's fee is set by the excess its parent left behind
+            fees = blob_base_fee(np.concatenate([[excess], after[:-1]]), schedule)
+            excess = int(after[-1])
+            blobs_total += int(blobs.sum())
+        else:
+            wanted, jitter = wanted.tolist(), jitter.tolist()
+            fees = [0] * n
+            max_blobs, target_gas, fraction = schedule.max_blobs, schedule.target_blob_gas, schedule.update_fraction
+            for i in range(n):
+                fee = fee_cache.get(excess)
+                if fee is None:
+                    fee = fee_cache[excess] = fake_exponential(MIN_BLOB_BASE_FEE, excess, fraction)
+                fees[i] = fee
+                scale = (reference_fee / fee) ** elasticity if fee > reference_fee else 1.0
+                blobs = int(wanted[i] * scale + jitter[i])
+                blobs = max_blobs if blobs > max_blobs else blobs
+                blobs_total += blobs
+                excess += blobs * GAS_PER_BLOB - target_gas
+                excess = excess if excess > 0 else 0
+            fees = np.array(fees, dtype=float)
+        histogram.add(fees)
+        samples.append(fees[(-start - 1) % record_every::record_every])
+
+    final_fee = fake_exponential(MIN_BLOB_BASE_FEE, excess, schedule.update_fraction)
+    return FeeMarketResult(histogram, np.concatenate(samples), record_every,
+                           blobs_total / (n_blocks * schedule.max_blobs), final_fee, n_blocks)
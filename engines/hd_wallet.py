@@ -0,0 +1,221 @@
+"""
+HD Wallets
+BIP32 hierarchical deterministic key derivation along BIP44 paths, with
+cached path prefixes and batch address generation.
+
+A seed (from a BIP39 mnemonic) gives the master extended key: a private key
+and a 32-byte chain code. Each child is HMAC-SHA512(chain code, parent key
+|| index): hardened indices (i >= 2^31, written i') hash the private key,
+normal ones the public key, so normal children can also be derived from the
+extended public key alone (a watch-only wallet).
+
+Deriving m/44'/0'/0'/0/i from scratch costs five HMACs and five scalar
+multiplications. HDWallet memoizes extended keys in an LRU cache keyed by
+path, and a path is derived from the cached key of its parent prefix, so
+walking an address range derives m/44'/0'/0'/0 once and then one step per
+index. addresses() goes further for ranges: the child private keys of one
+parent are HMAC'd in a loop and their public keys converted to affine in a
+single batch inversion (engines.secp256k1); from an xpub each child point
+is IL * G + K, batched the same way.
+
+Usage:
+    wallet = HDWallet.from_mnemonic('abandon ' * 11 + 'about')
+    wallet.address("m/44'/0'/0'/0/0")             # 1LqBGSKuX5yYUonjxT5qGfpUsXKYYWeabA
+    wallet.addresses("m/44'/0'/0'/0", 0, 1000)
+    wallet.cache_info()
+"""
+
+import hashlib
+import hmac
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+from engines.secp256k1 import (N, base58check, encode_public_key, hash160, multiply_base_add_batch,
+                               p2pkh_address, public_key, public_key_batch)
+
+HARDENED = 1 << 31
+XPRV_VERSION = bytes.fromhex('0488ade4')
+XPUB_VERSION = bytes.fromhex('0488b21e')
+
+Path = Tuple[int, ...]
+
+
+def seed_from_mnemonic(mnemonic: str, passphrase: str = '') -> bytes:
+    """BIP39 seed: PBKDF2-HMAC-SHA512 of the words, 2048 rounds (no wordlist check)."""
+    words = ' '.join(mnemonic.split())
+    return hashlib.pbkdf2_hmac('sha512', words.encode(), ('mnemonic' + passphrase).encode(), 2048)
+
+
+def parse_path(path) -> Path:
+    """Indices of a path such as m/44'/0'/0'/0/5 (' or h marks a hardened index)."""
+    if isinstance(path, tuple):
+        return path
+    parts = path.strip().split('/')
+    if parts[0] != 'm':
+        raise ValueError("path must start with m")
+    indices = []
+    for part in parts[1:]:
+        hardened = part.endswith(("'", 'h', 'H'))
+        index = int(part[:-1] if hardened else part)
+        if not 0 <= index < HARDENED:
+            raise ValueError(f"index {part} out of range")
+        indices.append(index + HARDENED if hardened else index)
+    return tuple(indices)
+
+
+def format_path(path: Path) -> str:
+    return '/'.join(['m'] + [f"{i - HARDENED}'" if i >= HARDENED else str(i) for i in path])
+
+
+class ExtendedKey:
+    """BIP32 extended key: private (or public only) key, chain code and position."""
+    def __init__(self, chain_code, private_key=None, public_key=None, depth=0, parent_fingerprint=bytes(4),
+                 index=0):
+        if private_key is None and public_key is None:
+            raise ValueError("need a private or a public key")
+        self.chain_code = chain_code                  # 32 bytes
+        self.private_key = private_key                # int, None for public-only keys
+        self._public_key = public_key                 # affine point, computed on demand
+        self.depth = depth
+        self.parent_fingerprint = parent_fingerprint  # first 4 bytes of the parent's hash160
+        self.index = index
+
+    @classmethod
+    def from_seed(cls, seed: bytes) -> 'ExtendedKey':
+        digest = hmac.new(b'Bitcoin seed', seed, hashlib.sha512).digest()
+        key = int.from_bytes(digest[:32], 'big')
+        if not 0 < key < N:
+            raise ValueError("seed gives an invalid master key")
+        return cls(digest[32:], private_key=key)
+
+    @property
+    def public_key(self):
+        if self._public_key is None:
+            self._public_key = public_key(self.private_key)
+        return self._public_key
+
+    @property
+    def public_bytes(self) -> bytes:
+        return encode_public_key(self.public_key)
+
+    @property
+    def fingerprint(self) -> bytes:
+        return hash160(self.public_bytes)[:4]
+
+    def _tweak(self, index: int) -> Tuple[int, bytes]:
+        """(IL, child chain code) for child index."""
+        if index >= HARDENED:
+            if self.private_key is None:
+                raise ValueError("hardened children need the private key")
+            data = b'\x00' + self.private_key.to_bytes(32, 'big')
+        else:
+            data = self.public_bytes
+        digest = hmac.new(self.chain_code, data + index.to_bytes(4, 'big'), hashlib.sha512).digest()
+        tweak = int.from_bytes(digest[:32], 'big')
+        if tweak >= N:
+            raise ValueError(f"index {index} gives an invalid key; use the next index")
+        return tweak, digest[32:]
+
+    def child(self, index: int) -> 'ExtendedKey':
+        tweak, chain_code = self._tweak(index)
+        if self.private_key is None:
+            point, = multiply_base_add_batch([tweak], self.public_key)
+            if point is None:
+                raise ValueError(f"index {index} gives an invalid key; use the next index")
+            return ExtendedKey(chain_code, public_key=point, depth=self.depth + 1,
+                               parent_fingerprint=self.fingerprint, index=index)
+        key = (tweak + self.private_key) % N
+        if key == 0:
+            raise ValueError(f"index {index} gives an invalid key; use the next index")
+        return ExtendedKey(chain_code, private_key=key, depth=self.depth + 1,
+                           parent_fingerprint=self.fingerprint, index=index)
+
+    def derive(self, path) -> 'ExtendedKey':
+        key = self
+        for index in parse_path(path):
+            key = key.child(index)
+        return key
+
+    def neuter(self) -> 'ExtendedKey':
+        """The extended public key (xpub) of this key."""
+        return ExtendedKey(self.chain_code, public_key=self.public_key, depth=self.depth,
+                           parent_fingerprint=self.parent_fingerprint, index=self.index)
+
+    def children(self, start: int, count: int) -> List['ExtendedKey']:
+        """Normal children start .. start + count - 1, public keys computed in one batch."""
+        if start < 0 or start + count > HARDENED:
+            raise ValueError("batch derivation is for normal (non-hardened) indices")
+        tweaks, chain_codes = zip(*[self._tweak(index) for index in range(start, start + count)])
+        if self.private_key is None:
+            points = multiply_base_add_batch(tweaks, self.public_key)
+            keys = [None] * count
+        else:
+            keys = [(tweak + self.private_key) % N for tweak in tweaks]
+            points = public_key_batch(keys)
+        fingerprint = self.fingerprint
+        return [ExtendedKey(chain_code, private_key=key, public_key=point, depth=self.depth + 1,
+                            parent_fingerprint=fingerprint, index=start + i)
+                for i, (chain_code, key, point) in enumerate(zip(chain_codes, keys, points))]
+
+    def serialize(self, private: Optional[bool] = None) -> str:
+        """xprv / xpub string (mainnet versions)."""
+        private = self.private_key is not None if private is None else private
+        if private and self.private_key is None:
+            raise ValueError("public-only key has no xprv")
+        key_data = b'\x00' + self.private_key.to_bytes(32, 'big') if private else self.public_bytes
+        return base58check((XPRV_VERSION if private else XPUB_VERSION) + bytes([self.depth]) +
+                           self.parent_fingerprint + self.index.to_bytes(4, 'big') + self.chain_code + key_data)
+
+    def address(self) -> str:
+        return p2pkh_address(self.public_key)
+
+    def __repr__(self):
+        kind = 'private' if self.private_key is not None else 'public'
+        return f"ExtendedKey({kind}, depth={self.depth}, fingerprint={self.fingerprint.hex()})"
+
+
+class HDWallet:
+    """Master key plus an LRU cache of derived extended keys keyed by path.
+
+    derive(path) looks the path up, and on a miss derives it as one child
+    step from its parent prefix, which is itself looked up the same way.
+    """
+    def __init__(self, seed: bytes, cache_size: int = 1024):
+        self.master = ExtendedKey.from_seed(seed)
+        self._cached = lru_cache(maxsize=cache_size)(self._derive)
+
+    @classmethod
+    def from_mnemonic(cls, mnemonic: str, passphrase: str = '', cache_size: int = 1024) -> 'HDWallet':
+        return cls(seed_from_mnemonic(mnemonic, passphrase), cache_size)
+
+    def _derive(self, path: Path) -> ExtendedKey:
+        if not path:
+            return self.master
+        return self._cached(path[:-1]).child(path[-1])
+
+    def derive(self, path) -> ExtendedKey:
+        return self._cached(parse_path(path))
+
+    def address(self, path) -> str:
+        return self.derive(path).address()
+
+    def addresses(self, parent_path, start: int = 0, count: int = 20) -> List[str]:
+        """P2PKH addresses of parent_path/start .. parent_path/start+count-1."""
+        return [child.address() for child in self.derive(parent_path).children(start, count)]
+
+    def cache_info(self):
+        return self._cached.cache_info()
+
+    def cache_clear(self):
+        self._cached.cache_clear()
+
+    def __repr__(self):
+        info = self.cache_info()
+        return f"HDWallet(master {self.master.fingerprint.hex()}, {info.currsize} cached keys)"
+
+
+def bip44_path(coin: int = 0, account: int = 0, change: int = 0, index: Optional[int] = None) -> Path:
+    """m/44'/coin'/account'/change[/index]."""
+    path = (44 + HARDENED, coin + HARDENED, account + HARDENED, change)
+    return path if index is None else path + (index,)
+
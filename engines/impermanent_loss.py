@@ -0,0 +1,173 @@
+"""
+Impermanent Loss Monte Carlo
+LP-versus-HODL outcomes over simulated price paths, full-range and
+concentrated.
+
+Prices are simulated as a ratio to the deposit price (p0 = 1) with either
+geometric Brownian motion or Merton jump-diffusion. A position over
+[lower, upper] (as ratios to p0; 0 and inf give a full-range v2 position)
+is compared with holding the tokens it was opened with:
+
+    il = LP value / HODL value - 1          (closed form, terminal price only)
+    fees = swap fees earned / initial value  (path dependent)
+    pnl = (LP value + fees) / HODL value - 1
+
+Fees come from two sources, both paid only while the price is in range:
+- arbitrage: each step the pool is re-priced to the new market price and
+  the arbitrageur pays the fee on the input it swaps in
+- noise volume: uninformed flow, given as annual volume per unit of
+  full-range-equivalent active liquidity (turnover)
+
+Paths are generated in blocks of chunk_paths x chunk_steps and reduced to
+per-path running totals, so memory stays bounded by one block no matter how
+many paths or steps are requested: 10^6 x 10^4 peaks at about 200 MB with
+the defaults. Only the per-path results, a few floats per path and position,
+are kept.
+
+Usage:
+    result = simulate_lp(100_000, 365, horizon=1.0, sigma=0.8,
+                         ranges=[(0, np.inf), (0.5, 1.5)], fee=0.003)
+    result.il[1]                  # IL of the +/-50% position on every path
+    result.percentiles([5, 50, 95])
+"""
+
+from typing import Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+
+from engines.clmm import range_value
+
+DEFAULT_FEE = 0.003
+FULL_RANGE = (0.0, np.inf)
+
+
+def impermanent_loss(price_ratio):
+    """Full-range IL: 2 sqrt(r) / (1 + r) - 1."""
+    r = np.asarray(price_ratio, dtype=float)
+    return 2 * np.sqrt(r) / (1 + r) - 1
+
+
+def _deposit(lower, upper):
+    """Token amounts per unit liquidity when opening [lower, upper] at p0 = 1."""
+    sa, sb = np.sqrt(lower), np.sqrt(upper)
+    sp = np.clip(1.0, sa, sb)
+    return 1 / sp - 1 / sb, sp - sa
+
+
+def range_impermanent_loss(price_ratio, lower=0.0, upper=np.inf):
+    """IL of a position over [lower, upper] (ratios to the deposit price)."""
+    r = np.asarray(price_ratio, dtype=float)
+    amount0, amount1 = _deposit(lower, upper)
+    with np.errstate(invalid='ignore'):
+        hodl = amount0 * r + amount1
+        return range_value(1.0, r, lower, upper) / hodl - 1
+
+
+def gbm_increments(rng: np.random.Generator, shape, dt: float, mu: float, sigma: float) -> np.ndarray:
+    """Log-price increments of geometric Brownian motion."""
+    return (mu - 0.5 * sigma ** 2) * dt + sigma * np.sqrt(dt) * rng.standard_normal(shape)
+
+
+def jump_diffusion_increments(rng: np.random.Generator, shape, dt: float, mu: float, sigma: float,
+                              jump_rate: float, jump_mean: float, jump_std: float) -> np.ndarray:
+    """Log-price increments of Merton jump-diffusion (lognormal jump sizes).
+
+    The drift is compensated so E[S_t] = S_0 exp(mu t), as for GBM.
+    """
+    compensator = jump_rate * (np.exp(jump_mean + 0.5 * jump_std ** 2) - 1)
+    jumps = rng.poisson(jump_rate * dt, shape)
+    jump_size = jumps * jump_mean + np.sqrt(jumps) * jump_std * rng.standard_normal(shape)
+    return gbm_increments(rng, shape, dt, mu - compensator, sigma) + jump_size
+
+
+class LPResult:
+    """Per-path outcomes, shape (positions, paths)."""
+    def __init__(self, ranges, price_ratio, il, fees, in_range):
+        self.ranges = ranges
+        self.price_ratio = price_ratio  # terminal price / deposit price, shape (paths,)
+        self.il = il                    # LP / HODL - 1 at the terminal price
+        self.fees = fees                # fees earned / initial position value
+        self.in_range = in_range        # fraction of steps spent in range
+
+    @property
+    def pnl(self):
+        """LP value plus fees relative to HODL."""
+        # fees are relative to the initial value, il to the terminal HODL value
+        hodl_growth = []
+        for lower, upper in self.ranges:
+            amount0, amount1 = _deposit(lower, upper)
+            hodl_growth.append((amount0 * self.price_ratio + amount1) / (amount0 + amount1))
+        return self.il + self.fees / np.array(hodl_growth)
+
+    def percentiles(self, q: Sequence[float], field: str = 'il') -> np.ndarray:
+        """Percentiles of il/fees/pnl per position, shape (positions, len(q))."""
+        return np.percentile(getattr(self, field), q, axis=1).T
+
+    def __repr__(self):
+        return f"LPResult({len(self.ranges)} positions, {self.price_ratio.shape[0]} paths)"
+
+
+def simulate_lp(n_paths: int, n_steps: int, horizon: float = 1.0, mu: float = 0.0,
+                sigma: float = 0.8, ranges: Iterable[Tuple[float, float]] = (FULL_RANGE,),
+                fee: float = DEFAULT_FEE, volume: float = 0.0,
+                jump_rate: float = 0.0, jump_mean: float = 0.0, jump_std: float = 0.0,
+                chunk_paths: int = 2_000, chunk_steps: int = 1_000,
+                seed: Optional[int] = None) -> LPResult:
+    """Simulate n_paths price paths and evaluate every position on each.
+
+    horizon is in years, sigma and mu are annualized. With jump_rate > 0
+    paths follow Merton jump-diffusion, otherwise GBM.
+    """
+    ranges = [(float(lo), float(hi)) for lo, hi in ranges]
+    rng = np.random.default_rng(seed)
+    dt = horizon / n_steps
+
+    sqrt_bounds = np.sqrt(np.array(ranges))              # (positions, 2)
+    sa, sb = sqrt_bounds[:, :1], sqrt_bounds[:, 1:]      # (positions, 1) for broadcasting
+    initial_value = range_value(1.0, 1.0, np.array(ranges)[:, 0], np.array(ranges)[:, 1])[:, None]
+
+    terminal = np.empty(n_paths)
+    fees = np.empty((len(ranges), n_paths))
+    in_range = np.empty((len(ranges), n_paths))
+
+    for start in range(0, n_paths, chunk_paths):
+        stop = min(start + chunk_paths, n_paths)
+        m = stop - start
+        log_price = np.zeros(m)
+        fee_total = np.zeros((len(ranges), m))
+        steps_in_range = np.zeros((len(ranges), m))
+
+        for step in range(0, n_steps, chunk_steps):
+            k = min(chunk_steps, n_steps - step)
+            if jump_rate > 0:
+                increments = jump_diffusion_increments(rng, (m, k), dt, mu, sigma,
+                                                       jump_rate, jump_mean, jump_std)
+            else:
+                increments = gbm_increments(rng, (m, k), dt, mu, sigma)
+            log_path = np.cumsum(increments, axis=1)
+            log_path += log_price[:, None]
+            previous = np.concatenate([log_price[:, None], log_path[:, :-1]], axis=1)
+            log_price = log_path[:, -1].copy()
+
+            sqrt_now = np.exp(0.5 * log_path)
+            sqrt_before = np.exp(0.5 * previous)
+            del log_path, previous
+            for i in range(len(ranges)):
+                # Pool sqrt price follows the market but stays inside the range
+                c_now = np.clip(sqrt_now, sa[i], sb[i])
+                c_before = np.clip(sqrt_before, sa[i], sb[i])
+                # Price up: token1 paid in; price down: token0 paid in, valued at the new price
+                arb_in = np.where(c_now >= c_before, c_now - c_before,
+                                  (1 / c_now - 1 / c_before) * sqrt_now ** 2)
+                active = (sqrt_now > sa[i]) & (sqrt_now < sb[i])
+                fee_total[i] += fee * arb_in.sum(axis=1)
+                if volume:
+                    fee_total[i] += fee * volume * dt * (2 * sqrt_now * active).sum(axis=1)
+                steps_in_range[i] += active.sum(axis=1)
+
+        terminal[start:stop] = np.exp(log_price)
+        fees[:, start:stop] = fee_total / initial_value
+        in_range[:, start:stop] = steps_in_range / n_steps
+
+    il = np.array([range_impermanent_loss(terminal, lo, hi) for lo, hi in ranges])
+    return LPResult(ranges, terminal, il, fees, in_range)
@@ -0,0 +1,131 @@
+"""
+Bitcoin Issuance
+Satoshi-exact block subsidy and supply schedule, queried by height or date.
+
+The subsidy is 50 BTC right-shifted once per 210,000 blocks, in integer
+satoshis exactly as in Bitcoin Core's GetBlockSubsidy, so it reaches zero in
+epoch 33 and total issuance is 20,999,999.9769 BTC, not 21M. The 34 epochs
+are tabulated once (subsidy and supply at the start of each epoch), after
+which supply at any height is a closed-form lookup:
+
+    supply(h) = epoch_start_supply[e] + (h - e * 210000) * subsidy[e],  e = h // 210000
+
+Dates map to heights through the actual timestamps of the genesis block and
+the four halvings so far, extrapolated at the 10-minute target beyond the
+last one. All queries are vectorized; the series the charts plot (supply at
+the start of each year, the halving table) are cached and read-only.
+
+Usage:
+    supply_at(840_000) / COIN                     # 19,687,500.0 BTC
+    yearly_supply(2009, 2140)                     # (years, satoshis)
+    height_at_date('2030-01-01')
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+COIN = 100_000_000
+INITIAL_SUBSIDY = 50 * COIN
+HALVING_INTERVAL = 210_000
+TARGET_SPACING = 600
+
+# Timestamps of the genesis block and the halvings so far (UTC)
+ANCHOR_HEIGHTS = np.array([0, 210_000, 420_000, 630_000, 840_000])
+ANCHOR_DATES = np.array(['2009-01-03T18:15:05', '2012-11-28T15:24:38', '2016-07-09T16:46:13',
+                         '2020-05-11T19:23:43', '2024-04-20T00:09:27'], dtype='datetime64[s]')
+_ANCHOR_SECONDS = ANCHOR_DATES.astype(np.int64)
+
+
+@lru_cache(maxsize=None)
+def epoch_table():
+    """(subsidy, start supply) per halving epoch in satoshis, until the subsidy is 0."""
+    subsidy = [INITIAL_SUBSIDY >> epoch for epoch in range(64) if INITIAL_SUBSIDY >> epoch]
+    subsidy = np.array(subsidy + [0], dtype=np.int64)
+    start_supply = np.concatenate([[0], np.cumsum(subsidy[:-1] * HALVING_INTERVAL)])
+    subsidy.setflags(write=False)
+    start_supply.setflags(write=False)
+    return subsidy, start_supply
+
+
+def _heights(height) -> np.ndarray:
+    height = np.asarray(height, dtype=np.int64)
+    if np.any(height < 0):
+        raise ValueError("height must be non-negative")
+    return height
+
+
+def block_subsidy(height):
+    """New coins in the coinbase of the block at height (satoshis)."""
+    subsidy, _ = epoch_table()
+    epoch = np.minimum(_heights(height) // HALVING_INTERVAL, len(subsidy) - 1)
+    return subsidy[epoch]
+
+
+def supply_at(height):
+    """Coins issued by blocks 0 .. height - 1, i.e. once height blocks exist (satoshis)."""
+    subsidy, start_supply = epoch_table()
+    height = _heights(height)
+    epoch = np.minimum(height // HALVING_INTERVAL, len(subsidy) - 1)
+    mined = np.minimum(height - epoch * HALVING_INTERVAL, HALVING_INTERVAL)
+    return start_supply[epoch] + mined * subsidy[epoch]
+
+
+MAX_SUPPLY = int(supply_at(len(epoch_table()[0]) * HALVING_INTERVAL))
+
+
+def annual_inflation(height, blocks_per_year: float = 365 * 24 * 3600 / TARGET_SPACING):
+    """New supply over the next year of blocks as a fraction of current supply."""
+    height = np.asarray(height, dtype=np.int64)
+    ahead = height + int(blocks_per_year)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (supply_at(ahead) - supply_at(height)) / supply_at(height)
+
+
+def height_at_date(date):
+    """Block height reached at date (datetime64 or ISO string), fractional."""
+    seconds = np.asarray(date, dtype='datetime64[s]').astype(np.int64)
+    projected = ANCHOR_HEIGHTS[-1] + (seconds - _ANCHOR_SECONDS[-1]) / TARGET_SPACING
+    return np.where(seconds > _ANCHOR_SECONDS[-1], projected,
+                    np.interp(seconds, _ANCHOR_SECONDS, ANCHOR_HEIGHTS))
+
+
+def date_at_height(height):
+    """Timestamp of the block at height (projected at 10 minutes after the last anchor)."""
+    height = np.asarray(height, dtype=float)
+    projected = _ANCHOR_SECONDS[-1] + (height - ANCHOR_HEIGHTS[-1]) * TARGET_SPACING
+    seconds = np.where(height > ANCHOR_HEIGHTS[-1], projected,
+                       np.interp(height, ANCHOR_HEIGHTS, _ANCHOR_SECONDS))
+    return np.round(seconds).astype(np.int64).astype('datetime64[s]')
+
+
+def decimal_year(date):
+    """Dates as fractional years (2024.3 for mid-April 2024)."""
+    date = np.asarray(date, dtype='datetime64[s]')
+    start = date.astype('datetime64[Y]')
+    length = (start + 1).astype('datetime64[s]') - start.astype('datetime64[s]')
+    return start.astype(np.int64) + 1970 + (date - start.astype('datetime64[s]')) / length
+
+
+@lru_cache(maxsize=None)
+def halving_table():
+    """Start height, date, subsidy and supply of every epoch with a subsidy."""
+    subsidy, start_supply = epoch_table()
+    heights = np.arange(len(subsidy) - 1, dtype=np.int64) * HALVING_INTERVAL
+    table = {'height': heights, 'date': date_at_height(heights), 'subsidy': subsidy[:-1],
+             'supply': start_supply[:-1]}
+    for column in table.values():
+        column.setflags(write=False)
+    return table
+
+
+@lru_cache(maxsize=None)
+def yearly_supply(first_year: int, last_year: int):
+    """(years, supply in satoshis) on January 1 of each year, inclusive."""
+    years = np.arange(first_year, last_year + 1)
+    dates = years.astype(str).astype('datetime64[Y]').astype('datetime64[s]')
+    tip = np.floor(height_at_date(dates)).astype(np.int64)
+    supply = supply_at(np.where(dates >= ANCHOR_DATES[0], tip + 1, 0))
+    years.setflags(write=False)
+    supply.setflags(write=False)
+    return years, supply
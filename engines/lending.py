@@ -0,0 +1,204 @@
+"""
+Lending Market
+Over-collateralized lending book (Aave/Compound-style) with vectorized
+health factors and liquidation cascades.
+
+Accounts are stored column-wise (structure of arrays): one NumPy array each
+for collateral (units of the collateral asset), debt (in the quote currency),
+loan-to-value, liquidation threshold and liquidation bonus. Every query is a
+single pass over the columns, so a book of 10^6 accounts reprices against a
+shock in a few milliseconds:
+
+    health factor    HF = collateral * price * liquidation_threshold / debt
+    liquidation at   price = debt / (collateral * liquidation_threshold)
+
+Liquidation follows Aave v3: a liquidator repays up to close_factor of the
+debt (all of it once HF < 0.95) and seizes collateral worth the repayment
+plus the bonus. Seized collateral is sold into a constant-product pool
+(engines.amm), which pushes the price down and can make further accounts
+liquidatable; run_cascade() repeats rounds until no account is below HF 1.
+
+Usage:
+    book = synthetic_book(1_000_000, price=2000, total_collateral=100_000, seed=1)
+    book.health_factor(1600)                  # every account after a -20% shock
+    result = run_cascade(book.copy(), 1600, market_depth=1e9)
+    result.final_price                        # ~1532: 11 rounds push it another 4% down
+"""
+
+from typing import Optional
+
+import numpy as np
+
+from engines.amm import get_amount_out
+
+CLOSE_FACTOR = 0.5
+FULL_CLOSE_HF = 0.95
+
+
+class LendingBook:
+    """Accounts of one collateral/debt market, one NumPy column per field."""
+    def __init__(self, collateral, debt, ltv=0.80, liquidation_threshold=0.825,
+                 liquidation_bonus=0.05):
+        self.collateral = np.array(collateral, dtype=float)
+        self.debt = np.array(debt, dtype=float)
+        n = self.collateral.shape
+        self.ltv = np.array(np.broadcast_to(ltv, n), dtype=float)
+        self.liquidation_threshold = np.array(np.broadcast_to(liquidation_threshold, n), dtype=float)
+        self.liquidation_bonus = np.array(np.broadcast_to(liquidation_bonus, n), dtype=float)
+
+    def __len__(self):
+        return len(self.collateral)
+
+    def copy(self) -> 'LendingBook':
+        return LendingBook(self.collateral, self.debt, self.ltv,
+                           self.liquidation_threshold, self.liquidation_bonus)
+
+    def collateral_value(self, price):
+        return self.collateral * price
+
+    def health_factor(self, price):
+        """HF per account; inf for accounts without debt.
+
+        price may be a scalar or broadcast against the columns, e.g. a
+        (prices, 1) array for a price sweep of a small book.
+        """
+        with np.errstate(divide='ignore', invalid='ignore'):
+            hf = self.collateral * price * self.liquidation_threshold / self.debt
+        return np.where(self.debt > 0, hf, np.inf)
+
+    def borrow_capacity(self, price):
+        """Additional debt each account could take at the given price."""
+        return np.maximum(self.collateral * price * self.ltv - self.debt, 0.0)
+
+    def liquidation_price(self):
+        """Collateral price at which each account reaches HF = 1."""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            price = self.debt / (self.collateral * self.liquidation_threshold)
+        return np.where(self.collateral > 0, price, np.inf)
+
+    def liquidatable(self, price):
+        """Mask of accounts that can be liquidated at price."""
+        return (self.debt > 0) & (self.collateral > 0) & \
+            (self.collateral * price * self.liquidation_threshold < self.debt)
+
+    def liquidatable_debt(self, prices):
+        """Total debt of accounts underwater at each price (vectorized sweep)."""
+        liquidation_price = self.liquidation_price()
+        order = np.argsort(liquidation_price)
+        sorted_prices = liquidation_price[order]
+        # Debt of every account whose liquidation price is above p
+        debt_above = np.concatenate([np.cumsum(self.debt[order][::-1])[::-1], [0.0]])
+        return debt_above[np.searchsorted(sorted_prices, prices, side='right')]
+
+    def liquidate(self, price, close_factor: float = CLOSE_FACTOR,
+                  full_close_hf: float = FULL_CLOSE_HF):
+        """One liquidation round at price; returns (accounts, debt repaid, collateral seized).
+
+        Accounts whose collateral cannot cover the repayment plus bonus are
+        closed out: all collateral is seized and the remaining debt is bad debt.
+        """
+        idx = np.flatnonzero(self.liquidatable(price))
+        if idx.size == 0:
+            return 0, 0.0, 0.0
+        collateral, debt = self.collateral[idx], self.debt[idx]
+        bonus = 1 + self.liquidation_bonus[idx]
+        hf = collateral * price * self.liquidation_threshold[idx] / debt
+        repay = debt * np.where(hf < full_close_hf, 1.0, close_factor)
+        seize = repay * bonus / price
+        short = seize > collateral
+        seize = np.where(short, collateral, seize)
+        repay = np.where(short, collateral * price / bonus, repay)
+        self.collateral[idx] = collateral - seize
+        self.debt[idx] = debt - repay
+        return idx.size, float(repay.sum()), float(seize.sum())
+
+    def accrue_interest(self, borrow_index_growth):
+        """Grow every debt by the borrow index ratio (see engines.interest_rates)."""
+        self.debt *= borrow_index_growth
+
+    def bad_debt(self) -> float:
+        """Debt left on accounts with no collateral."""
+        return float(self.debt[(self.collateral <= 0) & (self.debt > 0)].sum())
+
+    def __repr__(self):
+        return f"LendingBook({len(self)} accounts, debt={self.debt.sum():,.0f})"
+
+
+class CascadeResult:
+    """Price and liquidations after each round of a cascade."""
+    def __init__(self, prices, liquidations, repaid, seized, bad_debt):
+        self.prices = prices              # price before each round, then the final price
+        self.liquidations = liquidations  # accounts liquidated per round
+        self.repaid = repaid              # debt repaid per round
+        self.seized = seized              # collateral seized per round
+        self.bad_debt = bad_debt
+
+    @property
+    def rounds(self) -> int:
+        return len(self.liquidations)
+
+    @property
+    def final_price(self) -> float:
+        return float(self.prices[-1])
+
+    @property
+    def price_impact(self) -> float:
+        """Further price drop caused by the cascade (fraction of the shocked price)."""
+        return 1 - self.prices[-1] / self.prices[0]
+
+    def __repr__(self):
+        return (f"CascadeResult({self.rounds} rounds, {int(self.liquidations.sum())} liquidations, "
+                f"price {self.prices[0]:.2f} -> {self.prices[-1]:.2f})")
+
+
+def run_cascade(book: LendingBook, price: float, market_depth: Optional[float] = None,
+                fee: float = 0.003, max_rounds: int = 1000, **liquidate_kwargs) -> CascadeResult:
+    """Liquidate the book at price until no account is underwater.
+
+    Seized collateral is sold into a constant-product pool holding
+    market_depth of the quote currency at the starting price; the pool's new
+    spot price is used for the next round. Without market_depth the price
+    stays fixed and only repeated partial liquidations cascade. The book is
+    modified in place.
+    """
+    if market_depth is not None:
+        reserve_quote = float(market_depth)
+        reserve_collateral = reserve_quote / price
+    prices, liquidations, repaid, seized = [price], [], [], []
+
+    for _ in range(max_rounds):
+        count, debt_repaid, collateral_seized = book.liquidate(price, **liquidate_kwargs)
+        if count == 0:
+            break
+        liquidations.append(count)
+        repaid.append(debt_repaid)
+        seized.append(collateral_seized)
+        if market_depth is not None:
+            proceeds = float(get_amount_out(collateral_seized, reserve_collateral, reserve_quote, fee))
+            reserve_collateral += collateral_seized
+            reserve_quote -= proceeds
+            price = reserve_quote / reserve_collateral
+        prices.append(price)
+
+    return CascadeResult(np.array(prices), np.array(liquidations, dtype=np.int64),
+                         np.array(repaid), np.array(seized), book.bad_debt())
+
+
+def synthetic_book(n: int, price: float, total_collateral: Optional[float] = None,
+                   seed: Optional[int] = None, ltv: float = 0.80,
+                   liquidation_threshold: float = 0.825,
+                   liquidation_bonus: float = 0.05) -> LendingBook:
+    """A market of n borrowers with lognormal sizes and health factors above 1.
+
+    Health factors cluster around 1.5 with a long tail of cautious borrowers;
+    nobody starts above the LTV limit. total_collateral rescales account
+    sizes so the book holds that many units of collateral.
+    """
+    rng = np.random.default_rng(seed)
+    collateral = rng.lognormal(mean=0.0, sigma=1.5, size=n)
+    if total_collateral is not None:
+        collateral *= total_collateral / collateral.sum()
+    min_hf = liquidation_threshold / ltv
+    hf = min_hf + rng.lognormal(mean=np.log(0.5), sigma=0.8, size=n)
+    debt = collateral * price * liquidation_threshold / hf
+    return LendingBook(collateral, debt, ltv, liquidation_threshold, liquidation_bonus)
@@ -0,0 +1,295 @@
+"""
+Nonce-Search Mining
+Reference miner for the hash lab: SHA-256 nonce search split across processes.
+
+A lab block is serialized as its number, previous hash and data followed by
+the nonce in decimal, and is valid when its SHA-256 hex digest starts with
+leading_zeros zeros. Everything before the nonce is the same for every
+attempt, so it is absorbed into a hashlib.sha256 object once - the midstate -
+and each attempt copies that object and feeds only the nonce digits. An
+attempt then costs the same however large the block data is.
+
+A digest has k leading hex zeros exactly when it is below 16^(64 - k), so
+the check is one comparison of the 32 raw digest bytes with the target as
+big-endian bytes: no hexdigest() string per attempt.
+
+ParallelMiner deals consecutive chunks of nonces to worker processes, keeps
+a few chunks in flight per worker, and collects them in nonce order. The
+first chunk holding a solution gives the lowest valid nonce, the same block
+the single-process mine() finds, so attempts are reproducible and only the
+wall-clock time depends on the number of processes.
+
+The benchmarks start worker processes, so they run from this module's
+entry point rather than from a chart: the lab chart only plots the file it
+writes. Start methods other than fork (Windows, macOS) also need any script
+that creates a ParallelMiner to do so under an if __name__ == '__main__'
+guard.
+
+Usage:
+    prefix = block_prefix(1, 'Alice pays Bob 10 BTC', '0' * 64)
+    mine(prefix, 4)                               # single process
+    with ParallelMiner(processes=4) as miner:
+        miner.mine(prefix, 5)
+        miner.hashrate()
+
+    python -m engines.mining --output benchmark.json   # from the project root
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Optional, Sequence
+
+import numpy as np
+
+from engines.difficulty import expected_attempts
+
+DIGEST_SIZE = 32
+CHUNK = 1 << 15
+MAX_NONCE = 1 << 32
+
+
+def block_prefix(number: int, data: str, previous_hash: str) -> bytes:
+    """Serialized lab block up to (not including) the nonce."""
+    return f'{number}{previous_hash}{data}'.encode()
+
+
+def block_hash(prefix: bytes, nonce: int) -> str:
+    """Hex SHA-256 of the block with nonce, computed the plain way."""
+    return hashlib.sha256(prefix + str(nonce).encode()).hexdigest()
+
+
+def target_for(leading_zeros: int) -> bytes:
+    """Digests below this (as big-endian bytes) have leading_zeros hex zeros."""
+    if not 1 <= leading_zeros <= 2 * DIGEST_SIZE:
+        raise ValueError("leading_zeros must be between 1 and 64")
+    return (16 ** (2 * DIGEST_SIZE - leading_zeros)).to_bytes(DIGEST_SIZE, 'big')
+
+
+def search_range(prefix: bytes, target: bytes, start: int, stop: int) -> Optional[int]:
+    """Lowest nonce in [start, stop) whose block digest is below target."""
+    next_hash = hashlib.sha256(prefix).copy
+    for nonce in range(start, stop):
+        attempt = next_hash()
+        attempt.update(b'%d' % nonce)
+        if attempt.digest() < target:
+            return nonce
+    return None
+
+
+def _search_naive(prefix: bytes, target: bytes, start: int, stop: int) -> Optional[int]:
+    """search_range without the midstate: the whole block is hashed per attempt."""
+    for nonce in range(start, stop):
+        if hashlib.sha256(prefix + b'%d' % nonce).digest() < target:
+            return nonce
+    return None
+
+
+class MiningResult:
+    """A solved block and what it took to find it."""
+    def __init__(self, nonce, digest, attempts, seconds, processes):
+        self.nonce = nonce          # lowest valid nonce from the start nonce
+        self.digest = digest        # hex digest of the solved block
+        self.attempts = attempts    # nonces tried by a sequential search
+        self.seconds = seconds      # wall-clock search time
+        self.processes = processes  # worker processes used
+
+    @property
+    def hashrate(self) -> float:
+        return self.attempts / self.seconds if self.seconds > 0 else float('inf')
+
+    def __repr__(self):
+        return (f"MiningResult(nonce={self.nonce}, {self.digest[:12]}..., "
+                f"{self.attempts:,} attempts, {self.seconds:.3f}s)")
+
+
+def mine(prefix: bytes, leading_zeros: int, start: int = 0, stop: int = MAX_NONCE) -> MiningResult:
+    """Single-process nonce search from start: the baseline for ParallelMiner."""
+    target = target_for(leading_zeros)
+    began = time.perf_counter()
+    nonce = search_range(prefix, target, start, stop)
+    seconds = time.perf_counter() - began
+    if nonce is None:
+        raise ValueError(f"no valid nonce in [{start}, {stop})")
+    return MiningResult(nonce, block_hash(prefix, nonce), nonce - start + 1, seconds, 1)
+
+
+def measure_hashrate(hashes: int = 1 << 19, midstate: bool = True) -> float:
+    """Single-process hashes per second over hashes attempts that cannot succeed."""
+    search = search_range if midstate else _search_naive
+    prefix = block_prefix(0, 'hashrate benchmark', '0' * 64)
+    began = time.perf_counter()
+    search(prefix, bytes(DIGEST_SIZE), 0, hashes)
+    return hashes / (time.perf_counter() - began)
+
+
+class ParallelMiner:
+    """Pool of worker processes searching consecutive nonce chunks.
+
+    The pool is started once and reused across mine() and hashrate() calls;
+    use it as a context manager or call close().
+    """
+    def __init__(self, processes: Optional[int] = None, chunk: int = CHUNK, in_flight: int = 2):
+        self.processes = processes or os.cpu_count() or 1
+        self.chunk = chunk
+        self.in_flight = in_flight
+        self._pool = ProcessPoolExecutor(max_workers=self.processes)
+
+    def _search(self, prefix: bytes, target: bytes, start: int, stop: int) -> Optional[int]:
+        """Lowest valid nonce in [start, stop), searched chunk by chunk in order."""
+        pending = deque()
+        next_start = start
+        try:
+            while pending or next_start < stop:
+                while next_start < stop and len(pending) < self.processes * self.in_flight:
+                    chunk_stop = min(next_start + self.chunk, stop)
+                    pending.append(self._pool.submit(search_range, prefix, target, next_start, chunk_stop))
+                    next_start = chunk_stop
+                nonce = pending.popleft().result()
+                if nonce is not None:
+                    return nonce
+            return None
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def mine(self, prefix: bytes, leading_zeros: int, start: int = 0, stop: int = MAX_NONCE) -> MiningResult:
+        target = target_for(leading_zeros)
+        began = time.perf_counter()
+        nonce = self._search(prefix, target, start, stop)
+        seconds = time.perf_counter() - began
+        if nonce is None:
+            raise ValueError(f"no valid nonce in [{start}, {stop})")
+        return MiningResult(nonce, block_hash(prefix, nonce), nonce - start + 1, seconds, self.processes)
+
+    def hashrate(self, hashes: Optional[int] = None) -> float:
+        """Hashes per second of the whole pool over attempts that cannot succeed."""
+        hashes = hashes or self.processes * self.in_flight * 4 * self.chunk
+        prefix = block_prefix(0, 'hashrate benchmark', '0' * 64)
+        # One untimed round so that every worker process has started
+        self._search(prefix, bytes(DIGEST_SIZE), 0, self.processes * self.chunk)
+        began = time.perf_counter()
+        self._search(prefix, bytes(DIGEST_SIZE), 0, hashes)
+        return hashes / (time.perf_counter() - began)
+
+    def close(self):
+        self._pool.shutdown(cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __repr__(self):
+        return f"ParallelMiner({self.processes} processes, chunk={self.chunk:,})"
+
+
+class DifficultyBenchmark:
+    """Measured nonce searches per difficulty level (attempts of shape (levels, trials))."""
+    def __init__(self, levels, attempts, seconds, processes):
+        self.levels = levels        # leading hex zeros
+        self.attempts = attempts    # nonces tried for each trial block
+        self.seconds = seconds      # wall-clock time of each search
+        self.processes = processes  # worker processes used
+
+    @property
+    def expected(self) -> np.ndarray:
+        """Mean attempts in theory: 16^level."""
+        return expected_attempts(self.levels)
+
+    @property
+    def mean_attempts(self) -> np.ndarray:
+        return np.nanmean(self.attempts, axis=1)
+
+    @property
+    def hashrate(self) -> float:
+        """Hashes per second over all searches."""
+        return np.nansum(self.attempts) / np.nansum(self.seconds)
+
+    def to_dict(self) -> dict:
+        """JSON-ready form; each level keeps only the trials it ran."""
+        finite = [~np.isnan(row) for row in self.attempts]
+        return {
+            'levels': [int(level) for level in self.levels],
+            'attempts': [[int(a) for a in row[keep]] for row, keep in zip(self.attempts, finite)],
+            'seconds': [[round(float(t), 6) for t in row[keep]] for row, keep in zip(self.seconds, finite)],
+            'processes': self.processes,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'DifficultyBenchmark':
+        width = max(len(row) for row in data['attempts'])
+        attempts = np.full((len(data['levels']), width), np.nan)
+        seconds = np.full_like(attempts, np.nan)
+        for i, (runs, times) in enumerate(zip(data['attempts'], data['seconds'])):
+            attempts[i, :len(runs)] = runs
+            seconds[i, :len(times)] = times
+        return cls(np.asarray(data['levels']), attempts, seconds, data['processes'])
+
+    def __repr__(self):
+        return (f"DifficultyBenchmark(levels={[int(level) for level in self.levels]}, "
+                f"{self.attempts.shape[1]} trials, {self.hashrate:,.0f} H/s on {self.processes} processes)")
+
+
+def benchmark_difficulty(levels: Sequence[int], trials: Sequence[int], miner: Optional[ParallelMiner] = None,
+                         data: str = 'Alice pays Bob 10 BTC') -> DifficultyBenchmark:
+    """Mine trials[i] different blocks at each difficulty levels[i].
+
+    Trial t mines block number t + 1 with the same data, so every trial is
+    a fresh search and the results are the same on every run. Levels with
+    fewer trials than the maximum are padded with NaN.
+    """
+    levels = np.asarray(levels)
+    trials = np.broadcast_to(trials, levels.shape)
+    attempts = np.full((len(levels), trials.max()), np.nan)
+    seconds = np.full_like(attempts, np.nan)
+    for i, (level, count) in enumerate(zip(levels, trials)):
+        for trial in range(count):
+            prefix = block_prefix(trial + 1, data, '0' * 64)
+            result = miner.mine(prefix, int(level)) if miner else mine(prefix, int(level))
+            attempts[i, trial], seconds[i, trial] = result.attempts, result.seconds
+    return DifficultyBenchmark(levels, attempts, seconds, miner.processes if miner else 1)
+
+
+def run_benchmarks(levels: Sequence[int] = (1, 2, 3, 4, 5), trials: Sequence[int] = (100, 100, 100, 20, 4),
+                   processes: Optional[int] = None) -> dict:
+    """Difficulty searches and hashrates of the plain loop, the midstate and the pool."""
+    with ParallelMiner(processes) as miner:
+        bench = benchmark_difficulty(levels, trials, miner)
+        parallel_rate = miner.hashrate()
+    return {
+        'difficulty': bench.to_dict(),
+        'hashrate': {
+            'plain': measure_hashrate(midstate=False),
+            'midstate': measure_hashrate(),
+            'parallel': parallel_rate,
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the lab miner and write the results as JSON')
+    parser.add_argument('--output', '-o', type=Path, required=True,
+                        help='JSON file to write (e.g. next to the mining difficulty chart)')
+    parser.add_argument('--processes', '-p', type=int, default=None,
+                        help='Worker processes (default: all cores)')
+    args = parser.parse_args()
+
+    results = run_benchmarks(processes=args.processes)
+    if results['difficulty']['processes'] == 1:
+        print("Warning: 1 process, so there is no parallel speedup to record; "
+              "run on a multi-core machine for the lab chart")
+    args.output.write_text(json.dumps(results, indent=2) + '\n', encoding='utf-8')
+    bench = DifficultyBenchmark.from_dict(results['difficulty'])
+    print(bench)
+    print(f"Saved to: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,375 @@
+"""
+secp256k1
+Teaching-grade arithmetic on Bitcoin's curve y^2 = x^3 + 7 (mod p): keys,
+ECDSA signatures and addresses, fast enough for labs with thousands of them.
+
+Points are affine (x, y) tuples with None for the point at infinity, and
+Jacobian (X, Y, Z) triples inside the arithmetic, standing for
+(X / Z^2, Y / Z^3). Jacobian doubling and addition need no modular
+inverse, the single most expensive operation, so a scalar multiplication
+does one inversion at the very end instead of one per step.
+
+Scalar multiplication is windowed, 4 bits at a time:
+- k * G uses a table of j * 16^i * G (64 windows x 15 points, built once),
+  so it is 64 mixed additions and no doublings;
+- k * Q for any other point precomputes 1Q .. 15Q, then does 4 doublings
+  and at most one addition per window.
+
+Converting many Jacobian points back to affine uses Montgomery's batch
+inversion: n inverses for the cost of one inversion and 3(n - 1)
+multiplications. Key generation and verify_batch() use it across the
+whole batch, and verify_batch() also inverts all the s values at once and
+reuses each public key's window table.
+
+Nonces follow RFC 6979 (deterministic, HMAC-SHA256) and signatures are
+normalized to low s, as Bitcoin requires. None of this is constant-time:
+it is for learning and testing, not for keys that hold money.
+
+Usage:
+    private_keys, public_keys = generate_keys(1000, seed=1)
+    signature = sign(private_keys[0], message_hash(b'Alice pays Bob 1 BTC'))
+    verify(public_keys[0], message_hash(b'Alice pays Bob 1 BTC'), signature)   # True
+    p2pkh_address(public_keys[0])
+"""
+
+import hashlib
+import hmac
+from functools import lru_cache
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+P = 2 ** 256 - 2 ** 32 - 977
+N = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEBAAEDCE6AF48A03BBFD25E8CD0364141
+B = 7
+G = (0x79BE667EF9DCBBAC55A06295CE870B07029BFCDB2DCE28D959F2815B16F81798,
+     0x483ADA7726A3C4655DA4FBFC0E1108A8FD17B448A68554199C47D08FFB10D4B8)
+WINDOW = 4
+
+_BASE58 = '123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz'
+_INFINITY = (1, 1, 0)
+
+
+def is_on_curve(point) -> bool:
+    if point is None:
+        return True
+    x, y = point
+    return 0 <= x < P and 0 <= y < P and (y * y - x * x * x - B) % P == 0
+
+
+def batch_inverse(values: Sequence[int], modulus: int = P) -> List[int]:
+    """Inverses of all values mod modulus with a single modular inversion."""
+    prefix = []
+    running = 1
+    for value in values:
+        if value % modulus == 0:
+            raise ValueError("zero has no inverse")
+        prefix.append(running)
+        running = running * value % modulus
+    inverse = pow(running, -1, modulus)
+    result = [0] * len(prefix)
+    for i in range(len(prefix) - 1, -1, -1):
+        result[i] = inverse * prefix[i] % modulus
+        inverse = inverse * values[i] % modulus
+    return result
+
+
+def jacobian_double(point):
+    X1, Y1, Z1 = point
+    if Z1 == 0 or Y1 == 0:
+        return _INFINITY
+    A = X1 * X1 % P
+    B_ = Y1 * Y1 % P
+    C = B_ * B_ % P
+    D = 2 * ((X1 + B_) ** 2 - A - C) % P
+    E = 3 * A
+    X3 = (E * E - 2 * D) % P
+    return X3, (E * (D - X3) - 8 * C) % P, 2 * Y1 * Z1 % P
+
+
+def jacobian_add_affine(point, affine):
+    """Jacobian point plus an affine point (mixed addition)."""
+    if affine is None:
+        return point
+    X1, Y1, Z1 = point
+    x2, y2 = affine
+    if Z1 == 0:
+        return x2, y2, 1
+    Z1Z1 = Z1 * Z1 % P
+    H = (x2 * Z1Z1 - X1) % P
+    r = 2 * (y2 * Z1 * Z1Z1 - Y1) % P
+    if H == 0:
+        return jacobian_double(point) if r == 0 else _INFINITY
+    HH = H * H % P
+    HH4 = 4 * HH
+    J = H * HH4
+    V = X1 * HH4
+    X3 = (r * r - J - 2 * V) % P
+    return X3, (r * (V - X3) - 2 * Y1 * J) % P, ((Z1 + H) ** 2 - Z1Z1 - HH) % P
+
+
+def jacobian_add(point1, point2):
+    X1, Y1, Z1 = point1
+    X2, Y2, Z2 = point2
+    if Z1 == 0:
+        return point2
+    if Z2 == 0:
+        return point1
+    Z1Z1 = Z1 * Z1 % P
+    Z2Z2 = Z2 * Z2 % P
+    U1 = X1 * Z2Z2 % P
+    S1 = Y1 * Z2 * Z2Z2 % P
+    H = (X2 * Z1Z1 - U1) % P
+    r = 2 * (Y2 * Z1 * Z1Z1 - S1) % P
+    if H == 0:
+        return jacobian_double(point1) if r == 0 else _INFINITY
+    HH4 = 4 * H * H % P
+    J = H * HH4
+    V = U1 * HH4
+    X3 = (r * r - J - 2 * V) % P
+    return X3, (r * (V - X3) - 2 * S1 * J) % P, ((Z1 + Z2) ** 2 - Z1Z1 - Z2Z2) * H % P
+
+
+def to_affine(point):
+    X, Y, Z = point
+    if Z == 0:
+        return None
+    z_inv = pow(Z, -1, P)
+    z_inv2 = z_inv * z_inv % P
+    return X * z_inv2 % P, Y * z_inv2 * z_inv % P
+
+
+def batch_to_affine(points) -> list:
+    """Affine forms of many Jacobian points with one shared inversion."""
+    finite = [i for i, point in enumerate(points) if point[2] != 0]
+    inverses = batch_inverse([points[i][2] for i in finite]) if finite else []
+    affine = [None] * len(points)
+    for i, z_inv in zip(finite, inverses):
+        X, Y, _ = points[i]
+        z_inv2 = z_inv * z_inv % P
+        affine[i] = (X * z_inv2 % P, Y * z_inv2 * z_inv % P)
+    return affine
+
+
+def point_add(point1, point2):
+    """Affine point addition (None is the point at infinity)."""
+    if point1 is None:
+        return point2
+    return to_affine(jacobian_add_affine((point1[0], point1[1], 1), point2))
+
+
+def point_neg(point):
+    return None if point is None else (point[0], -point[1] % P)
+
+
+@lru_cache(maxsize=None)
+def _base_table() -> Tuple[tuple, ...]:
+    """Affine j * 16^i * G for window i = 0..63 and digit j = 0..15 (j = 0 is None)."""
+    jacobian = []
+    row_base = (G[0], G[1], 1)
+    for _ in range(256 // WINDOW):
+        row = [row_base]
+        for _ in range(2 ** WINDOW - 2):
+            row.append(jacobian_add(row[-1], row_base))
+        jacobian.extend(row)
+        row_base = jacobian_double(jacobian_double(jacobian_double(jacobian_double(row_base))))
+    affine = batch_to_affine(jacobian)
+    size = 2 ** WINDOW - 1
+    return tuple((None,) + tuple(affine[i:i + size]) for i in range(0, len(affine), size))
+
+
+def _base_multiply_jacobian(scalar: int):
+    table = _base_table()
+    result = _INFINITY
+    window = 0
+    while scalar:
+        digit = scalar & 0xF
+        if digit:
+            result = jacobian_add_affine(result, table[window][digit])
+        scalar >>= WINDOW
+        window += 1
+    return result
+
+
+def _window_table(point) -> tuple:
+    """Affine 0Q .. 15Q (0Q is None) for windowed multiplication of Q."""
+    jacobian = [(point[0], point[1], 1)]
+    for _ in range(2 ** WINDOW - 2):
+        jacobian.append(jacobian_add_affine(jacobian[-1], point))
+    return (None,) + tuple(batch_to_affine(jacobian))
+
+
+def _multiply_jacobian(scalar: int, table: tuple):
+    result = _INFINITY
+    for shift in range(256 - WINDOW, -WINDOW, -WINDOW):
+        if result[2]:
+            for _ in range(WINDOW):
+                result = jacobian_double(result)
+        digit = (scalar >> shift) & 0xF
+        if digit:
+            result = jacobian_add_affine(result, table[digit])
+    return result
+
+
+def scalar_multiply(scalar: int, point=G):
+    """scalar * point in affine coordinates; the fixed-base table is used for G."""
+    scalar %= N
+    if point is None or scalar == 0:
+        return None
+    if point == G:
+        return to_affine(_base_multiply_jacobian(scalar))
+    return to_affine(_multiply_jacobian(scalar, _window_table(point)))
+
+
+def public_key(private_key: int):
+    if not 0 < private_key < N:
+        raise ValueError("private key must be in [1, n - 1]")
+    return scalar_multiply(private_key)
+
+
+def public_key_batch(private_keys: Sequence[int]) -> list:
+    """public_key() of many private keys with one shared inversion."""
+    if not all(0 < key < N for key in private_keys):
+        raise ValueError("private keys must be in [1, n - 1]")
+    return batch_to_affine([_base_multiply_jacobian(key) for key in private_keys])
+
+
+def multiply_base_add_batch(scalars: Sequence[int], point) -> list:
+    """scalar * G + point for each scalar, with one shared inversion."""
+    return batch_to_affine([jacobian_add_affine(_base_multiply_jacobian(scalar % N), point)
+                            for scalar in scalars])
+
+
+def generate_keys(count: int, seed: Optional[int] = None) -> Tuple[List[int], list]:
+    """count random key pairs; public keys converted to affine in one batch."""
+    rng = np.random.default_rng(seed)
+    private_keys = []
+    while len(private_keys) < count:
+        key = int.from_bytes(rng.bytes(32), 'big')
+        if 0 < key < N:
+            private_keys.append(key)
+    return private_keys, public_key_batch(private_keys)
+
+
+def message_hash(message: bytes) -> int:
+    """SHA-256 of the message as the integer z that ECDSA signs."""
+    return int.from_bytes(hashlib.sha256(message).digest(), 'big')
+
+
+def rfc6979_nonce(private_key: int, z: int) -> int:
+    """Deterministic ECDSA nonce from the key and message hash (RFC 6979, HMAC-SHA256)."""
+    x = private_key.to_bytes(32, 'big')
+    h = (z % N).to_bytes(32, 'big')
+    K = b'\x00' * 32
+    V = b'\x01' * 32
+    K = hmac.new(K, V + b'\x00' + x + h, hashlib.sha256).digest()
+    V = hmac.new(K, V, hashlib.sha256).digest()
+    K = hmac.new(K, V + b'\x01' + x + h, hashlib.sha256).digest()
+    V = hmac.new(K, V, hashlib.sha256).digest()
+    while True:
+        V = hmac.new(K, V, hashlib.sha256).digest()
+        k = int.from_bytes(V, 'big')
+        if 0 < k < N:
+            return k
+        K = hmac.new(K, V + b'\x00', hashlib.sha256).digest()
+        V = hmac.new(K, V, hashlib.sha256).digest()
+
+
+def sign(private_key: int, z: int, nonce: Optional[int] = None) -> Tuple[int, int]:
+    """ECDSA signature (r, s) of message hash z, with low s."""
+    k = rfc6979_nonce(private_key, z) if nonce is None else nonce
+    R = scalar_multiply(k)
+    r = R[0] % N
+    s = pow(k, -1, N) * (z + r * private_key) % N
+    if r == 0 or s == 0:
+        raise ValueError("degenerate nonce; choose another")
+    return r, min(s, N - s)
+
+
+def _verify_point(public_key, z: int, r: int, s_inv: int, table: tuple):
+    u1 = z * s_inv % N
+    u2 = r * s_inv % N
+    return jacobian_add(_base_multiply_jacobian(u1), _multiply_jacobian(u2, table))
+
+
+def verify(public_key, z: int, signature: Tuple[int, int]) -> bool:
+    r, s = signature
+    if not (0 < r < N and 0 < s < N) or public_key is None or not is_on_curve(public_key):
+        return False
+    R = to_affine(_verify_point(public_key, z, r, pow(s, -1, N), _window_table(public_key)))
+    return R is not None and R[0] % N == r
+
+
+def verify_batch(public_keys: Sequence, hashes: Sequence[int], signatures: Sequence[Tuple[int, int]]) -> List[bool]:
+    """verify() for many signatures, sharing inversions and per-key tables.
+
+    All s^-1 mod n and all final Z^-1 mod p come from one batch inversion
+    each, and each distinct public key's window table is built once.
+    """
+    if not len(public_keys) == len(hashes) == len(signatures):
+        raise ValueError("public_keys, hashes and signatures must have the same length")
+    valid = [0 < r < N and 0 < s < N and key is not None and is_on_curve(key)
+             for key, (r, s) in zip(public_keys, signatures)]
+    checked = [i for i, ok in enumerate(valid) if ok]
+    s_inverses = batch_inverse([signatures[i][1] for i in checked], N) if checked else []
+    tables = {}
+    points = []
+    for i, s_inv in zip(checked, s_inverses):
+        key = public_keys[i]
+        if key not in tables:
+            tables[key] = _window_table(key)
+        points.append(_verify_point(key, hashes[i], signatures[i][0], s_inv, tables[key]))
+    result = [False] * len(valid)
+    for i, R in zip(checked, batch_to_affine(points)):
+        result[i] = R is not None and R[0] % N == signatures[i][0]
+    return result
+
+
+def encode_public_key(point, compressed: bool = True) -> bytes:
+    """SEC1 encoding: 33 bytes (02/03 + x) or 65 bytes (04 + x + y)."""
+    x, y = point
+    if compressed:
+        return bytes([2 + (y & 1)]) + x.to_bytes(32, 'big')
+    return b'\x04' + x.to_bytes(32, 'big') + y.to_bytes(32, 'big')
+
+
+def decode_public_key(data: bytes):
+    if len(data) == 65 and data[0] == 4:
+        point = (int.from_bytes(data[1:33], 'big'), int.from_bytes(data[33:], 'big'))
+    elif len(data) == 33 and data[0] in (2, 3):
+        x = int.from_bytes(data[1:], 'big')
+        y = pow((x * x * x + B) % P, (P + 1) // 4, P)
+        if y & 1 != data[0] & 1:
+            y = P - y
+        point = (x, y)
+    else:
+        raise ValueError("not a SEC1 public key")
+    if not is_on_curve(point):
+        raise ValueError("point is not on secp256k1")
+    return point
+
+
+def hash160(data: bytes) -> bytes:
+    """RIPEMD-160 of SHA-256, Bitcoin's public key hash."""
+    try:
+        ripemd = hashlib.new('ripemd160')
+    except ValueError as error:
+        raise ValueError("this OpenSSL build has no RIPEMD-160 (enable its legacy provider)") from error
+    ripemd.update(hashlib.sha256(data).digest())
+    return ripemd.digest()
+
+
+def base58check(payload: bytes) -> str:
+    """Base58 of payload plus its 4-byte double-SHA-256 checksum."""
+    data = payload + hashlib.sha256(hashlib.sha256(payload).digest()).digest()[:4]
+    number = int.from_bytes(data, 'big')
+    encoded = ''
+    while number:
+        number, digit = divmod(number, 58)
+        encoded = _BASE58[digit] + encoded
+    return '1' * (len(data) - len(data.lstrip(b'\x00'))) + encoded
+
+
+def p2pkh_address(point, compressed: bool = True, version: int = 0x00) -> str:
+    """Pay-to-public-key-hash address (1... on mainnet)."""
+    return base58check(bytes([version]) + hash160(encode_public_key(point, compressed)))
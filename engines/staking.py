@@ -0,0 +1,294 @@
+"""
+Proof-of-Stake Validator Set
+Ethereum consensus rewards, penalties, inactivity leak and slashing over
+about a million validators.
+
+Every validator is a slot in a handful of NumPy arrays (balance, effective
+balance, uptime, inactivity score, slashing state, owning entity), and the
+formulas are the consensus-spec ones (Altair weights, Bellatrix penalty
+constants), in Gwei:
+
+    base reward      = effective_balance / 1 ETH * 64 * 1 ETH / sqrt(total active balance)
+    attestation      source 14 + target 26 + head 14 out of 64, scaled by participation
+    missed duties    source and target weights are charged as a penalty
+    proposer         8/56 of the attestation rewards it includes, plus sync inclusions
+    sync committee   512 validators for 256 epochs share 2/64 of the base rewards
+    inactivity leak  after 4 epochs without finality: no attestation rewards, and
+                     score += 4 per missed epoch, penalty = balance * score / 2^26
+    slashing         1/32 of the balance at once; 4096 epochs later balance *
+                     min(3 * slashed in the last 8192 epochs, total) / total
+
+A year is 82,125 epochs, so epochs are processed in chunks of constant
+parameters: within a chunk every validator's count of timely epochs is one
+Binomial(epochs, uptime) draw and inactivity scores move linearly (exact for
+validators that are always on or always off). Chunks shrink to a few epochs
+while finality is at risk. A year of 10^6 validators runs in a few seconds.
+Slashed validators leave only when withdrawable, as a mass slashing queues
+behind the exit churn.
+
+Usage:
+    validators = ValidatorSet(1_000_000, uptime=0.99, seed=1)
+    result = validators.run(EPOCHS_PER_YEAR)
+    validators.apr(result.epochs)                # per validator
+"""
+
+from typing import Optional
+
+import numpy as np
+
+GWEI_PER_ETH = 10 ** 9
+SLOTS_PER_EPOCH = 32
+SECONDS_PER_SLOT = 12
+EPOCHS_PER_DAY = 24 * 3600 // (SLOTS_PER_EPOCH * SECONDS_PER_SLOT)
+EPOCHS_PER_YEAR = 365 * EPOCHS_PER_DAY
+
+MAX_EFFECTIVE_BALANCE = 32 * GWEI_PER_ETH
+EFFECTIVE_BALANCE_INCREMENT = GWEI_PER_ETH
+HYSTERESIS_DOWNWARD = EFFECTIVE_BALANCE_INCREMENT // 4
+HYSTERESIS_UPWARD = EFFECTIVE_BALANCE_INCREMENT * 5 // 4
+BASE_REWARD_FACTOR = 64
+
+TIMELY_SOURCE_WEIGHT = 14
+TIMELY_TARGET_WEIGHT = 26
+TIMELY_HEAD_WEIGHT = 14
+SYNC_REWARD_WEIGHT = 2
+PROPOSER_WEIGHT = 8
+WEIGHT_DENOMINATOR = 64
+ATTESTATION_WEIGHT = TIMELY_SOURCE_WEIGHT + TIMELY_TARGET_WEIGHT + TIMELY_HEAD_WEIGHT
+MISSED_WEIGHT = TIMELY_SOURCE_WEIGHT + TIMELY_TARGET_WEIGHT
+
+SYNC_COMMITTEE_SIZE = 512
+EPOCHS_PER_SYNC_COMMITTEE_PERIOD = 256
+
+MIN_EPOCHS_TO_INACTIVITY_PENALTY = 4
+INACTIVITY_SCORE_BIAS = 4
+INACTIVITY_SCORE_RECOVERY_RATE = 16
+INACTIVITY_PENALTY_QUOTIENT = 2 ** 24
+
+MIN_SLASHING_PENALTY_QUOTIENT = 32
+PROPORTIONAL_SLASHING_MULTIPLIER = 3
+EPOCHS_PER_SLASHINGS_VECTOR = 8192
+
+
+def base_reward_per_increment(total_active_balance):
+    """Gwei per epoch per 1 ETH of effective balance."""
+    return EFFECTIVE_BALANCE_INCREMENT * BASE_REWARD_FACTOR / np.sqrt(total_active_balance)
+
+
+def ideal_apr(total_staked_eth):
+    """Annual yield with perfect participation (attestations, proposals, sync)."""
+    total = np.asarray(total_staked_eth, dtype=float) * GWEI_PER_ETH
+    return base_reward_per_increment(total) * EPOCHS_PER_YEAR / EFFECTIVE_BALANCE_INCREMENT
+
+
+def correlation_penalty(effective_balance, slashed_balance, total_balance):
+    """Penalty applied halfway to withdrawal for slashed_balance slashed in the window."""
+    adjusted = np.minimum(np.asarray(slashed_balance, dtype=float) * PROPORTIONAL_SLASHING_MULTIPLIER,
+                          total_balance)
+    increments = np.floor(np.asarray(effective_balance, dtype=float) / EFFECTIVE_BALANCE_INCREMENT)
+    return np.floor(increments * adjusted / total_balance) * EFFECTIVE_BALANCE_INCREMENT
+
+
+def stake_shares(entity, balance):
+    """(entity ids, stake share) sorted from largest to smallest."""
+    ids, inverse = np.unique(entity, return_inverse=True)
+    stake = np.bincount(inverse, weights=balance)
+    order = np.argsort(stake)[::-1]
+    return ids[order], stake[order] / stake.sum()
+
+
+def nakamoto_coefficient(shares, threshold: float = 1 / 3) -> int:
+    """Fewest entities whose combined share exceeds threshold."""
+    cumulative = np.cumsum(np.sort(shares)[::-1])
+    return int(np.searchsorted(cumulative, threshold, side='right') + 1)
+
+
+def herfindahl(shares) -> float:
+    """Herfindahl-Hirschman index of stake shares (1 = a single entity)."""
+    shares = np.asarray(shares, dtype=float)
+    return float(np.sum(shares ** 2))
+
+
+class StakingResult:
+    """Network state after each chunk of a run."""
+    def __init__(self, epochs, chunk_epochs, participation, leaking, total_active_balance, rewards):
+        self.epochs = epochs                              # epochs simulated in total
+        self.chunk_epochs = chunk_epochs                  # length of each chunk
+        self.participation = participation                # balance-weighted uptime per chunk
+        self.leaking = leaking                            # inactivity leak active per chunk
+        self.total_active_balance = total_active_balance  # Gwei per chunk
+        self.rewards = rewards                            # net issuance per chunk (Gwei)
+
+    @property
+    def leak_epochs(self) -> int:
+        return int(self.chunk_epochs[self.leaking].sum())
+
+    def __repr__(self):
+        return (f"StakingResult({self.epochs} epochs, mean participation "
+                f"{np.mean(self.participation):.1%}, issuance {self.rewards.sum() / GWEI_PER_ETH:,.0f} ETH)")
+
+
+class ValidatorSet:
+    """Validators as parallel arrays; run() advances the chain epoch by epoch in chunks."""
+    def __init__(self, n: int, balance: float = MAX_EFFECTIVE_BALANCE, uptime=0.99,
+                 entity=None, seed: Optional[int] = None):
+        self.balance = np.array(np.broadcast_to(balance, n), dtype=float)
+        self.effective_balance = np.minimum(
+            np.floor(self.balance / EFFECTIVE_BALANCE_INCREMENT) * EFFECTIVE_BALANCE_INCREMENT, MAX_EFFECTIVE_BALANCE)
+        self.initial_balance = self.balance.copy()
+        self.uptime = np.array(np.broadcast_to(uptime, n), dtype=float)
+        self.entity = np.zeros(n, dtype=np.int64) if entity is None else np.asarray(entity)
+        self.inactivity_score = np.zeros(n)
+        self.slashed = np.zeros(n, dtype=bool)
+        self.exited = np.zeros(n, dtype=bool)
+        self.withdrawable_epoch = np.full(n, np.iinfo(np.int64).max)
+        self.slashings = []  # (epoch, effective balance slashed)
+        self.epoch = 0
+        self.finality_delay = 0
+        self.sync_committee = np.zeros(0, dtype=np.int64)
+        self.sync_period_end = 0
+        self.rng = np.random.default_rng(seed)
+
+    def __len__(self):
+        return len(self.balance)
+
+    @property
+    def active(self) -> np.ndarray:
+        return ~self.exited
+
+    def total_active_balance(self) -> float:
+        return float(self.effective_balance[self.active].sum())
+
+    def participation(self) -> float:
+        """Share of active stake expected to vote for the target each epoch."""
+        online = self.active & ~self.slashed
+        return float(np.sum(self.effective_balance[online] * self.uptime[online])) / self.total_active_balance()
+
+    def slash(self, indices):
+        """Slash validators at the current epoch: initial penalty, withdrawal in 8192 epochs."""
+        indices = np.asarray(indices, dtype=np.int64)
+        indices = indices[~self.slashed[indices] & self.active[indices]]
+        self.slashed[indices] = True
+        self.withdrawable_epoch[indices] = self.epoch + EPOCHS_PER_SLASHINGS_VECTOR
+        self.balance[indices] -= self.effective_balance[indices] // MIN_SLASHING_PENALTY_QUOTIENT
+        self.slashings.append((self.epoch, float(self.effective_balance[indices].sum())))
+
+    def apr(self, epochs: int) -> np.ndarray:
+        """Annualized return of every validator over the last epochs run."""
+        return (self.balance - self.initial_balance) / self.initial_balance * EPOCHS_PER_YEAR / epochs
+
+    def _sync_rewards(self, epochs: int, participant_reward: float, candidates, weights) -> float:
+        """Credit sync committee duty over the next epochs; returns the proposers' share."""
+        proposer_share, start = 0.0, self.epoch
+        while start < self.epoch + epochs:
+            if start >= self.sync_period_end:
+                picks = np.searchsorted(weights, self.rng.random(SYNC_COMMITTEE_SIZE) * weights[-1], side='right')
+                self.sync_committee = candidates[picks]
+                self.sync_period_end = start - start % EPOCHS_PER_SYNC_COMMITTEE_PERIOD + EPOCHS_PER_SYNC_COMMITTEE_PERIOD
+            stop = min(self.sync_period_end, self.epoch + epochs)
+            slots = (stop - start) * SLOTS_PER_EPOCH
+            members = self.sync_committee
+            signed = self.rng.binomial(slots, np.where(self.slashed[members], 0.0, self.uptime[members]))
+            np.add.at(self.balance, members, (2 * signed - slots) * participant_reward)
+            proposer_share += signed.sum() * participant_reward * PROPOSER_WEIGHT / (WEIGHT_DENOMINATOR - PROPOSER_WEIGHT)
+            start = stop
+        return proposer_share
+
+    def step(self, epochs: int):
+        """Advance epochs with constant participation; returns (participation, leaking, issuance)."""
+        online = self.active & ~self.slashed
+        eligible = self.active | (self.slashed & (self.epoch < self.withdrawable_epoch))
+        candidates = np.flatnonzero(online)
+        weights = np.cumsum(self.effective_balance[candidates])
+        total = self.total_active_balance()
+        participation = float(np.dot(self.effective_balance[candidates], self.uptime[candidates])) / total
+        leaking = self.finality_delay > MIN_EPOCHS_TO_INACTIVITY_PENALTY
+        before = self.balance.sum()
+
+        increments = self.effective_balance / EFFECTIVE_BALANCE_INCREMENT
+        base_reward = increments * base_reward_per_increment(total)
+        hits = self.rng.binomial(epochs, self.uptime)
+        hits[~online] = 0
+        misses = epochs - hits
+        misses[~eligible] = 0
+
+        # Attestations: rewards scale with participation and stop during a leak
+        reward = 0.0 if leaking else ATTESTATION_WEIGHT / WEIGHT_DENOMINATOR * participation
+        self.balance += base_reward * (hits * reward - misses * (MISSED_WEIGHT / WEIGHT_DENOMINATOR))
+
+        # Inactivity scores (linear over the chunk) and quadratic leak penalties
+        score_before = self.inactivity_score
+        score = score_before + (INACTIVITY_SCORE_BIAS * misses - hits)
+        if not leaking:
+            score -= INACTIVITY_SCORE_RECOVERY_RATE * epochs
+        np.maximum(score, 0.0, out=score)
+        leak_penalty = (score_before + score) * misses
+        leak_penalty *= self.effective_balance / (2 * INACTIVITY_SCORE_BIAS * INACTIVITY_PENALTY_QUOTIENT)
+        self.balance -= leak_penalty
+        self.inactivity_score = np.where(eligible, score, score_before)
+
+        # Proposers: 32 per epoch, chosen by effective balance; offline ones miss the slot
+        included = np.dot(base_reward, hits) * ATTESTATION_WEIGHT
+        proposer_pot = included / ((WEIGHT_DENOMINATOR - PROPOSER_WEIGHT) * WEIGHT_DENOMINATOR / PROPOSER_WEIGHT)
+        total_base = base_reward_per_increment(total) * total / EFFECTIVE_BALANCE_INCREMENT
+        participant_reward = total_base * SYNC_REWARD_WEIGHT / WEIGHT_DENOMINATOR / SLOTS_PER_EPOCH / SYNC_COMMITTEE_SIZE
+        proposer_pot += self._sync_rewards(epochs, participant_reward, candidates, weights)
+        slots = epochs * SLOTS_PER_EPOCH
+        proposers = candidates[np.searchsorted(weights, self.rng.random(slots) * weights[-1], side='right')]
+        proposed = self.rng.random(slots) < self.uptime[proposers]
+        np.add.at(self.balance, proposers[proposed], proposer_pot / slots)
+
+        # Correlation penalties fall due halfway through the withdrawal delay
+        if self.slashings:
+            due_epoch = self.withdrawable_epoch - EPOCHS_PER_SLASHINGS_VECTOR // 2
+            due = self.slashed & (due_epoch >= self.epoch) & (due_epoch < self.epoch + epochs)
+            for epoch in np.unique(due_epoch[due]):
+                # Everything slashed in the 8192 epochs up to the due epoch counts
+                window = sum(amount for slashed_at, amount in self.slashings
+                             if epoch - EPOCHS_PER_SLASHINGS_VECTOR < slashed_at <= epoch)
+                group = due & (due_epoch == epoch)
+                self.balance[group] -= correlation_penalty(self.effective_balance[group], window, total)
+
+        np.maximum(self.balance, 0.0, out=self.balance)
+        self.epoch += epochs
+        self.exited |= self.slashed & (self.epoch >= self.withdrawable_epoch)
+        self._update_effective_balance()
+        self.finality_delay = self.finality_delay + epochs if participation < 2 / 3 else 0
+        return participation, leaking, self.balance.sum() - before
+
+    def _update_effective_balance(self):
+        eb = self.effective_balance
+        move = np.flatnonzero((self.balance + HYSTERESIS_DOWNWARD < eb) | (eb + HYSTERESIS_UPWARD < self.balance))
+        whole = np.floor(self.balance[move] / EFFECTIVE_BALANCE_INCREMENT) * EFFECTIVE_BALANCE_INCREMENT
+        eb[move] = np.minimum(whole, MAX_EFFECTIVE_BALANCE)
+
+    def run(self, epochs: int, chunk_epochs: int = 30 * EPOCHS_PER_DAY, leak_chunk_epochs: int = 8,
+            scheduled_slashings: Optional[dict] = None) -> StakingResult:
+        """Advance epochs; chunks shrink to leak_chunk_epochs while finality is lost.
+
+        scheduled_slashings maps an epoch offset to validator indices slashed then.
+        """
+        self.initial_balance = self.balance.copy()
+        scheduled = dict(scheduled_slashings or {})
+        end = self.epoch + epochs
+        start = self.epoch
+        chunks, participation, leaking, totals, rewards = [], [], [], [], []
+        while self.epoch < end:
+            for offset in [o for o in scheduled if start + o <= self.epoch]:
+                self.slash(scheduled.pop(offset))
+            chunk = chunk_epochs
+            if self.finality_delay > 0 or self.participation() < 2 / 3:
+                chunk = leak_chunk_epochs
+            chunk = min([chunk, end - self.epoch] + [start + o - self.epoch for o in scheduled])
+            totals.append(self.total_active_balance())
+            p, leak, issued = self.step(chunk)
+            chunks.append(chunk)
+            participation.append(p)
+            leaking.append(leak)
+            rewards.append(issued)
+        return StakingResult(epochs, np.array(chunks), np.array(participation), np.array(leaking),
+                             np.array(totals), np.array(rewards))
+
+    def __repr__(self):
+        return (f"ValidatorSet({len(self)} validators, epoch {self.epoch}, "
+                f"{self.balance.sum() / GWEI_PER_ETH:,.0f} ETH)")
@@ -4,18 +4,17 @@ Fix LaTeX closing brace errors - replace > with } in \end{...> constructs
 
 import os
 import re
+import sys
 from pathlib import Path
 
 BASE_DIR = Path(r"D:\Joerg\Research\slides\Blockchain_Crypto")
 
+sys.path.insert(0, str(Path(__file__).parent / "tools"))
+from course_index import get_index
+
 def find_all_tex_files():
     """Find all .tex files in module directories"""
-    tex_files = []
-    for module_dir in BASE_DIR.glob("Module_*"):
-        for tex_file in module_dir.rglob("*.tex"):
-            if "temp" not in str(tex_file) and "previous" not in str(tex_file):
-                tex_files.append(tex_file)
-    return sorted(tex_files)
+    return sorted(get_index(BASE_DIR).tex_files)
 
 def fix_closing_braces(content):
     """Fix \end{...> to \end{...}"""
@@ -1,11 +1,19 @@
-"""Generate all chart PDFs for lessons 28, 29, 31, 33, 42, 45, 46, 47"""
-import subprocess
+"""Generate all chart PDFs for lessons 28, 29, 31, 33, 42, 45, 46, 47
+
+Usage:
+    python generate_all_charts.py                # Render every chart
+    python generate_all_charts.py --incremental  # Skip charts whose inputs are unchanged
+"""
 import sys
 from pathlib import Path
 
 # Base directory
 base = Path(__file__).parent
 
+sys.path.insert(0, str(base / 'tools'))
+from chart_build import build_charts, STATUS_SKIPPED
+from course_index import get_index
+
 # Find all chart.py files in the lessons we're working on
 lessons = [
     'Module_C_NFTs_Digital_Assets/L28_Lab_NFT_Evaluation',
@@ -18,38 +26,49 @@ lessons = [
     'Module_G_Regulation_Future/L47_CBDCs_Future'
 ]
 
-total_generated = 0
-total_errors = 0
 
-for lesson in lessons:
-    lesson_path = base / lesson
-    if lesson_path.exists():
-        chart_files = list(lesson_path.rglob('chart.py'))
+def main(incremental=False):
+    index = get_index(base)
+    lesson_charts = {}
+    for lesson in lessons:
+        entry = index.lesson(lesson)
+        if entry is not None:
+            lesson_charts[lesson] = sorted(chart.script for chart in entry.charts)
+
+    # Render everything in one worker pool, then report per lesson
+    all_charts = [f for charts in lesson_charts.values() for f in charts]
+    results = build_charts(all_charts, timeout=60, incremental=incremental)
+
+    total_generated = 0
+    total_skipped = 0
+    total_errors = 0
+
+    for lesson, chart_files in lesson_charts.items():
         print(f'\n{lesson}: {len(chart_files)} charts')
 
-        for chart_file in sorted(chart_files):
+        for chart_file in chart_files:
             chart_dir = chart_file.parent
-            try:
-                result = subprocess.run(
-                    [sys.executable, 'chart.py'],
-                    cwd=str(chart_dir),
-                    capture_output=True,
-                    text=True,
-                    timeout=60
-                )
-                if result.returncode == 0:
-                    pdf_file = chart_dir / 'chart.pdf'
-                    if pdf_file.exists():
-                        print(f'  [OK] {chart_dir.name}')
-                        total_generated += 1
-                    else:
-                        print(f'  [FAIL] {chart_dir.name} (no PDF created)')
-                        total_errors += 1
+            result = results[chart_file]
+            if result.status == STATUS_SKIPPED:
+                print(f'  [SKIP] {chart_dir.name} (unchanged)')
+                total_skipped += 1
+            elif result.ok:
+                pdf_file = chart_dir / 'chart.pdf'
+                if pdf_file.exists():
+                    print(f'  [OK] {chart_dir.name}')
+                    total_generated += 1
                 else:
-                    print(f'  [ERROR] {chart_dir.name}: {result.stderr[:100]}')
+                    print(f'  [FAIL] {chart_dir.name} (no PDF created)')
                     total_errors += 1
-            except Exception as e:
-                print(f'  [ERROR] {chart_dir.name}: {str(e)[:100]}')
+            else:
+                print(f'  [ERROR] {chart_dir.name}: {result.message[-100:]}')
                 total_errors += 1
 
-print(f'\n\nSummary: {total_generated} PDFs generated, {total_errors} errors')
+    summary = f'\n\nSummary: {total_generated} PDFs generated, {total_errors} errors'
+    if incremental:
+        summary += f', {total_skipped} unchanged'
+    print(summary)
+
+
+if __name__ == '__main__':
+    main(incremental='--incremental' in sys.argv)
@@ -1,26 +1,26 @@
 """
 Generate ZIP file containing all lecture PDFs
 Run this script to create all_lectures.zip for download
+
+Only new or changed PDFs are compressed; unchanged entries are copied from
+the previous all_lectures.zip, and identical inputs give a byte-identical
+archive (see tools/zip_archive.py).
 """
 
-import zipfile
+import sys
 from pathlib import Path
 from datetime import datetime
 
 BASE_DIR = Path(__file__).parent
+
+sys.path.insert(0, str(BASE_DIR / "tools"))
+from zip_archive import update_archive
+from course_index import get_index
 OUTPUT_FILE = BASE_DIR / "all_lectures.zip"
 
 def find_lecture_pdfs():
     """Find all lecture PDFs in Module directories"""
-    pdfs = []
-    for module_dir in sorted(BASE_DIR.glob("Module_*")):
-        for pdf in module_dir.rglob("*.pdf"):
-            # Skip PDFs in previous/ or temp/ folders
-            if "previous" not in str(pdf) and "temp" not in str(pdf):
-                # Only include lesson PDFs (starting with date pattern)
-                if pdf.name[0:8].isdigit():
-                    pdfs.append(pdf)
-    return sorted(pdfs)
+    return sorted(get_index(BASE_DIR).lecture_pdfs())
 
 def create_zip():
     """Create ZIP file with all lecture PDFs"""
@@ -32,24 +32,26 @@ def create_zip():
     print("=" * 60)
     print(f"\nFound {len(pdfs)} lecture PDFs\n")
 
-    with zipfile.ZipFile(OUTPUT_FILE, 'w', zipfile.ZIP_DEFLATED) as zf:
-        for pdf in pdfs:
-            # Create archive name: Module_X/Lxx_Name.pdf
-            module_name = pdf.parent.name
-            if module_name == "presentations":
-                module_name = pdf.parent.parent.name
+    entries = []
+    for pdf in pdfs:
+        # Create archive name: Module_X/Lxx_Name.pdf
+        module_name = pdf.parent.name
+        if module_name == "presentations":
+            module_name = pdf.parent.parent.name
+
+        # Get module letter
+        for part in pdf.parts:
+            if part.startswith("Module_"):
+                module_folder = part
+                break
 
-            # Get module letter
-            for part in pdf.parts:
-                if part.startswith("Module_"):
-                    module_folder = part
-                    break
+        # Simplified name in ZIP
+        archive_name = f"{module_folder}/{module_name}/{pdf.name}"
 
-            # Simplified name in ZIP
-            archive_name = f"{module_folder}/{module_name}/{pdf.name}"
+        entries.append((archive_name, pdf))
+        print(f"  Added: {pdf.name}")
 
-            zf.write(pdf, archive_name)
-            print(f"  Added: {pdf.name}")
+    stats = update_archive(OUTPUT_FILE, entries)
 
     # Get file size
     size_mb = OUTPUT_FILE.stat().st_size / (1024 * 1024)
@@ -58,6 +60,7 @@ def create_zip():
     print(f"ZIP created: {OUTPUT_FILE}")
     print(f"Total size: {size_mb:.1f} MB")
     print(f"Contains: {len(pdfs)} PDFs")
+    print(f"Reused unchanged: {stats['reused']}")
     print("=" * 60)
 
     return len(pdfs), size_mb
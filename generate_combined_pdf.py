@@ -1,80 +1,80 @@
 """
 Generate combined PDF of all lectures and update ZIP when PDFs change
 Monitors for changes and regenerates automatically
+
+The combined PDF is written by a streaming merger (tools/pdf_stream_merge.py)
+that holds one lecture in memory at a time, shares identical fonts and
+images between lectures, and records each lecture's page range as an
+outline entry and page label (e.g. "L07-12") in the combined file.
 """
 
-import hashlib
 import json
+import re
+import sys
 from pathlib import Path
 from datetime import datetime
-from PyPDF2 import PdfMerger
 
 BASE_DIR = Path(__file__).parent
+
+sys.path.insert(0, str(BASE_DIR / "tools"))
+from pdf_stream_merge import StreamingPdfMerger
+from zip_archive import update_archive
+from file_digests import scan_digests
+from course_index import get_index
+
 COMBINED_PDF = BASE_DIR / "all_lectures_combined.pdf"
 ZIP_FILE = BASE_DIR / "all_lectures.zip"
-HASH_FILE = BASE_DIR / ".pdf_hashes.json"
+HASH_FILE = BASE_DIR / ".pdf_hashes.json"          # tracked: content digests only
+STAT_CACHE_FILE = BASE_DIR / ".pdf_stat_cache.json"  # untracked: stat signatures of this checkout
 
 
 def get_lecture_pdfs():
     """Find all lecture PDFs in Module directories, sorted by lesson number"""
-    pdfs = []
-    for module_dir in sorted(BASE_DIR.glob("Module_*")):
-        for pdf in module_dir.rglob("*.pdf"):
-            # Skip PDFs in previous/ or temp/ folders
-            if "previous" not in str(pdf) and "temp" not in str(pdf):
-                # Only include lesson PDFs (starting with date pattern)
-                if pdf.name[0:8].isdigit() and "_L" in pdf.name:
-                    pdfs.append(pdf)
-
-    # Sort by lesson number (L01, L02, etc.)
-    def get_lesson_num(p):
-        name = p.name
-        try:
-            idx = name.index("_L") + 2
-            return int(name[idx:idx+2])
-        except:
-            return 999
-
-    return sorted(pdfs, key=get_lesson_num)
-
-
-def compute_file_hash(filepath):
-    """Compute MD5 hash of a file"""
-    hasher = hashlib.md5()
-    with open(filepath, 'rb') as f:
-        for chunk in iter(lambda: f.read(65536), b''):
-            hasher.update(chunk)
-    return hasher.hexdigest()
+    return get_index(BASE_DIR).lecture_pdfs()
 
 
 def load_hashes():
-    """Load previous hashes from file"""
+    """Load previous hashes from file (keys normalized to forward slashes)"""
     if HASH_FILE.exists():
         with open(HASH_FILE, 'r') as f:
-            return json.load(f)
+            return {key.replace("\\", "/"): value for key, value in json.load(f).items()}
     return {}
 
 
 def save_hashes(hashes):
-    """Save hashes to file"""
+    """Save hashes to file, leaving it untouched if nothing changed"""
+    if HASH_FILE.exists() and load_hashes() == hashes:
+        return
     with open(HASH_FILE, 'w') as f:
-        json.dump(hashes, f, indent=2)
+        json.dump(hashes, f, indent=2, sort_keys=True)
+
+
+def load_stat_cache():
+    try:
+        return json.loads(STAT_CACHE_FILE.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+
+
+def save_stat_cache(stats):
+    STAT_CACHE_FILE.write_text(json.dumps(stats, sort_keys=True), encoding='utf-8')
 
 
 def check_for_changes():
-    """Check if any PDFs have changed since last run"""
+    """Check if any PDFs have changed since last run
+
+    Only PDFs whose (size, mtime, inode) differ from the local stat cache are
+    re-hashed, in parallel (see tools/file_digests.py), so a second run with
+    no changes reads no PDF data.
+    """
     pdfs = get_lecture_pdfs()
     old_hashes = load_hashes()
-    new_hashes = {}
-    changed = []
 
-    for pdf in pdfs:
-        key = str(pdf.relative_to(BASE_DIR))
-        current_hash = compute_file_hash(pdf)
-        new_hashes[key] = current_hash
+    files = {pdf.relative_to(BASE_DIR).as_posix(): pdf for pdf in pdfs}
+    new_hashes, changed_keys, stats = scan_digests(files, old_hashes, load_stat_cache())
+    save_stat_cache(stats)
 
-        if key not in old_hashes or old_hashes[key] != current_hash:
-            changed.append(pdf.name)
+    changed = [files[key].name for key in files if key in changed_keys]
 
     # Check for removed files
     for key in old_hashes:
@@ -84,6 +84,18 @@ def check_for_changes():
     return changed, new_hashes
 
 
+def get_lecture_title(pdf):
+    """Outline title and page label prefix for a lecture PDF.
+
+    20251211_2200_L01_What_is_Blockchain.pdf -> ("L01 What is Blockchain", "L01-")
+    """
+    match = re.match(r'^\d{8}_\d{4}_(L\d{2})_(.*)$', pdf.stem)
+    if not match:
+        return pdf.stem, ""
+    lesson_id, name = match.groups()
+    return f"{lesson_id} {name.replace('_', ' ')}", f"{lesson_id}-"
+
+
 def generate_combined_pdf():
     """Generate combined PDF from all lecture PDFs"""
     pdfs = get_lecture_pdfs()
@@ -94,14 +106,17 @@ def generate_combined_pdf():
     print("=" * 60)
     print(f"\nFound {len(pdfs)} lecture PDFs\n")
 
-    merger = PdfMerger()
+    # Write to a temp file so a failed merge never leaves a truncated PDF
+    temp_pdf = COMBINED_PDF.with_suffix(".pdf.tmp")
 
-    for pdf in pdfs:
-        print(f"  Adding: {pdf.name}")
-        merger.append(str(pdf))
+    with StreamingPdfMerger(temp_pdf) as merger:
+        for pdf in pdfs:
+            title, label = get_lecture_title(pdf)
+            merger.append(pdf, title=title, label=label)
+            _, first_page, page_count = merger.page_ranges[-1]
+            print(f"  Adding: {pdf.name} (pages {first_page + 1}-{first_page + page_count})")
 
-    merger.write(str(COMBINED_PDF))
-    merger.close()
+    temp_pdf.replace(COMBINED_PDF)
 
     size_mb = COMBINED_PDF.stat().st_size / (1024 * 1024)
 
@@ -109,37 +124,43 @@ def generate_combined_pdf():
     print(f"Combined PDF: {COMBINED_PDF}")
     print(f"Total size: {size_mb:.1f} MB")
     print(f"Contains: {len(pdfs)} lectures")
+    print(f"Shared objects reused: {merger.shared_objects}")
     print("=" * 60)
 
     return len(pdfs), size_mb
 
 
 def generate_zip():
-    """Generate ZIP file with all lecture PDFs"""
-    import zipfile
+    """Generate ZIP file with all lecture PDFs
 
+    Unchanged entries are copied from the previous ZIP without recompressing,
+    and the archive is reproducible (see tools/zip_archive.py).
+    """
     pdfs = get_lecture_pdfs()
 
     print(f"\nGenerating ZIP file...")
 
-    with zipfile.ZipFile(ZIP_FILE, 'w', zipfile.ZIP_DEFLATED) as zf:
-        for pdf in pdfs:
-            # Get module folder
-            for part in pdf.parts:
-                if part.startswith("Module_"):
-                    module_folder = part
-                    break
+    entries = []
+    for pdf in pdfs:
+        # Get module folder
+        for part in pdf.parts:
+            if part.startswith("Module_"):
+                module_folder = part
+                break
+
+        # Get lesson folder
+        lesson_folder = pdf.parent.name
+        if lesson_folder == "presentations":
+            lesson_folder = pdf.parent.parent.name
 
-            # Get lesson folder
-            lesson_folder = pdf.parent.name
-            if lesson_folder == "presentations":
-                lesson_folder = pdf.parent.parent.name
+        archive_name = f"{module_folder}/{lesson_folder}/{pdf.name}"
+        entries.append((archive_name, pdf))
 
-            archive_name = f"{module_folder}/{lesson_folder}/{pdf.name}"
-            zf.write(pdf, archive_name)
+    stats = update_archive(ZIP_FILE, entries)
 
     size_mb = ZIP_FILE.stat().st_size / (1024 * 1024)
     print(f"ZIP created: {ZIP_FILE} ({size_mb:.1f} MB)")
+    print(f"  Reused: {stats['reused']}, deflated: {stats['deflated']}, stored: {stats['stored']}")
 
     return size_mb
 
@@ -149,6 +170,8 @@ def main():
     changed, new_hashes = check_for_changes()
 
     if not changed and COMBINED_PDF.exists() and ZIP_FILE.exists():
+        # Same content, but legacy MD5 entries and backslash keys get upgraded
+        save_hashes(new_hashes)
         print("No changes detected. PDFs are up to date.")
         return False
 
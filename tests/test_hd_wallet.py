@@ -0,0 +1,46 @@
+"""HD wallet engine against BIP32 test vector 1 and the BIP44 test mnemonic."""
+
+from engines.hd_wallet import ExtendedKey, HDWallet, parse_path
+
+# BIP32 test vector 1
+VECTOR1_SEED = bytes.fromhex('000102030405060708090a0b0c0d0e0f')
+VECTOR1 = {
+    'm': ('xpub661MyMwAqRbcFtXgS5sYJABqqG9YLmC4Q1Rdap9gSE8NqtwybGhePY2gZ29ESFjqJoCu1Rupje8YtGqsefD265TMg7usUDFdp6W1EGMcet8',
+          'xprv9s21ZrQH143K3QTDL4LXw2F7HEK3wJUD2nW2nRk4stbPy6cq3jPPqjiChkVvvNKmPGJxWUtg6LnF5kejMRNNU3TGtRBeJgk33yuGBxrMPHi'),
+    "m/0'": ('xpub68Gmy5EdvgibQVfPdqkBBCHxA5htiqg55crXYuXoQRKfDBFA1WEjWgP6LHhwBZeNK1VTsfTFUHCdrfp1bgwQ9xv5ski8PX9rL2dZXvgGDnw',
+             'xprv9uHRZZhk6KAJC1avXpDAp4MDc3sQKNxDiPvvkX8Br5ngLNv1TxvUxt4cV1rGL5hj6KCesnDYUhd7oWgT11eZG7XnxHrnYeSvkzY7d2bhkJ7'),
+}
+VECTOR1_DEEP = ("m/0'/1/2'/2/1000000000",
+                'xpub6H1LXWLaKsWFhvm6RVpEL9P4KfRZSW7abD2ttkWP3SSQvnyA8FSVqNTEcYFgJS2UaFcxupHiYkro49S8yGasTvXEYBVPamhGW6cFJodrTHy')
+
+TEST_MNEMONIC = 'abandon ' * 11 + 'about'
+
+
+def test_bip32_vector1():
+    wallet = HDWallet(VECTOR1_SEED)
+    for path, (xpub, xprv) in VECTOR1.items():
+        key = wallet.derive(path)
+        assert key.serialize() == xprv
+        assert key.serialize(private=False) == xpub
+    path, xpub = VECTOR1_DEEP
+    assert wallet.derive(path).serialize(private=False) == xpub
+    assert ExtendedKey.from_seed(VECTOR1_SEED).derive(path).serialize(private=False) == xpub
+
+
+def test_bip44_test_mnemonic():
+    wallet = HDWallet.from_mnemonic(TEST_MNEMONIC)
+    assert wallet.address("m/44'/0'/0'/0/0") == '1LqBGSKuX5yYUonjxT5qGfpUsXKYYWeabA'
+
+
+def test_batch_and_xpub_match_single_derivation():
+    wallet = HDWallet.from_mnemonic(TEST_MNEMONIC)
+    parent = "m/44'/0'/0'/0"
+    expected = [wallet.address(f'{parent}/{i}') for i in range(5)]
+    assert wallet.addresses(parent, 0, 5) == expected
+    watch_only = wallet.derive(parent).neuter()
+    assert [child.address() for child in watch_only.children(0, 5)] == expected
+    assert watch_only.child(3).address() == expected[3]
+
+
+def test_parse_path():
+    assert parse_path("m/44'/0h/5") == (44 + 2 ** 31, 2 ** 31, 5)
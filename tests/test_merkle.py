@@ -0,0 +1,46 @@
+"""Merkle engine against Bitcoin block 100000 and a full rebuild."""
+
+import pytest
+
+from engines.merkle import MerkleTree, merkle_root, sha256d, verify_proof
+
+# Block 100000: txids and merkle root in display (reversed) byte order
+BLOCK_100000_TXIDS = [
+    '8c14f0db3df150123e6f3dbbf30f8b955a8249b62ac1d1ff16284aefa3d06d87',
+    'fff2525b8931402dd09222c50775608f75787bd2b87e56995a7bdd30f79702c4',
+    '6359f0868171b1d194cbee1af2f16ea598ae8fad666d9b012c8ed2b79a236ec4',
+    'e9a66845e05d5abc0ad04ec80f774a7e585c6e8db975962d069a522137b80c1d',
+]
+BLOCK_100000_ROOT = 'f3e94742aca4b5ef85488dc37c06c3282295ffec960994b2c0d5ac2a25a95766'
+
+
+def _internal(display_hex):
+    return bytes.fromhex(display_hex)[::-1]
+
+
+def test_block_100000_root():
+    root = merkle_root([_internal(txid) for txid in BLOCK_100000_TXIDS])
+    assert root[::-1].hex() == BLOCK_100000_ROOT
+
+
+def test_proofs_verify():
+    tree = MerkleTree.from_data([b'tx %d' % i for i in range(37)])
+    for index in range(len(tree)):
+        assert verify_proof(tree.leaf(index), index, tree.proof(index), tree.root)
+
+
+def test_incremental_matches_rebuild():
+    leaves = [sha256d(b'tx %d' % i) for i in range(37)]
+    tree = MerkleTree(leaves[:20])
+    tree.extend(leaves[20:])
+    tree.update(36, sha256d(b'changed'))
+    leaves[36] = sha256d(b'changed')
+    assert tree.root == MerkleTree(leaves).root
+
+
+def test_update_rejects_bad_index():
+    tree = MerkleTree([sha256d(b'tx %d' % i) for i in range(37)])
+    for index in (-1, len(tree)):
+        with pytest.raises(IndexError):
+            tree.update(index, bytes(32))
+    assert len(tree) == 37
@@ -0,0 +1,43 @@
+"""secp256k1 engine against the RFC 6979 test vector and known addresses."""
+
+from engines.secp256k1 import (G, N, P, decode_public_key, encode_public_key, message_hash, p2pkh_address,
+                               public_key, public_key_batch, rfc6979_nonce, scalar_multiply, sign, verify,
+                               verify_batch)
+
+# Private key 1, message "Satoshi Nakamoto" (SHA-256), low-s signature
+SATOSHI_NONCE = 0x8F8A276C19F4149656B280621E358CCE24F5F52542772691EE69063B74F15D15
+SATOSHI_R = 0x934B1EA10A4B3C1757E2B0C017D0B6143CE3C9A7E6A4A49860D7A6AB210EE3D8
+SATOSHI_S = 0x2442CE9D2B916064108014783E923EC36B49743E2FFA1C4496F01A512AAFD9E5
+
+
+def test_rfc6979_vector():
+    z = message_hash(b'Satoshi Nakamoto')
+    assert rfc6979_nonce(1, z) == SATOSHI_NONCE
+    assert sign(1, z) == (SATOSHI_R, SATOSHI_S)
+    assert verify(G, z, (SATOSHI_R, SATOSHI_S))
+
+
+def test_addresses_of_key_one():
+    assert p2pkh_address(public_key(1)) == '1BgGZ9tcN4rm9KBzDn7KprQz87SZ26SAMH'
+    assert p2pkh_address(public_key(1), compressed=False) == '1EHNa6Q4Jz2uvNExL497mE43ikXhwF6kZm'
+
+
+def test_group_order():
+    assert scalar_multiply(N - 1) == (G[0], P - G[1])
+    assert scalar_multiply(N) is None
+
+
+def test_batch_matches_single():
+    keys = [3, 12345, N - 2, 2 ** 200 + 7]
+    assert public_key_batch(keys) == [scalar_multiply(k) for k in keys]
+    for compressed in (True, False):
+        point = public_key(12345)
+        assert decode_public_key(encode_public_key(point, compressed)) == point
+
+
+def test_verify_batch_rejects_tampered():
+    keys = [5, 6, 7]
+    hashes = [message_hash(b'tx %d' % i) for i in range(3)]
+    signatures = [sign(k, z) for k, z in zip(keys, hashes)]
+    hashes[1] = message_hash(b'tampered')
+    assert verify_batch(public_key_batch(keys), hashes, signatures) == [True, False, True]
@@ -0,0 +1,345 @@
+"""
+Chart Build Engine
+Renders chart.py scripts in a persistent pool of worker processes.
+
+Each worker imports matplotlib (Agg backend) and numpy once at start-up and
+then executes chart scripts in a fresh namespace, so a full regeneration pays
+the interpreter and import cost once per core instead of once per chart.
+rcParams, sys.path and the working directory are restored after every chart.
+
+Incremental mode writes a chart.manifest.json next to every chart.pdf that
+records the hash of chart.py, of every file it depends on (sibling data files
+and project modules it imports), the matplotlib version and a fingerprint of
+the default rcParams. Charts whose manifest still matches are skipped.
+
+Usage (library):
+    from chart_build import build_charts
+    results = build_charts(chart_files, jobs=4, timeout=60)
+    results = build_charts(chart_files, incremental=True)  # Skip unchanged
+"""
+
+import ast
+import hashlib
+import io
+import json
+import os
+import sys
+import threading
+import time
+import traceback
+import _thread
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import redirect_stdout, redirect_stderr
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+DEFAULT_TIMEOUT = 60
+MANIFEST_NAME = 'chart.manifest.json'
+MANIFEST_VERSION = 1
+
+# Files in a chart folder that are build outputs, not inputs
+OUTPUT_FILES = {'chart.pdf', 'chart.png', MANIFEST_NAME}
+
+STATUS_OK = 'OK'
+STATUS_ERROR = 'ERROR'
+STATUS_TIMEOUT = 'TIMEOUT'
+STATUS_EXCEPTION = 'EXCEPTION'
+STATUS_SKIPPED = 'SKIPPED'
+
+
+class ChartResult:
+    """Outcome of rendering a single chart script."""
+    def __init__(self, chart_file: Path, status: str, message: str = '',
+                 elapsed: float = 0.0):
+        self.chart_file = chart_file
+        self.status = status
+        self.message = message
+        self.elapsed = elapsed
+
+    @property
+    def ok(self) -> bool:
+        return self.status in (STATUS_OK, STATUS_SKIPPED)
+
+    def __repr__(self):
+        return f"ChartResult({self.chart_file.parent.name}, {self.status}, {self.elapsed:.2f}s)"
+
+
+def _init_worker():
+    """Import the plotting stack once per worker process."""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot  # noqa: F401
+    import numpy  # noqa: F401
+
+
+def _drain_interrupt():
+    """Take a KeyboardInterrupt a timeout timer requested just as the chart finished.
+
+    interrupt_main() only flags the main thread; the exception is raised at
+    its next bytecode check, which could otherwise land in the cleanup code
+    or after _run_chart returned.
+    """
+    try:
+        for _ in range(100):
+            time.sleep(0)
+    except KeyboardInterrupt:
+        pass
+
+
+def _restore_modules(saved: Dict[str, object], chart_dir: Path):
+    """Forget modules a chart imported from its own folder and undo replaced entries.
+
+    Engines and libraries a chart imports stay cached for the next chart;
+    a chart-local helper.py must not be reused by another chart's import.
+    """
+    for name, module in list(sys.modules.items()):
+        if name in saved:
+            if saved[name] is not module:
+                sys.modules[name] = saved[name]
+            continue
+        path = getattr(module, '__file__', None)
+        if path and chart_dir in Path(path).resolve().parents:
+            del sys.modules[name]
+
+
+def _run_chart(chart_file: str, timeout: float) -> ChartResult:
+    """Execute one chart.py in an isolated namespace inside a worker."""
+    import matplotlib
+    import matplotlib.pyplot as plt
+
+    chart_path = Path(chart_file).resolve()
+    start = time.perf_counter()
+    stderr = io.StringIO()
+    saved_cwd = os.getcwd()
+    saved_path = list(sys.path)
+    saved_modules = dict(sys.modules)
+    timed_out = threading.Event()
+
+    def on_timeout():
+        timed_out.set()
+        _thread.interrupt_main()
+
+    timer = threading.Timer(timeout, on_timeout) if timeout else None
+
+    namespace = {'__name__': '__main__', '__file__': str(chart_path),
+                 '__builtins__': __builtins__}
+    status, message = STATUS_OK, ''
+
+    try:
+        source = chart_path.read_text(encoding='utf-8')
+        code = compile(source, str(chart_path), 'exec')
+        os.chdir(chart_path.parent)
+        sys.path.insert(0, str(chart_path.parent))
+        with matplotlib.rc_context(), redirect_stdout(io.StringIO()), redirect_stderr(stderr):
+            if timer:
+                timer.start()
+            try:
+                exec(code, namespace)
+            except SystemExit as e:
+                # sys.exit(1) in a chart fails that chart, not the build
+                if e.code not in (None, 0):
+                    status = STATUS_ERROR
+                    message = (stderr.getvalue() + f'SystemExit: {e.code}').strip()
+            finally:
+                if timer:
+                    timer.cancel()
+                    timer.join()
+                    if timed_out.is_set():
+                        _drain_interrupt()
+    except KeyboardInterrupt:
+        if not timed_out.is_set():
+            raise
+        status, message = STATUS_TIMEOUT, f'exceeded {timeout}s'
+    except Exception:
+        status = STATUS_ERROR
+        message = (stderr.getvalue() + traceback.format_exc()).strip()
+    finally:
+        plt.close('all')
+        os.chdir(saved_cwd)
+        sys.path[:] = saved_path
+        _restore_modules(saved_modules, chart_path.parent)
+
+    return ChartResult(chart_path, status, message, time.perf_counter() - start)
+
+
+def _file_hash(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def _resolve_module(name: str, search_dirs: List[Path]) -> Optional[Path]:
+    """Map a dotted module name to a .py file inside the project, if any."""
+    parts = name.split('.')
+    for base in search_dirs:
+        candidate = base.joinpath(*parts)
+        for path in (candidate.with_suffix('.py'), candidate / '__init__.py'):
+            if path.is_file():
+                return path
+    return None
+
+
+def _local_imports(py_file: Path, root: Path) -> List[Path]:
+    """Project-local modules imported by py_file (not followed recursively)."""
+    try:
+        tree = ast.parse(py_file.read_text(encoding='utf-8'))
+    except (SyntaxError, UnicodeDecodeError):
+        return []
+
+    names = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names.append(node.module)
+            names.extend(f"{node.module}.{alias.name}" for alias in node.names)
+
+    search_dirs = [py_file.parent, root]
+    found = []
+    for name in names:
+        # Also register parent packages: engines.amm -> engines/__init__.py
+        parts = name.split('.')
+        for i in range(1, len(parts) + 1):
+            path = _resolve_module('.'.join(parts[:i]), search_dirs)
+            if path and root in path.resolve().parents:
+                found.append(path.resolve())
+    return found
+
+
+def chart_inputs(chart_file: Path, root: Path = PROJECT_ROOT) -> Dict[str, str]:
+    """Hash every file a chart depends on, keyed by path relative to root."""
+    chart_file = chart_file.resolve()
+    root = root.resolve()
+    inputs = {}
+
+    # chart.py plus any data files sitting next to it
+    for path in sorted(chart_file.parent.iterdir()):
+        if path.is_file() and path.name not in OUTPUT_FILES:
+            inputs[path] = None
+
+    # Project modules imported directly or transitively
+    pending = [chart_file]
+    seen = {chart_file}
+    while pending:
+        for dep in _local_imports(pending.pop(), root):
+            if dep not in seen:
+                seen.add(dep)
+                inputs[dep] = None
+                pending.append(dep)
+
+    return {path.relative_to(root).as_posix(): _file_hash(path)
+            for path in sorted(inputs)}
+
+
+_ENVIRONMENT = None
+
+
+def environment_fingerprint() -> Dict[str, str]:
+    """matplotlib version and a hash of the rcParams charts start from."""
+    global _ENVIRONMENT
+    if _ENVIRONMENT is None:
+        _init_worker()
+        import matplotlib
+        rc = sorted((k, repr(v)) for k, v in matplotlib.rcParams.items())
+        _ENVIRONMENT = {
+            'matplotlib': matplotlib.__version__,
+            'rcparams': hashlib.sha256(repr(rc).encode('utf-8')).hexdigest(),
+        }
+    return _ENVIRONMENT
+
+
+def compute_manifest(chart_file: Path, root: Path = PROJECT_ROOT) -> Dict:
+    """Build the manifest a freshly rendered chart would have."""
+    inputs = chart_inputs(chart_file, root)
+    env = environment_fingerprint()
+    return {
+        'version': MANIFEST_VERSION,
+        'source_hash': _file_hash(chart_file),
+        'inputs': inputs,
+        'matplotlib': env['matplotlib'],
+        'rcparams': env['rcparams'],
+    }
+
+
+def load_manifest(chart_file: Path) -> Optional[Dict]:
+    manifest_path = chart_file.parent / MANIFEST_NAME
+    try:
+        return json.loads(manifest_path.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return None
+
+
+def save_manifest(chart_file: Path, manifest: Dict):
+    manifest_path = chart_file.parent / MANIFEST_NAME
+    manifest_path.write_text(json.dumps(manifest, indent=2, sort_keys=True) + '\n',
+                             encoding='utf-8')
+
+
+def is_up_to_date(chart_file: Path, manifest: Dict) -> bool:
+    """True if chart.pdf exists and was built from exactly these inputs."""
+    return ((chart_file.parent / 'chart.pdf').exists()
+            and load_manifest(chart_file) == manifest)
+
+
+def default_jobs() -> int:
+    """Number of worker processes to use when none is given."""
+    return os.cpu_count() or 1
+
+
+def build_charts(chart_files: List[Path], jobs: Optional[int] = None,
+                 timeout: float = DEFAULT_TIMEOUT,
+                 on_result: Optional[Callable[[ChartResult], None]] = None,
+                 incremental: bool = False,
+                 root: Path = PROJECT_ROOT) -> Dict[Path, ChartResult]:
+    """Render chart scripts across a worker pool.
+
+    on_result is called in the parent process as each chart finishes, in
+    completion order. With incremental=True, charts whose manifest matches
+    their current inputs are reported as SKIPPED without being rendered.
+    Returns a dict mapping each chart file to its result.
+    """
+    chart_files = [Path(f) for f in chart_files]
+    results: Dict[Path, ChartResult] = {}
+    manifests: Dict[Path, Dict] = {}
+
+    if incremental:
+        stale = []
+        for chart_file in chart_files:
+            manifest = compute_manifest(chart_file, root)
+            if is_up_to_date(chart_file, manifest):
+                results[chart_file] = ChartResult(chart_file, STATUS_SKIPPED)
+                if on_result:
+                    on_result(results[chart_file])
+            else:
+                manifests[chart_file] = manifest
+                stale.append(chart_file)
+        chart_files = stale
+
+    if not chart_files:
+        return results
+
+    jobs = max(1, min(jobs or default_jobs(), len(chart_files)))
+
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker) as pool:
+        futures = {pool.submit(_run_chart, str(f), timeout): f for f in chart_files}
+        for future in as_completed(futures):
+            chart_file = futures[future]
+            try:
+                result = future.result()
+            except KeyboardInterrupt:
+                raise
+            except BaseException as e:
+                # Worker died (segfault, out of memory) or result not picklable
+                result = ChartResult(chart_file, STATUS_EXCEPTION, str(e) or type(e).__name__)
+            results[chart_file] = result
+
+            if incremental:
+                if result.ok:
+                    save_manifest(chart_file, manifests[chart_file])
+                else:
+                    (chart_file.parent / MANIFEST_NAME).unlink(missing_ok=True)
+
+            if on_result:
+                on_result(result)
+
+    return results
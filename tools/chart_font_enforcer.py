@@ -13,10 +13,12 @@ Usage:
     python chart_font_enforcer.py --all --fix          # Fix all charts
 """
 
-import re
 import sys
 from pathlib import Path
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Tuple
+
+from chart_model import ChartModel, get_model, get_models
+from course_index import get_index
 
 # Minimum font sizes for readability on scaled charts
 MIN_FONTS = {
@@ -40,13 +42,36 @@ RCPARAMS_MIN = {
 }
 
 
+def _apply_replacements(source: str, replacements: Dict[tuple, str]) -> str:
+    """Replace source spans (line, col, end_line, end_col) with new text.
+
+    Columns are UTF-8 byte offsets, as reported by the ast module.
+    """
+    lines = source.splitlines(keepends=True)
+    offsets = [0]
+    for line in lines:
+        offsets.append(offsets[-1] + len(line))
+
+    def position(line, col):
+        text = lines[line - 1]
+        return offsets[line - 1] + len(text.encode('utf-8')[:col].decode('utf-8'))
+
+    # Apply from the end so earlier offsets stay valid
+    for span in sorted(replacements, reverse=True):
+        start, end = position(span[0], span[1]), position(span[2], span[3])
+        source = source[:start] + replacements[span] + source[end:]
+    return source
+
+
 class ChartFontEnforcer:
-    def __init__(self, chart_path: Path):
+    def __init__(self, chart_path: Path, model: Optional[ChartModel] = None):
         self.chart_path = chart_path
+        self.model = model
         self.original_code = ""
         self.fixed_code = ""
         self.issues: List[Dict] = []
         self.fixes_made: List[str] = []
+        self._replacements: Dict[tuple, str] = {}
 
     def analyze(self) -> List[Dict]:
         """Analyze chart for font size issues."""
@@ -59,53 +84,62 @@ class ChartFontEnforcer:
 
         self.original_code = self.chart_path.read_text(encoding='utf-8')
         self.fixed_code = self.original_code
+        if self.model is None:
+            self.model = get_model(self.chart_path)
+        if self.model.error:
+            self.issues.append({
+                'type': 'PARSE_ERROR',
+                'message': f'Could not parse chart: {self.model.error}'
+            })
+            return self.issues
 
         self._check_rcparams()
         self._check_fontsize_params()
+        self.fixed_code = _apply_replacements(self.original_code, self._replacements)
 
         return self.issues
 
     def _check_rcparams(self):
         """Check and fix rcParams font sizes."""
         for param, min_val in RCPARAMS_MIN.items():
-            # Pattern: 'param': N or "param": N
-            pattern = rf"(['\"]){re.escape(param)}\1\s*:\s*(\d+)"
-            match = re.search(pattern, self.fixed_code)
-
-            if match:
-                current_val = int(match.group(2))
-                if current_val < min_val:
-                    self.issues.append({
-                        'type': 'RCPARAMS_TOO_SMALL',
-                        'param': param,
-                        'current': current_val,
-                        'minimum': min_val
-                    })
-                    # Fix it
-                    old = match.group(0)
-                    new = old.replace(str(current_val), str(min_val))
-                    self.fixed_code = self.fixed_code.replace(old, new)
-                    self.fixes_made.append(f"rcParams['{param}']: {current_val} -> {min_val}")
+            entry = self.model.rcparams.get(param)
+            current_val = entry['value'] if entry else None
 
-    def _check_fontsize_params(self):
-        """Check and fix fontsize=N parameters."""
-        # Pattern: fontsize=N or fontsize = N
-        pattern = r'fontsize\s*=\s*(\d+)'
-
-        def replace_fontsize(match):
-            current = int(match.group(1))
-            if current < MIN_FONTS['default']:
-                new_size = max(MIN_FONTS['default'], int(current * 1.3))  # 30% increase, minimum 14
+            if isinstance(current_val, (int, float)) and current_val < min_val:
                 self.issues.append({
-                    'type': 'FONTSIZE_TOO_SMALL',
-                    'current': current,
-                    'fixed': new_size
+                    'type': 'RCPARAMS_TOO_SMALL',
+                    'param': param,
+                    'current': current_val,
+                    'minimum': min_val
                 })
-                self.fixes_made.append(f"fontsize: {current} -> {new_size}")
-                return f'fontsize={new_size}'
-            return match.group(0)
+                # Fix it (only literals, or constants used just for font sizes, are rewritten)
+                if entry['span']:
+                    self._replacements[tuple(entry['span'])] = str(min_val)
+                    self.fixes_made.append(f"rcParams['{param}']: {current_val} -> {min_val}")
 
-        self.fixed_code = re.sub(pattern, replace_fontsize, self.fixed_code)
+    def _check_fontsize_params(self):
+        """Check and fix fontsize=N parameters.
+
+        A constant (fontsize=SMALL) is rewritten at its assignment only when
+        every use of it is a font size; otherwise it is reported but left alone.
+        """
+        for size in self.model.fontsizes:
+            current = size.value
+            if not isinstance(current, (int, float)) or isinstance(current, bool):
+                continue
+            if current >= MIN_FONTS['default'] or size.span in self._replacements:
+                continue
+
+            new_size = max(MIN_FONTS['default'], int(current * 1.3))  # 30% increase, minimum 14
+            self.issues.append({
+                'type': 'FONTSIZE_TOO_SMALL',
+                'current': current,
+                'fixed': new_size if size.span else None,
+                'line': size.line
+            })
+            if size.span:
+                self._replacements[size.span] = str(new_size)
+                self.fixes_made.append(f"{size.keyword}: {current} -> {new_size} (line {size.line})")
 
     def fix(self) -> bool:
         """Apply fixes to the file."""
@@ -129,7 +163,10 @@ class ChartFontEnforcer:
             if issue['type'] == 'RCPARAMS_TOO_SMALL':
                 print(f"  - rcParams['{issue['param']}']: {issue['current']}pt < {issue['minimum']}pt minimum")
             elif issue['type'] == 'FONTSIZE_TOO_SMALL':
-                print(f"  - fontsize={issue['current']}pt < {MIN_FONTS['default']}pt minimum")
+                manual = '' if issue['fixed'] else f" (line {issue['line']}: shared constant, fix by hand)"
+                print(f"  - fontsize={issue['current']}pt < {MIN_FONTS['default']}pt minimum{manual}")
+            elif issue['type'] == 'PARSE_ERROR':
+                print(f"  - {issue['message']}")
 
         if self.fixes_made:
             print(f"\nFIXES TO APPLY ({len(self.fixes_made)}):")
@@ -140,7 +177,8 @@ class ChartFontEnforcer:
 def process_all_charts(base_path: Path, fix: bool = False) -> Dict[str, List]:
     """Process all chart.py files in the project."""
     results = {}
-    chart_files = list(base_path.rglob('chart.py'))
+    chart_files = [chart.script for chart in get_index(base_path).charts]
+    models = get_models(chart_files, root=base_path)
 
     print(f"Found {len(chart_files)} chart files\n")
 
@@ -148,7 +186,7 @@ def process_all_charts(base_path: Path, fix: bool = False) -> Dict[str, List]:
     total_fixed = 0
 
     for chart_file in sorted(chart_files):
-        enforcer = ChartFontEnforcer(chart_file)
+        enforcer = ChartFontEnforcer(chart_file, models[chart_file])
         issues = enforcer.analyze()
 
         if issues:
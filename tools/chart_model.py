@@ -0,0 +1,549 @@
+"""
+Chart Model
+Single AST pass over a chart.py that extracts what the chart tools check.
+
+The overlap detector, readability analyzer and font enforcer all work from
+the same ChartModel instead of running their own line-based regexes, so
+multi-line calls, module-level constants (fontsize=LABEL_SIZE) and
+transform=ax.transAxes are understood the same way everywhere.
+
+A model holds:
+- texts:     text/annotate/title/label/legend/tick calls with position,
+             string, font size, alignment and coordinate system
+- fontsizes: every font size argument, with the source span of its literal
+             value so it can be rewritten in place (a constant's assignment
+             only when the constant is used for nothing but font sizes)
+- patches:   Rectangle, FancyBboxPatch, Circle, ... with their extent
+- grids:     subplot grids (subplots, add_subplot, GridSpec)
+- figsizes, limits (set_xlim/set_ylim) and rcparams
+
+Models are cached by the SHA-256 of the source: in memory for the process,
+and in .chart_models.json at the project root when loaded with get_models().
+
+Usage (library):
+    from chart_model import get_model, get_models
+    model = get_model(chart_path)
+    models = get_models(chart_files)   # {path: ChartModel}, persistent cache
+"""
+
+import ast
+import hashlib
+import json
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+CACHE_NAME = '.chart_models.json'
+MODEL_VERSION = 2
+
+# Method/function name -> text role
+TEXT_CALLS = {
+    'text': 'text', 'figtext': 'text', 'annotate': 'annotation',
+    'set_title': 'title', 'title': 'title', 'suptitle': 'title',
+    'set_xlabel': 'label', 'set_ylabel': 'label', 'xlabel': 'label', 'ylabel': 'label',
+    'legend': 'legend', 'set_xticklabels': 'tick', 'set_yticklabels': 'tick',
+    'xticks': 'tick', 'yticks': 'tick', 'tick_params': 'tick', 'bar_label': 'annotation',
+    'table': 'table',
+}
+
+# Keywords that set a font size, in any call
+FONTSIZE_KEYWORDS = {'fontsize', 'labelsize', 'title_fontsize'}
+
+PATCH_CALLS = {'Rectangle', 'FancyBboxPatch', 'Circle', 'Ellipse', 'Wedge',
+               'Polygon', 'FancyArrowPatch', 'Arc', 'RegularPolygon'}
+
+TRANSFORMS = {'transAxes': 'axes', 'transData': 'data', 'transFigure': 'figure'}
+
+# Span of a literal in the source: (line, col, end_line, end_col), 1-based lines
+Span = Tuple[int, int, int, int]
+
+
+class TextCall:
+    """A call that puts text on the figure."""
+    def __init__(self, role: str, func: str, owner: str, line: int,
+                 x: Optional[float] = None, y: Optional[float] = None,
+                 text: Optional[str] = None, fontsize=None,
+                 ha: Optional[str] = None, va: Optional[str] = None,
+                 transform: str = 'data', end_line: Optional[int] = None):
+        self.role = role
+        self.func = func
+        self.owner = owner
+        self.line = line
+        self.end_line = end_line or line
+        self.x = x
+        self.y = y
+        self.text = text
+        self.fontsize = fontsize
+        self.ha = ha
+        self.va = va
+        self.transform = transform
+
+    def to_dict(self) -> Dict:
+        return dict(self.__dict__)
+
+    def __repr__(self):
+        return f"TextCall({self.func}, {self.text!r:.30} line {self.line})"
+
+
+class FontSize:
+    """A font size argument; span locates the literal holding its value, if it may be rewritten."""
+    def __init__(self, keyword: str, func: str, line: int, value=None,
+                 span: Optional[Span] = None):
+        self.keyword = keyword
+        self.func = func
+        self.line = line
+        self.value = value
+        self.span = tuple(span) if span else None
+
+    def to_dict(self) -> Dict:
+        return dict(self.__dict__)
+
+    def __repr__(self):
+        return f"FontSize({self.keyword}={self.value} line {self.line})"
+
+
+class PatchCall:
+    """A patch constructor with its extent, when the arguments are literal."""
+    def __init__(self, kind: str, line: int, owner: Optional[str] = None,
+                 x_min: Optional[float] = None, y_min: Optional[float] = None,
+                 x_max: Optional[float] = None, y_max: Optional[float] = None,
+                 transform: str = 'data'):
+        self.kind = kind
+        self.line = line
+        self.owner = owner
+        self.x_min = x_min
+        self.y_min = y_min
+        self.x_max = x_max
+        self.y_max = y_max
+        self.transform = transform
+
+    @property
+    def has_extent(self) -> bool:
+        return None not in (self.x_min, self.y_min, self.x_max, self.y_max)
+
+    def to_dict(self) -> Dict:
+        return dict(self.__dict__)
+
+    def __repr__(self):
+        return f"PatchCall({self.kind} line {self.line})"
+
+
+class ChartModel:
+    """Everything the chart tools need to know about one chart.py."""
+    def __init__(self, path: Path, source_hash: str = ''):
+        self.path = Path(path)
+        self.source_hash = source_hash
+        self.error: Optional[str] = None
+        self.texts: List[TextCall] = []
+        self.fontsizes: List[FontSize] = []
+        self.patches: List[PatchCall] = []
+        self.grids: List[Dict] = []         # {'rows', 'cols', 'func', 'line'}
+        self.figsizes: List[Dict] = []      # {'width', 'height', 'line'}
+        self.limits: Dict[str, Dict] = {}   # owner -> {'x': [lo, hi], 'y': [lo, hi]}
+        self.rcparams: Dict[str, Dict] = {} # param -> {'value', 'line', 'span'}
+
+    @property
+    def text_count(self) -> int:
+        """Text and annotate calls, as counted for text density."""
+        return sum(1 for t in self.texts if t.func in ('text', 'figtext', 'annotate'))
+
+    def to_dict(self) -> Dict:
+        return {
+            'source_hash': self.source_hash,
+            'error': self.error,
+            'texts': [t.to_dict() for t in self.texts],
+            'fontsizes': [f.to_dict() for f in self.fontsizes],
+            'patches': [p.to_dict() for p in self.patches],
+            'grids': self.grids,
+            'figsizes': self.figsizes,
+            'limits': self.limits,
+            'rcparams': self.rcparams,
+        }
+
+    @classmethod
+    def from_dict(cls, path: Path, data: Dict) -> 'ChartModel':
+        model = cls(path, data['source_hash'])
+        model.error = data['error']
+        model.texts = [TextCall(**t) for t in data['texts']]
+        model.fontsizes = [FontSize(**f) for f in data['fontsizes']]
+        model.patches = [PatchCall(**p) for p in data['patches']]
+        model.grids = data['grids']
+        model.figsizes = data['figsizes']
+        model.limits = data['limits']
+        model.rcparams = data['rcparams']
+        return model
+
+    def __repr__(self):
+        return f"ChartModel({self.path.parent.name}, {len(self.texts)} texts)"
+
+
+# -- extraction -------------------------------------------------------------
+
+def _span(node: ast.AST) -> Span:
+    return (node.lineno, node.col_offset, node.end_lineno, node.end_col_offset)
+
+
+def _func_name(call: ast.Call) -> Tuple[str, str]:
+    """(function name, receiver source) for f(...) or obj.f(...)."""
+    func = call.func
+    if isinstance(func, ast.Attribute):
+        return func.attr, ast.unparse(func.value)
+    if isinstance(func, ast.Name):
+        return func.id, ''
+    return '', ''
+
+
+class _Extractor(ast.NodeVisitor):
+    def __init__(self, model: ChartModel):
+        self.model = model
+        self.constants: Dict[str, Tuple[object, Optional[Span]]] = {}
+        self.figures = {'fig'}
+        self.parents: Dict[ast.AST, ast.AST] = {}
+        self.loads: Counter = Counter()       # name -> times it is read
+        self.font_loads: Counter = Counter()  # name -> times it is read as a font size
+
+    # -- values ------------------------------------------------------------
+
+    def collect_constants(self, tree: ast.AST):
+        """Names bound exactly once (or always to the same value) to a literal."""
+        ambiguous = set()
+        for node in ast.walk(tree):
+            for child in ast.iter_child_nodes(node):
+                self.parents[child] = node
+            if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Load):
+                self.loads[node.id] += 1
+            if isinstance(node, ast.Assign):
+                value = node.value
+                if isinstance(value, ast.Call) and _func_name(value)[0] in ('figure', 'subplots'):
+                    target = node.targets[0]
+                    if isinstance(target, ast.Tuple) and target.elts:
+                        target = target.elts[0]
+                    if isinstance(target, ast.Name):
+                        self.figures.add(target.id)
+                for target in node.targets:
+                    if not isinstance(target, ast.Name):
+                        continue
+                    name = target.id
+                    try:
+                        literal = self.value(value)
+                    except ValueError:
+                        ambiguous.add(name)
+                        continue
+                    span = _span(value) if isinstance(value, ast.Constant) else None
+                    if name in self.constants and self.constants[name][0] != literal:
+                        ambiguous.add(name)
+                    self.constants[name] = (literal, span)
+            elif isinstance(node, (ast.AugAssign, ast.For, ast.comprehension)):
+                target = node.target
+                names = target.elts if isinstance(target, ast.Tuple) else [target]
+                ambiguous.update(n.id for n in names if isinstance(n, ast.Name))
+        for name in ambiguous:
+            self.constants.pop(name, None)
+
+    def value(self, node: ast.AST):
+        """Evaluate a literal expression, resolving known constants."""
+        if isinstance(node, ast.Constant):
+            return node.value
+        if isinstance(node, ast.Name) and node.id in self.constants:
+            return self.constants[node.id][0]
+        if isinstance(node, (ast.Tuple, ast.List)):
+            return [self.value(e) for e in node.elts]
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+            operand = self.value(node.operand)
+            if isinstance(operand, (int, float)):
+                return -operand if isinstance(node.op, ast.USub) else operand
+        if isinstance(node, ast.BinOp) and isinstance(node.op, (ast.Add, ast.Sub, ast.Mult, ast.Div)):
+            left, right = self.value(node.left), self.value(node.right)
+            if isinstance(left, (int, float)) and isinstance(right, (int, float)):
+                if isinstance(node.op, ast.Add):
+                    return left + right
+                if isinstance(node.op, ast.Sub):
+                    return left - right
+                if isinstance(node.op, ast.Mult):
+                    return left * right
+                if right:
+                    return left / right
+        if isinstance(node, ast.JoinedStr):
+            # f-string: keep the literal parts, placeholders count as two characters
+            return ''.join(v.value if isinstance(v, ast.Constant) else 'XX' for v in node.values)
+        raise ValueError(ast.dump(node))
+
+    def maybe(self, node: Optional[ast.AST], types=None):
+        if node is None:
+            return None
+        try:
+            value = self.value(node)
+        except ValueError:
+            return None
+        if types and not isinstance(value, types):
+            return None
+        return value
+
+    def value_span(self, node: ast.AST) -> Optional[Span]:
+        """Where the literal behind a font size lives (the node itself or a constant's assignment)."""
+        if isinstance(node, ast.Constant):
+            return _span(node)
+        if isinstance(node, ast.Name) and node.id in self.constants:
+            self.font_loads[node.id] += 1
+            return self.constants[node.id][1]
+        return None
+
+    def drop_shared_spans(self):
+        """Forget assignment spans of constants that are also read for something else.
+
+        Rewriting SMALL = 10 would change every other use of SMALL too.
+        """
+        shared = {self.constants[name][1] for name in self.font_loads
+                  if self.loads[name] > self.font_loads[name] and self.constants[name][1]}
+        for size in self.model.fontsizes:
+            if size.span in shared:
+                size.span = None
+        for entry in self.model.rcparams.values():
+            if entry['span'] in shared:
+                entry['span'] = None
+
+    @staticmethod
+    def arg(call: ast.Call, index: Optional[int], keyword: Optional[str]) -> Optional[ast.AST]:
+        for kw in call.keywords:
+            if keyword and kw.arg == keyword:
+                return kw.value
+        if index is not None and index < len(call.args) and not isinstance(call.args[index], ast.Starred):
+            return call.args[index]
+        return None
+
+    def transform(self, call: ast.Call, default: str) -> str:
+        node = self.arg(call, None, 'transform')
+        if node is None:
+            return default
+        if isinstance(node, ast.Attribute):
+            return TRANSFORMS.get(node.attr, 'other')
+        return 'other'
+
+    # -- calls -------------------------------------------------------------
+
+    def visit_Call(self, call: ast.Call):
+        name, owner = _func_name(call)
+        line = call.lineno
+
+        for kw in call.keywords:
+            if kw.arg in FONTSIZE_KEYWORDS or (kw.arg == 'size' and name in TEXT_CALLS):
+                self.model.fontsizes.append(FontSize(
+                    kw.arg, name, kw.value.lineno, self.maybe(kw.value, (int, float, str)),
+                    self.value_span(kw.value)))
+            elif kw.arg == 'figsize':
+                size = self.maybe(kw.value, list)
+                if size and len(size) == 2 and all(isinstance(v, (int, float)) for v in size):
+                    self.model.figsizes.append({'width': size[0], 'height': size[1], 'line': line})
+
+        if name in TEXT_CALLS:
+            self._text_call(call, name, owner, line)
+        elif name in PATCH_CALLS:
+            self._patch_call(call, name, line)
+        elif name in ('subplots', 'add_subplot', 'subplot', 'GridSpec', 'add_gridspec'):
+            self._grid_call(call, name, line)
+        elif name in ('set_xlim', 'set_ylim', 'xlim', 'ylim'):
+            bounds = [self.maybe(self.arg(call, 0, 'left' if 'x' in name else 'bottom'), (int, float)),
+                      self.maybe(self.arg(call, 1, 'right' if 'x' in name else 'top'), (int, float))]
+            first = self.maybe(call.args[0], list) if call.args else None
+            if first and len(first) == 2:
+                bounds = first
+            if None not in bounds:
+                self.model.limits.setdefault(owner or 'plt', {})['x' if 'x' in name else 'y'] = bounds
+        elif name == 'update' and owner.endswith('rcParams') and call.args:
+            self._rcparams_dict(call.args[0])
+        elif name == 'rc' and call.args:
+            group = self.maybe(call.args[0], str)
+            for kw in call.keywords:
+                if group and kw.arg:
+                    self._rcparam(f'{group}.{kw.arg}', kw.value)
+
+        self.generic_visit(call)
+
+    def _text_call(self, call: ast.Call, name: str, owner: str, line: int):
+        on_figure = name == 'figtext' or owner in self.figures
+        x = y = text = None
+        if name in ('text', 'figtext'):
+            x = self.maybe(self.arg(call, 0, 'x'), (int, float))
+            y = self.maybe(self.arg(call, 1, 'y'), (int, float))
+            text = self.maybe(self.arg(call, 2, 's'), str)
+        elif name == 'annotate':
+            text = self.maybe(self.arg(call, 0, 'text'), str)
+            xy = self.maybe(self.arg(call, None, 'xytext'), list) or self.maybe(self.arg(call, 1, 'xy'), list)
+            if xy and len(xy) == 2 and all(isinstance(v, (int, float)) for v in xy):
+                x, y = xy
+        elif name not in ('legend', 'tick_params', 'xticks', 'yticks', 'set_xticklabels',
+                          'set_yticklabels', 'bar_label', 'table'):
+            text = self.maybe(self.arg(call, 0, 'label' if name != 'suptitle' else 't'), str)
+
+        fontsize = None
+        for keyword in ('fontsize', 'size', 'labelsize'):
+            node = self.arg(call, None, keyword)
+            if node is not None:
+                fontsize = self.maybe(node, (int, float, str))
+                break
+
+        ha = self.maybe(self.arg(call, None, 'ha') or self.arg(call, None, 'horizontalalignment'), str)
+        va = self.maybe(self.arg(call, None, 'va') or self.arg(call, None, 'verticalalignment'), str)
+        transform = self.transform(call, 'figure' if on_figure else 'data')
+        if name == 'annotate':
+            coords = self.maybe(self.arg(call, None, 'textcoords') or self.arg(call, None, 'xycoords'), str)
+            if coords in ('axes fraction', 'figure fraction'):
+                transform = coords.split()[0]
+            elif coords is not None and coords != 'data':
+                transform = 'other'
+
+        self.model.texts.append(TextCall(
+            TEXT_CALLS[name], name, owner or 'plt', line, x, y, text, fontsize,
+            ha, va, transform, call.end_lineno))
+
+    def _patch_call(self, call: ast.Call, name: str, line: int):
+        patch = PatchCall(name, line, transform=self.transform(call, 'data'))
+        parent = self.parents.get(call)
+        if isinstance(parent, ast.Call) and _func_name(parent)[0] in ('add_patch', 'add_artist'):
+            patch.owner = _func_name(parent)[1]
+
+        xy = self.maybe(self.arg(call, 0, 'xy'), list)
+        if xy and len(xy) == 2 and all(isinstance(v, (int, float)) for v in xy):
+            x, y = xy
+            if name in ('Rectangle', 'FancyBboxPatch'):
+                w = self.maybe(self.arg(call, 1, 'width'), (int, float))
+                h = self.maybe(self.arg(call, 2, 'height'), (int, float))
+                if w is not None and h is not None:
+                    patch.x_min, patch.x_max = min(x, x + w), max(x, x + w)
+                    patch.y_min, patch.y_max = min(y, y + h), max(y, y + h)
+            elif name == 'Circle':
+                r = self.maybe(self.arg(call, 1, 'radius'), (int, float))
+                if r is None and self.arg(call, 1, 'radius') is None:
+                    r = 5
+                if r is not None:
+                    patch.x_min, patch.x_max, patch.y_min, patch.y_max = x - r, x + r, y - r, y + r
+            elif name == 'Ellipse':
+                w = self.maybe(self.arg(call, 1, 'width'), (int, float))
+                h = self.maybe(self.arg(call, 2, 'height'), (int, float))
+                if w is not None and h is not None:
+                    patch.x_min, patch.x_max = x - w / 2, x + w / 2
+                    patch.y_min, patch.y_max = y - h / 2, y + h / 2
+        self.model.patches.append(patch)
+
+    def _grid_call(self, call: ast.Call, name: str, line: int):
+        rows = self.maybe(self.arg(call, 0, 'nrows'), int)
+        cols = self.maybe(self.arg(call, 1, 'ncols'), int)
+        if name in ('add_subplot', 'subplot') and len(call.args) == 1:
+            # add_subplot(221)
+            code = self.maybe(call.args[0], int)
+            rows, cols = (code // 100, code // 10 % 10) if code and code >= 100 else (None, None)
+        if name in ('subplots',):
+            rows, cols = rows or 1, cols or 1
+        if rows is None or cols is None:
+            return
+        grid = {'rows': rows, 'cols': cols, 'func': name, 'line': line}
+        if not any(g['rows'] == rows and g['cols'] == cols and g['func'] == name for g in self.model.grids):
+            self.model.grids.append(grid)
+
+    def _rcparams_dict(self, node: ast.AST):
+        if isinstance(node, ast.Dict):
+            for key, value in zip(node.keys, node.values):
+                param = self.maybe(key, str) if key is not None else None
+                if param:
+                    self._rcparam(param, value)
+
+    def _rcparam(self, param: str, node: ast.AST):
+        # Only font sizes (font.size, axes.labelsize, ...) are ever rewritten
+        font = param.endswith('size') and param != 'figure.figsize'
+        self.model.rcparams[param] = {'value': self.maybe(node), 'line': node.lineno,
+                                      'span': self.value_span(node) if font else None}
+        if param == 'figure.figsize':
+            size = self.maybe(node, list)
+            if size and len(size) == 2:
+                self.model.figsizes.append({'width': size[0], 'height': size[1], 'line': node.lineno})
+
+    def visit_Assign(self, node: ast.Assign):
+        # plt.rcParams['font.size'] = 14
+        for target in node.targets:
+            if (isinstance(target, ast.Subscript) and isinstance(target.value, (ast.Attribute, ast.Name))
+                    and ast.unparse(target.value).endswith('rcParams')):
+                param = self.maybe(target.slice, str)
+                if param:
+                    self._rcparam(param, node.value)
+        self.generic_visit(node)
+
+
+def build_model(path: Path, source: str, source_hash: str = '') -> ChartModel:
+    """Parse source once and extract the chart model."""
+    model = ChartModel(path, source_hash or hashlib.sha256(source.encode('utf-8')).hexdigest())
+    try:
+        tree = ast.parse(source, filename=str(path))
+    except SyntaxError as e:
+        model.error = f'line {e.lineno}: {e.msg}'
+        return model
+    extractor = _Extractor(model)
+    extractor.collect_constants(tree)
+    extractor.visit(tree)
+    extractor.drop_shared_spans()
+    return model
+
+
+_MODELS: Dict[str, ChartModel] = {}
+
+
+def get_model(path: Path) -> ChartModel:
+    """Model of a chart file, parsed at most once per distinct source."""
+    path = Path(path)
+    data = path.read_bytes()
+    source_hash = hashlib.sha256(data).hexdigest()
+    cached = _MODELS.get(source_hash)
+    if cached is None:
+        cached = _MODELS[source_hash] = build_model(path, data.decode('utf-8'), source_hash)
+    if cached.path != path:
+        cached = ChartModel.from_dict(path, cached.to_dict())
+    return cached
+
+
+def get_models(paths: List[Path], root: Path = PROJECT_ROOT,
+               persist: bool = True) -> Dict[Path, ChartModel]:
+    """Models for many charts, reusing root/.chart_models.json across runs.
+
+    The cache is keyed by path relative to root; an entry is used only if
+    its source hash matches the file.
+    """
+    root = Path(root).resolve()
+    cache_path = root / CACHE_NAME
+    stored = {}
+    if persist:
+        try:
+            cached = json.loads(cache_path.read_text(encoding='utf-8'))
+            if cached.get('version') == MODEL_VERSION:
+                stored = cached['models']
+        except (OSError, ValueError, KeyError):
+            stored = {}
+
+    models = {}
+    changed = False
+    for path in paths:
+        path = Path(path)
+        resolved = path.resolve()
+        key = resolved.relative_to(root).as_posix() if resolved.is_relative_to(root) else resolved.as_posix()
+        data = path.read_bytes()
+        source_hash = hashlib.sha256(data).hexdigest()
+        entry = stored.get(key)
+        if entry is not None and entry.get('source_hash') == source_hash:
+            model = ChartModel.from_dict(path, entry)
+            _MODELS.setdefault(source_hash, model)
+        else:
+            model = _MODELS.get(source_hash)
+            if model is None:
+                model = _MODELS[source_hash] = build_model(path, data.decode('utf-8'), source_hash)
+            elif model.path != path:
+                model = ChartModel.from_dict(path, model.to_dict())
+            stored[key] = model.to_dict()
+            changed = True
+        models[path] = model
+
+    if persist and changed:
+        try:
+            cache_path.write_text(json.dumps({'version': MODEL_VERSION, 'models': stored}),
+                                  encoding='utf-8')
+        except OSError:
+            pass
+    return models
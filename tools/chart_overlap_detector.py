@@ -6,23 +6,34 @@ Detection methods:
 1. Static analysis: Find text elements with similar coordinates
 2. Runtime analysis: Render chart and detect bounding box overlaps
 
+Runtime analysis lays out each figure with the Agg renderer when the chart
+calls savefig() (see overlap_backend.py; no files are written) and sweeps the
+extents of all texts, annotations, legends, tick labels and patches for
+intersections. Batch mode does this for many charts in a worker pool.
+
 Usage:
     python chart_overlap_detector.py <chart.py>
     python chart_overlap_detector.py --render <chart.py>  # Full render analysis
+    python chart_overlap_detector.py --batch              # Render-analyze all charts
+    python chart_overlap_detector.py --batch --json overlaps.json <folder>
 """
 
+import argparse
 import ast
-import re
+import json
 import sys
 from pathlib import Path
 from typing import List, Dict, Tuple, Optional
 import warnings
 
+from chart_model import ChartModel, get_model
+
 
 class TextElement:
     """Represents a text element in a chart."""
     def __init__(self, x: float, y: float, text: str, fontsize: int,
-                 ha: str = 'center', va: str = 'center', line_num: int = 0):
+                 ha: str = 'center', va: str = 'center', line_num: int = 0,
+                 x_scale: float = 1.0, y_scale: float = 1.0, space: tuple = ()):
         self.x = x
         self.y = y
         self.text = text
@@ -30,11 +41,15 @@ class TextElement:
         self.ha = ha  # horizontal alignment
         self.va = va  # vertical alignment
         self.line_num = line_num
+        # Size of the coordinate space (axis limits for data coords, else 1)
+        self.x_scale = x_scale
+        self.y_scale = y_scale
+        self.space = space  # (owner, transform): only texts in one space are compared
 
         # Estimate bounding box (rough approximation)
         # Assume each character is ~0.6 * fontsize wide, height is ~1.2 * fontsize
-        char_width = 0.006 * fontsize  # in normalized coords (0-1)
-        char_height = 0.012 * fontsize
+        char_width = 0.006 * fontsize * x_scale  # in normalized coords (0-1)
+        char_height = 0.012 * fontsize * y_scale
 
         text_width = len(text) * char_width
         text_height = char_height * (1 + text.count('\n'))
@@ -63,22 +78,23 @@ class TextElement:
     def overlaps(self, other: 'TextElement', margin: float = 0.02) -> bool:
         """Check if this text element overlaps with another."""
         # Add margin for near-overlaps
-        return not (self.x_max + margin < other.x_min or
-                    other.x_max + margin < self.x_min or
-                    self.y_max + margin < other.y_min or
-                    other.y_max + margin < self.y_min)
+        x_margin, y_margin = margin * self.x_scale, margin * self.y_scale
+        return not (self.x_max + x_margin < other.x_min or
+                    other.x_max + x_margin < self.x_min or
+                    self.y_max + y_margin < other.y_min or
+                    other.y_max + y_margin < self.y_min)
 
     def __repr__(self):
         return f"Text('{self.text[:20]}...' at ({self.x:.2f}, {self.y:.2f}), size={self.fontsize})"
 
 
 class ChartOverlapDetector:
-    def __init__(self, chart_path: Path):
+    def __init__(self, chart_path: Path, model: Optional[ChartModel] = None):
         self.chart_path = chart_path
+        self.model = model
         self.text_elements: List[TextElement] = []
         self.patch_elements: List[Dict] = []  # Rectangles, circles, etc.
         self.issues: List[Dict] = []
-        self.code = ""
 
     def analyze(self) -> List[Dict]:
         """Analyze chart for text overlaps."""
@@ -90,7 +106,15 @@ class ChartOverlapDetector:
             })
             return self.issues
 
-        self.code = self.chart_path.read_text(encoding='utf-8')
+        if self.model is None:
+            self.model = get_model(self.chart_path)
+        if self.model.error:
+            self.issues.append({
+                'type': 'PARSE_ERROR',
+                'message': f'Could not parse chart: {self.model.error}',
+                'severity': 'ERROR'
+            })
+            return self.issues
 
         self._extract_text_elements()
         self._extract_patch_elements()
@@ -100,67 +124,49 @@ class ChartOverlapDetector:
 
         return self.issues
 
-    def _extract_text_elements(self):
-        """Extract text element positions from code."""
-        # Pattern for ax.text(x, y, 'text', ..., fontsize=N, ha='...', va='...')
-        text_pattern = r"ax\d?\.text\s*\(\s*([\d.]+)\s*,\s*([\d.]+)\s*,\s*['\"]([^'\"]+)['\"]([^)]*)\)"
-
-        for line_num, line in enumerate(self.code.split('\n'), 1):
-            match = re.search(text_pattern, line)
-            if match:
-                x, y, text = float(match.group(1)), float(match.group(2)), match.group(3)
-                rest = match.group(4)
+    def _space(self, owner: Optional[str], transform: str) -> Tuple[tuple, float, float]:
+        """Comparison space and its (x, y) extent for an artist."""
+        if transform == 'figure':
+            return ('figure',), 1.0, 1.0
+        if transform == 'data':
+            limits = self.model.limits.get(owner or 'plt', {})
+            x_lo, x_hi = limits.get('x', (0, 1))
+            y_lo, y_hi = limits.get('y', (0, 1))
+            return (owner, 'data'), abs(x_hi - x_lo) or 1.0, abs(y_hi - y_lo) or 1.0
+        return (owner, transform), 1.0, 1.0
 
-                # Extract fontsize
-                fontsize_match = re.search(r'fontsize\s*=\s*(\d+)', rest)
-                fontsize = int(fontsize_match.group(1)) if fontsize_match else 10
-
-                # Extract alignment
-                ha_match = re.search(r"ha\s*=\s*['\"](\w+)['\"]", rest)
-                ha = ha_match.group(1) if ha_match else 'center'
-
-                va_match = re.search(r"va\s*=\s*['\"](\w+)['\"]", rest)
-                va = va_match.group(1) if va_match else 'center'
-
-                self.text_elements.append(TextElement(x, y, text, fontsize, ha, va, line_num))
+    def _extract_text_elements(self):
+        """Text elements with literal positions (text, figtext, annotate)."""
+        for call in self.model.texts:
+            if call.func not in ('text', 'figtext', 'annotate') or call.transform == 'other':
+                continue
+            if call.x is None or call.y is None or not call.text:
+                continue
+            fontsize = call.fontsize if isinstance(call.fontsize, (int, float)) else 10
+            space, x_scale, y_scale = self._space(call.owner, call.transform)
+            self.text_elements.append(TextElement(
+                call.x, call.y, call.text, fontsize, call.ha or 'center', call.va or 'center',
+                call.line, x_scale, y_scale, space))
 
     def _extract_patch_elements(self):
-        """Extract patch (rectangle, circle) positions from code."""
-        # Pattern for Rectangle((x, y), width, height, ...)
-        rect_pattern = r"Rectangle\s*\(\s*\(\s*([\d.]+)\s*,\s*([\d.]+)\s*\)\s*,\s*([\d.]+)\s*,\s*([\d.]+)"
-
-        for line_num, line in enumerate(self.code.split('\n'), 1):
-            match = re.search(rect_pattern, line)
-            if match:
-                x, y = float(match.group(1)), float(match.group(2))
-                w, h = float(match.group(3)), float(match.group(4))
-                self.patch_elements.append({
-                    'type': 'rectangle',
-                    'x_min': x, 'y_min': y,
-                    'x_max': x + w, 'y_max': y + h,
-                    'line_num': line_num
-                })
-
-        # Pattern for FancyBboxPatch((x, y), width, height, ...)
-        fancy_pattern = r"FancyBboxPatch\s*\(\s*\(\s*([\d.]+)\s*,\s*([\d.]+)\s*\)\s*,\s*([\d.]+)\s*,\s*([\d.]+)"
-
-        for line_num, line in enumerate(self.code.split('\n'), 1):
-            match = re.search(fancy_pattern, line)
-            if match:
-                x, y = float(match.group(1)), float(match.group(2))
-                w, h = float(match.group(3)), float(match.group(4))
-                self.patch_elements.append({
-                    'type': 'fancybox',
-                    'x_min': x, 'y_min': y,
-                    'x_max': x + w, 'y_max': y + h,
-                    'line_num': line_num
-                })
+        """Extract patch (rectangle, circle) positions from the model."""
+        for patch in self.model.patches:
+            if not patch.has_extent or patch.transform == 'other':
+                continue
+            space, _, _ = self._space(patch.owner, patch.transform)
+            self.patch_elements.append({
+                'type': 'fancybox' if patch.kind == 'FancyBboxPatch' else patch.kind.lower(),
+                'x_min': patch.x_min, 'y_min': patch.y_min,
+                'x_max': patch.x_max, 'y_max': patch.y_max,
+                'line_num': patch.line,
+                'space': space,
+            })
 
     def _check_text_text_overlaps(self):
         """Check for overlapping text elements."""
         for i, t1 in enumerate(self.text_elements):
             for t2 in self.text_elements[i+1:]:
-                if t1.overlaps(t2):
+                if t1.space == t2.space and t1.overlaps(t2):
                     self.issues.append({
                         'type': 'TEXT_OVERLAP',
                         'message': f"Text overlap detected:\n"
@@ -174,17 +180,24 @@ class ChartOverlapDetector:
         """Check if text overlaps with patch boundaries (edges)."""
         for text in self.text_elements:
             for patch in self.patch_elements:
+                # Patches added without a known owner are compared in any matching space
+                if patch['space'] != text.space and patch['space'][0] is not None:
+                    continue
+                if patch['space'][1:] != text.space[1:]:
+                    continue
+
                 # Check if text is near patch edge (within margin)
-                margin = 0.03
+                margin = 0.03 * text.x_scale
 
                 # Check if text center is close to any edge
                 near_left = abs(text.x - patch['x_min']) < margin
                 near_right = abs(text.x - patch['x_max']) < margin
-                near_bottom = abs(text.y - patch['y_min']) < margin
-                near_top = abs(text.y - patch['y_max']) < margin
+                y_margin = 0.03 * text.y_scale
+                near_bottom = abs(text.y - patch['y_min']) < y_margin
+                near_top = abs(text.y - patch['y_max']) < y_margin
 
                 # Check if text is inside patch y-range
-                in_y_range = patch['y_min'] - margin < text.y < patch['y_max'] + margin
+                in_y_range = patch['y_min'] - y_margin < text.y < patch['y_max'] + y_margin
                 in_x_range = patch['x_min'] - margin < text.x < patch['x_max'] + margin
 
                 if (near_left or near_right) and in_y_range:
@@ -205,14 +218,19 @@ class ChartOverlapDetector:
         grid = {}
 
         for text in self.text_elements:
-            cell_x = int(text.x * grid_size)
-            cell_y = int(text.y * grid_size)
-            key = (cell_x, cell_y)
+            x_lo = y_lo = 0.0
+            if text.space[1:] == ('data',):
+                limits = self.model.limits.get(text.space[0] or 'plt', {})
+                x_lo = min(limits.get('x', (0, 1)))
+                y_lo = min(limits.get('y', (0, 1)))
+            cell_x = int((text.x - x_lo) / text.x_scale * grid_size)
+            cell_y = int((text.y - y_lo) / text.y_scale * grid_size)
+            key = (text.space, cell_x, cell_y)
             if key not in grid:
                 grid[key] = []
             grid[key].append(text)
 
-        for (cx, cy), texts in grid.items():
+        for (_, cx, cy), texts in grid.items():
             if len(texts) > 3:
                 self.issues.append({
                     'type': 'CROWDED_REGION',
@@ -254,94 +272,305 @@ class ChartOverlapDetector:
                     print(f"     FIX: {issue['fix']}")
 
 
+# -- render analysis -------------------------------------------------------
+
+TEXT_KINDS = {'text', 'annotation', 'title', 'axis_label', 'tick_label'}
+
+# Boxes must intersect by more than this many pixels in both directions
+MIN_OVERLAP_PX = 1.0
+
+
+class ArtistExtent:
+    """Window extent of one rendered artist, in display pixels."""
+    __slots__ = ('kind', 'label', 'x0', 'y0', 'x1', 'y1', 'axes')
+
+    def __init__(self, kind: str, label: str, bbox, axes: Optional[int] = None):
+        self.kind = kind
+        self.label = label
+        self.x0, self.y0, self.x1, self.y1 = bbox.x0, bbox.y0, bbox.x1, bbox.y1
+        self.axes = axes
+
+    def contains(self, other: 'ArtistExtent') -> bool:
+        return (self.x0 <= other.x0 and other.x1 <= self.x1 and
+                self.y0 <= other.y0 and other.y1 <= self.y1)
+
+    def to_dict(self) -> Dict:
+        return {'kind': self.kind, 'label': self.label, 'axes': self.axes,
+                'bbox': [round(float(v), 1) for v in (self.x0, self.y0, self.x1, self.y1)]}
+
+    def __repr__(self):
+        return f"ArtistExtent({self.kind}, '{self.label[:20]}')"
+
+
+def collect_extents(fig, renderer) -> List[ArtistExtent]:
+    """Extents of every text, annotation, legend, tick label and patch in fig."""
+    from matplotlib.axis import Axis
+    from matplotlib.legend import Legend
+    from matplotlib.patches import Patch
+    from matplotlib.spines import Spine
+    from matplotlib.text import Annotation, Text
+    from matplotlib.transforms import Bbox
+
+    extents = []
+
+    def add(kind, artist, label='', axes=None, clip=None):
+        if not artist.get_visible():
+            return
+        if isinstance(artist, Text):
+            label = artist.get_text()
+            if not label.strip():
+                return
+            # Annotation extents include the arrow; only the text matters here
+            bbox = Text.get_window_extent(artist, renderer)
+        else:
+            bbox = artist.get_window_extent(renderer)
+        if clip is not None:
+            bbox = Bbox.intersection(bbox, clip)
+            if bbox is None:
+                return
+        if bbox.width > 0 and bbox.height > 0:
+            extents.append(ArtistExtent(kind, label, bbox, axes))
+
+    for text in fig.texts:
+        add('title' if text is getattr(fig, '_suptitle', None) else 'text', text)
+    for legend in fig.legends:
+        add('legend', legend, 'legend')
+
+    for index, ax in enumerate(fig.axes):
+        if not ax.get_visible():
+            continue
+        for child in ax.get_children():
+            if isinstance(child, Annotation):
+                add('annotation', child, axes=index)
+            elif isinstance(child, Text):
+                add('text' if child in ax.texts else 'title', child, axes=index)
+            elif isinstance(child, Legend):
+                add('legend', child, 'legend', axes=index)
+            elif isinstance(child, Axis):
+                # axis('off') and twin axes hide whole axes without hiding their labels
+                if not (ax.axison and child.get_visible()):
+                    continue
+                add('axis_label', child.label, axes=index)
+                for tick in child.get_ticklabels(which='both'):
+                    add('tick_label', tick, axes=index)
+            elif isinstance(child, Patch) and not isinstance(child, Spine) and child is not ax.patch:
+                clip = ax.bbox if child.get_clip_on() else None
+                add('patch', child, type(child).__name__, axes=index, clip=clip)
+
+    return extents
+
+
+def _classify(a: ArtistExtent, b: ArtistExtent) -> Optional[Tuple[str, str]]:
+    """Issue type and severity for two intersecting extents, or None if harmless."""
+    kinds = {a.kind, b.kind}
+    if a.kind in TEXT_KINDS and b.kind in TEXT_KINDS:
+        return 'TEXT_OVERLAP', 'ERROR'
+    if 'legend' in kinds:
+        other = b if a.kind == 'legend' else a
+        if other.kind == 'patch':
+            return 'LEGEND_OVERLAP', 'WARNING'
+        return 'LEGEND_OVERLAP', 'ERROR'
+    if 'patch' in kinds and kinds & TEXT_KINDS:
+        # Labels sitting inside a box are intended; only edge crossings are flagged
+        text, patch = (a, b) if a.kind in TEXT_KINDS else (b, a)
+        if patch.contains(text):
+            return None
+        return 'TEXT_CROSSES_PATCH', 'WARNING'
+    return None
+
+
+def find_overlaps(extents: List[ArtistExtent],
+                  min_overlap: float = MIN_OVERLAP_PX) -> List[Dict]:
+    """Sort-and-sweep over x; intersecting pairs are classified by artist kind."""
+    issues = []
+    active: List[ArtistExtent] = []
+
+    for box in sorted(extents, key=lambda e: e.x0):
+        active = [a for a in active if a.x1 - box.x0 > min_overlap]
+        for other in active:
+            if min(box.y1, other.y1) - max(box.y0, other.y0) <= min_overlap:
+                continue
+            if min(box.x1, other.x1) - box.x0 <= min_overlap:
+                continue
+            if box.kind == 'patch' and other.kind == 'patch':
+                continue
+            verdict = _classify(other, box)
+            if verdict:
+                issues.append({'type': verdict[0], 'severity': verdict[1],
+                               'artists': [other.to_dict(), box.to_dict()]})
+        active.append(box)
+
+    return issues
+
+
+def _analyze_figure(fig, renderer) -> Dict:
+    extents = collect_extents(fig, renderer)
+    return {'artists': len(extents), 'overlaps': find_overlaps(extents)}
+
+
+def _init_render_worker():
+    """Route savefig() to the overlap backend once per worker process."""
+    import matplotlib
+    matplotlib.use('module://overlap_backend')
+    import matplotlib.pyplot  # noqa: F401
+    import numpy  # noqa: F401
+    import overlap_backend
+    overlap_backend.on_save = _analyze_figure
+
+
+def _render_chart(chart_file: str, timeout: float) -> Dict:
+    """Run one chart script and analyze every figure it saves."""
+    import overlap_backend
+    from chart_build import _run_chart
+
+    del overlap_backend.captured[:]
+    result = _run_chart(chart_file, timeout)
+    figures = list(overlap_backend.captured)
+
+    return {
+        'chart': chart_file,
+        'status': result.status,
+        'message': result.message,
+        'elapsed': round(result.elapsed, 3),
+        'figures': len(figures),
+        'artists': sum(f['artists'] for f in figures),
+        'overlaps': [dict(issue, figure=i) for i, f in enumerate(figures) for issue in f['overlaps']],
+    }
+
+
+def render_charts(chart_files: List[Path], jobs: Optional[int] = None,
+                  timeout: float = 60, on_result=None) -> List[Dict]:
+    """Render-analyze many charts in a worker pool (one Agg renderer per worker)."""
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    from chart_build import default_jobs
+
+    chart_files = sorted(Path(f).resolve() for f in chart_files)
+    reports = []
+    if not chart_files:
+        return reports
+
+    workers = max(1, min(jobs or default_jobs(), len(chart_files)))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_render_worker) as pool:
+        futures = [pool.submit(_render_chart, str(f), timeout) for f in chart_files]
+        for future in as_completed(futures):
+            report = future.result()
+            reports.append(report)
+            if on_result:
+                on_result(report)
+
+    return sorted(reports, key=lambda r: r['chart'])
+
+
 def render_and_detect(chart_path: Path) -> List[Dict]:
     """
     Render the chart and detect actual bounding box overlaps.
     This is more accurate but requires matplotlib.
     """
-    import matplotlib
-    matplotlib.use('Agg')  # Non-interactive backend
-    import matplotlib.pyplot as plt
-    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    report = render_charts([chart_path], jobs=1)[0]
+    if report['status'] != 'OK':
+        return [{
+            'type': 'RENDER_ERROR',
+            'message': f"Could not render chart: {report['message']}",
+            'severity': 'WARNING'
+        }]
 
     issues = []
-
-    # Execute the chart script in isolated namespace
-    namespace = {'__name__': '__main__', '__file__': str(chart_path)}
-
-    # Monkey-patch plt.savefig and plt.show to prevent actual output
-    original_savefig = plt.savefig
-    original_show = plt.show
-    original_close = plt.close
-
-    plt.savefig = lambda *args, **kwargs: None
-    plt.show = lambda *args, **kwargs: None
-
-    try:
-        exec(chart_path.read_text(encoding='utf-8'), namespace)
-
-        # Get current figure
-        fig = plt.gcf()
-        canvas = FigureCanvasAgg(fig)
-        canvas.draw()
-
-        # Get renderer
-        renderer = canvas.get_renderer()
-
-        # Collect all text bounding boxes
-        text_bboxes = []
-        for ax in fig.axes:
-            for text in ax.texts:
-                bbox = text.get_window_extent(renderer)
-                text_bboxes.append({
-                    'text': text.get_text()[:30],
-                    'bbox': bbox,
-                    'position': text.get_position()
-                })
-
-        # Check for overlaps
-        for i, t1 in enumerate(text_bboxes):
-            for t2 in text_bboxes[i+1:]:
-                if t1['bbox'].overlaps(t2['bbox']):
-                    issues.append({
-                        'type': 'RENDERED_OVERLAP',
-                        'message': f"Actual overlap detected:\n"
-                                   f"  '{t1['text']}' at {t1['position']}\n"
-                                   f"  '{t2['text']}' at {t2['position']}",
-                        'severity': 'ERROR'
-                    })
-
-    except Exception as e:
+    for overlap in report['overlaps']:
+        a, b = overlap['artists']
         issues.append({
-            'type': 'RENDER_ERROR',
-            'message': f"Could not render chart: {str(e)}",
-            'severity': 'WARNING'
+            'type': overlap['type'],
+            'message': f"Actual overlap detected:\n"
+                       f"  {a['kind']} '{a['label'][:30]}' at {a['bbox']}\n"
+                       f"  {b['kind']} '{b['label'][:30]}' at {b['bbox']}",
+            'severity': overlap['severity']
         })
-    finally:
-        plt.savefig = original_savefig
-        plt.show = original_show
-        plt.close('all')
-
     return issues
 
 
-def main():
-    if len(sys.argv) < 2:
-        print(__doc__)
-        sys.exit(1)
+def _batch_targets(paths: List[str]) -> List[Path]:
+    """chart.py files for the given files/folders (whole project if none)."""
+    from course_index import get_index
+
+    if not paths:
+        return [chart.script for chart in get_index().charts]
+    targets = []
+    for arg in paths:
+        path = Path(arg)
+        if path.is_dir():
+            targets.extend(sorted(path.rglob('chart.py')))
+        else:
+            targets.append(path)
+    return targets
 
-    render_mode = False
-    chart_arg = sys.argv[1]
 
-    if chart_arg == '--render':
-        render_mode = True
-        chart_arg = sys.argv[2] if len(sys.argv) > 2 else None
+def run_batch(paths: List[str], jobs: Optional[int], timeout: float,
+              json_path: Optional[str]) -> int:
+    """Render-analyze many charts; returns the number of charts with errors."""
+    charts = _batch_targets(paths)
+    quiet = json_path == '-'
+    done = 0
 
-    if not chart_arg:
+    def report(result):
+        nonlocal done
+        done += 1
+        if quiet:
+            return
+        errors = sum(1 for o in result['overlaps'] if o['severity'] == 'ERROR')
+        warnings = len(result['overlaps']) - errors
+        name = Path(result['chart']).parent.name
+        if result['status'] != 'OK':
+            print(f"[{done}/{len(charts)}] {result['status']:<8} {name}")
+        elif result['overlaps']:
+            print(f"[{done}/{len(charts)}] {errors} errors, {warnings} warnings  {name}")
+
+    reports = render_charts(charts, jobs=jobs, timeout=timeout, on_result=report)
+    failed = sum(1 for r in reports if r['status'] != 'OK'
+                 or any(o['severity'] == 'ERROR' for o in r['overlaps']))
+
+    summary = {
+        'charts': len(reports),
+        'with_errors': failed,
+        'overlaps': sum(len(r['overlaps']) for r in reports),
+        'results': reports,
+    }
+    if json_path == '-':
+        json.dump(summary, sys.stdout, indent=2)
+        print()
+    else:
+        if json_path:
+            Path(json_path).write_text(json.dumps(summary, indent=2) + '\n', encoding='utf-8')
+        print(f"\nAnalyzed {len(reports)} charts: {summary['overlaps']} overlaps, "
+              f"{failed} charts with errors")
+
+    return failed
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Detect text overlap issues in chart.py scripts.',
+        formatter_class=argparse.RawDescriptionHelpFormatter, epilog=__doc__)
+    parser.add_argument('charts', nargs='*', help='chart.py files or chart folders')
+    parser.add_argument('--render', action='store_true',
+                        help='also render the chart and check actual bounding boxes')
+    parser.add_argument('--batch', action='store_true',
+                        help='render-analyze all given charts (default: whole project) in a worker pool')
+    parser.add_argument('--jobs', '-j', type=int, default=None,
+                        help='worker processes for --batch (default: CPU count)')
+    parser.add_argument('--timeout', type=float, default=60,
+                        help='per-chart timeout in seconds for --batch (default: 60)')
+    parser.add_argument('--json', metavar='FILE', default=None,
+                        help="write --batch results as JSON to FILE ('-' for stdout)")
+    args = parser.parse_args()
+
+    if args.batch:
+        failed = run_batch(args.charts, args.jobs, args.timeout, args.json)
+        sys.exit(1 if failed else 0)
+
+    if not args.charts:
         print("Error: No chart file specified")
         sys.exit(1)
 
-    chart_path = Path(chart_arg)
+    chart_path = Path(args.charts[0])
     if chart_path.is_dir():
         chart_path = chart_path / 'chart.py'
 
@@ -351,7 +580,7 @@ def main():
     detector.print_report()
 
     # Optional render analysis
-    if render_mode:
+    if args.render:
         print("\n--- Render Analysis ---")
         render_issues = render_and_detect(chart_path)
         if render_issues:
@@ -14,10 +14,12 @@ Usage:
 """
 
 import ast
-import re
 import sys
 from pathlib import Path
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Tuple
+
+from chart_model import ChartModel, get_model, get_models
+from course_index import get_index
 
 # Minimum font sizes for different chart widths on slides
 # When chart is at 0.5\textwidth, fonts need to be ~2x larger to appear same size
@@ -38,11 +40,11 @@ RECOMMENDED_MIN_FONT = 11  # Before scaling
 
 
 class ChartReadabilityAnalyzer:
-    def __init__(self, chart_path: Path):
+    def __init__(self, chart_path: Path, model: Optional[ChartModel] = None):
         self.chart_path = chart_path
+        self.model = model
         self.issues: List[Dict] = []
         self.warnings: List[Dict] = []
-        self.code = ""
 
     def analyze(self) -> Tuple[List[Dict], List[Dict]]:
         """Analyze chart.py for readability issues."""
@@ -54,7 +56,15 @@ class ChartReadabilityAnalyzer:
             })
             return self.issues, self.warnings
 
-        self.code = self.chart_path.read_text(encoding='utf-8')
+        if self.model is None:
+            self.model = get_model(self.chart_path)
+        if self.model.error:
+            self.issues.append({
+                'type': 'PARSE_ERROR',
+                'message': f'Could not parse chart: {self.model.error}',
+                'severity': 'ERROR'
+            })
+            return self.issues, self.warnings
 
         self._check_font_sizes()
         self._check_subplots()
@@ -66,11 +76,9 @@ class ChartReadabilityAnalyzer:
 
     def _check_font_sizes(self):
         """Check for fontsize parameters that are too small."""
-        # Pattern: fontsize=N or fontsize = N
-        fontsize_pattern = r'fontsize\s*=\s*(\d+)'
-        matches = re.findall(fontsize_pattern, self.code)
-
-        small_fonts = [int(m) for m in matches if int(m) < RECOMMENDED_MIN_FONT]
+        sizes = [f.value for f in self.model.fontsizes
+                 if isinstance(f.value, (int, float)) and not isinstance(f.value, bool)]
+        small_fonts = [s for s in sizes if s < RECOMMENDED_MIN_FONT]
 
         if small_fonts:
             self.issues.append({
@@ -92,12 +100,9 @@ class ChartReadabilityAnalyzer:
 
     def _check_subplots(self):
         """Check for multi-panel layouts that should be split."""
-        # Pattern: plt.subplots(N, M) or subplots(N,M) where N*M > 1
-        subplot_pattern = r'subplots\s*\(\s*(\d+)\s*,\s*(\d+)'
-        matches = re.findall(subplot_pattern, self.code)
-
-        for rows, cols in matches:
-            total = int(rows) * int(cols)
+        for grid in self.model.grids:
+            rows, cols = grid['rows'], grid['cols']
+            total = rows * cols
             if total > 1:
                 self.issues.append({
                     'type': 'MULTI_PANEL',
@@ -108,39 +113,36 @@ class ChartReadabilityAnalyzer:
 
     def _check_text_density(self):
         """Check for charts with too many text elements."""
-        # Count ax.text() calls
-        text_calls = len(re.findall(r'ax\d?\.text\s*\(', self.code))
-        text_calls += len(re.findall(r'\.annotate\s*\(', self.code))
+        # text() and annotate() calls
+        text_calls = self.model.text_count
 
-        if text_calls > 15:
-            self.warnings.append({
-                'type': 'HIGH_TEXT_DENSITY',
-                'message': f'High text density: {text_calls} text elements. Consider simplifying.',
-                'severity': 'WARNING',
-                'fix': 'Reduce text elements or convert to LaTeX bullet points'
-            })
-        elif text_calls > 25:
+        if text_calls > 25:
             self.issues.append({
                 'type': 'EXCESSIVE_TEXT',
                 'message': f'Excessive text: {text_calls} elements. This should likely be LaTeX, not a chart.',
                 'severity': 'ERROR',
                 'fix': 'Convert to LaTeX text/itemize instead of matplotlib figure'
             })
+        elif text_calls > 15:
+            self.warnings.append({
+                'type': 'HIGH_TEXT_DENSITY',
+                'message': f'High text density: {text_calls} text elements. Consider simplifying.',
+                'severity': 'WARNING',
+                'fix': 'Reduce text elements or convert to LaTeX bullet points'
+            })
 
     def _check_rcparams(self):
         """Check if rcParams sets appropriate font sizes."""
-        if 'rcParams' in self.code:
+        if self.model.rcparams:
             # Check font.size setting
-            font_size_match = re.search(r"'font\.size'\s*:\s*(\d+)", self.code)
-            if font_size_match:
-                size = int(font_size_match.group(1))
-                if size < 10:
-                    self.warnings.append({
-                        'type': 'LOW_RCPARAMS_FONT',
-                        'message': f"rcParams font.size={size} is low. Recommend 12+",
-                        'severity': 'WARNING',
-                        'fix': "Set 'font.size': 12 in rcParams"
-                    })
+            size = self.model.rcparams.get('font.size', {}).get('value')
+            if isinstance(size, (int, float)) and size < 10:
+                self.warnings.append({
+                    'type': 'LOW_RCPARAMS_FONT',
+                    'message': f"rcParams font.size={size} is low. Recommend 12+",
+                    'severity': 'WARNING',
+                    'fix': "Set 'font.size': 12 in rcParams"
+                })
         else:
             self.warnings.append({
                 'type': 'NO_RCPARAMS',
@@ -151,12 +153,10 @@ class ChartReadabilityAnalyzer:
 
     def _check_figsize(self):
         """Check figure size for appropriate aspect ratio."""
-        figsize_pattern = r'figsize\s*=\s*\(\s*([\d.]+)\s*,\s*([\d.]+)\s*\)'
-        match = re.search(figsize_pattern, self.code)
-
-        if match:
-            width, height = float(match.group(1)), float(match.group(2))
-            aspect = width / height
+        if self.model.figsizes:
+            size = self.model.figsizes[0]
+            width, height = float(size['width']), float(size['height'])
+            aspect = width / height if height else 0
 
             # For 16:9 slides, charts should be wider than tall
             if aspect < 1.2:
@@ -208,7 +208,8 @@ def analyze_all_charts(base_path: Path) -> Dict[str, Tuple[List, List]]:
     results = {}
 
     # Find all chart.py files
-    chart_files = list(base_path.rglob('chart.py'))
+    chart_files = [chart.script for chart in get_index(base_path).charts]
+    models = get_models(chart_files, root=base_path)
 
     print(f"Found {len(chart_files)} chart files to analyze\n")
 
@@ -216,7 +217,7 @@ def analyze_all_charts(base_path: Path) -> Dict[str, Tuple[List, List]]:
     total_warnings = 0
 
     for chart_file in sorted(chart_files):
-        analyzer = ChartReadabilityAnalyzer(chart_file)
+        analyzer = ChartReadabilityAnalyzer(chart_file, models[chart_file])
         issues, warnings = analyzer.analyze()
         results[str(chart_file)] = (issues, warnings)
 
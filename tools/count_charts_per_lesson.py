@@ -7,6 +7,8 @@ from pathlib import Path
 from collections import defaultdict
 import re
 
+from course_index import get_index
+
 BASE_DIR = Path(__file__).parent.parent
 
 
@@ -14,23 +16,10 @@ def count_charts():
     """Count charts per lesson."""
     lesson_charts = defaultdict(list)
 
-    for chart_file in sorted(BASE_DIR.rglob('*/chart.py')):
-        path_str = str(chart_file)
-        if 'tools' in path_str or path_str.startswith('charts'):
-            continue
-
-        # Find the lesson folder
-        for parent in chart_file.parents:
-            if parent.name.startswith('L') and '_' in parent.name:
-                # Check if this folder has a .tex file (real lesson)
-                presentations_dir = parent / 'presentations'
-                has_tex = (
-                    any(parent.glob('*.tex')) or
-                    (presentations_dir.exists() and any(presentations_dir.glob('*.tex')))
-                )
-                if has_tex:
-                    lesson_charts[parent.name].append(chart_file.parent.name)
-                    break
+    for lesson in get_index(BASE_DIR).lessons:
+        # Only real lessons, i.e. folders with a .tex deck
+        if lesson.tex_files and lesson.charts:
+            lesson_charts[lesson.name].extend(chart.name for chart in lesson.charts)
 
     return lesson_charts
 
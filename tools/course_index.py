@@ -0,0 +1,274 @@
+"""
+Course Index
+One shared, cached scan of the course tree for every build script.
+
+The tree is walked once and reduced to the files the scripts care about
+(.tex decks, .pdf files and chart.py scripts). From that file list the index
+builds modules, lessons (with their latest deck and lecture PDFs) and charts.
+The file list is persisted to .course_index.json together with the mtime of
+every directory walked; a later invocation re-uses it as long as no
+directory has changed, which costs one stat() per directory instead of a
+full walk.
+
+Folders named temp/ or previous/ (aux files and archived versions) are
+excluded, as are hidden folders and __pycache__.
+
+Usage (library):
+    from course_index import get_index
+    index = get_index(BASE_DIR)
+    index.latest_decks()    # {'L01': Path(...tex), ...}
+    index.lecture_pdfs()    # lecture PDFs sorted by lesson number
+    index.charts            # every chart.py, lesson and shared
+"""
+
+import json
+import os
+import re
+from pathlib import Path
+from typing import Dict, List, Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+CACHE_NAME = '.course_index.json'
+CACHE_VERSION = 1
+
+EXCLUDED_DIRS = {'temp', 'previous', '__pycache__', 'node_modules', 'tools'}
+
+TIMESTAMP_PATTERN = re.compile(r'^(\d{8}_\d{4})_')
+LESSON_ID_PATTERN = re.compile(r'_(L\d{2})_')
+
+
+def get_timestamp(filename: str) -> Optional[str]:
+    """Extract timestamp from filename like 20251211_1400_L01_Name.tex"""
+    match = TIMESTAMP_PATTERN.match(filename)
+    return match.group(1) if match else None
+
+
+def get_lesson_id(filename: str) -> Optional[str]:
+    """Extract lesson ID like L01, L02, etc."""
+    match = LESSON_ID_PATTERN.search(filename)
+    return match.group(1) if match else None
+
+
+def _is_tracked(name: str) -> bool:
+    return name == 'chart.py' or name.endswith('.tex') or name.endswith('.pdf')
+
+
+class Chart:
+    """A chart folder: chart.py and the chart.pdf it renders."""
+    def __init__(self, script: Path, lesson: Optional['Lesson'] = None):
+        self.script = script
+        self.dir = script.parent
+        self.name = script.parent.name
+        self.pdf = script.parent / 'chart.pdf'
+        self.lesson = lesson
+
+    @property
+    def shared(self) -> bool:
+        return self.lesson is None
+
+    def __repr__(self):
+        return f"Chart({self.name})"
+
+
+class Lesson:
+    """A lesson folder such as Module_A_.../L01_What_is_Blockchain."""
+    def __init__(self, path: Path, module: 'Module'):
+        self.path = path
+        self.name = path.name
+        self.module = module
+        self.lesson_id = get_lesson_id(f'_{path.name}')
+        self.decks: List[Path] = []   # dated .tex files, oldest first
+        self.pdfs: List[Path] = []    # dated lecture PDFs
+        self.tex_files: List[Path] = []
+        self.charts: List[Chart] = []
+
+    @property
+    def number(self) -> int:
+        return int(self.lesson_id[1:]) if self.lesson_id else 999
+
+    @property
+    def deck_dir(self) -> Path:
+        """presentations/ for Modules D and E, the lesson folder otherwise."""
+        presentations = self.path / 'presentations'
+        if any(t.parent == presentations for t in self.tex_files):
+            return presentations
+        return self.path
+
+    @property
+    def latest_deck(self) -> Optional[Path]:
+        return self.decks[-1] if self.decks else None
+
+    def __repr__(self):
+        return f"Lesson({self.name})"
+
+
+class Module:
+    """A Module_* folder."""
+    def __init__(self, path: Path):
+        self.path = path
+        self.name = path.name
+        self.lessons: List[Lesson] = []
+
+    def __repr__(self):
+        return f"Module({self.name})"
+
+
+class CourseIndex:
+    """Structured view of the course tree built from a flat file list."""
+    def __init__(self, root: Path, files: List[str]):
+        self.root = root
+        self.files = files
+        self.modules: List[Module] = []
+        self.lessons: List[Lesson] = []
+        self.charts: List[Chart] = []
+        self.shared_charts: List[Chart] = []
+        self.tex_files: List[Path] = []
+        self.pdfs: List[Path] = []
+        self._build()
+
+    def _build(self):
+        modules: Dict[str, Module] = {}
+        lessons: Dict[tuple, Lesson] = {}
+
+        for rel in sorted(self.files):
+            parts = rel.split('/')
+            path = self.root.joinpath(*parts)
+            name = parts[-1]
+
+            lesson = None
+            if parts[0].startswith('Module_') and len(parts) >= 3:
+                module = modules.get(parts[0])
+                if module is None:
+                    module = modules[parts[0]] = Module(self.root / parts[0])
+                if parts[1].startswith('L'):
+                    key = (parts[0], parts[1])
+                    lesson = lessons.get(key)
+                    if lesson is None:
+                        lesson = lessons[key] = Lesson(module.path / parts[1], module)
+                        module.lessons.append(lesson)
+
+            if name == 'chart.py':
+                chart = Chart(path, lesson)
+                self.charts.append(chart)
+                if lesson:
+                    lesson.charts.append(chart)
+                elif parts[0] == 'charts':
+                    self.shared_charts.append(chart)
+            elif name.endswith('.tex') and parts[0].startswith('Module_'):
+                self.tex_files.append(path)
+                if lesson:
+                    lesson.tex_files.append(path)
+            elif name.endswith('.pdf') and parts[0].startswith('Module_'):
+                self.pdfs.append(path)
+                if lesson and get_timestamp(name) and '_L' in name:
+                    lesson.pdfs.append(path)
+
+        for lesson in lessons.values():
+            deck_dir = lesson.deck_dir
+            lesson.decks = sorted(
+                (t for t in lesson.tex_files
+                 if t.parent == deck_dir and get_timestamp(t.name) and get_lesson_id(t.name)),
+                key=lambda t: get_timestamp(t.name))
+
+        self.modules = [modules[k] for k in sorted(modules)]
+        self.lessons = [l for m in self.modules for l in m.lessons]
+
+    def latest_decks(self) -> Dict[str, Path]:
+        """Latest dated .tex per lesson ID (the deck that gets compiled)."""
+        decks = {}
+        for lesson in self.lessons:
+            for tex in lesson.decks:
+                lesson_id = get_lesson_id(tex.name)
+                if lesson_id not in decks or get_timestamp(tex.name) >= get_timestamp(decks[lesson_id].name):
+                    decks[lesson_id] = tex
+        return decks
+
+    def lecture_pdfs(self) -> List[Path]:
+        """Dated lecture PDFs, sorted by lesson number."""
+        pdfs = [p for lesson in self.lessons for p in lesson.pdfs]
+        return sorted(pdfs, key=lambda p: int((get_lesson_id(p.name) or 'L999')[1:]))
+
+    def lesson(self, name: str) -> Optional[Lesson]:
+        """Find a lesson by folder name, lesson ID or relative path."""
+        for lesson in self.lessons:
+            if name in (lesson.name, lesson.lesson_id,
+                        lesson.path.relative_to(self.root).as_posix()):
+                return lesson
+        return None
+
+
+def _scan(root: Path):
+    """Walk the tree once; returns (tracked files, directory mtimes)."""
+    files = []
+    dirs = {}
+    pending = ['']
+    while pending:
+        rel_dir = pending.pop()
+        abs_dir = root / rel_dir if rel_dir else root
+        try:
+            dirs[rel_dir] = os.stat(abs_dir).st_mtime_ns
+            entries = list(os.scandir(abs_dir))
+        except OSError:
+            continue
+        for entry in entries:
+            rel = f'{rel_dir}/{entry.name}' if rel_dir else entry.name
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name.startswith('.') or entry.name in EXCLUDED_DIRS:
+                    continue
+                pending.append(rel)
+            elif _is_tracked(entry.name):
+                files.append(rel)
+    return sorted(files), dirs
+
+
+def _cache_is_fresh(root: Path, dirs: Dict[str, int]) -> bool:
+    for rel_dir, mtime in dirs.items():
+        try:
+            if os.stat(root / rel_dir if rel_dir else root).st_mtime_ns != mtime:
+                return False
+        except OSError:
+            return False
+    return True
+
+
+_INDEXES: Dict[Path, CourseIndex] = {}
+
+
+def get_index(root: Path = PROJECT_ROOT, refresh: bool = False, persist: bool = True) -> CourseIndex:
+    """Return the course index for root, scanning at most once per process.
+
+    With persist=True the scan is stored in root/.course_index.json and
+    reused by later invocations while no directory in the tree has changed.
+    """
+    root = Path(root).resolve()
+    if not refresh and root in _INDEXES:
+        return _INDEXES[root]
+
+    cache_path = root / CACHE_NAME
+    files = None
+    if persist and not refresh and cache_path.exists():
+        try:
+            cached = json.loads(cache_path.read_text(encoding='utf-8'))
+            if cached.get('version') == CACHE_VERSION and _cache_is_fresh(root, cached['dirs']):
+                files = cached['files']
+        except (OSError, ValueError, KeyError):
+            files = None
+
+    if files is None:
+        if persist and not cache_path.exists():
+            # Create the cache before scanning: adding a file changes the
+            # root directory's mtime, which would invalidate the new cache
+            try:
+                cache_path.touch()
+            except OSError:
+                pass
+        files, dirs = _scan(root)
+        if persist:
+            try:
+                cache_path.write_text(json.dumps({'version': CACHE_VERSION, 'dirs': dirs,
+                                                  'files': files}), encoding='utf-8')
+            except OSError:
+                pass
+
+    _INDEXES[root] = CourseIndex(root, files)
+    return _INDEXES[root]
@@ -0,0 +1,103 @@
+"""
+File Digest Cache
+Detects changed files without re-reading unchanged ones.
+
+Digests and stat signatures are kept apart. The digests ({'blake2b': hex}
+per file) describe content and can be committed; the stat cache maps each
+file to its (size, mtime_ns, inode) and the digest read at that stat. Those
+values belong to one checkout on one machine, so the stat cache lives in an
+untracked file. A file whose stat matches its stat cache entry is not read;
+the others are hashed in parallel threads (hashlib releases the GIL while
+hashing large buffers). A fresh clone hashes everything once.
+
+Entries written by older versions (a bare MD5 string) are still understood:
+such files are hashed once with MD5 to compare and then upgraded.
+
+Usage (library):
+    from file_digests import scan_digests
+    digests, changed, stats = scan_digests({key: path, ...}, previous_digests, stat_cache)
+"""
+
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Optional, Set, Tuple
+
+CHUNK_SIZE = 1024 * 1024
+
+
+def _hash_file(path: Path, algorithm: str) -> str:
+    hasher = hashlib.blake2b(digest_size=16) if algorithm == 'blake2b' else hashlib.new(algorithm)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def file_digest(path: Path) -> str:
+    """BLAKE2b-128 hex digest of a file."""
+    return _hash_file(path, 'blake2b')
+
+
+def stat_signature(path: Path) -> list:
+    """(size, mtime_ns, inode) - changes whenever the file is rewritten."""
+    st = os.stat(path)
+    return [st.st_size, st.st_mtime_ns, st.st_ino]
+
+
+def _same(old: object, digest: str, path: Path) -> bool:
+    """Whether a previous digest entry describes the file with this digest."""
+    if isinstance(old, dict):
+        return old.get('blake2b') == digest
+    if isinstance(old, str):
+        # Legacy entry: a bare MD5 hex digest
+        return _hash_file(path, 'md5') == old
+    return False
+
+
+def scan_digests(files: Dict[str, Path], previous: Dict[str, object],
+                 stat_cache: Optional[Dict[str, dict]] = None,
+                 jobs: Optional[int] = None) -> Tuple[Dict[str, dict], Set[str], Dict[str, dict]]:
+    """Digest files, reading only those whose stat is not in stat_cache.
+
+    files maps a stable key (e.g. a relative path) to the file on disk and
+    previous maps keys to their last recorded digests. Returns (digests,
+    changed, stat_cache): the new digest entries, the keys that are new or
+    whose content differs from previous, and the stat cache to store for
+    the next scan. Keys missing from files are not reported; callers
+    compare key sets for removals.
+    """
+    stat_cache = stat_cache or {}
+    digests: Dict[str, dict] = {}
+    stats: Dict[str, dict] = {}
+    changed = set()
+    to_hash = []
+
+    for key, path in files.items():
+        signature = stat_signature(path)
+        cached = stat_cache.get(key)
+        if isinstance(cached, dict) and cached.get('stat') == signature and 'blake2b' in cached:
+            digest = cached['blake2b']
+            digests[key] = {'blake2b': digest}
+            stats[key] = cached
+            if not _same(previous.get(key), digest, path):
+                changed.add(key)
+        else:
+            to_hash.append((key, path, signature))
+
+    def digest_file(item):
+        key, path, signature = item
+        digest = file_digest(path)
+        return key, digest, signature, _same(previous.get(key), digest, path)
+
+    if to_hash:
+        workers = max(1, min(jobs or os.cpu_count() or 1, len(to_hash)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for key, digest, signature, same in pool.map(digest_file, to_hash):
+                digests[key] = {'blake2b': digest}
+                stats[key] = {'blake2b': digest, 'stat': signature}
+                if not same:
+                    changed.add(key)
+
+    return digests, changed, stats
@@ -0,0 +1,52 @@
+"""
+Overlap Analysis Backend
+Matplotlib backend used by chart_overlap_detector's render analysis.
+
+When a chart script calls savefig(), the figure is laid out with a single Agg
+renderer shared by every figure in the process (draw calls are disabled, so
+nothing is rasterized) and handed to on_save instead of being written out.
+The chart's real output files are never touched.
+
+Usage (library):
+    import matplotlib
+    matplotlib.use('module://overlap_backend')
+    import overlap_backend
+    overlap_backend.on_save = lambda figure, renderer: ...
+"""
+
+from matplotlib.backend_bases import FigureManagerBase
+from matplotlib.backends.backend_agg import FigureCanvasAgg, RendererAgg
+
+# Called as on_save(figure, renderer) for every savefig(); results collect in captured
+on_save = None
+captured = []
+
+_renderer = None
+_renderer_key = None
+
+
+def shared_renderer(width: float, height: float, dpi: float) -> RendererAgg:
+    """The process-wide Agg renderer, recreated only when the canvas size changes."""
+    global _renderer, _renderer_key
+    key = (width, height, dpi)
+    if _renderer is None or _renderer_key != key:
+        _renderer = RendererAgg(width, height, dpi)
+        _renderer_key = key
+    return _renderer
+
+
+class FigureCanvasOverlap(FigureCanvasAgg):
+    """Agg canvas whose savefig() lays the figure out and reports it."""
+    def get_renderer(self):
+        width, height = self.figure.bbox.size
+        return shared_renderer(width, height, self.figure.dpi)
+
+    def print_figure(self, filename, *args, **kwargs):
+        renderer = self.get_renderer()
+        with renderer._draw_disabled():
+            self.figure.draw(renderer)
+        captured.append(on_save(self.figure, renderer) if on_save else None)
+
+
+FigureCanvas = FigureCanvasOverlap
+FigureManager = FigureManagerBase
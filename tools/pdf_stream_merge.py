@@ -0,0 +1,323 @@
+"""
+Streaming PDF Merger
+Concatenates PDFs into one file while holding only one source in memory.
+
+PyPDF2's PdfMerger keeps every appended document in memory until write().
+StreamingPdfMerger instead copies each source's pages (and everything they
+reference) straight to the output file, renumbering objects as it goes, and
+then drops the source. Objects whose serialized content is byte-identical
+(embedded fonts, images, shared form XObjects) are written once and shared.
+
+Each source's page range is recorded in the combined file itself: as an
+outline entry per source and as a /PageLabels range (e.g. "L01-3").
+Named destinations used by internal links (Beamer navigation) are prefixed
+per source so they keep working after the merge.
+
+Usage (library):
+    from pdf_stream_merge import StreamingPdfMerger
+    with StreamingPdfMerger(output_path) as merger:
+        merger.append(pdf_path, title='L01 What is Blockchain', label='L01-')
+    merger.page_ranges  # [(title, first_page, page_count), ...]
+"""
+
+import hashlib
+import io
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from PyPDF2 import PdfReader
+from PyPDF2.generic import (ArrayObject, DictionaryObject, IndirectObject,
+                            NameObject, NumberObject, StreamObject,
+                            TextStringObject, ByteStringObject)
+
+# Objects of these types may be shared between pages and documents
+SHAREABLE_TYPES = {'/Font', '/FontDescriptor', '/Encoding', '/ExtGState',
+                   '/XObject', '/Pattern', '/Shading', '/Metadata'}
+
+# Page keys that are rebuilt rather than copied
+SKIPPED_PAGE_KEYS = {'/Parent', '/B', '/StructParents'}
+
+PAGES_ID = 1
+CATALOG_ID = 2
+
+
+def _is_name_dest(value) -> bool:
+    return isinstance(value, (TextStringObject, ByteStringObject, NameObject))
+
+
+def _dest_key(value) -> str:
+    if isinstance(value, ByteStringObject):
+        return value.decode('latin-1')
+    return str(value).lstrip('/') if isinstance(value, NameObject) else str(value)
+
+
+class StreamingPdfMerger:
+    """Write a combined PDF one source document at a time."""
+    def __init__(self, output_path: Path):
+        self.output_path = Path(output_path)
+        self.page_ranges: List[Tuple[str, int, int]] = []
+        self._labels: List[Tuple[int, str]] = []
+        self._out = None
+        self._offsets: Dict[int, int] = {}
+        self._next_id = CATALOG_ID + 1
+        self._page_ids: List[int] = []
+        self._shared: Dict[bytes, int] = {}     # content digest -> object id
+        self._dests: List[Tuple[str, int]] = []  # prefixed name -> dest object id
+        self.shared_objects = 0
+
+        # Per-source state
+        self._map: Dict[Tuple[int, int], int] = {}
+        self._active = set()
+        self._prefix = ''
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        elif self._out:
+            self._out.close()
+
+    def open(self):
+        self._out = open(self.output_path, 'wb')
+        self._out.write(b'%PDF-1.5\n%\xe2\xe3\xcf\xd3\n')
+
+    # -- object output -----------------------------------------------------
+
+    def _alloc(self) -> int:
+        obj_id = self._next_id
+        self._next_id += 1
+        return obj_id
+
+    def _write_object(self, obj_id: int, data: bytes):
+        self._offsets[obj_id] = self._out.tell()
+        self._out.write(f'{obj_id} 0 obj\n'.encode('ascii'))
+        self._out.write(data)
+        self._out.write(b'\nendobj\n')
+
+    @staticmethod
+    def _serialize(obj) -> bytes:
+        buffer = io.BytesIO()
+        obj.write_to_stream(buffer, None)
+        return buffer.getvalue()
+
+    @staticmethod
+    def _shareable(obj) -> bool:
+        if isinstance(obj, StreamObject):
+            return True
+        if isinstance(obj, DictionaryObject):
+            return obj.get('/Type') in SHAREABLE_TYPES
+        return True
+
+    def _emit(self, ref: IndirectObject) -> int:
+        """Copy a source object (and what it references) to the output."""
+        key = (ref.idnum, ref.generation)
+        if key in self._map:
+            return self._map[key]
+        if key in self._active:
+            # Reference cycle: fix this object's id now, content follows later
+            self._map[key] = self._alloc()
+            return self._map[key]
+
+        self._active.add(key)
+        obj = ref.get_object()
+        body = self._remap(obj)
+        self._active.discard(key)
+        data = self._serialize(body)
+
+        if key in self._map:
+            self._write_object(self._map[key], data)
+            return self._map[key]
+
+        digest = hashlib.sha256(data).digest() if self._shareable(obj) else None
+        if digest is not None and digest in self._shared:
+            self.shared_objects += 1
+            obj_id = self._shared[digest]
+        else:
+            obj_id = self._alloc()
+            self._write_object(obj_id, data)
+            if digest is not None:
+                self._shared[digest] = obj_id
+        self._map[key] = obj_id
+        return obj_id
+
+    def _remap(self, obj):
+        """Rebuild obj with references pointing at output object ids."""
+        if isinstance(obj, IndirectObject):
+            return IndirectObject(self._emit(obj), 0, None)
+        if isinstance(obj, StreamObject):
+            new = type(obj)()
+            new._data = obj._data
+            for k, v in obj.items():
+                if k != '/Length':
+                    new[NameObject(k)] = self._remap(v)
+            return new
+        if isinstance(obj, DictionaryObject):
+            new = DictionaryObject()
+            for k, v in obj.items():
+                new[NameObject(k)] = self._remap(v)
+            # Internal links by name: rename to this source's namespace
+            if '/Dest' in new and _is_name_dest(new['/Dest']):
+                new[NameObject('/Dest')] = TextStringObject(self._prefix + _dest_key(new['/Dest']))
+            if new.get('/S') == '/GoTo' and _is_name_dest(new.get('/D')):
+                new[NameObject('/D')] = TextStringObject(self._prefix + _dest_key(new['/D']))
+            return new
+        if isinstance(obj, ArrayObject):
+            return ArrayObject(self._remap(v) for v in obj)
+        return obj
+
+    # -- sources -----------------------------------------------------------
+
+    @staticmethod
+    def _named_destinations(reader: PdfReader) -> Dict[str, object]:
+        """Raw named destinations from the /Dests dict and /Names name tree."""
+        root = reader.trailer['/Root']
+        dests = {}
+        if '/Dests' in root:
+            for name, value in root['/Dests'].get_object().items():
+                dests[_dest_key(NameObject(name))] = value
+
+        names = root.get('/Names')
+        tree = names.get_object().get('/Dests') if names else None
+        pending = [tree] if tree else []
+        while pending:
+            node = pending.pop().get_object()
+            for kid in node.get('/Kids', []):
+                pending.append(kid)
+            entries = node.get('/Names', [])
+            for i in range(0, len(entries) - 1, 2):
+                dests[_dest_key(entries[i])] = entries[i + 1]
+        return dests
+
+    def append(self, pdf_path: Path, title: str, label: str = ''):
+        """Copy all pages of pdf_path, then release it."""
+        reader = PdfReader(str(pdf_path))
+        self._map = {}
+        self._active = set()
+        self._prefix = f"{(label or title).rstrip('-')}:"
+
+        first_page = len(self._page_ids)
+        pages = list(reader.pages)
+
+        # Pages are part of reference cycles (annotations point back to them),
+        # so give them their ids before copying any content
+        page_ids = []
+        for page in pages:
+            ref = page.indirect_reference
+            self._map[(ref.idnum, ref.generation)] = self._alloc()
+            page_ids.append(self._map[(ref.idnum, ref.generation)])
+
+        for page, page_id in zip(pages, page_ids):
+            # reader.pages already carries inherited Resources/MediaBox/Rotate
+            new = DictionaryObject()
+            for k, v in page.items():
+                if k not in SKIPPED_PAGE_KEYS:
+                    new[NameObject(k)] = self._remap(v)
+            new[NameObject('/Parent')] = IndirectObject(PAGES_ID, 0, None)
+            self._write_object(page_id, self._serialize(new))
+
+        for name, value in self._named_destinations(reader).items():
+            dest = self._remap(value)
+            if isinstance(dest, IndirectObject):
+                dest_id = dest.idnum
+            else:
+                dest_id = self._alloc()
+                self._write_object(dest_id, self._serialize(dest))
+            self._dests.append((self._prefix + name, dest_id))
+
+        self._page_ids.extend(page_ids)
+        self._labels.append((first_page, label))
+        self.page_ranges.append((title, first_page, len(page_ids)))
+
+        # Drop the reader and its object cache before the next source
+        self._map = {}
+        del reader, pages
+
+    # -- document structure ------------------------------------------------
+
+    def _write_outline(self) -> Optional[int]:
+        if not self.page_ranges:
+            return None
+        outline_id = self._alloc()
+        item_ids = [self._alloc() for _ in self.page_ranges]
+
+        for i, (title, first_page, _) in enumerate(self.page_ranges):
+            item = DictionaryObject({
+                NameObject('/Title'): TextStringObject(title),
+                NameObject('/Parent'): IndirectObject(outline_id, 0, None),
+                NameObject('/Dest'): ArrayObject([
+                    IndirectObject(self._page_ids[first_page], 0, None), NameObject('/Fit')]),
+            })
+            if i > 0:
+                item[NameObject('/Prev')] = IndirectObject(item_ids[i - 1], 0, None)
+            if i < len(item_ids) - 1:
+                item[NameObject('/Next')] = IndirectObject(item_ids[i + 1], 0, None)
+            self._write_object(item_ids[i], self._serialize(item))
+
+        outline = DictionaryObject({
+            NameObject('/Type'): NameObject('/Outlines'),
+            NameObject('/First'): IndirectObject(item_ids[0], 0, None),
+            NameObject('/Last'): IndirectObject(item_ids[-1], 0, None),
+            NameObject('/Count'): NumberObject(len(item_ids)),
+        })
+        self._write_object(outline_id, self._serialize(outline))
+        return outline_id
+
+    def close(self):
+        """Write page tree, catalog, cross-reference table and trailer."""
+        pages = DictionaryObject({
+            NameObject('/Type'): NameObject('/Pages'),
+            NameObject('/Kids'): ArrayObject(IndirectObject(i, 0, None) for i in self._page_ids),
+            NameObject('/Count'): NumberObject(len(self._page_ids)),
+        })
+        self._write_object(PAGES_ID, self._serialize(pages))
+
+        catalog = DictionaryObject({
+            NameObject('/Type'): NameObject('/Catalog'),
+            NameObject('/Pages'): IndirectObject(PAGES_ID, 0, None),
+        })
+
+        outline_id = self._write_outline()
+        if outline_id:
+            catalog[NameObject('/Outlines')] = IndirectObject(outline_id, 0, None)
+            catalog[NameObject('/PageMode')] = NameObject('/UseOutlines')
+
+        if self._labels:
+            nums = ArrayObject()
+            for first_page, label in self._labels:
+                nums.append(NumberObject(first_page))
+                nums.append(DictionaryObject({
+                    NameObject('/S'): NameObject('/D'),
+                    NameObject('/P'): TextStringObject(label),
+                }))
+            catalog[NameObject('/PageLabels')] = DictionaryObject({NameObject('/Nums'): nums})
+
+        if self._dests:
+            # Name tree leaves must be sorted by key
+            flat = ArrayObject()
+            for name, dest_id in sorted(self._dests, key=lambda d: d[0].encode('utf-8')):
+                flat.append(TextStringObject(name))
+                flat.append(IndirectObject(dest_id, 0, None))
+            dests_id = self._alloc()
+            self._write_object(dests_id, self._serialize(DictionaryObject({NameObject('/Names'): flat})))
+            catalog[NameObject('/Names')] = DictionaryObject({
+                NameObject('/Dests'): IndirectObject(dests_id, 0, None)})
+
+        self._write_object(CATALOG_ID, self._serialize(catalog))
+
+        xref_offset = self._out.tell()
+        size = self._next_id
+        self._out.write(f'xref\n0 {size}\n'.encode('ascii'))
+        self._out.write(b'0000000000 65535 f \n')
+        for obj_id in range(1, size):
+            offset = self._offsets.get(obj_id)
+            if offset is None:
+                self._out.write(b'0000000000 65535 f \n')
+            else:
+                self._out.write(f'{offset:010d} 00000 n \n'.encode('ascii'))
+        self._out.write(f'trailer\n<< /Size {size} /Root {CATALOG_ID} 0 R >>\n'
+                        f'startxref\n{xref_offset}\n%%EOF\n'.encode('ascii'))
+        self._out.close()
+        self._out = None
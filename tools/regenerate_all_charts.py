@@ -1,64 +1,86 @@
 """
 Regenerate All Charts
 Executes all chart.py files in the project to regenerate chart PDFs.
+
+Charts are rendered by a pool of worker processes (see chart_build.py) that
+import matplotlib once and run each script in an isolated namespace.
+
+Usage:
+    python regenerate_all_charts.py                # Use all cores
+    python regenerate_all_charts.py --jobs 4       # Limit worker count
+    python regenerate_all_charts.py --timeout 120  # Per-chart timeout (s)
+    python regenerate_all_charts.py --incremental  # Skip unchanged charts
 """
 
-import subprocess
+import argparse
 import sys
 from pathlib import Path
 
-def regenerate_all_charts(base_path: Path):
-    """Find and execute all chart.py files."""
-    chart_files = list(base_path.rglob('chart.py'))
+from chart_build import (build_charts, default_jobs, DEFAULT_TIMEOUT,
+                         STATUS_OK, STATUS_ERROR, STATUS_TIMEOUT, STATUS_SKIPPED)
+from course_index import get_index
 
-    # Exclude tools directory
-    chart_files = [f for f in chart_files if 'tools' not in str(f)]
 
-    print(f"Found {len(chart_files)} chart files to regenerate\n")
+def regenerate_all_charts(base_path: Path, jobs: int = None,
+                          timeout: float = DEFAULT_TIMEOUT,
+                          incremental: bool = False):
+    """Find and execute all chart.py files."""
+    # The course index never descends into tools/
+    chart_files = sorted(chart.script for chart in get_index(base_path).charts)
 
-    success = 0
-    failed = 0
+    jobs = jobs or default_jobs()
+    print(f"Found {len(chart_files)} chart files to regenerate ({jobs} workers)\n")
 
-    for i, chart_file in enumerate(sorted(chart_files), 1):
-        relative = chart_file.relative_to(base_path)
-        print(f"[{i}/{len(chart_files)}] Regenerating: {relative}")
+    done = 0
 
-        try:
-            result = subprocess.run(
-                [sys.executable, str(chart_file)],
-                cwd=chart_file.parent,
-                capture_output=True,
-                text=True,
-                timeout=60
-            )
+    def report(result):
+        nonlocal done
+        done += 1
+        if result.status == STATUS_SKIPPED:
+            return
+        relative = result.chart_file.relative_to(base_path)
+        print(f"[{done}/{len(chart_files)}] Regenerating: {relative}")
+        if result.status == STATUS_OK:
+            print(f"  -> OK")
+        elif result.status == STATUS_ERROR:
+            print(f"  -> ERROR: {result.message[-200:]}")
+        elif result.status == STATUS_TIMEOUT:
+            print(f"  -> TIMEOUT")
+        else:
+            print(f"  -> EXCEPTION: {result.message[:100]}")
 
-            if result.returncode == 0:
-                print(f"  -> OK")
-                success += 1
-            else:
-                print(f"  -> ERROR: {result.stderr[:200]}")
-                failed += 1
+    results = build_charts(chart_files, jobs=jobs, timeout=timeout,
+                           on_result=report, incremental=incremental)
 
-        except subprocess.TimeoutExpired:
-            print(f"  -> TIMEOUT")
-            failed += 1
-        except Exception as e:
-            print(f"  -> EXCEPTION: {str(e)[:100]}")
-            failed += 1
+    skipped = sum(1 for r in results.values() if r.status == STATUS_SKIPPED)
+    success = sum(1 for r in results.values() if r.status == STATUS_OK)
+    failed = len(results) - success - skipped
 
     print(f"\n{'='*60}")
     print(f"SUMMARY")
     print(f"{'='*60}")
     print(f"Total charts: {len(chart_files)}")
     print(f"Success: {success}")
+    if incremental:
+        print(f"Skipped (unchanged): {skipped}")
     print(f"Failed: {failed}")
 
     return failed == 0
 
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Regenerate all chart PDFs')
+    parser.add_argument('--jobs', '-j', type=int, default=None,
+                        help='Number of worker processes (default: all cores)')
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT,
+                        help='Per-chart timeout in seconds')
+    parser.add_argument('--incremental', '-i', action='store_true',
+                        help='Only rebuild charts whose inputs changed')
+    args = parser.parse_args()
+
     # Find project root
     current = Path(__file__).parent.parent
 
-    success = regenerate_all_charts(current)
+    success = regenerate_all_charts(current, jobs=args.jobs, timeout=args.timeout,
+                                    incremental=args.incremental)
     sys.exit(0 if success else 1)
@@ -0,0 +1,161 @@
+"""
+LaTeX Dependency Tracker
+Decides whether a deck needs recompiling by fingerprinting its inputs.
+
+A deck's fingerprint is the hash of the .tex source together with every file
+it references through \\includegraphics, \\input and \\include (followed
+recursively into included .tex files). The fingerprint of the last successful
+build is stored in .tex_fingerprints.json at the project root together with
+the hash of the PDF it produced; a deck is skipped only when its fingerprint
+still matches and the PDF on disk is that same file.
+
+Usage (library):
+    from tex_deps import TexBuildState
+    state = TexBuildState.load()
+    if not state.is_up_to_date(tex_path, pdf_path):
+        ... compile ...
+        state.record(tex_path, pdf_path)
+    state.save()
+"""
+
+import hashlib
+import json
+import re
+from pathlib import Path
+from typing import Dict, List, Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+STATE_FILE = PROJECT_ROOT / ".tex_fingerprints.json"
+
+# \includegraphics[opts]{path}, \input{path}, \include{path}
+REFERENCE_PATTERN = re.compile(
+    r'\\(includegraphics|input|include)\s*(?:\[[^\]]*\])?\s*\{([^}]+)\}')
+
+# Extensions pdflatex tries when \includegraphics omits one
+GRAPHICS_EXTENSIONS = ['.pdf', '.png', '.jpg', '.jpeg']
+
+
+def _strip_comments(source: str) -> str:
+    """Drop LaTeX comments so commented-out figures are not dependencies."""
+    return re.sub(r'(?<!\\)%.*', '', source)
+
+
+def _resolve(command: str, ref: str, base_dir: Path) -> Path:
+    """Map a reference to the file pdflatex would load (may not exist)."""
+    path = base_dir / ref.strip()
+    if path.suffix:
+        return path
+    if command == 'includegraphics':
+        for ext in GRAPHICS_EXTENSIONS:
+            if path.with_suffix(ext).exists():
+                return path.with_suffix(ext)
+        return path.with_suffix('.pdf')
+    return path.with_suffix('.tex')
+
+
+def find_dependencies(tex_path: Path) -> List[Path]:
+    """All files referenced by a deck, including nested \\input files.
+
+    Paths are resolved relative to the deck's directory, which is the
+    working directory pdflatex runs in.
+    """
+    tex_path = Path(tex_path)
+    base_dir = tex_path.parent
+    deps = []
+    seen = {tex_path.resolve()}
+    pending = [tex_path]
+
+    while pending:
+        current = pending.pop()
+        try:
+            source = current.read_text(encoding='utf-8', errors='replace')
+        except OSError:
+            continue
+        for command, ref in REFERENCE_PATTERN.findall(_strip_comments(source)):
+            path = _resolve(command, ref, base_dir)
+            key = path.resolve()
+            if key in seen:
+                continue
+            seen.add(key)
+            deps.append(path)
+            if path.suffix == '.tex':
+                pending.append(path)
+
+    return deps
+
+
+def _file_hash(path: Path) -> str:
+    hasher = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(65536), b''):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def compute_fingerprint(tex_path: Path) -> str:
+    """Hash the deck source and all of its dependencies into one digest."""
+    tex_path = Path(tex_path)
+    hasher = hashlib.sha256()
+    hasher.update(_file_hash(tex_path).encode('ascii'))
+
+    for dep in sorted(find_dependencies(tex_path), key=lambda p: p.as_posix()):
+        rel = dep.relative_to(tex_path.parent) if dep.is_relative_to(tex_path.parent) else dep
+        hasher.update(rel.as_posix().encode('utf-8'))
+        # A missing file is part of the fingerprint so its appearance triggers a rebuild
+        hasher.update(_file_hash(dep).encode('ascii') if dep.exists() else b'missing')
+
+    return hasher.hexdigest()
+
+
+class TexBuildState:
+    """Fingerprints of the last successful build of each deck."""
+    def __init__(self, path: Path = STATE_FILE, entries: Optional[Dict[str, Dict]] = None):
+        self.path = path
+        self.entries = entries or {}
+        self._pending: Dict[str, str] = {}
+
+    @classmethod
+    def load(cls, path: Path = STATE_FILE) -> 'TexBuildState':
+        try:
+            entries = json.loads(path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            entries = {}
+        return cls(path, entries)
+
+    def _key(self, tex_path: Path) -> str:
+        tex_path = Path(tex_path).resolve()
+        root = self.path.resolve().parent
+        if tex_path.is_relative_to(root):
+            return tex_path.relative_to(root).as_posix()
+        return tex_path.as_posix()
+
+    def is_up_to_date(self, tex_path: Path, pdf_path: Path) -> bool:
+        """True if the PDF exists and was built by us from the current inputs."""
+        key = self._key(tex_path)
+        fingerprint = compute_fingerprint(tex_path)
+        self._pending[key] = fingerprint
+
+        entry = self.entries.get(key)
+        pdf_path = Path(pdf_path)
+        return (entry is not None
+                and entry.get('fingerprint') == fingerprint
+                and pdf_path.exists()
+                and entry.get('pdf_hash') == _file_hash(pdf_path))
+
+    def record(self, tex_path: Path, pdf_path: Path):
+        """Remember the inputs and output of a deck that just compiled successfully.
+
+        Uses the fingerprint taken by is_up_to_date() before compiling, so
+        edits made while pdflatex was running still trigger a rebuild.
+        """
+        key = self._key(tex_path)
+        fingerprint = self._pending.pop(key, None) or compute_fingerprint(tex_path)
+        self.entries[key] = {'fingerprint': fingerprint, 'pdf_hash': _file_hash(Path(pdf_path))}
+
+    def forget(self, tex_path: Path):
+        """Drop a deck whose build failed so the next run retries it."""
+        self.entries.pop(self._key(tex_path), None)
+
+    def save(self):
+        self.path.write_text(json.dumps(self.entries, indent=2, sort_keys=True) + '\n',
+                             encoding='utf-8')
@@ -0,0 +1,138 @@
+"""
+Incremental, Reproducible ZIP Builder
+Rebuilds a ZIP archive while reusing the compressed bytes of unchanged entries.
+
+- An entry whose source file has the same size and CRC-32 as the entry in the
+  existing archive is copied across as raw compressed bytes, so it is never
+  recompressed.
+- New or changed entries are deflated only if a sample compresses well
+  enough to be worth it; otherwise they are stored.
+- Entries are written in sorted order with a fixed timestamp, permissions and
+  host OS, so the same inputs always produce a byte-identical archive.
+
+Usage (library):
+    from zip_archive import update_archive
+    stats = update_archive(zip_path, [(archive_name, source_path), ...])
+"""
+
+import os
+import struct
+import zipfile
+import zlib
+from pathlib import Path
+from typing import Dict, Iterable, Tuple
+
+# Fixed entry timestamp (the earliest a ZIP can hold) unless SOURCE_DATE_EPOCH is set
+DEFAULT_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+# Deflate an entry only if the sample shrinks by at least this fraction
+MIN_SAVING = 0.05
+SAMPLE_SIZE = 256 * 1024
+
+_LOCAL_HEADER = struct.Struct('<4s2B4HL2L2H')
+
+
+def entry_date_time() -> Tuple[int, ...]:
+    """Timestamp stamped on every entry."""
+    epoch = os.environ.get('SOURCE_DATE_EPOCH')
+    if epoch:
+        from datetime import datetime, timezone
+        stamp = datetime.fromtimestamp(int(epoch), tz=timezone.utc)
+        return max(DEFAULT_DATE_TIME, stamp.timetuple()[:6])
+    return DEFAULT_DATE_TIME
+
+
+def file_crc32(path: Path) -> int:
+    crc = 0
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            crc = zlib.crc32(chunk, crc)
+    return crc
+
+
+def choose_compression(path: Path) -> int:
+    """ZIP_DEFLATED if a sample of the file compresses usefully, else ZIP_STORED."""
+    with open(path, 'rb') as f:
+        sample = f.read(SAMPLE_SIZE)
+    if not sample:
+        return zipfile.ZIP_STORED
+    ratio = len(zlib.compress(sample, 6)) / len(sample)
+    return zipfile.ZIP_DEFLATED if ratio <= 1 - MIN_SAVING else zipfile.ZIP_STORED
+
+
+def _make_info(archive_name: str, date_time, compress_type: int) -> zipfile.ZipInfo:
+    info = zipfile.ZipInfo(archive_name, date_time=date_time)
+    info.compress_type = compress_type
+    info.create_system = 3                  # Unix, regardless of build host
+    info.external_attr = 0o100644 << 16     # -rw-r--r--
+    return info
+
+
+def _read_raw(archive: zipfile.ZipFile, info: zipfile.ZipInfo) -> bytes:
+    """Compressed bytes of an entry, exactly as stored in the archive."""
+    fp = archive.fp
+    fp.seek(info.header_offset)
+    header = _LOCAL_HEADER.unpack(fp.read(_LOCAL_HEADER.size))
+    name_len, extra_len = header[-2], header[-1]
+    fp.seek(name_len + extra_len, 1)
+    return fp.read(info.compress_size)
+
+
+def _write_raw(archive: zipfile.ZipFile, info: zipfile.ZipInfo, raw: bytes):
+    """Append an already-compressed entry (CRC and sizes set on info)."""
+    fp = archive.fp
+    info.header_offset = fp.tell()
+    fp.write(info.FileHeader(zip64=None))
+    fp.write(raw)
+    archive.filelist.append(info)
+    archive.NameToInfo[info.filename] = info
+    archive.start_dir = fp.tell()
+
+
+def update_archive(zip_path: Path, entries: Iterable[Tuple[str, Path]]) -> Dict[str, int]:
+    """Write zip_path from (archive_name, source_path) pairs.
+
+    Returns counts of 'reused', 'deflated' and 'stored' entries.
+    """
+    zip_path = Path(zip_path)
+    entries = sorted((name, Path(path)) for name, path in entries)
+    date_time = entry_date_time()
+    stats = {'reused': 0, 'deflated': 0, 'stored': 0}
+
+    old = None
+    if zip_path.exists():
+        try:
+            old = zipfile.ZipFile(zip_path, 'r')
+        except zipfile.BadZipFile:
+            old = None
+
+    temp_path = zip_path.with_suffix(zip_path.suffix + '.tmp')
+    try:
+        with zipfile.ZipFile(temp_path, 'w') as new:
+            for archive_name, source in entries:
+                size = source.stat().st_size
+                crc = file_crc32(source)
+
+                previous = old.NameToInfo.get(archive_name) if old else None
+                if (previous is not None and previous.file_size == size
+                        and previous.CRC == crc and previous.date_time == date_time):
+                    info = _make_info(archive_name, date_time, previous.compress_type)
+                    info.CRC = crc
+                    info.file_size = size
+                    info.compress_size = previous.compress_size
+                    _write_raw(new, info, _read_raw(old, previous))
+                    stats['reused'] += 1
+                    continue
+
+                compress_type = choose_compression(source)
+                info = _make_info(archive_name, date_time, compress_type)
+                with open(source, 'rb') as src, new.open(info, 'w') as dst:
+                    for chunk in iter(lambda: src.read(1024 * 1024), b''):
+                        dst.write(chunk)
+                stats['deflated' if compress_type == zipfile.ZIP_DEFLATED else 'stored'] += 1
+    finally:
+        if old:
+            old.close()
+
+    temp_path.replace(zip_path)
+    return stats